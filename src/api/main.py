@@ -1,69 +1,122 @@
-from typing import Awaitable, Callable, List
+from typing import Awaitable, Callable, List, Optional
 
+import numpy as np
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, Path, Request, Response
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
 
 from api.config import settings
 from api.custom_log import LOG
 from entity.build_model import BuildModel
+from entity.cooccurrence_entry import CooccurrenceEntry
 from entity.build_response import BuildResponse
+from entity.build_diff import BuildDiff
+from entity.build_history import BuildHistoryResponse
+from entity.build_trend import BuildTrends
 from entity.builds_query_params import BuildsQueryParams
+from entity.meta_diff_query_params import MetaDiffQueryParams
+from entity.meta_rollup import MetaRollup
+from entity.relevance_sweep import RelevanceSweep, SweepPoint
+from entity.search_result import SearchResult
+from entity.team import TeamRecommendation
+from entity.team_query_params import TeamQueryParams
+from entity.tier_list import TierList
+from entity.tier_query_params import TierQueryParams
+from entity.trend_query_params import TrendQueryParams
+from pokemon_unite_meta_analysis.build_history import (
+    BUILD_HISTORY,
+    build_key,
+)
+from pokemon_unite_meta_analysis.cooccurrence import (
+    COOCCURRENCE_MATRICES,
+    COOCCURRENCE_WEIGHTS,
+)
 from pokemon_unite_meta_analysis.filter_strategy import FILTER_STRATEGIES
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+from pokemon_unite_meta_analysis.meta_diff import (
+    META_DIFF_CACHE,
+    compute_meta_diff,
+    query_meta_diff,
+)
+from pokemon_unite_meta_analysis.percentile import PERCENTILE_COLUMNS
+from pokemon_unite_meta_analysis.query_plan import QueryPlan
 from pokemon_unite_meta_analysis.relevance_strategy import (
-    RELEVANCE_STRATEGIES,
     Relevance,
+    relevance_sweep,
+)
+from pokemon_unite_meta_analysis.rollup import ROLLUP_COLUMNS
+from pokemon_unite_meta_analysis.search_index import (
+    SEARCH_COLUMNS,
+    SEARCH_INDEX,
 )
-from pokemon_unite_meta_analysis.sort_strategy import SORT_STRATEGIES, SortBy
+from pokemon_unite_meta_analysis.snapshot_cache import SNAPSHOT_CACHE
+from pokemon_unite_meta_analysis.sort_strategy import SortBy
+from pokemon_unite_meta_analysis.team_recommender import recommend_teams
+from pokemon_unite_meta_analysis.tier_list import (
+    TIER_LIST_CACHE,
+    compute_tier_list,
+)
+from pokemon_unite_meta_analysis.trends import TREND_INDEX, compute_trends
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
 from repository.build_repository import BuildRepository
 
 app = FastAPI(title=settings.api_name, debug=settings.debug)
 
 
-def _calculate_popularity_ranks(
-    builds: List[BuildModel], week: str = None
-) -> dict[int, int]:
+def _lookup_rows(snapshot: WeekSnapshot, column: str, name: str) -> np.ndarray:
     """
-    Calculate popularity ranks for builds based on moveset_item_true_pick_rate.
+    Find the builds whose column matches a name, ignoring case and spacing.
 
     Args:
-        builds: List of builds to calculate popularity for
-        week: Optional week filter for calculating popularity within a week
+        snapshot: Snapshot to search
+        column: Build attribute (pokemon, role or item)
+        name: Name as typed by the user
 
     Returns:
-        Dictionary mapping build ID to popularity rank (1 = most popular)
+        Positions of the matching builds in the snapshot
     """
-    # Get all builds for the week to calculate popularity
-    with BuildRepository() as repo:
-        week_builds = repo.get_all_builds(week=week)
-
-    # Sort by moveset_item_true_pick_rate descending to get popularity order
-    sorted_by_popularity = sorted(
-        week_builds, key=lambda b: b.moveset_item_true_pick_rate, reverse=True
-    )
+    index = snapshot.inverted_index(column)
 
-    # Create mapping of build ID to popularity rank
-    popularity_map = {
-        build.id: idx + 1 for idx, build in enumerate(sorted_by_popularity)
-    }
-
-    return popularity_map
+    return np.flatnonzero(index.to_mask(index.union([normalize_key(name)])))
 
 
 def _convert_to_build_response(
-    builds: List[BuildModel], week: str = None
+    builds: List[BuildModel],
+    snapshot: WeekSnapshot,
+    include_percentiles: bool = False,
 ) -> List[BuildResponse]:
     """
     Convert BuildModel instances to BuildResponse with computed fields.
 
     Args:
         builds: List of BuildModel instances from database
-        week: Optional week for popularity calculation
+        snapshot: Snapshot of the week (or all weeks) the builds belong to,
+            used for the popularity and percentile ranks
+        include_percentiles: Whether to add the percentile ranks
 
     Returns:
         List of BuildResponse instances with popularity and rank fields
     """
-    # Calculate popularity ranks for all builds in the week
-    popularity_map = _calculate_popularity_ranks(builds, week)
+    # Popularity ranks are computed once per snapshot and reused
+    popularity_map = snapshot.popularity_ranks
+
+    percentiles = [None] * len(builds)
+    if include_percentiles:
+        positions = [snapshot.positions[build.id] for build in builds]
+        percentiles = [
+            {
+                name: None if np.isnan(rank) else round(rank, 4)
+                for name, rank in zip(PERCENTILE_COLUMNS, ranks)
+            }
+            for ranks in snapshot.percentiles[positions].tolist()
+        ]
 
     # Convert to BuildResponse with rank (position in current result set)
     # and popularity (position within week by moveset_item_true_pick_rate)
@@ -88,6 +141,12 @@ def _convert_to_build_response(
                 moveset_item_true_pick_rate=build.moveset_item_true_pick_rate,
                 popularity=popularity_map.get(build.id, 0),
                 rank=idx + 1,
+                weighted_win_rate=build.weighted_win_rate,
+                adjusted_win_rate=build.adjusted_win_rate,
+                win_rate_z_score=build.win_rate_z_score,
+                win_rate_ci_lower=build.win_rate_ci_lower,
+                win_rate_ci_upper=build.win_rate_ci_upper,
+                percentiles=percentiles[idx],
             )
         )
 
@@ -135,15 +194,13 @@ def get_pokemon():
 )
 def get_pokemon_by_name(name: str = Path(..., description="Pokémon name")):
     with BuildRepository() as repo:
-        builds = repo.get_all_builds()
-    filtered = [
-        build for build in builds if build.pokemon.lower() == name.lower()
-    ]
+        snapshot = SNAPSHOT_CACHE.get(None, repo.get_all_builds)
+    filtered = snapshot.take(_lookup_rows(snapshot, "pokemon", name))
     if not filtered:
         raise HTTPException(
             status_code=404, detail=f"Pokémon '{name}' not found."
         )
-    return _convert_to_build_response(filtered)
+    return _convert_to_build_response(filtered, snapshot)
 
 
 # /roles endpoints
@@ -175,16 +232,16 @@ def get_role_pokemon(role: str = Path(..., description="Role name")):
     LOG.debug("role: %s", role)
 
     with BuildRepository() as repo:
-        builds = repo.get_all_builds()
+        snapshot = SNAPSHOT_CACHE.get(None, repo.get_all_builds)
 
     # Filter builds by role (case-insensitive)
-    filtered = [build for build in builds if build.role.lower() == role.lower()]
+    rows = _lookup_rows(snapshot, "role", role)
 
-    if not filtered:
+    if len(rows) == 0:
         raise HTTPException(status_code=404, detail=f"Role '{role}' not found.")
 
     # Get unique Pokémon names for this role
-    pokemon_names = [build.pokemon for build in filtered]
+    pokemon_names = snapshot.column("pokemon")[rows].tolist()
     return sorted(list(set(pokemon_names)))
 
 
@@ -217,16 +274,16 @@ def get_item_pokemon(name: str = Path(..., description="Item name")):
     LOG.debug("name: %s", name)
 
     with BuildRepository() as repo:
-        builds = repo.get_all_builds()
+        snapshot = SNAPSHOT_CACHE.get(None, repo.get_all_builds)
 
     # Filter builds by item (case-insensitive)
-    filtered = [build for build in builds if build.item.lower() == name.lower()]
+    rows = _lookup_rows(snapshot, "item", name)
 
-    if not filtered:
+    if len(rows) == 0:
         raise HTTPException(status_code=404, detail=f"Item '{name}' not found.")
 
     # Get unique Pokémon names that use this item
-    pokemon_names = [build.pokemon for build in filtered]
+    pokemon_names = snapshot.column("pokemon")[rows].tolist()
     return sorted(list(set(pokemon_names)))
 
 
@@ -300,7 +357,10 @@ Returns a list of Pokémon Unite builds, with options for filtering, sorting, an
     - `cumulative_coverage`
     - `quartile`
 - `relevance_threshold` (float, optional): Threshold for relevance filtering.
-- `sort_by` (str, optional): Field to sort by. Options:
+- `sort_by` (str, optional): Comma-separated fields to sort by, most
+  significant first. Each field can be suffixed with `:asc` or `:desc`;
+  fields without a suffix use `sort_order`. Remaining ties are broken by
+  build id. Options:
     - `pokemon`
     - `role`
     - `pokemon_win_rate`
@@ -312,7 +372,11 @@ Returns a list of Pokémon Unite builds, with options for filtering, sorting, an
     - `moveset_item_win_rate`
     - `moveset_item_pick_rate`
     - `moveset_item_true_pick_rate`
-- `sort_order` (str, optional): Sort order:
+    - `weighted_win_rate`
+    - `adjusted_win_rate`
+    - `win_rate_z_score`
+    - `win_rate_ci_lower`
+- `sort_order` (str, optional): Default sort order:
     - `asc`
     - `desc`
 - `pokemon` (str, optional): Filter by Pokémon name.
@@ -336,6 +400,13 @@ Returns a list of Pokémon Unite builds, with options for filtering, sorting, an
 - `ignore_pokemon` (str, optional): Exclude Pokémon name.
 - `ignore_item` (str, optional): Exclude item.
 - `ignore_role` (str, optional): Exclude role.
+- `include_percentiles` (bool, optional): Add the percentile rank of every
+  numeric `sort_by` field within the week (100 = highest value).
+- `min_percentile_<field>` (float, optional): Keep builds whose percentile
+  rank for a numeric `sort_by` field is at least the value (0 to 100), e.g.
+  `min_percentile_moveset_item_win_rate=90` for the top 10% of the week.
+
+Include and ignore filters can be combined, also on the same dimension.
 
 **Response:**
 - List of builds, each with Pokémon, role, win/pick rates, moves, item, and more. See `BuildResponse` model for details.
@@ -356,6 +427,7 @@ def get_builds(params: BuildsQueryParams = Depends()):
     LOG.debug("ignore_item: %s", params.ignore_item)
     LOG.debug("ignore_role: %s", params.ignore_role)
     LOG.debug("top_n: %s", params.top_n)
+    LOG.debug("include_percentiles: %s", params.include_percentiles)
 
     with BuildRepository() as repo:
         week = None
@@ -369,69 +441,614 @@ def get_builds(params: BuildsQueryParams = Depends()):
                 )
             week = params.week
 
-        all_builds = repo.get_all_builds(week=week)
-
-    builds = all_builds.copy()
+        snapshot = SNAPSHOT_CACHE.get(
+            week, lambda: repo.get_all_builds(week=week)
+        )
 
     # Direct ID lookup
     if params.id is not None:
-        if params.id < 0 or params.id >= len(builds):
+        if params.id < 0 or params.id >= len(snapshot):
             raise HTTPException(status_code=404, detail="Build ID not found")
-        return _convert_to_build_response([builds[params.id]], week)
+        return _convert_to_build_response(
+            [snapshot.builds[params.id]],
+            snapshot,
+            include_percentiles=params.include_percentiles,
+        )
 
-    # Validate and map relevance
+    # Compile relevance, filters, sort and limit into a single plan
     try:
-        relevance_enum = Relevance(params.relevance)
-    except ValueError:
+        plan = QueryPlan.compile(params)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    builds = plan.execute(snapshot)
+
+    # Convert to response model with computed popularity and rank fields
+    return _convert_to_build_response(
+        builds, snapshot, include_percentiles=params.include_percentiles
+    )
+
+
+@app.get(
+    "/builds/explain",
+    response_model=dict,
+    summary="Explain the query plan for a /builds request",
+    description="""
+Accepts the same query parameters as `/builds` and returns the plan that would
+be executed instead of the builds themselves.
+
+**Response:**
+- `relevance` (dict): Relevance strategy and threshold used as the source.
+- `filters` (list): Filter predicates in evaluation order, with their
+  estimated selectivity.
+- `sort` (dict): Sort field, order and method (`precomputed_permutation`).
+- `limit` (int): Maximum number of builds returned, if any.
+    """,
+)
+def explain_builds(params: BuildsQueryParams = Depends()):
+    LOG.info("explain_builds")
+
+    try:
+        plan = QueryPlan.compile(params)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    return plan.explain()
+
+
+@app.get(
+    "/builds/history",
+    response_model=BuildHistoryResponse,
+    summary="History of builds across weeks",
+    description="""
+Returns the win rate, pick rates and popularity of builds in every week.
+
+A build is identified by `pokemon`, `move_1`, `move_2` and `item` (case and
+extra spaces are ignored). Several builds can be requested at once by
+repeating the four parameters; the n-th value of each parameter describes the
+n-th build.
+
+**Query Parameters:**
+- `pokemon` (str): Pokémon name.
+- `move_1` (str): First move.
+- `move_2` (str): Second move.
+- `item` (str): Held item.
+
+**Response:**
+- `weeks` (list): Every available week, oldest first.
+- `builds` (list): One history per requested build, with one value per week
+  in each metric list, or null for the weeks the build is missing from. Builds
+  missing from every week are left out. See `BuildHistory` model for details.
+
+**Errors:**
+- 404 if none of the requested builds is found in any week.
+    """,
+)
+def get_builds_history(
+    pokemon: List[str] = Query(..., description="Pokémon name"),
+    move_1: List[str] = Query(..., description="First move"),
+    move_2: List[str] = Query(..., description="Second move"),
+    item: List[str] = Query(..., description="Held item"),
+):
+    LOG.info("get_builds_history")
+    LOG.debug("pokemon: %s", pokemon)
+    LOG.debug("move_1: %s", move_1)
+    LOG.debug("move_2: %s", move_2)
+    LOG.debug("item: %s", item)
+
+    if not len(pokemon) == len(move_1) == len(move_2) == len(item):
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid relevance strategy: {params.relevance}",
+            detail="pokemon, move_1, move_2 and item must be repeated the same number of times",
         )
 
-    # Apply relevance strategy
-    builds = RELEVANCE_STRATEGIES[relevance_enum].apply(
-        builds, params.relevance_threshold, lambda: all_builds
+    # The series are only rebuilt after a week was ingested
+    with BuildRepository() as repo:
+        BUILD_HISTORY.sync(
+            repo.get_available_weeks(),
+            lambda week: SNAPSHOT_CACHE.get(
+                week, lambda: repo.get_all_builds(week=week)
+            ),
+        )
+
+    keys = [build_key(*build) for build in zip(pokemon, move_1, move_2, item)]
+    histories = BUILD_HISTORY.history(keys)
+    if not histories:
+        raise HTTPException(
+            status_code=404, detail="None of the requested builds was found."
+        )
+
+    return BuildHistoryResponse(
+        weeks=list(BUILD_HISTORY.weeks), builds=histories
     )
 
-    # Apply filter strategies
-    if params.pokemon:
-        builds = FILTER_STRATEGIES["pokemon"].apply(builds, params.pokemon)
-    elif params.ignore_pokemon:
-        builds = FILTER_STRATEGIES["ignore_pokemon"].apply(
-            builds, params.ignore_pokemon
+
+# /meta endpoints
+@app.get(
+    "/meta/diff",
+    response_model=List[BuildDiff],
+    summary="Week-over-week diff of builds",
+    description="""
+Matches the builds of two weeks on (pokemon, move_1, move_2, item) and returns
+how each build changed.
+
+**Query Parameters:**
+- `from` (str): Earlier week identifier.
+- `to` (str): Later week identifier, different from `from`.
+- `status` (str, optional): Comma-separated statuses to keep: `changed` (in
+  both weeks, with different values), `unchanged` (in both weeks, with the
+  same win rate, true pick rate and popularity), `new` (only in `to`),
+  `vanished` (only in `from`).
+- `sort_by` (str, optional): Any `BuildDiff` field. Defaults to
+  `moveset_item_win_rate_delta`. Rows without a value go last.
+- `sort_order` (str, optional): `asc` or `desc`. Defaults to `desc`.
+- `pokemon`, `role`, `item`, `ignore_pokemon`, `ignore_role`, `ignore_item`
+  (str, optional): Filters, as in `/builds`.
+- `top_n` (int, optional): Limit to top N results.
+
+**Response:**
+- List of diffs with the win rate, true pick rate and popularity of each week
+  and their deltas. See `BuildDiff` model for details.
+    """,
+)
+def get_meta_diff(
+    from_week: str = Query(..., alias="from", description="Earlier week"),
+    to_week: str = Query(..., alias="to", description="Later week"),
+    params: MetaDiffQueryParams = Depends(),
+):
+    LOG.info("get_meta_diff")
+    LOG.debug("from: %s", from_week)
+    LOG.debug("to: %s", to_week)
+    LOG.debug("params: %s", params)
+
+    if from_week == to_week:
+        raise HTTPException(
+            status_code=400, detail="from and to must be different weeks."
         )
 
-    if params.role:
-        builds = FILTER_STRATEGIES["role"].apply(builds, params.role)
-    elif params.ignore_role:
-        builds = FILTER_STRATEGIES["ignore_role"].apply(
-            builds, params.ignore_role
+    with BuildRepository() as repo:
+        available_weeks = repo.get_available_weeks()
+        for week in (from_week, to_week):
+            if week not in available_weeks:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid week: {week}. Available weeks: {available_weeks}",
+                )
+
+        def compute():
+            return compute_meta_diff(
+                SNAPSHOT_CACHE.get(
+                    from_week, lambda: repo.get_all_builds(week=from_week)
+                ),
+                SNAPSHOT_CACHE.get(
+                    to_week, lambda: repo.get_all_builds(week=to_week)
+                ),
+            )
+
+        # Only diffs between consecutive weeks are cached
+        weeks = sorted(available_weeks)
+        from_index = weeks.index(from_week)
+        if weeks[from_index + 1 : from_index + 2] == [to_week]:
+            diffs = META_DIFF_CACHE.get(from_week, to_week, compute)
+        else:
+            diffs = compute()
+
+    try:
+        return query_meta_diff(diffs, params)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+def _get_rollup(endpoint: str, week: Optional[str]) -> List[MetaRollup]:
+    """
+    Get the rollup served by a /meta endpoint for a week.
+
+    Args:
+        endpoint: Rollup endpoint name (see `ROLLUP_COLUMNS`)
+        week: Week identifier, or None for all weeks
+
+    Returns:
+        One rollup per group, most picked first
+    """
+    with BuildRepository() as repo:
+        if week is not None:
+            available_weeks = repo.get_available_weeks()
+            if week not in available_weeks:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid week: {week}. Available weeks: {available_weeks}",
+                )
+
+        snapshot = SNAPSHOT_CACHE.get(
+            week, lambda: repo.get_all_builds(week=week)
         )
 
-    if params.item:
-        builds = FILTER_STRATEGIES["item"].apply(builds, params.item)
-    elif params.ignore_item:
-        builds = FILTER_STRATEGIES["ignore_item"].apply(
-            builds, params.ignore_item
+    return snapshot.rollup(ROLLUP_COLUMNS[endpoint])
+
+
+ROLLUP_DESCRIPTION = """
+Aggregates builds by {group}. Rollups are computed once per week and reused
+until the week is ingested again.
+
+**Query Parameters:**
+- `week` (str, optional): Week identifier. Defaults to all weeks.
+
+**Response:**
+- List of rollups, by descending `total_true_pick_rate`, with `name`,
+  `build_count`, `pick_weighted_win_rate`, `total_true_pick_rate` and
+  `best_build` (highest `adjusted_win_rate`). See `MetaRollup` model for
+  details.
+"""
+
+
+@app.get(
+    "/meta/pokemon",
+    response_model=List[MetaRollup],
+    summary="Aggregates of builds by Pokémon",
+    description=ROLLUP_DESCRIPTION.format(group="Pokémon"),
+)
+def get_meta_pokemon(
+    week: Optional[str] = Query(None, description="Week identifier"),
+):
+    LOG.info("get_meta_pokemon")
+    LOG.debug("week: %s", week)
+
+    return _get_rollup("pokemon", week)
+
+
+@app.get(
+    "/meta/roles",
+    response_model=List[MetaRollup],
+    summary="Aggregates of builds by role",
+    description=ROLLUP_DESCRIPTION.format(group="role"),
+)
+def get_meta_roles(
+    week: Optional[str] = Query(None, description="Week identifier"),
+):
+    LOG.info("get_meta_roles")
+    LOG.debug("week: %s", week)
+
+    return _get_rollup("roles", week)
+
+
+@app.get(
+    "/meta/items",
+    response_model=List[MetaRollup],
+    summary="Aggregates of builds by held item",
+    description=ROLLUP_DESCRIPTION.format(group="held item"),
+)
+def get_meta_items(
+    week: Optional[str] = Query(None, description="Week identifier"),
+):
+    LOG.info("get_meta_items")
+    LOG.debug("week: %s", week)
+
+    return _get_rollup("items", week)
+
+
+@app.get(
+    "/meta/tiers",
+    response_model=TierList,
+    summary="Tier list of Pokémon or builds",
+    description="""
+Ranks the relevant Pokémon or builds of a week into the tiers S, A, B, C and
+D by one metric. Tier lists are computed once per week and parameters, and
+reused until the week is ingested again.
+
+**Query Parameters:**
+- `week` (str, optional): Week identifier. Defaults to all weeks.
+- `level` (str, optional): `pokemon` (default) or `build`. A Pokémon is
+  ranked by the mean metric of its relevant builds, weighted by
+  `moveset_item_true_pick_rate`.
+- `metric` (str, optional): Any numeric `sort_by` field. Defaults to
+  `adjusted_win_rate`.
+- `method` (str, optional): How tier breaks are found:
+    - `quantile` (default): tiers of equal size
+    - `kmeans`: 1-D k-means, splitting at natural gaps between values
+- `relevance` (str, optional): Relevance strategy selecting the builds, as
+  in `/builds`. Defaults to `any`.
+- `relevance_threshold` (float, optional): Threshold for the relevance
+  strategy.
+
+**Response:**
+- The tier list, with the value range and entries (best first) of each tier.
+  See `TierList` model for details.
+    """,
+)
+def get_meta_tiers(params: TierQueryParams = Depends()):
+    LOG.info("get_meta_tiers")
+    LOG.debug("params: %s", params)
+
+    with BuildRepository() as repo:
+        if params.week is not None:
+            available_weeks = repo.get_available_weeks()
+            if params.week not in available_weeks:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid week: {params.week}. Available weeks: {available_weeks}",
+                )
+
+        def compute():
+            snapshot = SNAPSHOT_CACHE.get(
+                params.week, lambda: repo.get_all_builds(week=params.week)
+            )
+            return compute_tier_list(snapshot, params)
+
+        try:
+            return TIER_LIST_CACHE.get(params, compute)
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+
+@app.get(
+    "/meta/trends",
+    response_model=BuildTrends,
+    summary="Rising and falling builds",
+    description="""
+Returns the builds whose win rate or true pick rate rises or falls the most
+over a window of weeks, by least-squares slope. Every build also carries the
+mean, slope and exponentially weighted moving average (EWMA) of both metrics.
+
+Trend statistics are maintained incrementally: a new week only adds its own
+contribution to running sums, and a window is the difference of two of them.
+
+**Query Parameters:**
+- `week` (str, optional): Last week of the window. Defaults to the latest
+  week.
+- `window` (int, optional): Number of weeks the window spans, at least 2.
+  Defaults to 4.
+- `metric` (str, optional): `moveset_item_win_rate` (default) or
+  `moveset_item_true_pick_rate`; its slope ranks the builds.
+- `min_weeks` (int, optional): Minimum number of weeks of the window a build
+  must be seen in, at least 2. Defaults to 2.
+- `pokemon`, `role`, `item` (str, optional): Filters, as in `/builds`.
+- `top_n` (int, optional): Number of risers, of fallers and of sorted
+  builds. Defaults to 10.
+- `sort_by` (str, optional): Trend statistic ordering the `builds` list, e.g.
+  `moveset_item_win_rate_ewma`. Defaults to none, leaving `builds` empty.
+- `sort_order` (str, optional): asc or desc. Defaults to desc.
+- `min_<statistic>`, `max_<statistic>` (float, optional): Keep builds whose
+  trend statistic is within these bounds, e.g.
+  `min_moveset_item_win_rate_slope=0`.
+
+**Response:**
+- `risers` and `fallers`, steepest first, and `builds` ordered by `sort_by`.
+  Slopes are in points per week. See `BuildTrends` model for details.
+    """,
+)
+def get_meta_trends(params: TrendQueryParams = Depends()):
+    LOG.info("get_meta_trends")
+    LOG.debug("params: %s", params)
+
+    with BuildRepository() as repo:
+        available_weeks = repo.get_available_weeks()
+        if not available_weeks:
+            raise HTTPException(status_code=404, detail="No weeks available.")
+
+        week = params.week or max(available_weeks)
+        if week not in available_weeks:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid week: {week}. Available weeks: {available_weeks}",
+            )
+
+        def load_snapshot(week: str) -> WeekSnapshot:
+            return SNAPSHOT_CACHE.get(
+                week, lambda: repo.get_all_builds(week=week)
+            )
+
+        # Only the weeks ingested since the last request are processed
+        TREND_INDEX.sync(available_weeks, load_snapshot)
+        snapshot = load_snapshot(week)
+
+    try:
+        return compute_trends(TREND_INDEX, snapshot, params)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+# /teams endpoints
+@app.get(
+    "/teams/recommend",
+    response_model=TeamRecommendation,
+    summary="Recommend 5-Pokémon teams",
+    description="""
+Finds the teams of distinct Pokémon that maximize the sum of one metric over
+their builds, under role constraints. Every Pokémon plays its best relevant
+build, and the best teams are found by branch-and-bound search.
+
+**Query Parameters:**
+- `week` (str, optional): Week identifier. Defaults to the latest week.
+- `metric` (str, optional): Any numeric `sort_by` field. Defaults to
+  `adjusted_win_rate`.
+- `team_size` (int, optional): Number of Pokémon in a team. Defaults to 5.
+- `roles` (str, optional): Comma-separated roles every team must contain;
+  repeat a role to require it several times (e.g. `Attacker,Attacker`).
+  Defaults to one of each role of the week.
+- `max_per_role` (int, optional): Maximum number of members of one role.
+- `include_pokemon` (str, optional): Comma-separated Pokémon every team must
+  contain.
+- `exclude_pokemon` (str, optional): Comma-separated Pokémon no team may
+  contain.
+- `relevance` (str, optional): Relevance strategy selecting the candidate
+  builds, as in `/builds`. Defaults to `any`.
+- `relevance_threshold` (float, optional): Threshold for the relevance
+  strategy.
+- `top_k` (int, optional): Number of teams to return. Defaults to 3.
+
+**Response:**
+- The best teams, best first, each with its score and members. No team is
+  returned if the constraints cannot be met. See `TeamRecommendation` model
+  for details.
+    """,
+)
+def recommend_team(params: TeamQueryParams = Depends()):
+    LOG.info("recommend_team")
+    LOG.debug("params: %s", params)
+
+    with BuildRepository() as repo:
+        available_weeks = repo.get_available_weeks()
+        if not available_weeks:
+            raise HTTPException(status_code=404, detail="No weeks available.")
+
+        week = params.week or max(available_weeks)
+        if week not in available_weeks:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid week: {week}. Available weeks: {available_weeks}",
+            )
+
+        snapshot = SNAPSHOT_CACHE.get(
+            week, lambda: repo.get_all_builds(week=week)
         )
 
-    # Validate and map sort_by
     try:
-        sort_by_enum = SortBy(params.sort_by)
-    except ValueError:
+        return recommend_teams(snapshot, params)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+# /analysis endpoints
+@app.get(
+    "/analysis/cooccurrence/{matrix}",
+    response_model=List[CooccurrenceEntry],
+    summary="Co-occurrence of items, Pokémon and moves",
+    description="""
+Returns entries of a sparse co-occurrence matrix of the builds. Matrices are
+computed once per week and reused until the week is ingested again.
+
+**Path Parameters:**
+- `matrix` (str): One of:
+    - `item_pokemon`: items (rows) by Pokémon (columns)
+    - `item_move`: items (rows) by moves in either slot (columns)
+    - `move1_move2`: first moves (rows) by second moves (columns)
+
+**Query Parameters:**
+- `week` (str, optional): Week identifier. Defaults to all weeks.
+- `row` (str, optional): Only return entries of this row.
+- `column` (str, optional): Only return entries of this column.
+- `weight` (str, optional): Rank entries by `true_pick_rate` (default),
+  `win_rate` or `build_count`.
+- `top_k` (int, optional): Number of entries to return. Defaults to 10.
+
+**Response:**
+- List of entries by descending weight, each with `row`, `column`,
+  `build_count`, `true_pick_rate` and pick-weighted `win_rate`.
+    """,
+)
+def get_cooccurrence(
+    matrix: str = Path(..., description="Matrix name"),
+    week: Optional[str] = Query(None, description="Week identifier"),
+    row: Optional[str] = Query(None, description="Row value"),
+    column: Optional[str] = Query(None, description="Column value"),
+    weight: str = Query("true_pick_rate", description="Ranking weight"),
+    top_k: int = Query(10, ge=1, description="Number of entries"),
+):
+    LOG.info("get_cooccurrence")
+    LOG.debug("matrix: %s", matrix)
+    LOG.debug("week: %s", week)
+    LOG.debug("row: %s", row)
+    LOG.debug("column: %s", column)
+    LOG.debug("weight: %s", weight)
+    LOG.debug("top_k: %s", top_k)
+
+    if matrix not in COOCCURRENCE_MATRICES:
         raise HTTPException(
-            status_code=400, detail=f"Invalid sort_by field: {params.sort_by}"
+            status_code=404,
+            detail=f"Co-occurrence matrix '{matrix}' not found.",
         )
 
-    reverse = params.sort_order == "desc"
-    builds = SORT_STRATEGIES[sort_by_enum.value].apply(builds, reverse=reverse)
+    if weight not in COOCCURRENCE_WEIGHTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid weight: {weight}. Available weights: {list(COOCCURRENCE_WEIGHTS)}",
+        )
 
-    # Limit to top_n results if specified
-    if params.top_n is not None and params.top_n > 0:
-        builds = builds[: params.top_n]
+    with BuildRepository() as repo:
+        if week is not None:
+            available_weeks = repo.get_available_weeks()
+            if week not in available_weeks:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid week: {week}. Available weeks: {available_weeks}",
+                )
 
-    # Convert to response model with computed popularity and rank fields
-    return _convert_to_build_response(builds, week)
+        snapshot = SNAPSHOT_CACHE.get(
+            week, lambda: repo.get_all_builds(week=week)
+        )
+
+    cooccurrence = snapshot.cooccurrence(matrix)
+    cells = None
+
+    if row is not None:
+        cells = cooccurrence.row_cells(row)
+        if cells is None:
+            raise HTTPException(
+                status_code=404, detail=f"Row '{row}' not found."
+            )
+
+    if column is not None:
+        column_cells = cooccurrence.column_cells(column)
+        if column_cells is None:
+            raise HTTPException(
+                status_code=404, detail=f"Column '{column}' not found."
+            )
+        cells = (
+            column_cells
+            if cells is None
+            else np.intersect1d(cells, column_cells)
+        )
+
+    return cooccurrence.top(cells, weight=weight, k=top_k)
+
+
+# /search endpoint
+@app.get(
+    "/search",
+    response_model=List[SearchResult],
+    summary="Search Pokémon, item and move names",
+    description="""
+Autocomplete and fuzzy search over every Pokémon, item and move name in the
+builds database.
+
+**Query Parameters:**
+- `q` (str): Text to search for. Case and extra spaces are ignored.
+- `kind` (str, optional): Only return `pokemon`, `item` or `move` names.
+- `limit` (int, optional): Maximum number of results (1-50). Defaults to 10.
+
+**Response:**
+- List of matches, best first. Each match has `name`, `kind`, `match`
+  (`exact`, `prefix` or `fuzzy`) and `score` (1.0 = exact match).
+    """,
+)
+def search(
+    q: str = Query(..., min_length=1, description="Text to search for"),
+    kind: Optional[str] = Query(
+        None, description="Only return pokemon, item or move names"
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Maximum results"),
+):
+    LOG.info("search")
+    LOG.debug("q: %s", q)
+    LOG.debug("kind: %s", kind)
+    LOG.debug("limit: %s", limit)
+
+    if kind is not None and kind not in SEARCH_COLUMNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid kind: {kind}. Available kinds: {list(SEARCH_COLUMNS)}",
+        )
+
+    # Only weeks ingested since the last search are (re)indexed
+    with BuildRepository() as repo:
+        SEARCH_INDEX.sync(
+            repo.get_available_weeks(),
+            lambda week: SNAPSHOT_CACHE.get(
+                week, lambda: repo.get_all_builds(week=week)
+            ).builds,
+        )
+
+    return SEARCH_INDEX.search(q, limit=limit, kind=kind)
 
 
 # /relevance endpoints
@@ -526,6 +1143,77 @@ def get_relevance_strategy(
     return strategies_info[relevance_enum]
 
 
+@app.get(
+    "/relevance/{strategy}/sweep",
+    response_model=RelevanceSweep,
+    summary="Result size and coverage of every relevance threshold",
+    description="""
+Lists every threshold that changes the builds selected by a relevance
+strategy, with the number of builds it selects and their coverage (sum of
+`moveset_item_true_pick_rate`). The whole curve is computed in one pass over
+the week sorted by popularity, so clients can preview any threshold without
+calling `/builds`.
+
+**Path Parameters:**
+- `strategy` (str): Relevance strategy name.
+
+**Query Parameters:**
+- `week` (str, optional): Week identifier. Defaults to all weeks.
+
+**Response:**
+- The number of builds and coverage of the week, and one point per
+  threshold, ascending. A threshold between two points selects the builds of
+  the next point. See `RelevanceSweep` model for details.
+    """,
+)
+def get_relevance_sweep(
+    strategy: str = Path(..., description="Relevance strategy name"),
+    week: Optional[str] = Query(None, description="Week identifier"),
+):
+    LOG.info("get_relevance_sweep")
+    LOG.debug("strategy: %s", strategy)
+    LOG.debug("week: %s", week)
+
+    try:
+        relevance = Relevance(strategy)
+    except ValueError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Relevance strategy '{strategy}' not found.",
+        )
+
+    with BuildRepository() as repo:
+        if week is not None:
+            available_weeks = repo.get_available_weeks()
+            if week not in available_weeks:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid week: {week}. Available weeks: {available_weeks}",
+                )
+
+        snapshot = SNAPSHOT_CACHE.get(
+            week, lambda: repo.get_all_builds(week=week)
+        )
+
+    rates = snapshot.column("moveset_item_true_pick_rate").astype(np.float64)
+    thresholds, counts, coverage = relevance_sweep(
+        relevance, rates, snapshot.popularity_order
+    )
+
+    return RelevanceSweep(
+        strategy=relevance.value,
+        week=week,
+        build_count=len(rates),
+        coverage=rates.sum(),
+        points=[
+            SweepPoint(threshold=threshold, build_count=count, coverage=total)
+            for threshold, count, total in zip(
+                thresholds.tolist(), counts.tolist(), coverage.tolist()
+            )
+        ],
+    )
+
+
 # /sort_by endpoints
 @app.get(
     "/sort_by",
@@ -592,6 +1280,26 @@ def get_sort_criteria():
             "description": "Sort by moveset item true pick rate.",
             "default_order": "desc",
         },
+        {
+            "name": SortBy.WEIGHTED_WIN_RATE.value,
+            "description": "Sort by win rate weighted by true pick rate.",
+            "default_order": "desc",
+        },
+        {
+            "name": SortBy.ADJUSTED_WIN_RATE.value,
+            "description": "Sort by win rate adjusted for sample size.",
+            "default_order": "desc",
+        },
+        {
+            "name": SortBy.WIN_RATE_Z_SCORE.value,
+            "description": "Sort by win rate z-score within the week.",
+            "default_order": "desc",
+        },
+        {
+            "name": SortBy.WIN_RATE_CI_LOWER.value,
+            "description": "Sort by lower bound of the win rate confidence interval.",
+            "default_order": "desc",
+        },
     ]
 
 
@@ -684,6 +1392,30 @@ def get_sort_criteria_details(
             "field_type": "float",
             "default_order": "desc",
         },
+        SortBy.WEIGHTED_WIN_RATE: {
+            "name": SortBy.WEIGHTED_WIN_RATE.value,
+            "description": "Sort builds by moveset item win rate times moveset item true pick rate, the share of the week's matches won with the build.",
+            "field_type": "float",
+            "default_order": "desc",
+        },
+        SortBy.ADJUSTED_WIN_RATE: {
+            "name": SortBy.ADJUSTED_WIN_RATE.value,
+            "description": "Sort builds by moveset item win rate shrunk towards the week's pick-weighted mean, using moveset item true pick rate as the evidence weight (percentage).",
+            "field_type": "float",
+            "default_order": "desc",
+        },
+        SortBy.WIN_RATE_Z_SCORE: {
+            "name": SortBy.WIN_RATE_Z_SCORE.value,
+            "description": "Sort builds by the z-score of moveset item win rate within the week.",
+            "field_type": "float",
+            "default_order": "desc",
+        },
+        SortBy.WIN_RATE_CI_LOWER: {
+            "name": SortBy.WIN_RATE_CI_LOWER.value,
+            "description": "Sort builds by the lower bound of the moveset item win rate confidence interval, favoring win rates backed by many matches (percentage).",
+            "field_type": "float",
+            "default_order": "desc",
+        },
     }
 
     return criteria_info[sort_by_enum]
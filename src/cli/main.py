@@ -106,6 +106,11 @@ def get_builds(
                 "moveset_item_win_rate": "M&I_WR",
                 "moveset_item_pick_rate": "M&I_PR",
                 "moveset_item_true_pick_rate": "M&I_@PR",
+                "weighted_win_rate": "wWR",
+                "adjusted_win_rate": "adjWR",
+                "win_rate_z_score": "WR_z",
+                "win_rate_ci_lower": "WR_lo",
+                "win_rate_ci_upper": "WR_hi",
             }
         )
         text = df.to_string(index=False)
@@ -120,6 +125,94 @@ def get_builds(
         sys.exit(1)
 
 
+def search(query: str, kind: Optional[str] = None, limit: int = 10) -> None:
+    """Search Pokémon, item and move names and print the best matches."""
+    params: Dict[str, Any] = {"q": query, "limit": limit}
+    if kind:
+        params["kind"] = kind
+
+    try:
+        response = httpx.get(f"{API_BASE_URL}/search", params=params)
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            print("No matches found.")
+            return
+        for result in results:
+            print(
+                f"{result['name']:<24} {result['kind']:<8} "
+                f"{result['match']:<6} {result['score']:.2f}"
+            )
+    except Exception as e:
+        logger.error(f"Search failed: {e}")
+        sys.exit(1)
+
+
+def get_tiers(params: Optional[Dict[str, Any]] = None) -> None:
+    """Fetch a tier list from the API and print it, S tier first."""
+    try:
+        response = httpx.get(f"{API_BASE_URL}/meta/tiers", params=params)
+        response.raise_for_status()
+        tier_list = response.json()
+        lines = []
+        for tier in tier_list["tiers"]:
+            if not tier["entries"]:
+                lines.append(f"{tier['tier']}  -")
+                continue
+            lines.append(
+                f"{tier['tier']}  ({tier['min_value']:.2f} - "
+                f"{tier['max_value']:.2f})"
+            )
+            for entry in tier["entries"]:
+                name = entry["pokemon"]
+                if entry["build_id"] is not None:
+                    name += (
+                        f" [{entry['move_1']} / {entry['move_2']} "
+                        f"@ {entry['item']}]"
+                    )
+                lines.append(
+                    f"   {name:<56} {entry['role']:<12} {entry['value']:.2f}"
+                )
+        try:
+            print(colorize_role("\n".join(lines)))
+        except BrokenPipeError:
+            # Handle pipe being closed (e.g., when piping to head)
+            sys.stderr.close()
+    except Exception as e:
+        logger.error(f"Fetching tier list failed: {e}")
+        sys.exit(1)
+
+
+def recommend_team(params: Optional[Dict[str, Any]] = None) -> None:
+    """Fetch team recommendations from the API and print them, best first."""
+    try:
+        response = httpx.get(f"{API_BASE_URL}/teams/recommend", params=params)
+        response.raise_for_status()
+        recommendation = response.json()
+        if not recommendation["teams"]:
+            print("No team satisfies the constraints.")
+            return
+        lines = []
+        for rank, team in enumerate(recommendation["teams"], start=1):
+            lines.append(f"#{rank}  score {team['score']:.2f}")
+            for member in team["members"]:
+                name = (
+                    f"{member['pokemon']} [{member['move_1']} / "
+                    f"{member['move_2']} @ {member['item']}]"
+                )
+                lines.append(
+                    f"   {name:<56} {member['role']:<12} {member['value']:.2f}"
+                )
+        try:
+            print(colorize_role("\n".join(lines)))
+        except BrokenPipeError:
+            # Handle pipe being closed (e.g., when piping to head)
+            sys.stderr.close()
+    except Exception as e:
+        logger.error(f"Team recommendation failed: {e}")
+        sys.exit(1)
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -129,6 +222,123 @@ def main():
 
     subparsers.add_parser("health", help="Check API health")
 
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Search Pokémon, item and move names",
+        description="Find Pokémon, item and move names by prefix or approximate spelling.",
+    )
+    search_parser.add_argument("query", type=str, help="Text to search for")
+    search_parser.add_argument(
+        "--kind",
+        type=str,
+        choices=["pokemon", "item", "move"],
+        help="Only return names of this kind",
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of matches (default: 10)",
+    )
+
+    tiers_parser = subparsers.add_parser(
+        "tiers",
+        help="Show a tier list of Pokémon or builds",
+        description="Rank Pokémon or builds into the tiers S to D by one metric.",
+    )
+    tiers_parser.add_argument(
+        "--week", type=str, help="Week (format: Y2025m10d05)"
+    )
+    tiers_parser.add_argument(
+        "--level",
+        type=str,
+        choices=["pokemon", "build"],
+        help="Rank Pokémon (default) or builds",
+    )
+    tiers_parser.add_argument(
+        "--metric",
+        type=str,
+        help="Numeric field to rank by (default: adjusted_win_rate)",
+    )
+    tiers_parser.add_argument(
+        "--method",
+        type=str,
+        choices=["quantile", "kmeans"],
+        help="Tier breaks: equal-sized tiers (quantile) or natural gaps (kmeans)",
+    )
+    tiers_parser.add_argument(
+        "--relevance",
+        type=str,
+        choices=[
+            "any",
+            "percentage",
+            "top_n",
+            "cumulative_coverage",
+            "quartile",
+        ],
+        help="Relevance strategy selecting the builds",
+    )
+    tiers_parser.add_argument(
+        "--relevance-threshold",
+        type=float,
+        help="Threshold for relevance strategy (meaning varies by strategy)",
+    )
+
+    team_parser = subparsers.add_parser(
+        "team",
+        help="Recommend teams under role constraints",
+        description="Find the teams of distinct Pokémon maximizing the sum of one metric.",
+    )
+    team_parser.add_argument(
+        "--week", type=str, help="Week (format: Y2025m10d05)"
+    )
+    team_parser.add_argument(
+        "--metric",
+        type=str,
+        help="Numeric field to maximize (default: adjusted_win_rate)",
+    )
+    team_parser.add_argument(
+        "--team-size", type=int, help="Number of Pokémon in a team (default: 5)"
+    )
+    team_parser.add_argument(
+        "--roles",
+        type=str,
+        help="Comma-separated roles every team must contain (default: one of each)",
+    )
+    team_parser.add_argument(
+        "--max-per-role", type=int, help="Maximum number of members of one role"
+    )
+    team_parser.add_argument(
+        "--include-pokemon",
+        type=str,
+        help="Comma-separated Pokémon every team must contain",
+    )
+    team_parser.add_argument(
+        "--exclude-pokemon",
+        type=str,
+        help="Comma-separated Pokémon no team may contain",
+    )
+    team_parser.add_argument(
+        "--relevance",
+        type=str,
+        choices=[
+            "any",
+            "percentage",
+            "top_n",
+            "cumulative_coverage",
+            "quartile",
+        ],
+        help="Relevance strategy selecting the candidate builds",
+    )
+    team_parser.add_argument(
+        "--relevance-threshold",
+        type=float,
+        help="Threshold for relevance strategy (meaning varies by strategy)",
+    )
+    team_parser.add_argument(
+        "--top-k", type=int, help="Number of teams to show (default: 3)"
+    )
+
     get_builds_parser = subparsers.add_parser(
         "get-builds",
         help="Get builds with optional filters and column selection",
@@ -136,7 +346,9 @@ def main():
         epilog="""Available columns for --include/--exclude:
   id, week, rank, popularity, pokemon, role, pokemon_win_rate, pokemon_pick_rate,
   move_1, move_2, moveset_win_rate, moveset_pick_rate, moveset_true_pick_rate,
-  item, moveset_item_win_rate, moveset_item_pick_rate, moveset_item_true_pick_rate
+  item, moveset_item_win_rate, moveset_item_pick_rate, moveset_item_true_pick_rate,
+  weighted_win_rate, adjusted_win_rate, win_rate_z_score, win_rate_ci_lower,
+  win_rate_ci_upper
 
 Relevance strategies:
   any                  - Return all builds (no filtering)
@@ -202,6 +414,10 @@ Example usage:
             "moveset_item_win_rate",
             "moveset_item_pick_rate",
             "moveset_item_true_pick_rate",
+            "weighted_win_rate",
+            "adjusted_win_rate",
+            "win_rate_z_score",
+            "win_rate_ci_lower",
         ],
         help="Sort builds by specified field",
     )
@@ -224,6 +440,40 @@ Example usage:
 
     if args.command == "health":
         get_health()
+    elif args.command == "search":
+        search(args.query, kind=args.kind, limit=args.limit)
+    elif args.command == "tiers":
+        params = {
+            name: value
+            for name, value in (
+                ("week", args.week),
+                ("level", args.level),
+                ("metric", args.metric),
+                ("method", args.method),
+                ("relevance", args.relevance),
+                ("relevance_threshold", args.relevance_threshold),
+            )
+            if value is not None
+        }
+        get_tiers(params if params else None)
+    elif args.command == "team":
+        params = {
+            name: value
+            for name, value in (
+                ("week", args.week),
+                ("metric", args.metric),
+                ("team_size", args.team_size),
+                ("roles", args.roles),
+                ("max_per_role", args.max_per_role),
+                ("include_pokemon", args.include_pokemon),
+                ("exclude_pokemon", args.exclude_pokemon),
+                ("relevance", args.relevance),
+                ("relevance_threshold", args.relevance_threshold),
+                ("top_k", args.top_k),
+            )
+            if value is not None
+        }
+        recommend_team(params if params else None)
     elif args.command == "get-builds":
         params = {}
         if args.pokemon:
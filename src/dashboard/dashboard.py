@@ -150,15 +150,52 @@ selected_relevance = st.sidebar.selectbox(
     help="Strategy for filtering relevant builds",
 )
 
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def fetch_relevance_sweep(strategy: str, week: str):
+    """Fetch the result size and coverage of every threshold of a strategy"""
+
+    try:
+        response = httpx.get(
+            f"{API_BASE}/relevance/{strategy}/sweep", params={"week": week}
+        )
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        st.sidebar.warning(f"Failed to fetch relevance thresholds: {e}")
+        return None
+
+
 # Relevance threshold
-relevance_threshold = st.sidebar.number_input(
-    "Relevance Threshold",
-    min_value=0.0,
-    max_value=1000.0,
-    value=100.0,
-    step=1.0,
-    help="Threshold value for the selected relevance strategy",
-)
+sweep = fetch_relevance_sweep(selected_relevance, selected_week)
+if sweep and sweep["points"]:
+    # The slider only offers thresholds that change the selection, and shows
+    # their result size without querying /builds
+    points = {point["threshold"]: point for point in sweep["points"]}
+    thresholds = list(points)
+    default_threshold = min(thresholds, key=lambda t: abs(t - 100.0))
+    relevance_threshold = st.sidebar.select_slider(
+        "Relevance Threshold",
+        options=thresholds,
+        value=default_threshold,
+        format_func=lambda t: f"{t:g}",
+        help="Threshold value for the selected relevance strategy",
+    )
+    selected_point = points[relevance_threshold]
+    st.sidebar.caption(
+        f"{selected_point['build_count']} of {sweep['build_count']} builds, "
+        f"{selected_point['coverage']:.1f} of {sweep['coverage']:.1f} "
+        "true pick rate covered"
+    )
+else:
+    relevance_threshold = st.sidebar.number_input(
+        "Relevance Threshold",
+        min_value=0.0,
+        max_value=1000.0,
+        value=100.0,
+        step=1.0,
+        help="Threshold value for the selected relevance strategy",
+    )
 
 # Sort by
 sort_options = {s["name"]: s["description"] for s in metadata["sort_by"]}
@@ -317,6 +354,11 @@ if response.status_code == 200:
             "moveset_true_pick_rate": "moveset true pick rate",
             "moveset_item_pick_rate": "build pick rate",
             "moveset_item_true_pick_rate": "build true pick rate",
+            "weighted_win_rate": "weighted win rate",
+            "adjusted_win_rate": "adjusted win rate",
+            "win_rate_z_score": "win rate z-score",
+            "win_rate_ci_lower": "win rate CI low",
+            "win_rate_ci_upper": "win rate CI high",
         }
     )
 
@@ -0,0 +1,57 @@
+"""
+Pydantic response model for week-over-week build diffs
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BuildDiff(BaseModel):
+    """
+    Pydantic response model for week-over-week build diffs
+
+    A build is identified by its Pokémon, moves and item. Values of the week
+    a build is missing from are None.
+
+    Attributes:
+        status: changed (in both weeks, with a different win rate, true
+            pick rate or popularity), unchanged (in both weeks, with the same
+            values), new (only in the later week) or vanished (only in the
+            earlier week).
+        pokemon: The name of the Pokémon.
+        role: The role of the Pokémon.
+        move_1: The first move of the Pokémon.
+        move_2: The second move of the Pokémon.
+        item: The item used by the Pokémon.
+        from_id: The build ID in the earlier week.
+        to_id: The build ID in the later week.
+        moveset_item_win_rate_from: Win rate in the earlier week.
+        moveset_item_win_rate_to: Win rate in the later week.
+        moveset_item_win_rate_delta: Win rate change.
+        moveset_item_true_pick_rate_from: True pick rate in the earlier week.
+        moveset_item_true_pick_rate_to: True pick rate in the later week.
+        moveset_item_true_pick_rate_delta: True pick rate change.
+        popularity_from: Popularity rank in the earlier week.
+        popularity_to: Popularity rank in the later week.
+        popularity_delta: Popularity ranks climbed (positive when the build
+            became more popular).
+    """
+
+    status: str
+    pokemon: str
+    role: str
+    move_1: str
+    move_2: str
+    item: str
+    from_id: Optional[int] = None
+    to_id: Optional[int] = None
+    moveset_item_win_rate_from: Optional[float] = None
+    moveset_item_win_rate_to: Optional[float] = None
+    moveset_item_win_rate_delta: Optional[float] = None
+    moveset_item_true_pick_rate_from: Optional[float] = None
+    moveset_item_true_pick_rate_to: Optional[float] = None
+    moveset_item_true_pick_rate_delta: Optional[float] = None
+    popularity_from: Optional[int] = None
+    popularity_to: Optional[int] = None
+    popularity_delta: Optional[int] = None
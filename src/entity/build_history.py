@@ -0,0 +1,54 @@
+"""
+Pydantic response models for per-build history across weeks
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BuildHistory(BaseModel):
+    """
+    Pydantic response model for the history of one build
+
+    Every list holds one value per week, in the order of
+    `BuildHistoryResponse.weeks`, with None for the weeks the build is missing
+    from.
+
+    Attributes:
+        pokemon: The name of the Pokémon.
+        role: The role of the Pokémon.
+        move_1: The first move of the Pokémon.
+        move_2: The second move of the Pokémon.
+        item: The item used by the Pokémon.
+        ids: The build ID of each week.
+        moveset_item_win_rate: The win rate of each week.
+        moveset_item_pick_rate: The pick rate of each week.
+        moveset_item_true_pick_rate: The true pick rate of each week.
+        popularity: The popularity rank of each week (1 = most picked).
+    """
+
+    pokemon: str
+    role: str
+    move_1: str
+    move_2: str
+    item: str
+    ids: list[Optional[int]]
+    moveset_item_win_rate: list[Optional[float]]
+    moveset_item_pick_rate: list[Optional[float]]
+    moveset_item_true_pick_rate: list[Optional[float]]
+    popularity: list[Optional[int]]
+
+
+class BuildHistoryResponse(BaseModel):
+    """
+    Pydantic response model for /builds/history
+
+    Attributes:
+        weeks: Every available week, oldest first.
+        builds: The history of each requested build seen in any week, in
+            request order.
+    """
+
+    weeks: list[str]
+    builds: list[BuildHistory]
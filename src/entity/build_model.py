@@ -2,7 +2,9 @@
 Pydantic model for Build database entity
 """
 
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 class BuildModel(BaseModel):
@@ -28,6 +30,16 @@ class BuildModel(BaseModel):
         moveset_item_pick_rate: The pick rate of the moveset with the item.
         moveset_item_true_pick_rate: The true pick rate of the moveset with
             the item.
+        weighted_win_rate: Win rate scaled by the true pick rate. Derived.
+        adjusted_win_rate: Win rate shrunk towards the week mean, weighted by
+            the true pick rate. Derived.
+        win_rate_z_score: Standard score of the win rate within the week.
+            Derived.
+        win_rate_ci_lower: Lower bound of the win rate confidence interval.
+        win_rate_ci_upper: Upper bound of the win rate confidence interval.
+        percentile_ranks: Percentile ranks of the build within its week, as
+            stored at ingest (see `percentile.encode_percentile_ranks`). Not
+            serialized.
     """
 
     id: int
@@ -45,3 +57,9 @@ class BuildModel(BaseModel):
     moveset_item_win_rate: float
     moveset_item_pick_rate: float
     moveset_item_true_pick_rate: float
+    weighted_win_rate: Optional[float] = None
+    adjusted_win_rate: Optional[float] = None
+    win_rate_z_score: Optional[float] = None
+    win_rate_ci_lower: Optional[float] = None
+    win_rate_ci_upper: Optional[float] = None
+    percentile_ranks: Optional[bytes] = Field(None, exclude=True, repr=False)
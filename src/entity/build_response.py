@@ -2,6 +2,8 @@
 Pydantic response model for Build API responses
 """
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -29,10 +31,19 @@ class BuildResponse(BaseModel):
         moveset_item_pick_rate: The pick rate of the moveset with the item.
         moveset_item_true_pick_rate: The true pick rate of the moveset with
             the item.
+        weighted_win_rate: Win rate scaled by the true pick rate. Derived.
+        adjusted_win_rate: Win rate shrunk towards the week mean, weighted by
+            the true pick rate. Derived.
+        win_rate_z_score: Standard score of the win rate within the week.
+            Derived.
+        win_rate_ci_lower: Lower bound of the win rate confidence interval.
+        win_rate_ci_upper: Upper bound of the win rate confidence interval.
         popularity: The ordinal position within the week based on
             moveset_item_true_pick_rate (1 = most popular).
         rank: The ordinal position within the current result set based on the
             specified sorting method (1 = first in sorted results).
+        percentiles: The percentile rank of every numeric column within the
+            week (100 = highest value), only when requested.
     """
 
     id: int
@@ -52,3 +63,9 @@ class BuildResponse(BaseModel):
     moveset_item_true_pick_rate: float
     popularity: int
     rank: int
+    weighted_win_rate: Optional[float] = None
+    adjusted_win_rate: Optional[float] = None
+    win_rate_z_score: Optional[float] = None
+    win_rate_ci_lower: Optional[float] = None
+    win_rate_ci_upper: Optional[float] = None
+    percentiles: Optional[dict[str, Optional[float]]] = None
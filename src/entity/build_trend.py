@@ -0,0 +1,79 @@
+"""
+Pydantic response models for build trends across weeks
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BuildTrend(BaseModel):
+    """
+    Pydantic response model for the trend of one build
+
+    Statistics cover the weeks of the window the build was seen in. Slopes are
+    in points per week and are None when the build was seen in fewer than two
+    weeks.
+
+    Attributes:
+        id: The build ID in the trend week.
+        pokemon: The name of the Pokémon.
+        role: The role of the Pokémon.
+        move_1: The first move of the Pokémon.
+        move_2: The second move of the Pokémon.
+        item: The item used by the Pokémon.
+        weeks: The number of weeks of the window the build was seen in.
+        moveset_item_win_rate: The win rate of the trend week.
+        moveset_item_win_rate_mean: The mean win rate over the window.
+        moveset_item_win_rate_slope: The least-squares slope of the win rate
+            over the window.
+        moveset_item_win_rate_ewma: The exponentially weighted moving average
+            of the win rate over every week up to the trend week.
+        moveset_item_true_pick_rate: The true pick rate of the trend week.
+        moveset_item_true_pick_rate_mean: The mean true pick rate over the
+            window.
+        moveset_item_true_pick_rate_slope: The least-squares slope of the
+            true pick rate over the window.
+        moveset_item_true_pick_rate_ewma: The exponentially weighted moving
+            average of the true pick rate over every week up to the trend
+            week.
+    """
+
+    id: int
+    pokemon: str
+    role: str
+    move_1: str
+    move_2: str
+    item: str
+    weeks: int
+    moveset_item_win_rate: float
+    moveset_item_win_rate_mean: float
+    moveset_item_win_rate_slope: Optional[float] = None
+    moveset_item_win_rate_ewma: float
+    moveset_item_true_pick_rate: float
+    moveset_item_true_pick_rate_mean: float
+    moveset_item_true_pick_rate_slope: Optional[float] = None
+    moveset_item_true_pick_rate_ewma: float
+
+
+class BuildTrends(BaseModel):
+    """
+    Pydantic response model for /meta/trends
+
+    Attributes:
+        week: The trend week, the last week of the window.
+        window: The number of weeks the window spans.
+        metric: The metric whose slope ranks the builds.
+        risers: The builds with the steepest positive slope, steepest first.
+        fallers: The builds with the steepest negative slope, steepest first.
+        sort_by: The trend statistic ordering `builds`, None if not sorted.
+        builds: The builds ordered by `sort_by`, empty if not sorted.
+    """
+
+    week: str
+    window: int
+    metric: str
+    risers: list[BuildTrend]
+    fallers: list[BuildTrend]
+    sort_by: Optional[str] = None
+    builds: list[BuildTrend] = []
@@ -15,7 +15,8 @@ class BuildsQueryParams(BaseModel):
         id (Optional[int]): Build ID for direct lookup.
         relevance (Optional[str]): Relevance strategy (any, moveset_item_true_pr, position_of_popularity).
         relevance_threshold (Optional[float]): Threshold for relevance filtering.
-        sort_by (Optional[str]): Field to sort by.
+        sort_by (Optional[str]): Comma-separated fields to sort by, each
+            optionally suffixed with :asc or :desc.
         sort_order (Optional[str]): Sort order: asc or desc.
         pokemon (Optional[str]): Filter by Pokémon name.
         role (Optional[str]): Filter by role.
@@ -24,6 +25,11 @@ class BuildsQueryParams(BaseModel):
         ignore_item (Optional[str]): Exclude item.
         ignore_role (Optional[str]): Exclude role.
         top_n (Optional[int]): Limit to top N results.
+        include_percentiles (Optional[bool]): Add the percentile ranks of
+            every build within its week.
+        min_percentile_<column> (Optional[float]): Keep builds whose
+            percentile rank for the numeric column is at least this value
+            (0 to 100).
     """
 
     week: Optional[str] = Field(
@@ -38,7 +44,8 @@ class BuildsQueryParams(BaseModel):
         0.0, description="Threshold for relevance filtering"
     )
     sort_by: Optional[str] = Field(
-        SortBy.MOVESET_ITEM_TRUE_PICK_RATE.value, description="Field to sort by"
+        SortBy.MOVESET_ITEM_TRUE_PICK_RATE.value,
+        description="Comma-separated fields to sort by, e.g. pokemon,moveset_item_win_rate:desc",
     )
     sort_order: Optional[str] = Field(
         "desc", description="Sort order: asc or desc"
@@ -52,3 +59,43 @@ class BuildsQueryParams(BaseModel):
     ignore_item: Optional[str] = Field(None, description="Exclude item")
     ignore_role: Optional[str] = Field(None, description="Exclude role")
     top_n: Optional[int] = Field(None, description="Limit to top N results")
+    include_percentiles: Optional[bool] = Field(
+        False, description="Add percentile ranks within the week"
+    )
+    min_percentile_pokemon_win_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of pokemon_win_rate"
+    )
+    min_percentile_pokemon_pick_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of pokemon_pick_rate"
+    )
+    min_percentile_moveset_win_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of moveset_win_rate"
+    )
+    min_percentile_moveset_pick_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of moveset_pick_rate"
+    )
+    min_percentile_moveset_true_pick_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of moveset_true_pick_rate"
+    )
+    min_percentile_moveset_item_win_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of moveset_item_win_rate"
+    )
+    min_percentile_moveset_item_pick_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of moveset_item_pick_rate"
+    )
+    min_percentile_moveset_item_true_pick_rate: Optional[float] = Field(
+        None,
+        description="Minimum percentile rank of moveset_item_true_pick_rate",
+    )
+    min_percentile_weighted_win_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of weighted_win_rate"
+    )
+    min_percentile_adjusted_win_rate: Optional[float] = Field(
+        None, description="Minimum percentile rank of adjusted_win_rate"
+    )
+    min_percentile_win_rate_z_score: Optional[float] = Field(
+        None, description="Minimum percentile rank of win_rate_z_score"
+    )
+    min_percentile_win_rate_ci_lower: Optional[float] = Field(
+        None, description="Minimum percentile rank of win_rate_ci_lower"
+    )
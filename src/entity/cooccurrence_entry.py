@@ -0,0 +1,25 @@
+"""
+Pydantic response model for co-occurrence matrix entries
+"""
+
+from pydantic import BaseModel
+
+
+class CooccurrenceEntry(BaseModel):
+    """
+    Pydantic response model for co-occurrence matrix entries
+
+    Attributes:
+        row: The row value (e.g. the item).
+        column: The column value (e.g. the Pokémon or move).
+        build_count: The number of builds holding both values.
+        true_pick_rate: The sum of the moveset_item_true_pick_rate of those
+            builds.
+        win_rate: Their win rate, weighted by moveset_item_true_pick_rate.
+    """
+
+    row: str
+    column: str
+    build_count: int
+    true_pick_rate: float
+    win_rate: float
@@ -0,0 +1,42 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class MetaDiffQueryParams(BaseModel):
+    """
+    Query parameters for the /meta/diff endpoint, besides the two weeks.
+
+    Attributes:
+        status (Optional[str]): Comma-separated statuses to keep (changed,
+            unchanged, new, vanished).
+        sort_by (Optional[str]): BuildDiff field to sort by.
+        sort_order (Optional[str]): Sort order: asc or desc.
+        pokemon (Optional[str]): Filter by Pokémon name.
+        role (Optional[str]): Filter by role.
+        item (Optional[str]): Filter by item.
+        ignore_pokemon (Optional[str]): Exclude Pokémon name.
+        ignore_item (Optional[str]): Exclude item.
+        ignore_role (Optional[str]): Exclude role.
+        top_n (Optional[int]): Limit to top N results.
+    """
+
+    status: Optional[str] = Field(
+        None,
+        description="Comma-separated statuses: changed, unchanged, new, vanished",
+    )
+    sort_by: Optional[str] = Field(
+        "moveset_item_win_rate_delta", description="BuildDiff field to sort by"
+    )
+    sort_order: Optional[str] = Field(
+        "desc", description="Sort order: asc or desc"
+    )
+    pokemon: Optional[str] = Field(None, description="Filter by Pokémon name")
+    role: Optional[str] = Field(None, description="Filter by role")
+    item: Optional[str] = Field(None, description="Filter by item")
+    ignore_pokemon: Optional[str] = Field(
+        None, description="Exclude Pokémon name"
+    )
+    ignore_item: Optional[str] = Field(None, description="Exclude item")
+    ignore_role: Optional[str] = Field(None, description="Exclude role")
+    top_n: Optional[int] = Field(None, description="Limit to top N results")
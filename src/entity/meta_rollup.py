@@ -0,0 +1,29 @@
+"""
+Pydantic response model for Pokémon, role and item rollups
+"""
+
+from pydantic import BaseModel
+
+from entity.build_model import BuildModel
+
+
+class MetaRollup(BaseModel):
+    """
+    Pydantic response model for the aggregate of a group of builds
+
+    Attributes:
+        name: The Pokémon, role or item the builds share.
+        build_count: The number of builds in the group.
+        pick_weighted_win_rate: The win rate of the group, with every build
+            weighted by its moveset_item_true_pick_rate.
+        total_true_pick_rate: The sum of the moveset_item_true_pick_rate of
+            the builds.
+        best_build: The build of the group with the highest
+            adjusted_win_rate.
+    """
+
+    name: str
+    build_count: int
+    pick_weighted_win_rate: float
+    total_true_pick_rate: float
+    best_build: BuildModel
@@ -0,0 +1,42 @@
+"""
+Pydantic response models for relevance threshold sweeps
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SweepPoint(BaseModel):
+    """
+    Pydantic response model for one threshold of a sweep
+
+    Attributes:
+        threshold: The relevance threshold.
+        build_count: The number of builds the threshold selects.
+        coverage: The sum of the moveset_item_true_pick_rate of those builds.
+    """
+
+    threshold: float
+    build_count: int
+    coverage: float
+
+
+class RelevanceSweep(BaseModel):
+    """
+    Pydantic response model for /relevance/{strategy}/sweep
+
+    Attributes:
+        strategy: The relevance strategy.
+        week: The week identifier, None for all weeks.
+        build_count: The number of builds of the week.
+        coverage: The sum of the moveset_item_true_pick_rate of every build
+            of the week.
+        points: Every threshold that changes the selection, ascending.
+    """
+
+    strategy: str
+    week: Optional[str] = None
+    build_count: int
+    coverage: float
+    points: list[SweepPoint]
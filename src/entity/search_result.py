@@ -0,0 +1,22 @@
+"""
+Pydantic response model for /search results
+"""
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    """
+    Pydantic response model for /search results
+
+    Attributes:
+        name: The matched name, as stored in the builds.
+        kind: The kind of name: pokemon, item or move.
+        match: How the name matched the query: exact, prefix or fuzzy.
+        score: Relevance of the match, from 0.0 to 1.0 (1.0 = exact match).
+    """
+
+    name: str
+    kind: str
+    match: str
+    score: float
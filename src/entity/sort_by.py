@@ -21,3 +21,7 @@ class SortBy(str, Enum):
     MOVESET_ITEM_WIN_RATE = "moveset_item_win_rate"
     MOVESET_ITEM_PICK_RATE = "moveset_item_pick_rate"
     MOVESET_ITEM_TRUE_PICK_RATE = "moveset_item_true_pick_rate"
+    WEIGHTED_WIN_RATE = "weighted_win_rate"
+    ADJUSTED_WIN_RATE = "adjusted_win_rate"
+    WIN_RATE_Z_SCORE = "win_rate_z_score"
+    WIN_RATE_CI_LOWER = "win_rate_ci_lower"
@@ -0,0 +1,67 @@
+"""
+Pydantic response models for team recommendations
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TeamMember(BaseModel):
+    """
+    Pydantic response model for one Pokémon of a recommended team
+
+    Attributes:
+        pokemon: The name of the Pokémon.
+        role: The role of the Pokémon.
+        build_id: The ID of the build the Pokémon plays.
+        move_1: The first move of the build.
+        move_2: The second move of the build.
+        item: The item of the build.
+        value: The value of the objective metric for the build.
+    """
+
+    pokemon: str
+    role: str
+    build_id: int
+    move_1: str
+    move_2: str
+    item: str
+    value: float
+
+
+class Team(BaseModel):
+    """
+    Pydantic response model for a recommended team
+
+    Attributes:
+        score: The sum of the objective metric over the members.
+        members: The members, by descending value.
+    """
+
+    score: float
+    members: list[TeamMember]
+
+
+class TeamRecommendation(BaseModel):
+    """
+    Pydantic response model for /teams/recommend
+
+    Attributes:
+        week: The week identifier, None for all weeks.
+        metric: The objective metric summed over the members.
+        team_size: The number of Pokémon in a team.
+        roles: The roles every team must contain, repeated for roles
+            required several times.
+        max_per_role: The maximum number of members of one role, None for
+            no limit.
+        teams: The best teams, best first. Empty if no team satisfies the
+            constraints.
+    """
+
+    week: Optional[str] = None
+    metric: str
+    team_size: int
+    roles: list[str]
+    max_per_role: Optional[int] = None
+    teams: list[Team]
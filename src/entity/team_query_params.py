@@ -0,0 +1,54 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from pokemon_unite_meta_analysis.relevance_strategy import Relevance
+from pokemon_unite_meta_analysis.sort_strategy import SortBy
+
+
+class TeamQueryParams(BaseModel):
+    """
+    Query parameters for the /teams/recommend endpoint.
+
+    Attributes:
+        week (Optional[str]): Week identifier, None for the latest week.
+        metric (str): Numeric build field summed over the team.
+        team_size (int): Number of Pokémon in a team.
+        roles (Optional[str]): Comma-separated roles every team must contain,
+            repeated for roles required several times. None for one of each
+            role of the week.
+        max_per_role (Optional[int]): Maximum number of members of one role.
+        include_pokemon (Optional[str]): Comma-separated Pokémon every team
+            must contain.
+        exclude_pokemon (Optional[str]): Comma-separated Pokémon no team may
+            contain.
+        relevance (str): Relevance strategy selecting the candidate builds.
+        relevance_threshold (Optional[float]): Threshold for the relevance
+            strategy.
+        top_k (int): Number of teams to return.
+    """
+
+    week: Optional[str] = Field(None, description="Week identifier")
+    metric: str = Field(
+        SortBy.ADJUSTED_WIN_RATE.value, description="Numeric field to maximize"
+    )
+    team_size: int = Field(5, description="Number of Pokémon in a team")
+    roles: Optional[str] = Field(
+        None, description="Comma-separated roles every team must contain"
+    )
+    max_per_role: Optional[int] = Field(
+        None, description="Maximum number of members of one role"
+    )
+    include_pokemon: Optional[str] = Field(
+        None, description="Comma-separated Pokémon every team must contain"
+    )
+    exclude_pokemon: Optional[str] = Field(
+        None, description="Comma-separated Pokémon no team may contain"
+    )
+    relevance: str = Field(
+        Relevance.ANY.value, description="Relevance strategy"
+    )
+    relevance_threshold: Optional[float] = Field(
+        0.0, description="Threshold for relevance filtering"
+    )
+    top_k: int = Field(3, description="Number of teams to return")
@@ -0,0 +1,72 @@
+"""
+Pydantic response models for tier lists
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TierEntry(BaseModel):
+    """
+    Pydantic response model for a Pokémon or build placed in a tier
+
+    Attributes:
+        pokemon: The name of the Pokémon.
+        role: The role of the Pokémon.
+        build_id: The build ID, None when Pokémon are ranked.
+        move_1: The first move of the build, None when Pokémon are ranked.
+        move_2: The second move of the build, None when Pokémon are ranked.
+        item: The item of the build, None when Pokémon are ranked.
+        build_count: The number of relevant builds behind the entry.
+        value: The value of the ranking metric.
+    """
+
+    pokemon: str
+    role: str
+    build_id: Optional[int] = None
+    move_1: Optional[str] = None
+    move_2: Optional[str] = None
+    item: Optional[str] = None
+    build_count: int
+    value: float
+
+
+class Tier(BaseModel):
+    """
+    Pydantic response model for one tier
+
+    Attributes:
+        tier: The tier name, S to D.
+        min_value: The lowest metric value in the tier, None if empty.
+        max_value: The highest metric value in the tier, None if empty.
+        entries: The entries of the tier, best first.
+    """
+
+    tier: str
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    entries: list[TierEntry]
+
+
+class TierList(BaseModel):
+    """
+    Pydantic response model for /meta/tiers
+
+    Attributes:
+        week: The week identifier, None for all weeks.
+        level: What is ranked: pokemon or build.
+        metric: The ranking metric.
+        method: How tier breaks are found: quantile or kmeans.
+        relevance: The relevance strategy selecting the builds.
+        relevance_threshold: The relevance threshold.
+        tiers: The tiers, S first.
+    """
+
+    week: Optional[str] = None
+    level: str
+    metric: str
+    method: str
+    relevance: str
+    relevance_threshold: Optional[float] = None
+    tiers: list[Tier]
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from pokemon_unite_meta_analysis.relevance_strategy import Relevance
+from pokemon_unite_meta_analysis.sort_strategy import SortBy
+
+
+class TierQueryParams(BaseModel):
+    """
+    Query parameters for the /meta/tiers endpoint.
+
+    Attributes:
+        week (Optional[str]): Week identifier, None for all weeks.
+        level (str): What to rank: pokemon or build.
+        metric (str): Numeric build field to rank by.
+        method (str): How tier breaks are found: quantile or kmeans.
+        relevance (str): Relevance strategy selecting the builds.
+        relevance_threshold (Optional[float]): Threshold for the relevance
+            strategy.
+    """
+
+    week: Optional[str] = Field(None, description="Week identifier")
+    level: str = Field("pokemon", description="What to rank: pokemon or build")
+    metric: str = Field(
+        SortBy.ADJUSTED_WIN_RATE.value, description="Numeric field to rank by"
+    )
+    method: str = Field(
+        "quantile", description="Tier breaks: quantile or kmeans"
+    )
+    relevance: str = Field(
+        Relevance.ANY.value, description="Relevance strategy"
+    )
+    relevance_threshold: Optional[float] = Field(
+        0.0, description="Threshold for relevance filtering"
+    )
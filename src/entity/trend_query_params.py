@@ -0,0 +1,85 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class TrendQueryParams(BaseModel):
+    """
+    Query parameters for the /meta/trends endpoint.
+
+    Attributes:
+        week (Optional[str]): Last week of the window, None for the latest.
+        window (int): Number of weeks the window spans.
+        metric (str): Metric whose slope ranks the builds.
+        min_weeks (int): Minimum number of weeks of the window a build must
+            be seen in.
+        pokemon (Optional[str]): Filter by Pokémon name.
+        role (Optional[str]): Filter by role.
+        item (Optional[str]): Filter by item.
+        top_n (int): Number of risers, of fallers and of sorted builds to
+            return.
+        sort_by (Optional[str]): Trend statistic ordering the `builds` list,
+            e.g. moveset_item_win_rate_ewma. None leaves it empty.
+        sort_order (Optional[str]): Sort order: asc or desc.
+        min_<statistic> (Optional[float]): Keep builds whose trend statistic
+            is at least this value.
+        max_<statistic> (Optional[float]): Keep builds whose trend statistic
+            is at most this value.
+    """
+
+    week: Optional[str] = Field(None, description="Last week of the window")
+    window: int = Field(4, description="Number of weeks in the window")
+    metric: str = Field(
+        "moveset_item_win_rate", description="Metric whose slope ranks builds"
+    )
+    min_weeks: int = Field(
+        2, description="Minimum number of weeks a build is seen in"
+    )
+    pokemon: Optional[str] = Field(None, description="Filter by Pokémon name")
+    role: Optional[str] = Field(None, description="Filter by role")
+    item: Optional[str] = Field(None, description="Filter by item")
+    top_n: int = Field(
+        10, description="Number of risers, fallers and sorted builds"
+    )
+    sort_by: Optional[str] = Field(
+        None, description="Trend statistic ordering the builds list"
+    )
+    sort_order: Optional[str] = Field(
+        "desc", description="Sort order: asc or desc"
+    )
+    min_moveset_item_win_rate_mean: Optional[float] = Field(
+        None, description="Minimum moveset_item_win_rate_mean"
+    )
+    max_moveset_item_win_rate_mean: Optional[float] = Field(
+        None, description="Maximum moveset_item_win_rate_mean"
+    )
+    min_moveset_item_win_rate_slope: Optional[float] = Field(
+        None, description="Minimum moveset_item_win_rate_slope"
+    )
+    max_moveset_item_win_rate_slope: Optional[float] = Field(
+        None, description="Maximum moveset_item_win_rate_slope"
+    )
+    min_moveset_item_win_rate_ewma: Optional[float] = Field(
+        None, description="Minimum moveset_item_win_rate_ewma"
+    )
+    max_moveset_item_win_rate_ewma: Optional[float] = Field(
+        None, description="Maximum moveset_item_win_rate_ewma"
+    )
+    min_moveset_item_true_pick_rate_mean: Optional[float] = Field(
+        None, description="Minimum moveset_item_true_pick_rate_mean"
+    )
+    max_moveset_item_true_pick_rate_mean: Optional[float] = Field(
+        None, description="Maximum moveset_item_true_pick_rate_mean"
+    )
+    min_moveset_item_true_pick_rate_slope: Optional[float] = Field(
+        None, description="Minimum moveset_item_true_pick_rate_slope"
+    )
+    max_moveset_item_true_pick_rate_slope: Optional[float] = Field(
+        None, description="Maximum moveset_item_true_pick_rate_slope"
+    )
+    min_moveset_item_true_pick_rate_ewma: Optional[float] = Field(
+        None, description="Minimum moveset_item_true_pick_rate_ewma"
+    )
+    max_moveset_item_true_pick_rate_ewma: Optional[float] = Field(
+        None, description="Maximum moveset_item_true_pick_rate_ewma"
+    )
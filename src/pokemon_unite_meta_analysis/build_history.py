@@ -0,0 +1,212 @@
+"""
+Per-build time series across weeks.
+
+Every build identity (pokemon, move1, move2, item), compared through lookup
+keys, gets a row in a set of (builds x weeks) matrices, one per metric in
+`HISTORY_METRICS`. Looking up the history of a build is then a dict lookup
+plus a row slice, instead of loading every week.
+
+The matrices are built from the week snapshots on first use and rebuilt after
+a week is (re)ingested.
+"""
+
+import threading
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from entity.build_history import BuildHistory
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+HISTORY_METRICS = (
+    "moveset_item_win_rate",
+    "moveset_item_pick_rate",
+    "moveset_item_true_pick_rate",
+)
+
+IDENTITY_COLUMNS = ("pokemon", "move_1", "move_2", "item")
+
+BuildKey = tuple[str, str, str, str]
+
+
+def build_key(pokemon: str, move_1: str, move_2: str, item: str) -> BuildKey:
+    """
+    Get the lookup key of a build identity
+
+    Args:
+        pokemon (str): Pokémon name
+        move_1 (str): First move
+        move_2 (str): Second move
+        item (str): Held item
+
+    Returns:
+        BuildKey: Lookup keys of the four names
+    """
+    return (
+        normalize_key(pokemon),
+        normalize_key(move_1),
+        normalize_key(move_2),
+        normalize_key(item),
+    )
+
+
+def _nullable(values: np.ndarray, missing: np.ndarray) -> list:
+    return [
+        None if absent else value
+        for value, absent in zip(values.tolist(), missing.tolist())
+    ]
+
+
+class BuildHistoryIndex:
+    """
+    Precomputed per-build series of every metric across all weeks
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.weeks: tuple[str, ...] = ()
+        self._rows: dict[BuildKey, int] = {}
+        # Names as stored, and the role, of every row
+        self._names: list[tuple[str, str, str, str, str]] = []
+        # Build ids, -1 where the build is missing from a week
+        self._ids = np.empty((0, 0), dtype=np.int64)
+        self._popularity = np.empty((0, 0), dtype=np.int64)
+        self._metrics: dict[str, np.ndarray] = {}
+        self._stale = True
+
+    def sync(
+        self,
+        weeks: Iterable[str],
+        load_snapshot: Callable[[str], WeekSnapshot],
+    ) -> None:
+        """
+        Rebuild the series if weeks were added or (re)ingested
+
+        Args:
+            weeks (Iterable[str]): Every available week
+            load_snapshot (Callable[[str], WeekSnapshot]): Loads the snapshot
+                of a week
+        """
+        weeks = tuple(sorted(weeks))
+
+        with self._lock:
+            if not self._stale and weeks == self.weeks:
+                return
+
+        LOG.info("Building build history")
+        LOG.debug("weeks: %s", len(weeks))
+
+        rows: dict[BuildKey, int] = {}
+        names = []
+        positions = []
+        for week in weeks:
+            snapshot = load_snapshot(week)
+            keys = zip(*(snapshot.keys(column) for column in IDENTITY_COLUMNS))
+            week_rows = np.empty(len(snapshot), dtype=np.int64)
+
+            for position, key in enumerate(keys):
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = len(names)
+                    build = snapshot.builds[position]
+                    names.append(
+                        (
+                            build.pokemon,
+                            build.role,
+                            build.move_1,
+                            build.move_2,
+                            build.item,
+                        )
+                    )
+                week_rows[position] = row
+
+            positions.append((snapshot, week_rows))
+
+        # Fill one week column of every matrix at a time
+        shape = (len(names), len(weeks))
+        ids = np.full(shape, -1, dtype=np.int64)
+        popularity = np.zeros(shape, dtype=np.int64)
+        metrics = {name: np.full(shape, np.nan) for name in HISTORY_METRICS}
+
+        for column, (snapshot, week_rows) in enumerate(positions):
+            ids[week_rows, column] = snapshot.ids
+            popularity[week_rows[snapshot.popularity_order], column] = (
+                np.arange(1, len(snapshot) + 1)
+            )
+            for name in HISTORY_METRICS:
+                metrics[name][week_rows, column] = snapshot.column(name)
+
+        with self._lock:
+            self.weeks = weeks
+            self._rows = rows
+            self._names = names
+            self._ids = ids
+            self._popularity = popularity
+            self._metrics = metrics
+            self._stale = False
+
+    def invalidate(self, week: Optional[str] = None) -> None:
+        """
+        Mark the series as stale after a week was (re)ingested
+
+        Args:
+            week (str, optional): The week identifier
+        """
+        with self._lock:
+            self._stale = True
+
+    def clear(self) -> None:
+        """Drop every series"""
+        with self._lock:
+            self._reset()
+
+    def history(self, keys: list[BuildKey]) -> list[BuildHistory]:
+        """
+        Get the series of several builds
+
+        Args:
+            keys (list[BuildKey]): Lookup keys of the builds (see
+                `build_key`)
+
+        Returns:
+            list[BuildHistory]: One history per key of a build seen in any
+                week, in the same order; unknown keys are left out. Values of
+                weeks a build is missing from are None.
+        """
+        with self._lock:
+            rows = [self._rows[key] for key in keys if key in self._rows]
+            ids = self._ids[rows]
+            popularity = self._popularity[rows]
+            metrics = {
+                name: values[rows] for name, values in self._metrics.items()
+            }
+            names = [self._names[row] for row in rows]
+
+        histories = []
+        for position, (pokemon, role, move_1, move_2, item) in enumerate(names):
+            missing = ids[position] < 0
+            histories.append(
+                BuildHistory(
+                    pokemon=pokemon,
+                    role=role,
+                    move_1=move_1,
+                    move_2=move_2,
+                    item=item,
+                    ids=_nullable(ids[position], missing),
+                    popularity=_nullable(popularity[position], missing),
+                    **{
+                        name: _nullable(values[position], missing)
+                        for name, values in metrics.items()
+                    },
+                )
+            )
+
+        return histories
+
+
+BUILD_HISTORY = BuildHistoryIndex()
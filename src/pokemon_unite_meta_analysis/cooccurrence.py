@@ -0,0 +1,210 @@
+"""
+Sparse co-occurrence matrices of build attributes.
+
+A matrix counts how often a row value (e.g. an item) appears in the same build
+as a column value (e.g. a Pokémon). Only the pairs that occur are stored, as
+coordinate arrays sorted by row (so a row is a contiguous slice, like CSR),
+plus a permutation sorted by column. Every pair carries:
+
+- `build_count`: number of builds holding the pair;
+- `true_pick_rate`: sum of their moveset_item_true_pick_rate;
+- `win_rate`: their win rate weighted by moveset_item_true_pick_rate.
+
+Matrices are computed once per week snapshot (see
+`WeekSnapshot.cooccurrence`).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from entity.cooccurrence_entry import CooccurrenceEntry
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+
+# Matrix name to the (row column, column column) pairs counted by it
+COOCCURRENCE_MATRICES = {
+    "item_pokemon": (("item", "pokemon"),),
+    "item_move": (("item", "move_1"), ("item", "move_2")),
+    "move1_move2": (("move_1", "move_2"),),
+}
+
+# Pair attributes entries can be ranked by
+COOCCURRENCE_WEIGHTS = ("true_pick_rate", "win_rate", "build_count")
+
+
+class CooccurrenceMatrix:
+    """
+    Sparse co-occurrence matrix
+
+    Args:
+        rows (np.ndarray): Row value of every occurrence
+        columns (np.ndarray): Column value of every occurrence
+        win_rates (np.ndarray): moveset_item_win_rate of every occurrence
+        pick_rates (np.ndarray): moveset_item_true_pick_rate of every
+            occurrence
+    """
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        win_rates: np.ndarray,
+        pick_rates: np.ndarray,
+    ):
+        LOG.info("Building co-occurrence matrix")
+        LOG.debug("occurrences: %s", len(rows))
+
+        win_rates = np.asarray(win_rates, dtype=np.float64)
+        pick_rates = np.asarray(pick_rates, dtype=np.float64)
+
+        self.row_labels, row_codes = np.unique(rows, return_inverse=True)
+        self.column_labels, column_codes = np.unique(
+            columns, return_inverse=True
+        )
+        self._row_codes = {
+            normalize_key(label): code
+            for code, label in enumerate(self.row_labels.tolist())
+        }
+        self._column_codes = {
+            normalize_key(label): code
+            for code, label in enumerate(self.column_labels.tolist())
+        }
+
+        # np.unique sorts the flat cell codes, hence the cells by row first
+        cells, pairs = np.unique(
+            row_codes * len(self.column_labels) + column_codes,
+            return_inverse=True,
+        )
+        n_cells = len(cells)
+        self.rows, self.columns = np.divmod(cells, len(self.column_labels))
+        self.build_count = np.bincount(pairs, minlength=n_cells)
+        self.true_pick_rate = np.bincount(
+            pairs, weights=pick_rates, minlength=n_cells
+        )
+        mean_win_rate = np.bincount(
+            pairs, weights=win_rates, minlength=n_cells
+        ) / np.maximum(self.build_count, 1)
+        self.win_rate = np.divide(
+            np.bincount(
+                pairs, weights=win_rates * pick_rates, minlength=n_cells
+            ),
+            self.true_pick_rate,
+            out=mean_win_rate,
+            where=self.true_pick_rate > 0,
+        )
+
+        self._row_starts = np.searchsorted(
+            self.rows, np.arange(len(self.row_labels) + 1)
+        )
+        self._by_column = np.lexsort((self.rows, self.columns))
+        self._column_starts = np.searchsorted(
+            self.columns[self._by_column],
+            np.arange(len(self.column_labels) + 1),
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def row_cells(self, name: str) -> Optional[np.ndarray]:
+        """
+        Get the cells of a row
+
+        Args:
+            name (str): Row value, compared through its lookup key
+
+        Returns:
+            np.ndarray: Cell positions, or None if the row does not exist
+        """
+        code = self._row_codes.get(normalize_key(name))
+        if code is None:
+            return None
+
+        return np.arange(self._row_starts[code], self._row_starts[code + 1])
+
+    def column_cells(self, name: str) -> Optional[np.ndarray]:
+        """
+        Get the cells of a column
+
+        Args:
+            name (str): Column value, compared through its lookup key
+
+        Returns:
+            np.ndarray: Cell positions, or None if the column does not exist
+        """
+        code = self._column_codes.get(normalize_key(name))
+        if code is None:
+            return None
+
+        return self._by_column[
+            self._column_starts[code] : self._column_starts[code + 1]
+        ]
+
+    def top(
+        self,
+        cells: Optional[np.ndarray] = None,
+        weight: str = "true_pick_rate",
+        k: Optional[int] = None,
+    ) -> list[CooccurrenceEntry]:
+        """
+        Get the cells with the highest weight
+
+        Args:
+            cells (np.ndarray, optional): Cell positions to rank. Defaults to
+                every cell.
+            weight (str, optional): One of `COOCCURRENCE_WEIGHTS`. Defaults to
+                "true_pick_rate".
+            k (int, optional): Number of cells to return. Defaults to all.
+
+        Returns:
+            list[CooccurrenceEntry]: Cells by descending weight, ties by row
+                and column
+        """
+        if cells is None:
+            cells = np.arange(len(self))
+
+        values = getattr(self, weight)[cells]
+        if k is not None and k < len(cells):
+            # Select the top k before sorting them
+            selected = np.argpartition(-values, k - 1)[:k]
+            cells, values = cells[selected], values[selected]
+        cells = cells[np.lexsort((cells, -values))]
+
+        return [
+            CooccurrenceEntry(
+                row=self.row_labels[self.rows[cell]],
+                column=self.column_labels[self.columns[cell]],
+                build_count=self.build_count[cell],
+                true_pick_rate=self.true_pick_rate[cell],
+                win_rate=self.win_rate[cell],
+            )
+            for cell in cells.tolist()
+        ]
+
+
+def build_cooccurrence(
+    name: str,
+    columns: dict[str, np.ndarray],
+    win_rates: np.ndarray,
+    pick_rates: np.ndarray,
+) -> CooccurrenceMatrix:
+    """
+    Build one of `COOCCURRENCE_MATRICES` from build columns
+
+    Args:
+        name (str): Matrix name
+        columns (dict[str, np.ndarray]): Build columns by attribute name
+        win_rates (np.ndarray): moveset_item_win_rate of every build
+        pick_rates (np.ndarray): moveset_item_true_pick_rate of every build
+
+    Returns:
+        CooccurrenceMatrix: The matrix
+    """
+    pairs = COOCCURRENCE_MATRICES[name]
+
+    return CooccurrenceMatrix(
+        np.concatenate([columns[row] for row, _ in pairs]),
+        np.concatenate([columns[column] for _, column in pairs]),
+        np.tile(win_rates, len(pairs)),
+        np.tile(pick_rates, len(pairs)),
+    )
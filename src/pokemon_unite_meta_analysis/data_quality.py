@@ -0,0 +1,290 @@
+"""
+Vectorized data quality checks of the builds of a week.
+
+Row checks run column-wise over a whole week at once, each giving a boolean
+mask of the failing rows, so a week costs a handful of NumPy operations
+whatever its size:
+
+- `missing_name`: an empty Pokémon, move or item name;
+- `unknown_role` / `unknown_item`: a name missing from the `ROLES` vocabulary
+  or from the item vocabulary (`KNOWN_ITEMS` and the items already stored);
+- `rate_not_a_number` / `rate_out_of_range`: a rate that is not a number, or
+  not between 0 and 100;
+- `true_pick_rate_above_pick_rate`: a true pick rate above the pick rate it is
+  a share of (`moveset_item_true_pick_rate ≤ moveset_true_pick_rate ≤
+  pkm_pick_rate`);
+- `duplicate_build`: an earlier row of a build (same Pokémon, moves and item)
+  passing every other check, the last row wins.
+
+A row failing any check is quarantined with the names of its failed checks,
+encoded as a bit set per row (see `failure_reasons`).
+
+Week checks run on the valid rows and only raise warnings, since no single
+row is to blame. Every match has 10 picks, so the pick rates of the Pokémon of
+a week sum to at most 1000%, and the true pick rates of the builds of a
+Pokémon to at most its pick rate. Rates are rounded, so every summed rate is
+allowed `ROUNDING_TOLERANCE` points of error.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+
+# Canonical role names, by lookup key
+ROLES = {
+    normalize_key(role): role
+    for role in ("All-Rounder", "Attacker", "Defender", "Speedster", "Support")
+}
+ROLES[normalize_key("Supporter")] = "Support"
+
+# Battle items known before any import, in their canonical spelling
+KNOWN_ITEMS = (
+    "???",
+    "Controller",
+    "EjectButton",
+    "Ganrao",
+    "Gear",
+    "Potion",
+    "Purify",
+    "ShedinjaDoll",
+    "Tail",
+    "XAttack",
+    "XSpeed",
+)
+
+
+def item_vocabulary(stored: Iterable[str] = ()) -> dict[str, str]:
+    """
+    Get the canonical item names, by lookup key
+
+    Args:
+        stored (Iterable[str], optional): Items of the stored builds, so items
+            added by the game are known once imported. Defaults to none.
+
+    Returns:
+        dict[str, str]: Canonical names of the stored and `KNOWN_ITEMS`, the
+            spelling of `KNOWN_ITEMS` winning
+    """
+    vocabulary = {
+        normalize_key(item): item
+        for item in stored
+        # Header rows exported as builds store the column name as item
+        if normalize_key(item) != "item"
+    }
+    vocabulary.update((normalize_key(item), item) for item in KNOWN_ITEMS)
+
+    return vocabulary
+
+
+ITEMS = item_vocabulary()
+
+# Picks of a match, 5 per team
+PICKS_PER_MATCH = 10
+
+# Error allowed on every summed or compared rate, in percentage points
+ROUNDING_TOLERANCE = 0.05
+
+# Row checks, in the bit order of `failure_reasons`
+ROW_CHECKS = (
+    "missing_name",
+    "unknown_role",
+    "unknown_item",
+    "rate_not_a_number",
+    "rate_out_of_range",
+    "true_pick_rate_above_pick_rate",
+    "duplicate_build",
+)
+
+
+def check_rows(
+    names: dict[str, np.ndarray],
+    raw_names: dict[str, np.ndarray],
+    rates: dict[str, np.ndarray],
+    identity: tuple[str, ...],
+) -> dict[str, np.ndarray]:
+    """
+    Run the row checks of a week
+
+    Args:
+        names (dict[str, np.ndarray]): Canonical names of every name column,
+            empty for unknown roles and items
+        raw_names (dict[str, np.ndarray]): Names before the vocabulary
+            lookup, empty if missing
+        rates (dict[str, np.ndarray]): Float64 values of every rate column,
+            NaN if not a number
+        identity (tuple[str, ...]): Name columns identifying a build
+
+    Returns:
+        dict[str, np.ndarray]: Boolean mask of the failing rows of every
+            check of `ROW_CHECKS`
+    """
+    missing = np.logical_or.reduce(
+        [raw_names[column] == "" for column in raw_names]
+    )
+    matrix = np.column_stack(list(rates.values()))
+    not_a_number = np.isnan(matrix)
+
+    failures = {
+        "missing_name": missing,
+        "unknown_role": (raw_names["role"] != "") & (names["role"] == ""),
+        "unknown_item": (raw_names["item"] != "") & (names["item"] == ""),
+        "rate_not_a_number": not_a_number.any(axis=1),
+        # NaN rates fail neither comparison
+        "rate_out_of_range": ((matrix < 0) | (matrix > 100)).any(axis=1),
+        "true_pick_rate_above_pick_rate": (
+            rates["moveset_item_true_pick_rate"]
+            > rates["moveset_true_pick_rate"] + ROUNDING_TOLERANCE
+        )
+        | (
+            rates["moveset_true_pick_rate"]
+            > rates["pkm_pick_rate"] + ROUNDING_TOLERANCE
+        ),
+    }
+
+    valid = ~np.logical_or.reduce(list(failures.values()))
+    failures["duplicate_build"] = valid & _earlier_duplicates(
+        [names[column] for column in identity], valid
+    )
+
+    return failures
+
+
+def _earlier_duplicates(keys: list[np.ndarray], valid: np.ndarray):
+    duplicated = np.zeros(len(valid), dtype=bool)
+    duplicated[valid] = (
+        pd.DataFrame(
+            {position: values[valid] for position, values in enumerate(keys)}
+        )
+        .duplicated(keep="last")
+        .to_numpy()
+    )
+
+    return duplicated
+
+
+def failure_reasons(failures: dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Get the failed checks of every row
+
+    Args:
+        failures (dict[str, np.ndarray]): Masks returned by `check_rows`
+
+    Returns:
+        np.ndarray: Comma-separated names of the failed checks of every row,
+            empty for valid rows
+    """
+    bits = np.zeros(len(next(iter(failures.values()))), dtype=np.int64)
+    for bit, check in enumerate(ROW_CHECKS):
+        bits |= failures[check].astype(np.int64) << bit
+
+    # Only the distinct combinations of failed checks are spelled out
+    combinations, inverse = np.unique(bits, return_inverse=True)
+    labels = np.array(
+        [
+            ",".join(
+                check
+                for bit, check in enumerate(ROW_CHECKS)
+                if combination >> bit & 1
+            )
+            for combination in combinations
+        ],
+        dtype=object,
+    )
+
+    return labels[inverse]
+
+
+def check_week(
+    pokemon: np.ndarray,
+    pick_rates: np.ndarray,
+    true_pick_rates: np.ndarray,
+) -> list[dict]:
+    """
+    Run the week checks on the valid builds of a week
+
+    Args:
+        pokemon (np.ndarray): Pokémon of every build
+        pick_rates (np.ndarray): `pkm_pick_rate` of every build
+        true_pick_rates (np.ndarray): `moveset_item_true_pick_rate` of every
+            build
+
+    Returns:
+        list[dict]: Warnings, with the check name, the observed value and the
+            allowed limit
+    """
+    if len(pokemon) == 0:
+        return []
+
+    names, first, codes = np.unique(
+        pokemon, return_index=True, return_inverse=True
+    )
+    warnings = []
+
+    pick_rate_total = float(pick_rates[first].sum())
+    limit = PICKS_PER_MATCH * 100 + ROUNDING_TOLERANCE * len(names)
+    if pick_rate_total > limit:
+        warnings.append(
+            {
+                "check": "pick_rate_total",
+                "value": round(pick_rate_total, 4),
+                "limit": round(limit, 4),
+            }
+        )
+
+    true_pick_rate_total = float(true_pick_rates.sum())
+    limit = PICKS_PER_MATCH * 100 + ROUNDING_TOLERANCE * len(pokemon)
+    if true_pick_rate_total > limit:
+        warnings.append(
+            {
+                "check": "true_pick_rate_total",
+                "value": round(true_pick_rate_total, 4),
+                "limit": round(limit, 4),
+            }
+        )
+
+    sums = np.bincount(codes, weights=true_pick_rates)
+    counts = np.bincount(codes)
+    over = sums > pick_rates[first] + ROUNDING_TOLERANCE * counts
+    if over.any():
+        warnings.append(
+            {
+                "check": "pokemon_true_pick_rate_total",
+                "pokemon": names[over].tolist(),
+            }
+        )
+
+    return warnings
+
+
+def rate_summary(
+    rates: dict[str, np.ndarray], valid: Optional[np.ndarray] = None
+) -> dict[str, dict[str, Optional[float]]]:
+    """
+    Get the minimum, mean and maximum of every rate column
+
+    Args:
+        rates (dict[str, np.ndarray]): Values of every rate column
+        valid (np.ndarray, optional): Mask of the rows to summarize. Defaults
+            to every row.
+
+    Returns:
+        dict[str, dict[str, Optional[float]]]: Minimum, mean and maximum of
+            every column, None without rows
+    """
+    summary = {}
+    for column, values in rates.items():
+        if valid is not None:
+            values = values[valid]
+        if len(values) == 0:
+            summary[column] = {"min": None, "mean": None, "max": None}
+            continue
+        summary[column] = {
+            "min": round(float(values.min()), 4),
+            "mean": round(float(values.mean()), 4),
+            "max": round(float(values.max()), 4),
+        }
+
+    return summary
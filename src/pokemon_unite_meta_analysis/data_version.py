@@ -0,0 +1,106 @@
+"""
+Data version of the builds database.
+
+Every write to the builds of a week bumps a monotonic, database-wide data
+version and records it as the version of that week (see
+`BuildRepository.sync_week`). Ingesting runs in its own process, so the
+caches of a running API are not invalidated directly: instead, every process
+remembers the data version its caches were built from, and when the stored
+version moved, drops the cached data of the weeks whose version changed.
+
+Weeks also store a content hash of their normalized builds, so re-ingesting
+an unchanged week is skipped without touching the database or any cache.
+"""
+
+import hashlib
+import threading
+from typing import Iterable, Optional
+
+
+def content_hash(rows: Iterable[tuple]) -> str:
+    """
+    Hash the builds of a week, independently of their order
+
+    Args:
+        rows (Iterable[tuple]): Stored values of every build
+
+    Returns:
+        str: Hexadecimal SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for row in sorted(rows):
+        digest.update("\x1f".join(map(repr, row)).encode())
+        digest.update(b"\n")
+
+    return digest.hexdigest()
+
+
+class DataVersionTracker:
+    """
+    Data version the caches of this process were built from
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version: Optional[int] = None
+        self._weeks: dict[str, int] = {}
+
+    def is_current(self, version: int) -> bool:
+        """
+        Whether the caches were built from a data version
+
+        Args:
+            version (int): The stored data version
+
+        Returns:
+            bool: True if no week changed since the last update
+        """
+        with self._lock:
+            return version == self.version
+
+    def update(self, version: int, weeks: dict[str, int]) -> list[str]:
+        """
+        Move to a data version, getting the weeks that changed
+
+        Args:
+            version (int): The stored data version
+            weeks (dict[str, int]): The stored version of every week
+
+        Returns:
+            list[str]: Weeks changed, added or removed since the last update
+        """
+        with self._lock:
+            changed = sorted(
+                week
+                for week in weeks.keys() | self._weeks.keys()
+                if weeks.get(week) != self._weeks.get(week)
+            )
+            self.version = version
+            self._weeks = dict(weeks)
+
+        return changed
+
+    def record(self, version: int, week: str) -> None:
+        """
+        Record a week written by this process, whose caches are up to date
+
+        The version is only adopted if no other write happened since the
+        last update, otherwise the next update finds every changed week.
+
+        Args:
+            version (int): The data version of the write
+            week (str): The week identifier
+        """
+        with self._lock:
+            if self.version is not None and self.version == version - 1:
+                self.version = version
+                self._weeks[week] = version
+
+    def clear(self) -> None:
+        """Forget the data version"""
+        with self._lock:
+            self.version = None
+            self._weeks = {}
+
+
+DATA_VERSION = DataVersionTracker()
@@ -0,0 +1,180 @@
+"""
+Derived, confidence-adjusted metrics of builds.
+
+Raw win rates of rarely picked builds are noisy, so sorting by
+`moveset_item_win_rate` tends to surface them. The metrics below use
+`moveset_item_true_pick_rate` as the evidence weight of a build's win rate and
+are computed for a whole batch of builds at once, grouped by week:
+
+- `weighted_win_rate`: win rate scaled by the true pick rate, i.e. the share of
+  all matches of the week won with the build.
+- `adjusted_win_rate`: win rate shrunk towards the pick-weighted mean win rate
+  of the week. A build with a true pick rate equal to the median of its week
+  lands halfway between its own win rate and the week mean.
+- `win_rate_z_score`: number of standard deviations the win rate sits above
+  the mean win rate of the week.
+
+Builds whose win rate confidence interval was not stored by the interval job
+(see `win_rate_interval_job`) get the analytic Wilson interval.
+
+The metrics and intervals of a week are stored with its builds when it is
+ingested (see `BuildRepository.sync_week`), so loading a week costs no
+computation. `with_derived_metrics` only computes them when some build of the
+batch misses them, e.g. builds created one by one or ingested before the
+columns existed.
+"""
+
+import numpy as np
+
+from entity.build_model import BuildModel
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.win_rate_intervals import (
+    compute_win_rate_intervals,
+)
+
+DERIVED_METRICS = ("weighted_win_rate", "adjusted_win_rate", "win_rate_z_score")
+
+# Columns stored at ingest: the derived metrics and the win rate interval
+DERIVED_COLUMNS = DERIVED_METRICS + ("win_rate_ci_lower", "win_rate_ci_upper")
+
+
+def _group_sum(groups: np.ndarray, values: np.ndarray, n_groups: int):
+    return np.bincount(groups, weights=values, minlength=n_groups)
+
+
+def compute_derived_metrics(
+    weeks: np.ndarray, win_rates: np.ndarray, pick_rates: np.ndarray
+) -> dict[str, np.ndarray]:
+    """
+    Compute the derived metrics of a batch of builds
+
+    Args:
+        weeks (np.ndarray): Week of every build
+        win_rates (np.ndarray): moveset_item_win_rate of every build
+        pick_rates (np.ndarray): moveset_item_true_pick_rate of every build
+
+    Returns:
+        dict[str, np.ndarray]: One array per name in `DERIVED_METRICS`, in
+            the order of the input builds
+    """
+    LOG.info("Computing derived metrics")
+    LOG.debug("builds: %s", len(weeks))
+
+    win_rates = np.asarray(win_rates, dtype=np.float64)
+    pick_rates = np.asarray(pick_rates, dtype=np.float64)
+
+    if len(weeks) == 0:
+        return {name: np.empty(0, dtype=np.float64) for name in DERIVED_METRICS}
+
+    _, groups = np.unique(weeks, return_inverse=True)
+    n_groups = groups.max() + 1
+    counts = np.bincount(groups, minlength=n_groups)
+
+    # Per-week mean and population standard deviation of the win rate
+    mean = _group_sum(groups, win_rates, n_groups) / counts
+    deviation = win_rates - mean[groups]
+    std = np.sqrt(_group_sum(groups, deviation**2, n_groups) / counts)
+    std_per_build = std[groups]
+    z_score = np.divide(
+        deviation,
+        std_per_build,
+        out=np.zeros_like(deviation),
+        where=std_per_build > 0,
+    )
+
+    # Pick-weighted mean win rate of the week is the shrinkage target, and
+    # the week median true pick rate is the weight of that prior
+    weight_total = _group_sum(groups, pick_rates, n_groups)
+    weighted_total = _group_sum(groups, win_rates * pick_rates, n_groups)
+    prior_mean = np.divide(
+        weighted_total, weight_total, out=mean.copy(), where=weight_total > 0
+    )
+    prior_weight = np.array(
+        [np.median(pick_rates[groups == group]) for group in range(n_groups)]
+    )
+    evidence = np.clip(pick_rates, 0.0, None)
+    denominator = evidence + prior_weight[groups]
+    adjusted = np.divide(
+        evidence * win_rates + prior_weight[groups] * prior_mean[groups],
+        denominator,
+        out=prior_mean[groups].copy(),
+        where=denominator > 0,
+    )
+
+    return {
+        "weighted_win_rate": win_rates * pick_rates / 100.0,
+        "adjusted_win_rate": adjusted,
+        "win_rate_z_score": z_score,
+    }
+
+
+def derived_columns(builds: list[BuildModel]) -> dict[str, np.ndarray]:
+    """
+    Compute the `DERIVED_COLUMNS` of a batch of builds
+
+    Args:
+        builds (list[BuildModel]): Builds of one or more weeks
+
+    Returns:
+        dict[str, np.ndarray]: One array per name in `DERIVED_COLUMNS`, in
+            the order of the builds. Stored intervals are kept, missing ones
+            are Wilson intervals.
+    """
+    win_rates = np.fromiter(
+        (build.moveset_item_win_rate for build in builds),
+        dtype=np.float64,
+        count=len(builds),
+    )
+    pick_rates = np.fromiter(
+        (build.moveset_item_true_pick_rate for build in builds),
+        dtype=np.float64,
+        count=len(builds),
+    )
+    columns = compute_derived_metrics(
+        np.array([build.week for build in builds]), win_rates, pick_rates
+    )
+
+    stored_lower = np.array(
+        [build.win_rate_ci_lower for build in builds], dtype=np.float64
+    )
+    stored_upper = np.array(
+        [build.win_rate_ci_upper for build in builds], dtype=np.float64
+    )
+    stored = ~(np.isnan(stored_lower) | np.isnan(stored_upper))
+    lower, upper = compute_win_rate_intervals(win_rates, pick_rates)
+    columns["win_rate_ci_lower"] = np.where(stored, stored_lower, lower)
+    columns["win_rate_ci_upper"] = np.where(stored, stored_upper, upper)
+
+    return columns
+
+
+def with_derived_metrics(builds: list[BuildModel]) -> list[BuildModel]:
+    """
+    Copy builds with their derived metrics filled in
+
+    Args:
+        builds (list[BuildModel]): Builds of one or more weeks
+
+    Returns:
+        list[BuildModel]: Copies of the builds, in the same order, or the
+            builds themselves if they all have their `DERIVED_COLUMNS`
+    """
+    # Stored at ingest, unless a build was written without them
+    if all(
+        getattr(build, name) is not None
+        for build in builds
+        for name in DERIVED_COLUMNS
+    ):
+        return list(builds)
+
+    columns = {
+        name: values.tolist()
+        for name, values in derived_columns(builds).items()
+    }
+
+    return [
+        build.model_copy(
+            update={name: values[index] for name, values in columns.items()}
+        )
+        for index, build in enumerate(builds)
+    ]
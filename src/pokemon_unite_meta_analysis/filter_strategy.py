@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from entity.build_response import BuildResponse
 from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.lookup_key import normalize_key, parse_keys
 
 
 class FilterStrategy:
@@ -18,9 +19,9 @@ class PokemonFilterStrategy(FilterStrategy):
         if not value:
             return builds
 
-        pokemon_list = [p.strip().lower() for p in value.split(",")]
+        pokemon_keys = parse_keys(value)
 
-        return [b for b in builds if b.pokemon.lower() in pokemon_list]
+        return [b for b in builds if normalize_key(b.pokemon) in pokemon_keys]
 
 
 class RoleFilterStrategy(FilterStrategy):
@@ -32,9 +33,9 @@ class RoleFilterStrategy(FilterStrategy):
         if not value:
             return builds
 
-        role_list = [r.strip().lower() for r in value.split(",")]
+        role_keys = parse_keys(value)
 
-        return [b for b in builds if b.role.lower() in role_list]
+        return [b for b in builds if normalize_key(b.role) in role_keys]
 
 
 class ItemFilterStrategy(FilterStrategy):
@@ -46,9 +47,9 @@ class ItemFilterStrategy(FilterStrategy):
         if not value:
             return builds
 
-        item_list = [i.strip().lower() for i in value.split(",")]
+        item_keys = parse_keys(value)
 
-        return [b for b in builds if b.item.lower() in item_list]
+        return [b for b in builds if normalize_key(b.item) in item_keys]
 
 
 class IgnorePokemonFilterStrategy(FilterStrategy):
@@ -60,10 +61,12 @@ class IgnorePokemonFilterStrategy(FilterStrategy):
         if not value:
             return builds
 
-        ignore_pokemon_list = [p.strip().lower() for p in value.split(",")]
+        ignore_pokemon_keys = parse_keys(value)
 
         return [
-            b for b in builds if b.pokemon.lower() not in ignore_pokemon_list
+            b
+            for b in builds
+            if normalize_key(b.pokemon) not in ignore_pokemon_keys
         ]
 
 
@@ -76,9 +79,11 @@ class IgnoreRoleFilterStrategy(FilterStrategy):
         if not value:
             return builds
 
-        ignore_role_list = [r.strip().lower() for r in value.split(",")]
+        ignore_role_keys = parse_keys(value)
 
-        return [b for b in builds if b.role.lower() not in ignore_role_list]
+        return [
+            b for b in builds if normalize_key(b.role) not in ignore_role_keys
+        ]
 
 
 class IgnoreItemFilterStrategy(FilterStrategy):
@@ -90,9 +95,11 @@ class IgnoreItemFilterStrategy(FilterStrategy):
         if not value:
             return builds
 
-        ignore_item_list = [i.strip().lower() for i in value.split(",")]
+        ignore_item_keys = parse_keys(value)
 
-        return [b for b in builds if b.item.lower() not in ignore_item_list]
+        return [
+            b for b in builds if normalize_key(b.item) not in ignore_item_keys
+        ]
 
 
 FILTER_STRATEGIES = {
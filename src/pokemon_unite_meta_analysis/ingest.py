@@ -0,0 +1,453 @@
+"""
+Parallel importer of weekly build snapshot files.
+
+Every `.csv` or `.json` file of a directory holds the builds of one week,
+named after the week (`Y2025m09d28.csv`) or with a `week` column. Columns use
+either the stored names (`pkm_win_rate`, `move1`, ...) or the `BuildModel`
+field names (`pokemon_win_rate`, `move_1`, ...). Missing true pick rates are
+derived from the pick rates, as `pkm_pick_rate × moveset_pick_rate / 100` and
+`moveset_true_pick_rate × moveset_item_pick_rate / 100`.
+
+Files are parsed, validated and normalized in a process pool, one task per
+file, with operations vectorized over the columns:
+
+- names are stripped and their inner whitespace collapsed, and roles and
+  items are mapped to their canonical spelling (`supporter` → `Support`);
+- rows failing a data quality check (a missing name, an unknown role or item,
+  a rate that is not a number between 0 and 100, ...) are quarantined, see
+  `pokemon_unite_meta_analysis.data_quality`;
+- duplicated builds (same Pokémon, moves and item) keep their last row.
+
+The parent process then loads every week in its own transaction, so a
+failing file leaves every other week untouched. Workers also hash the
+normalized builds: a week whose content hash matches the stored one is
+skipped, and a changed week only gets its row-level changes (see
+`BuildRepository.sync_week`), which bump the data version.
+
+Quarantined rows are stored with their failed checks in the `quarantine`
+table, replacing the ones of the previous import of the file, and the quality
+report of every file (row counts, failed checks, week warnings and rate
+ranges) can be written as JSON with `--report`.
+
+Usage:
+    pkmn-unite-ingest DIRECTORY [--workers N] [--report PATH]
+    python -m pokemon_unite_meta_analysis.ingest DIRECTORY [--workers N]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.data_quality import (
+    ITEMS,
+    ROLES,
+    ROW_CHECKS,
+    check_rows,
+    check_week,
+    failure_reasons,
+    item_vocabulary,
+    rate_summary,
+)
+from pokemon_unite_meta_analysis.data_version import content_hash
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+from repository.build_repository import BUILD_COLUMNS, BuildRepository
+
+SNAPSHOT_SUFFIXES = (".csv", ".json")
+
+WEEK_PATTERN = re.compile(r"Y\d{4}m\d{2}d\d{2}")
+
+# BuildModel field names accepted for the stored column names
+COLUMN_ALIASES = {
+    "pokemon_win_rate": "pkm_win_rate",
+    "pokemon_pick_rate": "pkm_pick_rate",
+    "move_1": "move1",
+    "move_2": "move2",
+}
+
+NAME_COLUMNS = ("pokemon", "role", "move1", "move2", "item")
+
+# Stored columns of a file's rows, without the week
+ROW_COLUMNS = BUILD_COLUMNS[1:]
+
+RATE_COLUMNS = tuple(
+    column for column in ROW_COLUMNS if column not in NAME_COLUMNS
+)
+
+IDENTITY_COLUMNS = ("pokemon", "move1", "move2", "item")
+
+# Parsed file: path, week, rows, quarantined rows (position, failed checks,
+# raw values as JSON), quality report, content hash and parse seconds
+ParsedFile = tuple[str, str, list[tuple], list[tuple], dict, str, float]
+
+
+def snapshot_files(directory: Path) -> list[Path]:
+    """
+    List the snapshot files of a directory
+
+    Args:
+        directory (Path): Directory holding the snapshot files
+
+    Raises:
+        ValueError: If the path is not a directory
+
+    Returns:
+        list[Path]: The `.csv` and `.json` files, sorted by name
+    """
+    if not directory.is_dir():
+        raise ValueError(f"Not a directory: {directory}")
+
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and path.suffix.lower() in SNAPSHOT_SUFFIXES
+    )
+
+
+def _read(path: Path) -> pd.DataFrame:
+    if path.suffix.lower() == ".json":
+        with path.open(encoding="utf-8") as file:
+            records = json.load(file)
+        if not isinstance(records, list) or not all(
+            isinstance(record, dict) for record in records
+        ):
+            raise ValueError("JSON snapshot must be a list of objects")
+        return pd.DataFrame.from_records(records)
+
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def _week(path: Path, frame: pd.DataFrame) -> str:
+    if "week" not in frame.columns:
+        week = path.stem
+    else:
+        weeks = frame["week"].astype(str).str.strip().unique()
+        if len(weeks) != 1:
+            raise ValueError(f"{path.name} holds several weeks")
+        week = weeks[0]
+
+    if not WEEK_PATTERN.fullmatch(week):
+        raise ValueError(f"Invalid week: {week}")
+
+    return week
+
+
+def _derive_true_pick_rates(columns: dict[str, np.ndarray]) -> None:
+    if "moveset_true_pick_rate" not in columns:
+        columns["moveset_true_pick_rate"] = (
+            columns["pkm_pick_rate"] * columns["moveset_pick_rate"] / 100
+        )
+    if "moveset_item_true_pick_rate" not in columns:
+        columns["moveset_item_true_pick_rate"] = (
+            columns["moveset_true_pick_rate"]
+            * columns["moveset_item_pick_rate"]
+            / 100
+        )
+
+
+def _normalize_names(values: pd.Series) -> np.ndarray:
+    # Names repeat across builds, so every distinct name is normalized once
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    names = np.array(
+        [
+            " ".join(str(name).split()) if pd.notna(name) else ""
+            for name in uniques
+        ]
+        + [""],
+        dtype=object,
+    )
+
+    # Missing values have code -1, the trailing empty name
+    return names[codes]
+
+
+def _canonical_names(names: np.ndarray, vocabulary: dict) -> np.ndarray:
+    codes, uniques = pd.factorize(names)
+    canonical = np.array(
+        [vocabulary.get(normalize_key(name), "") for name in uniques],
+        dtype=object,
+    )
+
+    return canonical[codes]
+
+
+def _quarantined(
+    frame: pd.DataFrame, invalid: np.ndarray, reasons: np.ndarray
+) -> list[tuple]:
+    # Only the few invalid rows are serialized, with their raw values
+    positions = np.flatnonzero(invalid)
+    records = frame.iloc[positions].to_dict(orient="records")
+
+    return [
+        (
+            int(position) + 1,
+            reasons[position],
+            json.dumps(record, default=str, ensure_ascii=False),
+        )
+        for position, record in zip(positions, records)
+    ]
+
+
+def normalize_builds(
+    frame: pd.DataFrame, items: Optional[dict[str, str]] = None
+) -> tuple[pd.DataFrame, list[tuple], dict]:
+    """
+    Validate and normalize the builds of a snapshot file
+
+    Args:
+        frame (pd.DataFrame): Raw rows of the file
+        items (dict[str, str], optional): Canonical item names by lookup key,
+            see `item_vocabulary`. Defaults to the known items.
+
+    Raises:
+        ValueError: If a required column is missing
+
+    Returns:
+        tuple[pd.DataFrame, list[tuple], dict]: Valid rows with the
+            `ROW_COLUMNS` columns, the quarantined rows as (position in the
+            file from 1, comma-separated failed checks, raw values as JSON),
+            and the quality report of the rows
+    """
+    raw = frame
+    frame = frame.rename(
+        columns=lambda column: COLUMN_ALIASES.get(
+            str(column).strip(), str(column).strip()
+        )
+    )
+
+    # Vocabulary of the name columns mapped to a canonical spelling
+    vocabularies = {"role": ROLES, "item": ITEMS if items is None else items}
+    raw_names = {}
+    columns = {}
+    for column in NAME_COLUMNS:
+        if column not in frame.columns:
+            raise ValueError(f"Missing column: {column}")
+        raw_names[column] = _normalize_names(frame[column])
+        columns[column] = (
+            _canonical_names(raw_names[column], vocabularies[column])
+            if column in vocabularies
+            else raw_names[column]
+        )
+
+    for column in RATE_COLUMNS:
+        if column in frame.columns:
+            columns[column] = pd.to_numeric(
+                frame[column], errors="coerce"
+            ).to_numpy(dtype=np.float64)
+        elif not column.endswith("_true_pick_rate"):
+            raise ValueError(f"Missing column: {column}")
+    _derive_true_pick_rates(columns)
+
+    rates = {column: columns[column] for column in RATE_COLUMNS}
+    failures = check_rows(columns, raw_names, rates, IDENTITY_COLUMNS)
+    reasons = failure_reasons(failures)
+    invalid = reasons != ""
+    valid = ~invalid
+
+    builds = pd.DataFrame(
+        {column: columns[column][valid] for column in ROW_COLUMNS}
+    )
+    report = {
+        "rows": len(frame),
+        "valid": len(builds),
+        "quarantined": int(invalid.sum()),
+        "checks": {check: int(failures[check].sum()) for check in ROW_CHECKS},
+        "warnings": check_week(
+            builds["pokemon"].to_numpy(),
+            builds["pkm_pick_rate"].to_numpy(),
+            builds["moveset_item_true_pick_rate"].to_numpy(),
+        ),
+        "rates": rate_summary(rates, valid),
+    }
+
+    return builds, _quarantined(raw, invalid, reasons), report
+
+
+def _parse(path: str, items: Optional[dict[str, str]] = None) -> ParsedFile:
+    # Runs in a worker process, so it only receives and returns plain data
+    start = time.perf_counter()
+    file = Path(path)
+
+    frame = _read(file)
+    week = _week(file, frame)
+    builds, quarantined, report = normalize_builds(frame, items)
+    rows = list(builds.itertuples(index=False, name=None))
+    digest = content_hash(rows)
+    report = {"file": file.name, "week": week, **report}
+
+    return (
+        path,
+        week,
+        rows,
+        quarantined,
+        report,
+        digest,
+        time.perf_counter() - start,
+    )
+
+
+def _parse_safely(
+    path: str, items: Optional[dict[str, str]] = None
+) -> tuple[Optional[ParsedFile], Optional[str]]:
+    # A bad file must not stop the other files of the pool; values of the
+    # wrong type (e.g. nested JSON objects) fail in pandas with TypeError
+    try:
+        return _parse(path, items), None
+    except (OSError, ValueError, TypeError, KeyError) as error:
+        return None, f"{Path(path).name}: {error}"
+
+
+def run(
+    directory: Path,
+    workers: Optional[int] = None,
+    report: Optional[Path] = None,
+) -> tuple[int, int]:
+    """
+    Import every snapshot file of a directory, printing its throughput
+
+    Weeks whose content hash did not change are skipped, the others only
+    get their row-level changes. Rows failing a data quality check are
+    quarantined, and a file without any valid row leaves its week untouched.
+
+    Args:
+        directory (Path): Directory holding the snapshot files
+        workers (int, optional): Worker processes. Defaults to one per CPU.
+        report (Path, optional): File the JSON quality report is written to.
+            Defaults to None, no report.
+
+    Raises:
+        ValueError: If the path is not a directory
+
+    Returns:
+        tuple[int, int]: Number of valid rows read and of files that failed
+    """
+    LOG.info("Ingesting snapshot files")
+    LOG.debug("directory: %s", directory)
+    LOG.debug("workers: %s", workers)
+
+    paths = [str(path) for path in snapshot_files(directory)]
+    ingested = 0
+    quarantined = 0
+    skipped = 0
+    failed = 0
+    files = []
+    start = time.perf_counter()
+
+    with (
+        BuildRepository() as repo,
+        ProcessPoolExecutor(max_workers=workers) as executor,
+    ):
+        # Items added by the game are known once stored
+        items = item_vocabulary(repo.get_stored_items())
+        for source, (parsed, error) in zip(
+            paths, executor.map(_parse_safely, paths, repeat(items))
+        ):
+            if error is not None:
+                LOG.error("Failed to parse %s", error)
+                print(f"FAILED {error}", file=sys.stderr)
+                failed += 1
+                files.append({"file": Path(source).name, "error": error})
+                continue
+
+            path, week, rows, bad_rows, quality, digest, parse_seconds = parsed
+            load_start = time.perf_counter()
+            # A file without any valid row is a bad export, which must not
+            # delete the stored builds of its week
+            changes = repo.sync_week(week, rows, digest) if rows else None
+            repo.quarantine_builds(week, Path(path).name, bad_rows)
+            seconds = parse_seconds + time.perf_counter() - load_start
+            ingested += len(rows)
+            quarantined += len(bad_rows)
+            files.append(quality)
+
+            if not rows:
+                skipped += 1
+                outcome = "no valid rows, skipped"
+                quality["warnings"].append({"check": "no_valid_rows"})
+            elif changes is None:
+                skipped += 1
+                outcome = "unchanged, skipped"
+            else:
+                outcome = "+{} ~{} -{}".format(*changes)
+            for warning in quality["warnings"]:
+                LOG.warning("%s: %s", Path(path).name, warning)
+            print(
+                f"{Path(path).name}: week {week}, {len(rows)} rows, "
+                f"{len(bad_rows)} quarantined, "
+                f"{len(quality['warnings'])} warnings, {outcome}, "
+                f"{seconds:.3f} s, "
+                f"{len(rows) / max(seconds, 1e-9):,.0f} rows/s"
+            )
+
+        version = repo.get_data_version()
+        # Planner statistics follow the new data distribution
+        repo.optimize()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Ingested {ingested} rows from {len(paths) - failed} files "
+        f"({skipped} unchanged, {quarantined} rows quarantined) in "
+        f"{elapsed:.3f} s ({ingested / max(elapsed, 1e-9):,.0f} rows/s), "
+        f"data version {version}"
+    )
+
+    if report is not None:
+        summary = {
+            "rows": ingested + quarantined,
+            "valid": ingested,
+            "quarantined": quarantined,
+            "failed": failed,
+            "data_version": version,
+            "files": files,
+        }
+        report.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"Quality report written to {report}")
+
+    return ingested, failed
+
+
+def main():
+    """Command line entry point of the importer."""
+    parser = argparse.ArgumentParser(
+        description="Import a directory of weekly build snapshot files"
+    )
+    parser.add_argument(
+        "directory",
+        type=Path,
+        help="Directory holding one .csv or .json file per week",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write the JSON quality report of every file to this path",
+    )
+    args = parser.parse_args()
+
+    try:
+        _, failed = run(
+            args.directory, workers=args.workers, report=args.report
+        )
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        sys.exit(1)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Bitmap inverted index over a categorical build column.
+
+Each distinct lookup key of the column (see `lookup_key`) maps to a packed
+bitset of the rows holding it, so include and exclude filters are evaluated
+with bitwise union, intersection and difference instead of scanning every
+build.
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from pokemon_unite_meta_analysis.custom_log import LOG
+
+
+class InvertedIndex:
+    """
+    Inverted index from lookup key to row bitmap
+
+    Args:
+        keys (np.ndarray): Lookup keys of the column, one per row
+    """
+
+    def __init__(self, keys: np.ndarray):
+        self.size = len(keys)
+        self._bitmaps: dict[str, np.ndarray] = {}
+
+        distinct, inverse = np.unique(keys, return_inverse=True)
+
+        for code, value in enumerate(distinct.tolist()):
+            self._bitmaps[value] = np.packbits(inverse == code)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._bitmaps
+
+    def empty(self) -> np.ndarray:
+        """
+        Bitmap with no rows set
+
+        Returns:
+            np.ndarray: Packed bitmap
+        """
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def full(self) -> np.ndarray:
+        """
+        Bitmap with every row set
+
+        Returns:
+            np.ndarray: Packed bitmap
+        """
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def union(self, values: Iterable[str]) -> np.ndarray:
+        """
+        Bitmap of the rows holding any of the keys
+
+        Keys missing from the index match no rows.
+
+        Args:
+            values (Iterable[str]): Lookup keys
+
+        Returns:
+            np.ndarray: Packed bitmap
+        """
+        LOG.debug("values: %s", values)
+
+        bitmap = self.empty()
+        for value in values:
+            if value in self._bitmaps:
+                bitmap |= self._bitmaps[value]
+
+        return bitmap
+
+    def to_mask(self, bitmap: np.ndarray) -> np.ndarray:
+        """
+        Unpack a bitmap into a boolean row mask
+
+        Args:
+            bitmap (np.ndarray): Packed bitmap
+
+        Returns:
+            np.ndarray: Boolean mask, one entry per row
+        """
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
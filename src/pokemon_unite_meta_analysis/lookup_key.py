@@ -0,0 +1,42 @@
+"""
+Case-folded, whitespace-normalized lookup keys.
+
+Pokémon, role and item names are compared through their keys, so `pikachu`,
+`Pikachu` and ` PIKACHU ` all match the same builds. Keys are interned and
+memoized, so normalizing the same name again returns the same string object
+without allocating a new one.
+"""
+
+import sys
+from functools import lru_cache
+
+# Distinct names are few (Pokémon, roles and items), so this comfortably holds
+# every key of the dataset plus recent user input
+KEY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def normalize_key(value: str) -> str:
+    """
+    Get the lookup key of a name
+
+    Args:
+        value (str): Name as stored or as typed by the user
+
+    Returns:
+        str: Interned, case-folded key with single spaces between words
+    """
+    return sys.intern(" ".join(value.split()).casefold())
+
+
+def parse_keys(value: str) -> frozenset[str]:
+    """
+    Get the lookup keys of a comma-separated list of names
+
+    Args:
+        value (str): Comma-separated names
+
+    Returns:
+        frozenset[str]: Lookup keys of the names
+    """
+    return frozenset(normalize_key(name) for name in value.split(","))
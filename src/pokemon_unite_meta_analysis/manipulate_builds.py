@@ -11,7 +11,9 @@ import json
 from entity.build_model import BuildModel
 from entity.sort_by import SortBy
 from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.derived_metrics import with_derived_metrics
 from pokemon_unite_meta_analysis.relevance_strategy import RELEVANCE_STRATEGIES
+from pokemon_unite_meta_analysis.sort_strategy import SORT_STRATEGIES
 from repository.build_repository import BuildRepository
 
 # import rich
@@ -62,36 +64,29 @@ class ManipulateBuilds:
         )
         return relevant_builds
 
-    def _head(self, builds: list[BuildModel], n: int = 0) -> list[BuildModel]:
-        LOG.info("Getting head of builds")
-        LOG.debug("builds: %s", builds)
-        LOG.debug("n: %s", n)
-
-        if n == 0:
-            return builds
-
-        return builds[:n]
-
     def _sort(
-        self, builds: list[BuildModel], sort_by: SortBy
+        self, builds: list[BuildModel], sort_by: SortBy, n: int = 0
     ) -> list[BuildModel]:
         LOG.info("Sorting builds")
         LOG.debug("builds: %s", builds)
         LOG.debug("sort_by: %s", sort_by)
+        LOG.debug("n: %s", n)
 
-        data = sorted(
-            builds,
-            key=lambda build: getattr(build, sort_by.value),
-            reverse=True,
-        )
+        if n < 0:
+            raise ValueError(f"Invalid top_n: {n}")
 
-        return data
+        # Select only the top n builds instead of sorting the whole list
+        return SORT_STRATEGIES[sort_by].apply(
+            builds, reverse=True, k=n if n > 0 else None
+        )
 
     def _get_builds(self, week: str = None) -> list[BuildModel]:
         LOG.info("Getting builds from repository")
         LOG.debug("week: %s", week)
 
-        return self.build_repository.get_all_builds(week=week)
+        return with_derived_metrics(
+            self.build_repository.get_all_builds(week=week)
+        )
 
     def _return_builds_as_json(self, builds: list[BuildModel]) -> list[dict]:
         LOG.info("Returning builds as json")
@@ -135,12 +130,15 @@ class ManipulateBuilds:
 
         Args:
             sort_by (SortBy): Sort by
-            top_n (int, optional): Top n. Defaults to 0.
+            top_n (int, optional): Top n, 0 for every build. Defaults to 0.
             relevance (str, optional): Relevance. Defaults to "any".
             relevance_threshold (float, optional): Relevance threshold. Defaults
                 to 0.0.
             print_result (bool, optional): Print result. Defaults to False.
 
+        Raises:
+            ValueError: If the relevance is invalid or top_n is negative
+
         Returns:
             list[dict]: List of builds
         """
@@ -159,8 +157,7 @@ class ManipulateBuilds:
             builds, relevance, relevance_threshold, get_builds=lambda: builds
         )
 
-        sorted_builds = self._sort(relevant_builds, sort_by)
-        sorted_builds = self._head(sorted_builds, top_n)
+        sorted_builds = self._sort(relevant_builds, sort_by, top_n)
 
         result = self._return_builds_as_json(sorted_builds)
 
@@ -0,0 +1,262 @@
+"""
+Week-over-week diff of builds.
+
+Builds of two weeks are matched on (pokemon, move1, move2, item) with a hash
+join: the earlier week is loaded into a dict keyed by build identity, then the
+later week probes it row by row. Matched rows are changed, or unchanged when
+their win rate, true pick rate and popularity are the same in both weeks, and
+unmatched rows of either side become new or vanished builds.
+
+Diffs between consecutive weeks are what analysts ask for most, so they are
+kept in `META_DIFF_CACHE` until one of their weeks is ingested again.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from entity.build_diff import BuildDiff
+from entity.build_model import BuildModel
+from entity.meta_diff_query_params import MetaDiffQueryParams
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.filter_strategy import FILTER_STRATEGIES
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+DIFF_STATUSES = ("changed", "unchanged", "new", "vanished")
+
+
+def build_identity(build: BuildModel) -> tuple[str, str, str, str]:
+    """
+    Get the identity of a build across weeks
+
+    Args:
+        build (BuildModel): The build
+
+    Returns:
+        tuple[str, str, str, str]: (pokemon, move_1, move_2, item)
+    """
+    return (build.pokemon, build.move_1, build.move_2, build.item)
+
+
+def _delta(to_value, from_value):
+    if to_value is None or from_value is None:
+        return None
+
+    return to_value - from_value
+
+
+def compute_meta_diff(
+    from_snapshot: WeekSnapshot, to_snapshot: WeekSnapshot
+) -> list[BuildDiff]:
+    """
+    Diff the builds of two weeks
+
+    Args:
+        from_snapshot (WeekSnapshot): Snapshot of the earlier week
+        to_snapshot (WeekSnapshot): Snapshot of the later week
+
+    Returns:
+        list[BuildDiff]: Matched and new builds in the order of the later
+            week, followed by vanished builds in the order of the earlier
+            week
+    """
+    LOG.info("Computing meta diff")
+    LOG.debug("from: %s", from_snapshot.week)
+    LOG.debug("to: %s", to_snapshot.week)
+
+    # Build side: the earlier week, keyed by build identity
+    from_builds = {build_identity(b): b for b in from_snapshot.builds}
+    from_ranks = from_snapshot.popularity_ranks
+    to_ranks = to_snapshot.popularity_ranks
+
+    diffs = []
+    matched = set()
+
+    # Probe side: the later week
+    for to_build in to_snapshot.builds:
+        identity = build_identity(to_build)
+        from_build = from_builds.get(identity)
+
+        if from_build is not None:
+            matched.add(identity)
+
+        diffs.append(
+            _diff(from_build, to_build, from_ranks, to_ranks, identity)
+        )
+
+    for identity, from_build in from_builds.items():
+        if identity not in matched:
+            diffs.append(
+                _diff(from_build, None, from_ranks, to_ranks, identity)
+            )
+
+    return diffs
+
+
+def _diff(
+    from_build: Optional[BuildModel],
+    to_build: Optional[BuildModel],
+    from_ranks: dict[int, int],
+    to_ranks: dict[int, int],
+    identity: tuple[str, str, str, str],
+) -> BuildDiff:
+    pokemon, move_1, move_2, item = identity
+    from_win_rate = from_build.moveset_item_win_rate if from_build else None
+    to_win_rate = to_build.moveset_item_win_rate if to_build else None
+    from_pick_rate = (
+        from_build.moveset_item_true_pick_rate if from_build else None
+    )
+    to_pick_rate = to_build.moveset_item_true_pick_rate if to_build else None
+    from_popularity = from_ranks.get(from_build.id) if from_build else None
+    to_popularity = to_ranks.get(to_build.id) if to_build else None
+    deltas = (
+        _delta(to_win_rate, from_win_rate),
+        _delta(to_pick_rate, from_pick_rate),
+        # Climbing from rank 10 to rank 3 is +7
+        _delta(from_popularity, to_popularity),
+    )
+
+    if from_build is None:
+        status = "new"
+    elif to_build is None:
+        status = "vanished"
+    elif all(delta == 0 for delta in deltas):
+        status = "unchanged"
+    else:
+        status = "changed"
+
+    return BuildDiff(
+        status=status,
+        pokemon=pokemon,
+        role=(to_build or from_build).role,
+        move_1=move_1,
+        move_2=move_2,
+        item=item,
+        from_id=from_build.id if from_build else None,
+        to_id=to_build.id if to_build else None,
+        moveset_item_win_rate_from=from_win_rate,
+        moveset_item_win_rate_to=to_win_rate,
+        moveset_item_win_rate_delta=deltas[0],
+        moveset_item_true_pick_rate_from=from_pick_rate,
+        moveset_item_true_pick_rate_to=to_pick_rate,
+        moveset_item_true_pick_rate_delta=deltas[1],
+        popularity_from=from_popularity,
+        popularity_to=to_popularity,
+        popularity_delta=deltas[2],
+    )
+
+
+def query_meta_diff(
+    diffs: list[BuildDiff], params: MetaDiffQueryParams
+) -> list[BuildDiff]:
+    """
+    Filter, sort and limit diff rows like /builds does with builds
+
+    Args:
+        diffs (list[BuildDiff]): Diff rows
+        params (MetaDiffQueryParams): Filter, sort and limit parameters
+
+    Raises:
+        ValueError: If a status or the sort field is invalid
+
+    Returns:
+        list[BuildDiff]: Selected diff rows
+    """
+    LOG.info("Querying meta diff")
+    LOG.debug("params: %s", params)
+
+    result = diffs
+
+    if params.status:
+        statuses = {s.strip().lower() for s in params.status.split(",")}
+        invalid = statuses.difference(DIFF_STATUSES)
+        if invalid:
+            raise ValueError(f"Invalid status: {', '.join(sorted(invalid))}")
+        result = [diff for diff in result if diff.status in statuses]
+
+    for column in ("pokemon", "role", "item"):
+        for name in (column, f"ignore_{column}"):
+            if getattr(params, name):
+                result = FILTER_STRATEGIES[name].apply(
+                    result, getattr(params, name)
+                )
+
+    if params.sort_by not in BuildDiff.model_fields:
+        raise ValueError(f"Invalid sort_by field: {params.sort_by}")
+
+    # Rows missing the sort value (e.g. deltas of new builds) always go last
+    reverse = params.sort_order == "desc"
+    present = [d for d in result if getattr(d, params.sort_by) is not None]
+    missing = [d for d in result if getattr(d, params.sort_by) is None]
+    result = (
+        sorted(
+            present, key=lambda d: getattr(d, params.sort_by), reverse=reverse
+        )
+        + missing
+    )
+
+    if params.top_n is not None and params.top_n > 0:
+        result = result[: params.top_n]
+
+    return result
+
+
+class MetaDiffCache:
+    """
+    Cache of diffs between consecutive weeks, keyed by (from, to)
+    """
+
+    def __init__(self):
+        self._diffs: dict[tuple[str, str], list[BuildDiff]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        from_week: str,
+        to_week: str,
+        compute: Callable[[], list[BuildDiff]],
+    ) -> list[BuildDiff]:
+        """
+        Get the diff of two weeks, computing it on first use
+
+        Args:
+            from_week (str): The earlier week
+            to_week (str): The later week
+            compute (Callable[[], list[BuildDiff]]): Computes the diff
+
+        Returns:
+            list[BuildDiff]: The diff rows
+        """
+        key = (from_week, to_week)
+
+        with self._lock:
+            diffs = self._diffs.get(key)
+
+        if diffs is None:
+            LOG.info("Meta diff cache miss")
+            LOG.debug("key: %s", key)
+
+            diffs = compute()
+
+            with self._lock:
+                diffs = self._diffs.setdefault(key, diffs)
+
+        return diffs
+
+    def invalidate(self, week: Optional[str] = None) -> None:
+        """
+        Drop the diffs involving a week after it was (re)ingested
+
+        Args:
+            week (str, optional): The week identifier
+        """
+        with self._lock:
+            for key in [key for key in self._diffs if week in key]:
+                del self._diffs[key]
+
+    def clear(self) -> None:
+        """Drop every cached diff"""
+        with self._lock:
+            self._diffs.clear()
+
+
+META_DIFF_CACHE = MetaDiffCache()
@@ -0,0 +1,155 @@
+"""
+Per-week percentile ranks of the numeric build metrics.
+
+The percentile rank of a build for a metric is the share of the builds of its
+week whose value is lower or equal, in percent: `rank / n * 100`, where tied
+values share the highest rank, so the best build of a week is at 100.
+
+Ranks of every week are computed in one vectorized pass per metric: builds
+are sorted by (week, value), the last position of every run of equal values
+gives the rank and the first position of every week its offset. A snapshot
+stores the ranks of all `PERCENTILE_COLUMNS` as a single float32 matrix (see
+`WeekSnapshot.percentiles`).
+
+The ranks of a week are computed when it is ingested and stored with every
+build as a float32 blob (see `encode_percentile_ranks`), so loading a week only
+joins the blobs. Weeks with a build missing its blob are ranked on load.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from entity.build_model import BuildModel
+from entity.sort_by import SortBy
+
+# Numeric sort columns, in the column order of the percentile matrix
+PERCENTILE_COLUMNS = tuple(
+    sort_by.value
+    for sort_by in SortBy
+    if sort_by not in (SortBy.POKEMON, SortBy.ROLE, SortBy.ITEM)
+)
+
+# Prefix of the /builds query parameters filtering on percentile ranks
+MIN_PERCENTILE_PREFIX = "min_percentile_"
+
+
+def percentile_ranks(
+    values: np.ndarray, groups: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Percentile rank of every value within its group
+
+    Args:
+        values (np.ndarray): Metric values. NaN values get a NaN rank and do
+            not count towards their group size.
+        groups (np.ndarray, optional): Group (week) of every value. Defaults
+            to a single group.
+
+    Returns:
+        np.ndarray: Percentile ranks in ]0, 100], as float32
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.empty(0, dtype=np.float32)
+
+    if groups is None:
+        codes = np.zeros(n, dtype=np.int64)
+    else:
+        _, codes = np.unique(groups, return_inverse=True)
+
+    # NaN values sort last within their group
+    order = np.lexsort((values, codes))
+    sorted_values, sorted_codes = values[order], codes[order]
+
+    run_ends = np.ones(n, dtype=bool)
+    run_ends[:-1] = (sorted_values[1:] != sorted_values[:-1]) | (
+        sorted_codes[1:] != sorted_codes[:-1]
+    )
+    ends = np.flatnonzero(run_ends)
+    last = ends[np.searchsorted(ends, np.arange(n))]
+
+    starts = np.searchsorted(sorted_codes, sorted_codes, side="left")
+    missing = np.isnan(values)
+    sizes = np.bincount(codes[~missing], minlength=codes.max() + 1)
+
+    ranks = np.empty(n, dtype=np.float32)
+    ranks[order] = (
+        (last - starts + 1) / np.maximum(sizes[sorted_codes], 1) * 100
+    )
+    ranks[missing] = np.nan
+
+    return ranks
+
+
+def percentile_matrix(
+    columns: dict[str, np.ndarray], groups: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Percentile ranks of several metrics
+
+    Args:
+        columns (dict[str, np.ndarray]): Values of every metric of
+            `PERCENTILE_COLUMNS`
+        groups (np.ndarray, optional): Group (week) of every build
+
+    Returns:
+        np.ndarray: (builds x metrics) float32 matrix, in the order of
+            `PERCENTILE_COLUMNS`
+    """
+    n = len(next(iter(columns.values()), ()))
+    matrix = np.empty((n, len(PERCENTILE_COLUMNS)), dtype=np.float32)
+
+    for position, name in enumerate(PERCENTILE_COLUMNS):
+        matrix[:, position] = percentile_ranks(columns[name], groups)
+
+    return matrix
+
+
+def encode_percentile_ranks(
+    builds: list[BuildModel], derived: dict[str, np.ndarray]
+) -> list[bytes]:
+    """
+    Percentile ranks of the builds of a week, as stored at ingest
+
+    Args:
+        builds (list[BuildModel]): Builds of one week
+        derived (dict[str, np.ndarray]): Their derived columns (see
+            `derived_metrics.derived_columns`)
+
+    Returns:
+        list[bytes]: Float32 ranks of every build, in the order of
+            `PERCENTILE_COLUMNS`
+    """
+    columns = {
+        name: derived[name]
+        if name in derived
+        else np.array([getattr(build, name) for build in builds], np.float64)
+        for name in PERCENTILE_COLUMNS
+    }
+
+    return [ranks.tobytes() for ranks in percentile_matrix(columns)]
+
+
+def decode_percentile_ranks(
+    blobs: Sequence[Optional[bytes]],
+) -> Optional[np.ndarray]:
+    """
+    Percentile matrix of stored ranks
+
+    Args:
+        blobs (Sequence[Optional[bytes]]): Stored ranks of every build
+
+    Returns:
+        np.ndarray, optional: (builds x metrics) float32 matrix, or None if a
+            build misses its ranks or they were stored for other
+            `PERCENTILE_COLUMNS`
+    """
+    size = len(PERCENTILE_COLUMNS) * np.dtype(np.float32).itemsize
+    if any(blob is None or len(blob) != size for blob in blobs):
+        return None
+
+    return np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(
+        len(blobs), len(PERCENTILE_COLUMNS)
+    )
@@ -0,0 +1,324 @@
+"""
+Compiles /builds query parameters into a single-pass execution plan.
+
+The plan selects the relevant rows of the week as its source (memoized on the
+week snapshot per strategy and threshold), combines the filter predicates with
+bitwise operations over the week's inverted indexes (most selective predicate
+first), keeps the rows above the minimum percentile ranks and orders the
+survivors by walking the week's precomputed sort permutation up to
+the top_n limit.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from entity.build_model import BuildModel
+from entity.builds_query_params import BuildsQueryParams
+from entity.relevance import Relevance
+from entity.sort_by import SortBy
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.inverted_index import InvertedIndex
+from pokemon_unite_meta_analysis.lookup_key import parse_keys
+from pokemon_unite_meta_analysis.percentile import (
+    MIN_PERCENTILE_PREFIX,
+    PERCENTILE_COLUMNS,
+)
+from pokemon_unite_meta_analysis.week_snapshot import SortKeys, WeekSnapshot
+
+# Rough number of distinct values per filterable column, used to estimate how
+# many builds survive an include or exclude predicate.
+ESTIMATED_CARDINALITY = {"pokemon": 80, "role": 5, "item": 10}
+
+
+def parse_sort_keys(sort_by: str, sort_order: Optional[str]) -> SortKeys:
+    """
+    Parse a composite sort_by parameter
+
+    `sort_by` is a comma-separated list of columns, each optionally followed
+    by `:asc` or `:desc`, e.g. `pokemon,moveset_item_win_rate:desc`. Columns
+    without a direction use `sort_order`.
+
+    Args:
+        sort_by (str): Sort columns, most significant first
+        sort_order (str, optional): Default direction, asc or desc
+
+    Raises:
+        ValueError: If a sort field or direction is invalid
+
+    Returns:
+        SortKeys: (column, descending) pairs, most significant first
+    """
+    sort_keys = []
+
+    for entry in (sort_by or "").split(","):
+        column, _, order = entry.strip().partition(":")
+
+        try:
+            column = SortBy(column.strip())
+        except ValueError:
+            raise ValueError(f"Invalid sort_by field: {column.strip()}")
+
+        order = order.strip().lower()
+        if not order:
+            sort_keys.append((column, sort_order == "desc"))
+        elif order in ("asc", "desc"):
+            sort_keys.append((column, order == "desc"))
+        else:
+            raise ValueError(f"Invalid sort order: {order}")
+
+    return tuple(sort_keys)
+
+
+class FilterPredicate:
+    """
+    Include or exclude predicate over a single build column
+
+    Args:
+        column (str): Build attribute to test (pokemon, role or item)
+        value (str): Comma-separated list of values
+        include (bool): Keep matching builds when True, drop them otherwise
+    """
+
+    def __init__(self, column: str, value: str, include: bool):
+        self.column = column
+        self.include = include
+        self.values = parse_keys(value)
+
+        selectivity = min(1.0, len(self.values) / ESTIMATED_CARDINALITY[column])
+        self.selectivity = selectivity if include else 1.0 - selectivity
+
+    @property
+    def name(self) -> str:
+        return self.column if self.include else f"ignore_{self.column}"
+
+    def apply(self, bitmap: np.ndarray, index: InvertedIndex) -> np.ndarray:
+        """
+        Narrow a row bitmap with this predicate
+
+        Args:
+            bitmap (np.ndarray): Packed bitmap of the candidate rows
+            index (InvertedIndex): Inverted index of the predicate column
+
+        Returns:
+            np.ndarray: Packed bitmap of the rows that still match
+        """
+        matched = index.union(self.values)
+
+        # Intersection for include predicates, difference for exclude ones
+        return bitmap & matched if self.include else bitmap & ~matched
+
+    def explain(self) -> dict:
+        return {
+            "name": self.name,
+            "type": "include" if self.include else "exclude",
+            "values": sorted(self.values),
+            "estimated_selectivity": round(self.selectivity, 4),
+        }
+
+
+class PercentilePredicate:
+    """
+    Minimum percentile rank of a numeric build column
+
+    Args:
+        column (str): Numeric build column, one of `PERCENTILE_COLUMNS`
+        minimum (float): Minimum percentile rank (0 to 100)
+
+    Raises:
+        ValueError: If the minimum is not between 0 and 100
+    """
+
+    def __init__(self, column: str, minimum: float):
+        if not 0.0 <= minimum <= 100.0:
+            raise ValueError(
+                f"{MIN_PERCENTILE_PREFIX}{column} must be between 0 and 100"
+            )
+
+        self.column = column
+        self.minimum = minimum
+
+    def apply(self, indices: np.ndarray, snapshot: WeekSnapshot) -> np.ndarray:
+        """
+        Keep the rows whose percentile rank reaches the minimum
+
+        Args:
+            indices (np.ndarray): Positions of the candidate rows
+            snapshot (WeekSnapshot): Snapshot of the queried week
+
+        Returns:
+            np.ndarray: Positions of the rows that still match
+        """
+        return indices[
+            snapshot.percentile(self.column)[indices] >= self.minimum
+        ]
+
+    def explain(self) -> dict:
+        return {
+            "name": f"{MIN_PERCENTILE_PREFIX}{self.column}",
+            "type": "min_percentile",
+            "values": [self.minimum],
+        }
+
+
+class QueryPlan:
+    """
+    Execution plan for a /builds query
+
+    Use `QueryPlan.compile` to build a plan from `BuildsQueryParams`, then
+    `execute` it against the snapshot of the requested week.
+
+    Args:
+        relevance (Relevance): Relevance strategy used as the plan source
+        relevance_threshold (float): Threshold for the relevance strategy
+        predicates (list[FilterPredicate]): Filters, most selective first
+        sort_keys (SortKeys): (column, descending) pairs, most significant
+            first. Ties left by every key are broken by build id.
+        limit (int, optional): Maximum number of builds to return
+        percentile_predicates (list[PercentilePredicate], optional): Minimum
+            percentile ranks, applied after the filters
+    """
+
+    def __init__(
+        self,
+        relevance: Relevance,
+        relevance_threshold: Optional[float],
+        predicates: list[FilterPredicate],
+        sort_keys: SortKeys,
+        limit: Optional[int] = None,
+        percentile_predicates: Optional[list[PercentilePredicate]] = None,
+    ):
+        self.relevance = relevance
+        self.relevance_threshold = relevance_threshold
+        self.predicates = sorted(predicates, key=lambda p: p.selectivity)
+        self.sort_keys = tuple(sort_keys)
+        self.limit = limit
+        self.percentile_predicates = percentile_predicates or []
+
+    @classmethod
+    def compile(cls, params: BuildsQueryParams) -> "QueryPlan":
+        """
+        Compile query parameters into a plan
+
+        Args:
+            params (BuildsQueryParams): Parsed /builds query parameters
+
+        Raises:
+            ValueError: If the relevance strategy, sort field or a minimum
+                percentile rank is invalid
+
+        Returns:
+            QueryPlan: The compiled plan
+        """
+        LOG.info("Compiling query plan")
+        LOG.debug("params: %s", params)
+
+        try:
+            relevance = Relevance(params.relevance)
+        except ValueError:
+            raise ValueError(f"Invalid relevance strategy: {params.relevance}")
+
+        predicates = []
+        for column in ("pokemon", "role", "item"):
+            include_value = getattr(params, column)
+            ignore_value = getattr(params, f"ignore_{column}")
+
+            # Include and ignore can be combined on the same column
+            if include_value:
+                predicates.append(FilterPredicate(column, include_value, True))
+            if ignore_value:
+                predicates.append(FilterPredicate(column, ignore_value, False))
+
+        percentile_predicates = [
+            PercentilePredicate(column, minimum)
+            for column in PERCENTILE_COLUMNS
+            if (minimum := getattr(params, f"{MIN_PERCENTILE_PREFIX}{column}"))
+            is not None
+        ]
+
+        sort_keys = parse_sort_keys(params.sort_by, params.sort_order)
+
+        limit = None
+        if params.top_n is not None and params.top_n > 0:
+            limit = params.top_n
+
+        return cls(
+            relevance,
+            params.relevance_threshold,
+            predicates,
+            sort_keys,
+            limit=limit,
+            percentile_predicates=percentile_predicates,
+        )
+
+    def execute(self, snapshot: WeekSnapshot) -> list[BuildModel]:
+        """
+        Run the plan
+
+        Args:
+            snapshot (WeekSnapshot): Snapshot of the queried week
+
+        Returns:
+            list[BuildModel]: Relevant, filtered and sorted builds
+        """
+        LOG.info("Executing query plan")
+        LOG.debug("plan: %s", self.explain())
+
+        indices = snapshot.relevant_indices(
+            self.relevance, self.relevance_threshold
+        )
+
+        if self.predicates:
+            keep = self._filter_mask(snapshot)
+            indices = indices[keep[indices]]
+
+        for predicate in self.percentile_predicates:
+            indices = predicate.apply(indices, snapshot)
+
+        indices = snapshot.sort_indices(indices, self.sort_keys, k=self.limit)
+
+        return snapshot.take(indices)
+
+    def _filter_mask(self, snapshot: WeekSnapshot) -> np.ndarray:
+        # Every predicate narrows the same bitmap, so their cost depends on
+        # the number of values named rather than on the number of builds
+        bitmap = None
+
+        for predicate in self.predicates:
+            index = snapshot.inverted_index(predicate.column)
+
+            if bitmap is None:
+                bitmap = index.full()
+
+            bitmap = predicate.apply(bitmap, index)
+
+        return index.to_mask(bitmap)
+
+    def explain(self) -> dict:
+        """
+        Describe the chosen plan
+
+        Returns:
+            dict: Relevance source, ordered filters, sort method and limit
+        """
+        return {
+            "relevance": {
+                "strategy": self.relevance.value,
+                "threshold": self.relevance_threshold,
+            },
+            "filters": [
+                predicate.explain()
+                for predicate in self.predicates + self.percentile_predicates
+            ],
+            "sort": {
+                "by": self.sort_keys[0][0].value,
+                "order": "desc" if self.sort_keys[0][1] else "asc",
+                "keys": [
+                    {"by": sort_by.value, "order": "desc" if reverse else "asc"}
+                    for sort_by, reverse in self.sort_keys
+                ],
+                "tie_breaker": "id",
+                "method": "precomputed_permutation",
+            },
+            "limit": self.limit,
+        }
@@ -1,14 +1,74 @@
 """
 Defines relevance strategies for filtering builds based on different criteria.
+
+Every strategy works on a `moveset_item_true_pick_rate` column: `select`
+returns the indices of the relevant builds of a week, and `apply` maps those
+indices back to build objects. Strategies that rank builds by popularity
+accept a precomputed popularity order, so a week is sorted only once.
+
+Every strategy selects a prefix of the week sorted by popularity, so `sweep`
+lists each threshold that changes the selection together with the size of
+that prefix, all at once with `np.searchsorted` over the sorted column. The
+coverage of each prefix is then read from the cumulative sum of the sorted
+pick rates (see `relevance_sweep`).
 """
 
-from typing import Callable, Protocol
+from typing import Callable, Optional, Protocol
+
+import numpy as np
 
 from entity.build_response import BuildResponse
 from entity.relevance import Relevance
 from pokemon_unite_meta_analysis.custom_log import LOG
 
 
+def pick_rate_column(builds: list[BuildResponse]) -> np.ndarray:
+    """
+    Extract the moveset_item_true_pick_rate column of a list of builds
+
+    Args:
+        builds (list[BuildResponse]): List of builds
+
+    Returns:
+        np.ndarray: Pick rates, in the same order as the builds
+    """
+    return np.fromiter(
+        (build.moveset_item_true_pick_rate for build in builds),
+        dtype=np.float64,
+        count=len(builds),
+    )
+
+
+def popularity_order(rates: np.ndarray) -> np.ndarray:
+    """
+    Order of a pick rate column from most to least popular
+
+    Ties keep their original relative order, like a stable
+    `sorted(..., reverse=True)`.
+
+    Args:
+        rates (np.ndarray): Pick rate column
+
+    Returns:
+        np.ndarray: Indices into `rates`
+    """
+    return np.argsort(-rates, kind="stable")
+
+
+def _take(builds: list[BuildResponse], indices: np.ndarray) -> list:
+    return [builds[index] for index in indices.tolist()]
+
+
+_NO_INDICES = np.empty(0, dtype=np.intp)
+
+
+def _counts_at_least(
+    sorted_rates: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    # Number of builds with a rate >= each value, rates sorted descending
+    return np.searchsorted(-sorted_rates, -values, side="right")
+
+
 class RelevanceStrategy(Protocol):
     """
     Relevance strategy interface
@@ -31,6 +91,17 @@ class RelevanceStrategy(Protocol):
     ) -> list[BuildResponse]:
         raise NotImplementedError()
 
+    def select(
+        self,
+        rates: np.ndarray,
+        threshold: float,
+        order: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        raise NotImplementedError()
+
+    def sweep(self, sorted_rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError()
+
 
 class AnyRelevanceStrategy:
     """Any relevance strategy
@@ -57,6 +128,39 @@ class AnyRelevanceStrategy:
 
         return builds
 
+    def select(
+        self,
+        rates: np.ndarray,
+        threshold: float,
+        order: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Select every build of the week
+
+        Args:
+            rates (np.ndarray): moveset_item_true_pick_rate of the week
+            threshold (float): Ignored in this strategy
+            order (np.ndarray, optional): Ignored in this strategy
+
+        Returns:
+            np.ndarray: Indices of all builds
+        """
+        return np.arange(len(rates))
+
+    def sweep(self, sorted_rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List the thresholds that change the selection
+
+        Args:
+            sorted_rates (np.ndarray): moveset_item_true_pick_rate of the
+                week, most popular first
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: A single threshold, since it is
+                ignored, and the number of builds it selects
+        """
+        return np.zeros(1), np.array([len(sorted_rates)])
+
 
 class PercentageRelevanceStrategy:
     """
@@ -85,23 +189,54 @@ class PercentageRelevanceStrategy:
         LOG.debug("Threshold: %s", threshold)
         LOG.debug("Get Builds: %s", get_builds)
 
+        return _take(builds, self.select(pick_rate_column(builds), threshold))
+
+    def select(
+        self,
+        rates: np.ndarray,
+        threshold: float,
+        order: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Select builds with moveset_item_true_pick_rate >= threshold
+
+        Args:
+            rates (np.ndarray): moveset_item_true_pick_rate of the builds
+            threshold (float): Relevance threshold (0.0 to 100.0)
+            order (np.ndarray, optional): Ignored in this strategy
+
+        Returns:
+            np.ndarray: Indices of the relevant builds, in original order
+        """
         if threshold is None:
             LOG.warning("Threshold is None, returning all builds")
-            return builds
+            return np.arange(len(rates))
 
         if threshold > 100.0:
             LOG.warning("Threshold > 100.0, returning no builds")
-            return []
+            return _NO_INDICES
 
         if threshold <= 0.0:
             LOG.warning("Threshold <= 0.0, returning all builds")
-            return builds
+            return np.arange(len(rates))
+
+        return np.flatnonzero(rates >= threshold)
+
+    def sweep(self, sorted_rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List the thresholds that change the selection
 
-        return [
-            build
-            for build in builds
-            if build.moveset_item_true_pick_rate >= threshold
-        ]
+        Args:
+            sorted_rates (np.ndarray): moveset_item_true_pick_rate of the
+                week, most popular first
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Every distinct pick rate,
+                ascending, and the number of builds each one selects
+        """
+        thresholds = np.unique(sorted_rates)
+
+        return thresholds, _counts_at_least(sorted_rates, thresholds)
 
 
 class TopNRelevanceStrategy:
@@ -131,31 +266,90 @@ class TopNRelevanceStrategy:
         LOG.debug("Threshold: %s", threshold)
         LOG.debug("Get Builds: %s", get_builds)
 
+        return _take(
+            builds,
+            self.select(
+                pick_rate_column(builds),
+                threshold,
+                week_rates=pick_rate_column(get_builds()),
+            ),
+        )
+
+    def select(
+        self,
+        rates: np.ndarray,
+        threshold: float,
+        week_rates: np.ndarray = None,
+        order: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Select builds at least as popular as the N-th most popular build
+
+        Args:
+            rates (np.ndarray): moveset_item_true_pick_rate of the builds
+            threshold (float): Relevance threshold (N)
+            week_rates (np.ndarray, optional): moveset_item_true_pick_rate of
+                the whole week, used to find the cut value. Defaults to
+                `rates`.
+            order (np.ndarray, optional): Popularity order of `week_rates`,
+                used to read the cut value directly. Defaults to a partial
+                sort.
+
+        Returns:
+            np.ndarray: Indices of the relevant builds, in original order
+        """
         if threshold is None:
             LOG.warning("Threshold is None, returning all builds")
-            return builds
+            return np.arange(len(rates))
 
         if threshold <= 0:
             LOG.warning("Threshold <= 0, returning no builds")
-            return []
+            return _NO_INDICES
 
-        if threshold > len(builds):
+        if threshold > len(rates):
             LOG.warning("Threshold > number of builds, returning all builds")
-            return builds
+            return np.arange(len(rates))
 
-        position = int(threshold - 1)
-        sorted_builds = sorted(
-            get_builds(),
-            key=lambda build: build.moveset_item_true_pick_rate,
-            reverse=True,
-        )
-        cut_value = sorted_builds[position].moveset_item_true_pick_rate
+        if week_rates is None:
+            week_rates = rates
+
+        cut_value = self._cut_value(week_rates, threshold, order)
+
+        return np.flatnonzero(rates >= cut_value)
+
+    def _cut_value(
+        self,
+        week_rates: np.ndarray,
+        threshold: float,
+        order: Optional[np.ndarray] = None,
+    ) -> float:
+        # The N-th largest value
+        if order is not None:
+            return week_rates[order[int(threshold - 1)]]
+
+        # Without a popularity order, a partial sort is enough
+        kth = len(week_rates) - 1 - int(threshold - 1)
+
+        return np.partition(week_rates, kth)[kth]
+
+    def sweep(self, sorted_rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List the thresholds that change the selection
+
+        Builds tied with the N-th most popular one are selected too, so a
+        threshold can select more than N builds.
+
+        Args:
+            sorted_rates (np.ndarray): moveset_item_true_pick_rate of the
+                week, most popular first
 
-        return [
-            build
-            for build in builds
-            if build.moveset_item_true_pick_rate >= cut_value
-        ]
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Every N from 1 to the number of
+                builds, and the number of builds each one selects
+        """
+        thresholds = np.arange(1, len(sorted_rates) + 1, dtype=np.float64)
+
+        return thresholds, _counts_at_least(sorted_rates, sorted_rates)
 
 
 class CumulativeCoverageRelevanceStrategy:
@@ -189,27 +383,67 @@ class CumulativeCoverageRelevanceStrategy:
             LOG.warning("Threshold is None, returning all builds")
             return builds
 
+        week_builds = get_builds()
+
+        return _take(
+            week_builds, self.select(pick_rate_column(week_builds), threshold)
+        )
+
+    def select(
+        self,
+        rates: np.ndarray,
+        threshold: float,
+        order: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Select the most popular builds until their cumulative
+        moveset_item_true_pick_rate reaches the threshold
+
+        Args:
+            rates (np.ndarray): moveset_item_true_pick_rate of the week
+            threshold (float): Relevance threshold (0.0 to 100.0)
+            order (np.ndarray, optional): Popularity order of `rates`.
+                Computed when not given.
+
+        Returns:
+            np.ndarray: Indices of the relevant builds, most popular first
+        """
+        if threshold is None:
+            LOG.warning("Threshold is None, returning all builds")
+            return np.arange(len(rates))
+
         if threshold <= 0.0:
             LOG.warning("Threshold <= 0.0, returning no builds")
-            return []
+            return _NO_INDICES
 
-        sorted_builds = sorted(
-            get_builds(),
-            key=lambda build: build.moveset_item_true_pick_rate,
-            reverse=True,
-        )
-        cumulative = 0.0
-        selected_builds: list[BuildResponse] = []
+        if order is None:
+            order = popularity_order(rates)
+
+        cumulative = np.cumsum(rates[order])
+
+        # First position where the coverage reaches the threshold, inclusive
+        count = int(np.searchsorted(cumulative, threshold, side="left")) + 1
+
+        return order[:count]
 
-        for build in sorted_builds:
-            cumulative += build.moveset_item_true_pick_rate
-            selected_builds.append(build)
+    def sweep(self, sorted_rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List the thresholds that change the selection
 
-            if cumulative >= threshold:
-                LOG.info("Cumulative coverage threshold met")
-                break
+        Args:
+            sorted_rates (np.ndarray): moveset_item_true_pick_rate of the
+                week, most popular first
 
-        return selected_builds
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Every distinct cumulative pick
+                rate, ascending, and the number of builds each one selects
+        """
+        # A threshold selects builds up to the first one reaching it
+        thresholds, first = np.unique(
+            np.cumsum(sorted_rates), return_index=True
+        )
+
+        return thresholds, first + 1
 
 
 class QuartileRelevanceStrategy:
@@ -239,43 +473,81 @@ class QuartileRelevanceStrategy:
         LOG.debug("Threshold: %s", threshold)
         LOG.debug("Get Builds: %s", get_builds)
 
-        sorted_builds = sorted(
-            get_builds(),
-            key=lambda build: build.moveset_item_true_pick_rate,
-            reverse=True,
+        week_builds = get_builds()
+
+        if week_builds and threshold is None:
+            LOG.warning("Threshold is None, returning all builds")
+            return builds
+
+        return _take(
+            week_builds, self.select(pick_rate_column(week_builds), threshold)
         )
-        n = len(sorted_builds)
+
+    def select(
+        self,
+        rates: np.ndarray,
+        threshold: float,
+        order: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Select the builds of the top quartiles of moveset_item_true_pick_rate
+
+        Each quartile holds `n // 4` builds of the week, so the cut is made
+        on positions rather than on interpolated quantile values.
+
+        Args:
+            rates (np.ndarray): moveset_item_true_pick_rate of the week
+            threshold (float): Quartile threshold (1, 2, 3, or 4)
+            order (np.ndarray, optional): Popularity order of `rates`.
+                Computed when not given.
+
+        Returns:
+            np.ndarray: Indices of the relevant builds, most popular first
+        """
+        n = len(rates)
 
         if n == 0:
             LOG.warning("No builds available, returning no builds")
-            return []
+            return _NO_INDICES
 
         if threshold is None:
             LOG.warning("Threshold is None, returning all builds")
-            return builds
+            return np.arange(n)
 
         if threshold < 1 or threshold > 4:
             LOG.warning(
                 "Threshold must be between 1 and 4, returning no builds"
             )
-            return []
+            return _NO_INDICES
+
+        if threshold != int(threshold):
+            LOG.error("Unexpected case, returning no builds.")
+            return _NO_INDICES
+
+        if order is None:
+            order = popularity_order(rates)
 
         quartile_size = n // 4
 
-        if threshold == 1:
-            return sorted_builds[:quartile_size]
+        return order[: int(threshold) * quartile_size]
 
-        if threshold == 2:
-            return sorted_builds[: 2 * quartile_size]
+    def sweep(self, sorted_rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List the thresholds that change the selection
 
-        if threshold == 3:
-            return sorted_builds[: 3 * quartile_size]
+        Args:
+            sorted_rates (np.ndarray): moveset_item_true_pick_rate of the
+                week, most popular first
 
-        if threshold == 4:
-            return sorted_builds[: 4 * quartile_size]
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The quartiles 1 to 4 and the
+                number of builds each one selects
+        """
+        quartiles = np.arange(1, 5)
 
-        LOG.error("Unexpected case, returning no builds.")
-        return []  # Fallback, should not reach here
+        return quartiles.astype(np.float64), quartiles * (
+            len(sorted_rates) // 4
+        )
 
 
 RELEVANCE_STRATEGIES: dict[Relevance, RelevanceStrategy] = {
@@ -285,3 +557,32 @@ RELEVANCE_STRATEGIES: dict[Relevance, RelevanceStrategy] = {
     Relevance.CUMULATIVE_COVERAGE: CumulativeCoverageRelevanceStrategy(),
     Relevance.QUARTILE: QuartileRelevanceStrategy(),
 }
+
+
+def relevance_sweep(
+    relevance: Relevance,
+    rates: np.ndarray,
+    order: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Result size and coverage of a strategy at every meaningful threshold
+
+    Args:
+        relevance (Relevance): Relevance strategy
+        rates (np.ndarray): moveset_item_true_pick_rate of the week
+        order (np.ndarray, optional): Popularity order of `rates`. Computed
+            when not given.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Thresholds, number of
+            builds selected by each one, and the sum of their
+            moveset_item_true_pick_rate
+    """
+    if order is None:
+        order = popularity_order(rates)
+
+    sorted_rates = rates[order]
+    thresholds, counts = RELEVANCE_STRATEGIES[relevance].sweep(sorted_rates)
+    cumulative = np.concatenate(([0.0], np.cumsum(sorted_rates)))
+
+    return thresholds, counts, cumulative[counts]
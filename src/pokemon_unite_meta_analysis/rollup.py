@@ -0,0 +1,86 @@
+"""
+Pokémon, role and item rollups of builds.
+
+A rollup groups the builds of a week by one categorical column and
+aggregates every group in a single pass of `np.bincount`. Week snapshots keep
+their rollups (see `WeekSnapshot.rollup`), so serving a rollup costs one entry
+per group rather than one per build.
+"""
+
+import numpy as np
+
+from entity.build_model import BuildModel
+from entity.meta_rollup import MetaRollup
+from pokemon_unite_meta_analysis.custom_log import LOG
+
+# Rollup endpoints and the build column they group by
+ROLLUP_COLUMNS = {
+    "pokemon": "pokemon",
+    "roles": "role",
+    "items": "item",
+}
+
+
+def compute_rollup(
+    builds: list[BuildModel],
+    names: np.ndarray,
+    win_rates: np.ndarray,
+    pick_rates: np.ndarray,
+    scores: np.ndarray,
+) -> list[MetaRollup]:
+    """
+    Aggregate builds by name
+
+    Args:
+        builds (list[BuildModel]): The builds
+        names (np.ndarray): Group name of every build
+        win_rates (np.ndarray): moveset_item_win_rate of every build
+        pick_rates (np.ndarray): moveset_item_true_pick_rate of every build
+        scores (np.ndarray): Score picking the best build of every group
+
+    Returns:
+        list[MetaRollup]: One rollup per name, by descending total true pick
+            rate, then by name
+    """
+    LOG.info("Computing rollup")
+    LOG.debug("builds: %s", len(builds))
+
+    if len(builds) == 0:
+        return []
+
+    win_rates = np.asarray(win_rates, dtype=np.float64)
+    pick_rates = np.asarray(pick_rates, dtype=np.float64)
+
+    distinct, groups = np.unique(names, return_inverse=True)
+    n_groups = len(distinct)
+
+    counts = np.bincount(groups, minlength=n_groups)
+    total_pick = np.bincount(groups, weights=pick_rates, minlength=n_groups)
+    total_win = np.bincount(groups, weights=win_rates, minlength=n_groups)
+    weighted_win = np.bincount(
+        groups, weights=win_rates * pick_rates, minlength=n_groups
+    )
+    # Groups nobody picked fall back to their plain mean win rate
+    win_rate = np.divide(
+        weighted_win,
+        total_pick,
+        out=total_win / counts,
+        where=total_pick > 0,
+    )
+
+    # First position of every group once sorted by group, best score first
+    order = np.lexsort((-np.asarray(scores, dtype=np.float64), groups))
+    best = order[np.searchsorted(groups[order], np.arange(n_groups))]
+
+    ranking = np.lexsort((distinct, -total_pick))
+
+    return [
+        MetaRollup(
+            name=distinct[group],
+            build_count=counts[group],
+            pick_weighted_win_rate=win_rate[group],
+            total_true_pick_rate=total_pick[group],
+            best_build=builds[best[group]].model_dump(),
+        )
+        for group in ranking.tolist()
+    ]
@@ -0,0 +1,311 @@
+"""
+In-memory search index over Pokémon, item and move names.
+
+Names are looked up through their lookup keys (see `lookup_key`) in two
+structures:
+
+- a trie over every word-start suffix of the keys, so `weight` finds
+  `Attack Weight`; every node keeps the entries below it, making a prefix
+  lookup proportional to the length of the query;
+- a trigram index, which finds misspelled names by trigram similarity.
+
+Every name keeps the set of weeks it was indexed from. `sync` adds the names
+of weeks it has not seen yet, and `invalidate` releases the names of a changed
+week, removing the ones no other week holds (a misspelling fixed by a
+re-ingest) before `sync` indexes the week again. Weeks missing from the
+available weeks passed to `sync` are released the same way.
+"""
+
+import threading
+from typing import Callable, Iterable, Optional
+
+from entity.build_model import BuildModel
+from entity.search_result import SearchResult
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+
+# Build attribute indexed for every kind of name
+SEARCH_COLUMNS = {
+    "pokemon": ("pokemon",),
+    "item": ("item",),
+    "move": ("move_1", "move_2"),
+}
+
+# Minimum trigram similarity of a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+
+def trigrams(key: str) -> frozenset[str]:
+    """
+    Get the trigrams of a lookup key, padded like PostgreSQL's pg_trgm
+
+    Args:
+        key (str): Lookup key
+
+    Returns:
+        frozenset[str]: Trigrams of every word of the key
+    """
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+
+    return frozenset(grams)
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: dict[str, "_TrieNode"] = {}
+        self.entries: set[int] = set()
+
+
+class SearchIndex:
+    """
+    Prefix and fuzzy search index over names of builds
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Entries are (kind, name, key) triples, referenced by position;
+        # removed entries leave a None slot so positions stay stable
+        self._entries: list[Optional[tuple[str, str, str]]] = []
+        self._entry_ids: dict[tuple[str, str], int] = {}
+        self._root = _TrieNode()
+        self._trigrams: dict[str, set[int]] = {}
+        self._entry_trigrams: list[frozenset[str]] = []
+        # Weeks every entry was indexed from, None for names added directly
+        self._sources: dict[int, set[Optional[str]]] = {}
+        self._week_entries: dict[str, set[int]] = {}
+        self._weeks: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entry_ids)
+
+    @staticmethod
+    def _suffixes(key: str) -> list[str]:
+        # Every word-start suffix, so inner words match as prefixes
+        words = key.split(" ")
+        return [" ".join(words[start:]) for start in range(len(words))]
+
+    def add(self, kind: str, name: str, week: Optional[str] = None) -> None:
+        """
+        Add a name to the index, only recording the week of names already
+        indexed
+
+        Args:
+            kind (str): Kind of name (pokemon, item or move)
+            name (str): Name as stored in the builds
+            week (str, optional): Week the name was read from. Names added
+                without a week are never released. Defaults to None.
+        """
+        key = normalize_key(name)
+
+        with self._lock:
+            if not key:
+                return
+
+            entry_id = self._entry_ids.get((kind, key))
+            if entry_id is None:
+                entry_id = len(self._entries)
+                self._entries.append((kind, name, key))
+                self._entry_ids[(kind, key)] = entry_id
+                self._sources[entry_id] = set()
+
+                for suffix in self._suffixes(key):
+                    node = self._root
+                    for char in suffix:
+                        node = node.children.setdefault(char, _TrieNode())
+                        node.entries.add(entry_id)
+
+                grams = trigrams(key)
+                self._entry_trigrams.append(grams)
+                for gram in grams:
+                    self._trigrams.setdefault(gram, set()).add(entry_id)
+
+            self._sources[entry_id].add(week)
+            if week is not None:
+                self._week_entries.setdefault(week, set()).add(entry_id)
+
+    def _remove(self, entry_id: int) -> None:
+        # Called with the lock held
+        kind, _, key = self._entries[entry_id]
+
+        for suffix in self._suffixes(key):
+            node = self._root
+            for char in suffix:
+                # Missing if pruned with an earlier suffix of the same key
+                child = node.children.get(char)
+                if child is None:
+                    break
+                child.entries.discard(entry_id)
+                # Nodes keep the entries below them, so an empty node has
+                # no entry left in its subtree
+                if not child.entries:
+                    del node.children[char]
+                    break
+                node = child
+
+        for gram in self._entry_trigrams[entry_id]:
+            entry_ids = self._trigrams[gram]
+            entry_ids.discard(entry_id)
+            if not entry_ids:
+                del self._trigrams[gram]
+
+        self._entries[entry_id] = None
+        self._entry_trigrams[entry_id] = frozenset()
+        del self._entry_ids[(kind, key)]
+        del self._sources[entry_id]
+
+    def _release(self, week: str) -> None:
+        # Called with the lock held
+        for entry_id in self._week_entries.pop(week, ()):
+            sources = self._sources[entry_id]
+            sources.discard(week)
+            if not sources:
+                self._remove(entry_id)
+
+    def add_builds(
+        self, builds: Iterable[BuildModel], week: Optional[str] = None
+    ) -> None:
+        """
+        Add the Pokémon, item and move names of builds
+
+        Args:
+            builds (Iterable[BuildModel]): Builds to index
+            week (str, optional): Week of the builds. Defaults to None.
+        """
+        names = {
+            (kind, getattr(build, column))
+            for build in builds
+            for kind, columns in SEARCH_COLUMNS.items()
+            for column in columns
+        }
+
+        for kind, name in sorted(names):
+            self.add(kind, name, week)
+
+    def sync(
+        self,
+        weeks: Iterable[str],
+        load_builds: Callable[[str], list[BuildModel]],
+    ) -> None:
+        """
+        Index the weeks that are not indexed yet, releasing the names of the
+        weeks no longer available
+
+        Args:
+            weeks (Iterable[str]): Every available week
+            load_builds (Callable[[str], list[BuildModel]]): Loads the builds
+                of a week
+        """
+        weeks = list(weeks)
+        with self._lock:
+            for week in self._weeks - set(weeks):
+                self._release(week)
+                self._weeks.discard(week)
+            new_weeks = [week for week in weeks if week not in self._weeks]
+
+        for week in new_weeks:
+            LOG.info("Indexing week for search")
+            LOG.debug("week: %s", week)
+
+            self.add_builds(load_builds(week), week)
+
+            with self._lock:
+                self._weeks.add(week)
+
+    def invalidate(self, week: Optional[str] = None) -> None:
+        """
+        Mark a week as changed, so the next `sync` indexes it again
+
+        The names only this week held are removed until then.
+
+        Args:
+            week (str, optional): The week identifier
+        """
+        with self._lock:
+            self._release(week)
+            self._weeks.discard(week)
+
+    def clear(self) -> None:
+        """Drop every indexed name"""
+        with self._lock:
+            self._reset()
+
+    def search(
+        self, query: str, limit: int = 10, kind: Optional[str] = None
+    ) -> list[SearchResult]:
+        """
+        Find the names best matching a query
+
+        Exact matches rank first, then prefix matches (shorter names first),
+        then fuzzy matches by trigram similarity.
+
+        Args:
+            query (str): Text typed by the user
+            limit (int, optional): Maximum number of results. Defaults to 10.
+            kind (str, optional): Only return names of this kind
+
+        Returns:
+            list[SearchResult]: Matches, best first
+        """
+        # Runs on every keystroke of an autocomplete, so it does not log;
+        # the /search handler logs the query once
+        key = normalize_key(query)
+        if not key:
+            return []
+
+        scores: dict[int, tuple[float, str]] = {}
+
+        with self._lock:
+            node = self._root
+            for char in key:
+                node = node.children.get(char)
+                if node is None:
+                    break
+            else:
+                for entry_id in node.entries:
+                    entry_key = self._entries[entry_id][2]
+                    if entry_key == key:
+                        scores[entry_id] = (1.0, "exact")
+                    else:
+                        # Between 0.5 and 1.0, closer to 1.0 for short names
+                        score = 0.5 + 0.5 * len(key) / len(entry_key)
+                        scores[entry_id] = (min(score, 0.99), "prefix")
+
+            query_grams = trigrams(key)
+            candidates = set()
+            for gram in query_grams:
+                candidates.update(self._trigrams.get(gram, ()))
+
+            for entry_id in candidates - scores.keys():
+                grams = self._entry_trigrams[entry_id]
+                similarity = len(grams & query_grams) / len(grams | query_grams)
+                if similarity >= FUZZY_THRESHOLD:
+                    # Fuzzy matches always rank below prefix matches
+                    scores[entry_id] = (0.5 * similarity, "fuzzy")
+
+            entries = self._entries
+
+        ranked = sorted(
+            (
+                (-score, entries[entry_id][1], entries[entry_id][0], match)
+                for entry_id, (score, match) in scores.items()
+                if kind is None or entries[entry_id][0] == kind
+            )
+        )
+
+        return [
+            SearchResult(
+                name=name, kind=name_kind, match=match, score=round(-score, 4)
+            )
+            for score, name, name_kind, match in ranked[:limit]
+        ]
+
+
+SEARCH_INDEX = SearchIndex()
@@ -0,0 +1,100 @@
+"""
+Process-wide cache of week snapshots.
+
+Snapshots are loaded lazily on the first request for a week and dropped when
+the repository ingests new builds for that week. At most `SNAPSHOT_CACHE_SIZE`
+snapshots are kept, the least recently used one being dropped first, so
+syncing the history of every week does not keep the whole dataset in memory.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from entity.build_model import BuildModel
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+# Maximum number of snapshots kept, the all-weeks snapshot included
+SNAPSHOT_CACHE_SIZE = 16
+
+
+class SnapshotCache:
+    """
+    Cache of `WeekSnapshot` instances keyed by week
+
+    The key None holds the snapshot of all weeks together.
+
+    Args:
+        max_size (int, optional): Maximum number of snapshots kept. Defaults
+            to SNAPSHOT_CACHE_SIZE.
+    """
+
+    def __init__(self, max_size: int = SNAPSHOT_CACHE_SIZE):
+        # Ordered from least to most recently used
+        self._snapshots: dict[Optional[str], WeekSnapshot] = {}
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get(
+        self,
+        week: Optional[str],
+        load_builds: Callable[[], list[BuildModel]],
+    ) -> WeekSnapshot:
+        """
+        Get the snapshot of a week, loading it on first use
+
+        Args:
+            week (str, optional): The week identifier, or None for all weeks
+            load_builds (Callable[[], list[BuildModel]]): Loads the builds of
+                the week from the repository
+
+        Returns:
+            WeekSnapshot: The week snapshot
+        """
+        with self._lock:
+            snapshot = self._snapshots.pop(week, None)
+            if snapshot is not None:
+                # Moved to the most recently used end
+                self._snapshots[week] = snapshot
+
+        if snapshot is None:
+            LOG.info("Snapshot cache miss")
+            LOG.debug("week: %s", week)
+
+            snapshot = WeekSnapshot(week, load_builds())
+
+            with self._lock:
+                snapshot = self._snapshots.setdefault(week, snapshot)
+                while len(self._snapshots) > self._max_size:
+                    self._snapshots.pop(next(iter(self._snapshots)))
+
+        return snapshot
+
+    def invalidate(self, week: Optional[str] = None) -> None:
+        """
+        Drop the snapshot of a week after it was (re)ingested
+
+        The all-weeks snapshot is always dropped too, since it contains
+        every week.
+
+        Args:
+            week (str, optional): The week identifier. Defaults to None,
+                which drops only the all-weeks snapshot.
+        """
+        LOG.info("Invalidating snapshot")
+        LOG.debug("week: %s", week)
+
+        with self._lock:
+            self._snapshots.pop(week, None)
+            self._snapshots.pop(None, None)
+
+    def clear(self) -> None:
+        """Drop every cached snapshot"""
+        with self._lock:
+            self._snapshots.clear()
+
+
+SNAPSHOT_CACHE = SnapshotCache()
@@ -1,5 +1,7 @@
 # src/pokemon_unite_meta_analysis/sort_by.py
-from typing import List
+import heapq
+from operator import attrgetter
+from typing import Any, Callable, Iterable, List, Optional
 
 from entity.build_response import BuildResponse
 from entity.sort_by import SortBy
@@ -8,144 +10,268 @@ from pokemon_unite_meta_analysis.custom_log import LOG
 
 class SortStrategy:
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         raise NotImplementedError()
 
+    def _sort(
+        self,
+        builds: Iterable[BuildResponse],
+        key: Callable[[BuildResponse], Any],
+        reverse: bool,
+        k: Optional[int],
+    ) -> List[BuildResponse]:
+        """
+        Sort builds, keeping only the first k when k is given
+
+        The heap selection runs in O(n log k) and is stable: it returns
+        exactly `sorted(builds, key=key, reverse=reverse)[:k]`.
+        """
+        if k is None:
+            return sorted(builds, key=key, reverse=reverse)
+
+        if reverse:
+            return heapq.nlargest(k, builds, key=key)
+
+        return heapq.nsmallest(k, builds, key=key)
+
 
 class PokemonSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = False
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = False,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Pokemon")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(builds, key=lambda b: b.pokemon, reverse=reverse)
+        return self._sort(builds, attrgetter("pokemon"), reverse, k)
 
 
 class RoleSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = False
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = False,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Role")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(builds, key=lambda b: b.role, reverse=reverse)
+        return self._sort(builds, attrgetter("role"), reverse, k)
 
 
 class PokemonWinRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Pokemon Win Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(builds, key=lambda b: b.pokemon_win_rate, reverse=reverse)
+        return self._sort(builds, attrgetter("pokemon_win_rate"), reverse, k)
 
 
 class PokemonPickRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Pokemon Pick Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(
-            builds, key=lambda b: b.pokemon_pick_rate, reverse=reverse
-        )
+        return self._sort(builds, attrgetter("pokemon_pick_rate"), reverse, k)
 
 
 class MovesetWinRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Moveset Win Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(builds, key=lambda b: b.moveset_win_rate, reverse=reverse)
+        return self._sort(builds, attrgetter("moveset_win_rate"), reverse, k)
 
 
 class MovesetPickRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Moveset Pick Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(
-            builds, key=lambda b: b.moveset_pick_rate, reverse=reverse
-        )
+        return self._sort(builds, attrgetter("moveset_pick_rate"), reverse, k)
 
 
 class MovesetTruePickRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Moveset True Pick Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(
-            builds, key=lambda b: b.moveset_true_pick_rate, reverse=reverse
+        return self._sort(
+            builds, attrgetter("moveset_true_pick_rate"), reverse, k
         )
 
 
 class ItemSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = False
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = False,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Item")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(builds, key=lambda b: b.item, reverse=reverse)
+        return self._sort(builds, attrgetter("item"), reverse, k)
 
 
 class MovesetItemWinRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Moveset Item Win Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(
-            builds, key=lambda b: b.moveset_item_win_rate, reverse=reverse
+        return self._sort(
+            builds, attrgetter("moveset_item_win_rate"), reverse, k
         )
 
 
 class MovesetItemPickRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Moveset Item Pick Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(
-            builds, key=lambda b: b.moveset_item_pick_rate, reverse=reverse
+        return self._sort(
+            builds, attrgetter("moveset_item_pick_rate"), reverse, k
         )
 
 
 class MovesetItemTruePickRateSortStrategy(SortStrategy):
     def apply(
-        self, builds: List[BuildResponse], reverse: bool = True
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
     ) -> List[BuildResponse]:
         LOG.info("Sorting by Moveset Item True Pick Rate")
         LOG.debug("Builds:\n%s", builds)
         LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
 
-        return sorted(
-            builds, key=lambda b: b.moveset_item_true_pick_rate, reverse=reverse
+        return self._sort(
+            builds, attrgetter("moveset_item_true_pick_rate"), reverse, k
         )
 
 
+class WeightedWinRateSortStrategy(SortStrategy):
+    def apply(
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
+    ) -> List[BuildResponse]:
+        LOG.info("Sorting by Weighted Win Rate")
+        LOG.debug("Builds:\n%s", builds)
+        LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
+
+        return self._sort(builds, attrgetter("weighted_win_rate"), reverse, k)
+
+
+class AdjustedWinRateSortStrategy(SortStrategy):
+    def apply(
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
+    ) -> List[BuildResponse]:
+        LOG.info("Sorting by Adjusted Win Rate")
+        LOG.debug("Builds:\n%s", builds)
+        LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
+
+        return self._sort(builds, attrgetter("adjusted_win_rate"), reverse, k)
+
+
+class WinRateZScoreSortStrategy(SortStrategy):
+    def apply(
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
+    ) -> List[BuildResponse]:
+        LOG.info("Sorting by Win Rate Z-Score")
+        LOG.debug("Builds:\n%s", builds)
+        LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
+
+        return self._sort(builds, attrgetter("win_rate_z_score"), reverse, k)
+
+
+class WinRateCiLowerSortStrategy(SortStrategy):
+    def apply(
+        self,
+        builds: List[BuildResponse],
+        reverse: bool = True,
+        k: Optional[int] = None,
+    ) -> List[BuildResponse]:
+        LOG.info("Sorting by Win Rate CI Lower Bound")
+        LOG.debug("Builds:\n%s", builds)
+        LOG.debug("Reverse: %s", reverse)
+        LOG.debug("K: %s", k)
+
+        return self._sort(builds, attrgetter("win_rate_ci_lower"), reverse, k)
+
+
 SORT_STRATEGIES = {
     SortBy.POKEMON: PokemonSortStrategy(),
     SortBy.ROLE: RoleSortStrategy(),
@@ -158,4 +284,8 @@ SORT_STRATEGIES = {
     SortBy.MOVESET_ITEM_WIN_RATE: MovesetItemWinRateSortStrategy(),
     SortBy.MOVESET_ITEM_PICK_RATE: MovesetItemPickRateSortStrategy(),
     SortBy.MOVESET_ITEM_TRUE_PICK_RATE: MovesetItemTruePickRateSortStrategy(),
+    SortBy.WEIGHTED_WIN_RATE: WeightedWinRateSortStrategy(),
+    SortBy.ADJUSTED_WIN_RATE: AdjustedWinRateSortStrategy(),
+    SortBy.WIN_RATE_Z_SCORE: WinRateZScoreSortStrategy(),
+    SortBy.WIN_RATE_CI_LOWER: WinRateCiLowerSortStrategy(),
 }
@@ -0,0 +1,321 @@
+"""
+Team composition recommender.
+
+A team is `team_size` distinct Pokémon, each playing one build, and its score
+is the sum of one numeric metric (by default `adjusted_win_rate`) over its
+builds. Teams must contain the required roles (by default one of each role of
+the week), may cap the members of one role, and may force Pokémon in or out.
+
+Since the score is a sum and a Pokémon plays a single build, only the best
+relevant build of every Pokémon can be part of an optimal team, so candidates
+are one build per Pokémon (~80 per week rather than ~900 builds).
+
+The best `top_k` teams are then found by depth-first branch-and-bound over
+the candidates sorted by descending value, adding members in that order:
+
+- bound: a partial team can at most gain the values of the next candidates
+  in order, so once that optimistic score cannot beat the worst kept team,
+  the branch and every later sibling are pruned;
+- feasibility: a member is only added if the remaining slots and the
+  remaining candidates of each role can still cover the missing roles.
+"""
+
+import heapq
+from collections import Counter
+
+import numpy as np
+
+from entity.relevance import Relevance
+from entity.team import Team, TeamMember, TeamRecommendation
+from entity.team_query_params import TeamQueryParams
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.lookup_key import normalize_key, parse_keys
+from pokemon_unite_meta_analysis.tier_list import TIER_METRICS
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+# Metrics a team can maximize
+TEAM_METRICS = TIER_METRICS
+
+
+def _validate(params: TeamQueryParams) -> Relevance:
+    try:
+        relevance = Relevance(params.relevance)
+    except ValueError:
+        raise ValueError(f"Invalid relevance strategy: {params.relevance}")
+
+    if params.metric not in TEAM_METRICS:
+        raise ValueError(f"Invalid metric: {params.metric}")
+    if params.team_size < 1:
+        raise ValueError("team_size must be at least 1")
+    if params.max_per_role is not None and params.max_per_role < 1:
+        raise ValueError("max_per_role must be at least 1")
+    if params.top_k < 1:
+        raise ValueError("top_k must be at least 1")
+
+    return relevance
+
+
+def _best_build_per_pokemon(
+    snapshot: WeekSnapshot, indices: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    # Sort by Pokémon, then by descending value and ascending id, and keep
+    # the first build of every Pokémon
+    pokemon = snapshot.keys("pokemon")[indices]
+    order = np.lexsort((snapshot.ids[indices], -values, pokemon))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = pokemon[order][1:] != pokemon[order][:-1]
+
+    return indices[order[first]]
+
+
+class _Search:
+    """
+    Branch-and-bound search of the best teams over sorted candidates
+
+    Args:
+        values (list[float]): Value of every candidate, descending
+        roles (list[int]): Role code of every candidate
+        required (list[int]): Number of members required per role code
+        max_per_role (int): Maximum number of members of one role
+        team_size (int): Number of members to add to the forced ones
+        top_k (int): Number of teams to keep
+    """
+
+    def __init__(
+        self,
+        values: list[float],
+        roles: list[int],
+        required: list[int],
+        max_per_role: int,
+        team_size: int,
+        top_k: int,
+    ):
+        self.values = values
+        self.roles = roles
+        self.required = required
+        self.max_per_role = max_per_role
+        self.team_size = team_size
+        self.top_k = top_k
+
+        self.prefix = [0.0]
+        for value in values:
+            self.prefix.append(self.prefix[-1] + value)
+
+        # Candidates of every role from each position on
+        n_roles = len(required)
+        remaining = np.zeros((len(values) + 1, n_roles), dtype=np.int64)
+        if values:
+            one_hot = np.eye(n_roles, dtype=np.int64)[roles]
+            remaining[:-1] = np.cumsum(one_hot[::-1], axis=0)[::-1]
+        self.remaining = remaining.tolist()
+
+        # Min-heap of (score, -discovery order, members); among equal
+        # scores the team found last is evicted first
+        self.best: list[tuple[float, int, tuple[int, ...]]] = []
+        self.found = 0
+
+    def run(self, counts: list[int], score: float):
+        """
+        Search the teams completing the forced members
+
+        Args:
+            counts (list[int]): Forced members per role code
+            score (float): Score of the forced members
+
+        Returns:
+            list[tuple[float, tuple[int, ...]]]: Score and candidate
+                positions of the best teams, best first
+        """
+        if self.team_size > 0 or not self._missing(counts):
+            self._search(0, [], counts, score)
+
+        teams = sorted(self.best, key=lambda team: (-team[0], -team[1]))
+        return [(score, members) for score, _, members in teams]
+
+    def _missing(self, counts: list[int]) -> int:
+        return sum(
+            max(required - count, 0)
+            for required, count in zip(self.required, counts)
+        )
+
+    def _search(
+        self, start: int, members: list[int], counts: list[int], score: float
+    ) -> None:
+        need = self.team_size - len(members)
+        if need == 0:
+            self.found += 1
+            team = (score, -self.found, tuple(members))
+            if len(self.best) < self.top_k:
+                heapq.heappush(self.best, team)
+            elif score > self.best[0][0]:
+                heapq.heapreplace(self.best, team)
+            return
+
+        missing = self._missing(counts)
+        for position in range(start, len(self.values) - need + 1):
+            # Candidates are sorted, so later siblings have lower bounds
+            bound = score + self.prefix[position + need] - self.prefix[position]
+            if len(self.best) == self.top_k and bound <= self.best[0][0]:
+                break
+
+            role = self.roles[position]
+            if counts[role] >= self.max_per_role:
+                continue
+            fills = counts[role] < self.required[role]
+            if missing - fills > need - 1:
+                continue
+
+            counts[role] += 1
+            # Every missing role must still have enough candidates left
+            left = self.remaining[position + 1]
+            if all(
+                required - count <= available
+                for required, count, available in zip(
+                    self.required, counts, left
+                )
+            ):
+                members.append(position)
+                self._search(
+                    position + 1,
+                    members,
+                    counts,
+                    score + self.values[position],
+                )
+                members.pop()
+            counts[role] -= 1
+
+
+def recommend_teams(
+    snapshot: WeekSnapshot, params: TeamQueryParams
+) -> TeamRecommendation:
+    """
+    Find the best teams of a week under role constraints
+
+    Args:
+        snapshot (WeekSnapshot): Snapshot of the week
+        params (TeamQueryParams): Objective, constraints and relevance
+
+    Raises:
+        ValueError: If a parameter is invalid, a role or forced Pokémon does
+            not exist, or the constraints exceed the team size
+
+    Returns:
+        TeamRecommendation: The best teams, best first
+    """
+    LOG.info("Recommending teams")
+    LOG.debug("week: %s", snapshot.week)
+    LOG.debug("params: %s", params)
+
+    relevance = _validate(params)
+
+    # Role names as stored, by lookup key, in order of first appearance
+    role_names = dict(
+        zip(snapshot.keys("role").tolist(), snapshot.column("role").tolist())
+    )
+    role_codes = {key: code for code, key in enumerate(role_names)}
+
+    if params.roles is None:
+        required_keys = list(role_names)
+    else:
+        required_keys = []
+        for role in params.roles.split(","):
+            key = normalize_key(role)
+            if key not in role_codes:
+                raise ValueError(f"Invalid role: {role.strip()}")
+            required_keys.append(key)
+    if len(required_keys) > params.team_size:
+        raise ValueError(
+            f"{len(required_keys)} roles are required but team_size is "
+            f"{params.team_size}"
+        )
+    required = [0] * len(role_codes)
+    for key, count in Counter(required_keys).items():
+        required[role_codes[key]] = count
+    max_per_role = params.max_per_role or params.team_size
+    if max(required, default=0) > max_per_role:
+        raise ValueError("A role is required more than max_per_role times")
+
+    metric = snapshot.column(params.metric).astype(np.float64)
+    indices = snapshot.relevant_indices(relevance, params.relevance_threshold)
+    candidates = _best_build_per_pokemon(snapshot, indices, metric[indices])
+
+    candidate_keys = snapshot.keys("pokemon")[candidates].tolist()
+    excluded = (
+        frozenset()
+        if params.exclude_pokemon is None
+        else parse_keys(params.exclude_pokemon)
+    )
+    included = (
+        frozenset()
+        if params.include_pokemon is None
+        else parse_keys(params.include_pokemon)
+    )
+
+    forced = []
+    for key in sorted(included):
+        if key in excluded or key not in candidate_keys:
+            raise ValueError(f"Pokémon '{key}' is not a candidate")
+        forced.append(int(candidates[candidate_keys.index(key)]))
+    if len(forced) > params.team_size:
+        raise ValueError(
+            f"{len(forced)} Pokémon are included but team_size is "
+            f"{params.team_size}"
+        )
+    candidates = candidates[
+        np.array(
+            [key not in excluded | included for key in candidate_keys],
+            dtype=bool,
+        )
+    ]
+
+    role_keys = snapshot.keys("role")
+    # Descending value, ties by ascending id
+    candidates = candidates[
+        np.lexsort((snapshot.ids[candidates], -metric[candidates]))
+    ]
+
+    counts = [0] * len(role_codes)
+    for position in forced:
+        counts[role_codes[role_keys[position]]] += 1
+    if max(counts, default=0) > max_per_role:
+        raise ValueError("Included Pokémon exceed max_per_role")
+
+    search = _Search(
+        values=metric[candidates].tolist(),
+        roles=[role_codes[key] for key in role_keys[candidates].tolist()],
+        required=required,
+        max_per_role=max_per_role,
+        team_size=params.team_size - len(forced),
+        top_k=params.top_k,
+    )
+    results = search.run(counts, float(metric[forced].sum()))
+
+    def member(position: int) -> TeamMember:
+        build = snapshot.builds[position]
+        return TeamMember(
+            pokemon=build.pokemon,
+            role=build.role,
+            build_id=build.id,
+            move_1=build.move_1,
+            move_2=build.move_2,
+            item=build.item,
+            value=metric[position],
+        )
+
+    teams = []
+    for score, members in results:
+        positions = forced + candidates[list(members)].tolist()
+        positions.sort(key=lambda position: (-metric[position], position))
+        teams.append(Team(score=score, members=[member(p) for p in positions]))
+
+    return TeamRecommendation(
+        week=snapshot.week,
+        metric=params.metric,
+        team_size=params.team_size,
+        roles=[
+            role_names[key]
+            for key in sorted(required_keys, key=lambda key: role_codes[key])
+        ],
+        max_per_role=params.max_per_role,
+        teams=teams,
+    )
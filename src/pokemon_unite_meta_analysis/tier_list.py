@@ -0,0 +1,298 @@
+"""
+Tier-list engine.
+
+Pokémon or builds are ranked into the tiers S to D by one numeric metric,
+after selecting the relevant builds with a strategy of `RELEVANCE_STRATEGIES`.
+Tier breaks are found on the metric values with either:
+
+- `quantile`: equal-sized tiers, split at the 20th, 40th, 60th and 80th
+  percentiles;
+- `kmeans`: 1-D k-means, so tiers follow natural gaps between values. Since
+  values are one-dimensional, every iteration assigns them to the nearest
+  centroid with a single `np.searchsorted` over the centroid midpoints.
+
+When Pokémon are ranked, their value is the mean metric of their relevant
+builds, weighted by moveset_item_true_pick_rate.
+
+Tier lists are cached per (week, level, metric, method, relevance,
+threshold) in `TIER_LIST_CACHE` until their week is ingested again.
+"""
+
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+from entity.relevance import Relevance
+from entity.sort_by import SortBy
+from entity.tier_list import Tier, TierEntry, TierList
+from entity.tier_query_params import TierQueryParams
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+TIERS = ("S", "A", "B", "C", "D")
+
+TIER_LEVELS = ("pokemon", "build")
+
+TIER_METHODS = ("quantile", "kmeans")
+
+# Sort columns that hold numbers, hence can rank a tier list
+TIER_METRICS = tuple(
+    sort_by.value
+    for sort_by in SortBy
+    if sort_by not in (SortBy.POKEMON, SortBy.ROLE, SortBy.ITEM)
+)
+
+# Maximum number of k-means iterations
+KMEANS_MAX_ITERATIONS = 100
+
+# Maximum number of tier lists kept in the cache
+TIER_LIST_CACHE_SIZE = 256
+
+
+def quantile_tiers(values: np.ndarray, n_tiers: int = len(TIERS)) -> np.ndarray:
+    """
+    Assign values to equal-sized tiers
+
+    Args:
+        values (np.ndarray): Metric values
+        n_tiers (int, optional): Number of tiers. Defaults to 5.
+
+    Returns:
+        np.ndarray: Tier of every value, 0 for the highest values
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    breaks = np.quantile(values, np.arange(1, n_tiers) / n_tiers)
+
+    return n_tiers - 1 - np.searchsorted(breaks, values, side="right")
+
+
+def kmeans_tiers(values: np.ndarray, n_tiers: int = len(TIERS)) -> np.ndarray:
+    """
+    Assign values to tiers with 1-D k-means
+
+    Centroids start at evenly spaced quantiles, so the result is
+    deterministic.
+
+    Args:
+        values (np.ndarray): Metric values
+        n_tiers (int, optional): Number of tiers. Defaults to 5.
+
+    Returns:
+        np.ndarray: Tier of every value, 0 for the highest values
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    centroids = np.quantile(values, (np.arange(n_tiers) + 0.5) / n_tiers)
+    labels = np.zeros(len(values), dtype=np.int64)
+
+    for _ in range(KMEANS_MAX_ITERATIONS):
+        # Centroids stay sorted, so the nearest one is found by bisection
+        midpoints = (centroids[:-1] + centroids[1:]) / 2
+        labels = np.searchsorted(midpoints, values)
+
+        counts = np.bincount(labels, minlength=n_tiers)
+        sums = np.bincount(labels, weights=values, minlength=n_tiers)
+        # Empty clusters keep their centroid
+        updated = np.divide(
+            sums, counts, out=centroids.copy(), where=counts > 0
+        )
+
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+
+    return n_tiers - 1 - labels
+
+
+TIER_METHOD_FUNCTIONS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "quantile": quantile_tiers,
+    "kmeans": kmeans_tiers,
+}
+
+
+def _validate(params: TierQueryParams) -> Relevance:
+    try:
+        relevance = Relevance(params.relevance)
+    except ValueError:
+        raise ValueError(f"Invalid relevance strategy: {params.relevance}")
+
+    if params.level not in TIER_LEVELS:
+        raise ValueError(f"Invalid level: {params.level}")
+    if params.metric not in TIER_METRICS:
+        raise ValueError(f"Invalid metric: {params.metric}")
+    if params.method not in TIER_METHODS:
+        raise ValueError(f"Invalid method: {params.method}")
+
+    return relevance
+
+
+def compute_tier_list(
+    snapshot: WeekSnapshot, params: TierQueryParams
+) -> TierList:
+    """
+    Rank the relevant builds or Pokémon of a week into tiers
+
+    Args:
+        snapshot (WeekSnapshot): Snapshot of the week
+        params (TierQueryParams): Level, metric, method and relevance
+
+    Raises:
+        ValueError: If the level, metric, method or relevance strategy is
+            invalid
+
+    Returns:
+        TierList: The tier list
+    """
+    LOG.info("Computing tier list")
+    LOG.debug("week: %s", snapshot.week)
+    LOG.debug("params: %s", params)
+
+    relevance = _validate(params)
+    indices = snapshot.relevant_indices(relevance, params.relevance_threshold)
+
+    values = snapshot.column(params.metric)[indices].astype(np.float64)
+    pokemon = snapshot.column("pokemon")[indices]
+
+    if params.level == "pokemon":
+        names, groups = np.unique(pokemon, return_inverse=True)
+        weights = snapshot.column("moveset_item_true_pick_rate")[indices]
+        counts = np.bincount(groups, minlength=len(names))
+        total_weight = np.bincount(
+            groups, weights=weights, minlength=len(names)
+        )
+        # Pokémon nobody picked fall back to their plain mean
+        values = np.divide(
+            np.bincount(groups, weights=values * weights, minlength=len(names)),
+            total_weight,
+            out=np.bincount(groups, weights=values, minlength=len(names))
+            / np.maximum(counts, 1),
+            where=total_weight > 0,
+        )
+        # Role of the most picked build of every Pokémon
+        first = np.lexsort((-weights, groups))
+        representative = indices[
+            first[np.searchsorted(groups[first], np.arange(len(names)))]
+        ]
+        entries = [
+            TierEntry(
+                pokemon=build.pokemon,
+                role=build.role,
+                build_count=count,
+                value=value,
+            )
+            for build, count, value in zip(
+                snapshot.take(representative), counts.tolist(), values.tolist()
+            )
+        ]
+    else:
+        entries = [
+            TierEntry(
+                pokemon=build.pokemon,
+                role=build.role,
+                build_id=build.id,
+                move_1=build.move_1,
+                move_2=build.move_2,
+                item=build.item,
+                build_count=1,
+                value=value,
+            )
+            for build, value in zip(snapshot.take(indices), values.tolist())
+        ]
+
+    labels = TIER_METHOD_FUNCTIONS[params.method](values)
+
+    tiers = []
+    for code, name in enumerate(TIERS):
+        members = np.flatnonzero(labels == code)
+        members = members[np.argsort(-values[members], kind="stable")]
+        tiers.append(
+            Tier(
+                tier=name,
+                min_value=values[members].min() if len(members) else None,
+                max_value=values[members].max() if len(members) else None,
+                entries=[entries[member] for member in members.tolist()],
+            )
+        )
+
+    return TierList(
+        week=snapshot.week,
+        level=params.level,
+        metric=params.metric,
+        method=params.method,
+        relevance=relevance.value,
+        relevance_threshold=params.relevance_threshold,
+        tiers=tiers,
+    )
+
+
+class TierListCache:
+    """
+    Cache of tier lists keyed by week and tier parameters
+    """
+
+    def __init__(self):
+        self._tier_lists: dict[tuple, TierList] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, params: TierQueryParams, compute: Callable[[], TierList]
+    ) -> TierList:
+        """
+        Get a tier list, computing it on first use
+
+        Args:
+            params (TierQueryParams): Week and tier parameters
+            compute (Callable[[], TierList]): Computes the tier list
+
+        Returns:
+            TierList: The tier list
+        """
+        key = (
+            params.week,
+            params.level,
+            params.metric,
+            params.method,
+            params.relevance,
+            params.relevance_threshold,
+        )
+
+        with self._lock:
+            tier_list = self._tier_lists.get(key)
+
+        if tier_list is None:
+            LOG.info("Tier list cache miss")
+            LOG.debug("key: %s", key)
+
+            tier_list = compute()
+
+            with self._lock:
+                if len(self._tier_lists) >= TIER_LIST_CACHE_SIZE:
+                    self._tier_lists.pop(next(iter(self._tier_lists)), None)
+                tier_list = self._tier_lists.setdefault(key, tier_list)
+
+        return tier_list
+
+    def invalidate(self, week: Optional[str] = None) -> None:
+        """
+        Drop the tier lists of a week after it was (re)ingested
+
+        Tier lists of all weeks together are always dropped too.
+
+        Args:
+            week (str, optional): The week identifier
+        """
+        with self._lock:
+            for key in [k for k in self._tier_lists if k[0] in (week, None)]:
+                del self._tier_lists[key]
+
+    def clear(self) -> None:
+        """Drop every cached tier list"""
+        with self._lock:
+            self._tier_lists.clear()
+
+
+TIER_LIST_CACHE = TierListCache()
@@ -0,0 +1,354 @@
+"""
+Rolling trend statistics of builds across weeks.
+
+For every metric of `TREND_METRICS`, each build identity (pokemon, move1,
+move2, item) gets, over a window of the last k weeks:
+
+- `mean`: the mean value over the weeks it was seen in;
+- `slope`: the least-squares slope of its values against the week index, in
+  points per week;
+- `ewma`: the exponentially weighted moving average of its values over every
+  week up to the current one, with smoothing factor `EWMA_ALPHA`.
+
+The state is maintained incrementally, week by week, in chronological order.
+Every week stores running (prefix) sums over all previous weeks of the number
+of observations, the week index t, t², x and t·x, plus the EWMA of every
+build, each computed from the previous week's state and the new week's values
+only. Window statistics of any length are then the difference of two prefix
+sums, so appending a week costs one pass over its builds, and re-ingesting a
+week only recomputes that week and the ones after it.
+
+/meta/trends ranks builds by slope into risers and fallers, and can also sort
+them by any of the `TREND_STATISTICS` and filter them on minimum and maximum
+statistic values, for the requested window.
+"""
+
+import threading
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from entity.build_trend import BuildTrend, BuildTrends
+from entity.trend_query_params import TrendQueryParams
+from pokemon_unite_meta_analysis.build_history import (
+    IDENTITY_COLUMNS,
+    BuildKey,
+)
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+TREND_METRICS = ("moveset_item_win_rate", "moveset_item_true_pick_rate")
+
+# Statistics of every build, `{metric}_{statistic}`
+TREND_STATISTICS = tuple(
+    f"{metric}_{statistic}"
+    for metric in TREND_METRICS
+    for statistic in ("mean", "slope", "ewma")
+)
+
+# Smoothing factor of the exponentially weighted moving averages
+EWMA_ALPHA = 0.5
+
+# Running sums that do not depend on the metric
+_INDEX_SUMS = ("count", "t", "tt")
+
+
+def _pad(values: np.ndarray, size: int) -> np.ndarray:
+    # Builds first seen after a week have no contribution to its sums
+    return np.pad(values, (0, size - len(values)))
+
+
+class TrendIndex:
+    """
+    Incrementally maintained trend state of every build across all weeks
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.weeks: tuple[str, ...] = ()
+        self._rows: dict[BuildKey, int] = {}
+        # Row of every snapshot position, per week
+        self._week_rows: list[np.ndarray] = []
+        # Running sums up to and including every week, one value per row
+        self._sums: list[dict[str, np.ndarray]] = []
+        # EWMA of every row as of every week, NaN before a row is first seen
+        self._ewma: list[dict[str, np.ndarray]] = []
+
+    def _truncate(self, n_weeks: int) -> None:
+        self.weeks = self.weeks[:n_weeks]
+        del self._week_rows[n_weeks:]
+        del self._sums[n_weeks:]
+        del self._ewma[n_weeks:]
+
+    def _append(self, week: str, snapshot: WeekSnapshot) -> None:
+        t = len(self.weeks)
+
+        keys = zip(*(snapshot.keys(column) for column in IDENTITY_COLUMNS))
+        week_rows = np.fromiter(
+            (self._rows.setdefault(key, len(self._rows)) for key in keys),
+            dtype=np.int64,
+            count=len(snapshot),
+        )
+        n_rows = len(self._rows)
+
+        # Contribution of the new week to every running sum
+        contributions = {
+            "count": 1.0,
+            "t": float(t),
+            "tt": float(t * t),
+        }
+        values = {
+            metric: snapshot.column(metric).astype(np.float64)
+            for metric in TREND_METRICS
+        }
+        for metric in TREND_METRICS:
+            contributions[metric] = values[metric]
+            contributions[f"{metric}_t"] = values[metric] * t
+
+        previous_sums = self._sums[-1] if self._sums else {}
+        sums = {}
+        for name, contribution in contributions.items():
+            previous = previous_sums.get(name, np.zeros(0))
+            sums[name] = _pad(previous, n_rows)
+            sums[name][week_rows] += contribution
+
+        previous_ewma = self._ewma[-1] if self._ewma else {}
+        ewma = {}
+        for metric in TREND_METRICS:
+            previous = previous_ewma.get(metric, np.zeros(0))
+            ewma[metric] = np.pad(
+                previous,
+                (0, n_rows - len(previous)),
+                constant_values=np.nan,
+            )
+            last = ewma[metric][week_rows]
+            ewma[metric][week_rows] = np.where(
+                np.isnan(last),
+                values[metric],
+                EWMA_ALPHA * values[metric] + (1 - EWMA_ALPHA) * last,
+            )
+
+        self.weeks = self.weeks + (week,)
+        self._week_rows.append(week_rows)
+        self._sums.append(sums)
+        self._ewma.append(ewma)
+
+    def sync(
+        self,
+        weeks: Iterable[str],
+        load_snapshot: Callable[[str], WeekSnapshot],
+    ) -> None:
+        """
+        Bring the trend state up to date with the available weeks
+
+        Only the weeks after the last one already processed in chronological
+        order are computed.
+
+        Args:
+            weeks (Iterable[str]): Every available week
+            load_snapshot (Callable[[str], WeekSnapshot]): Loads the snapshot
+                of a week
+        """
+        weeks = tuple(sorted(weeks))
+
+        with self._lock:
+            kept = 0
+            while (
+                kept < min(len(weeks), len(self.weeks))
+                and weeks[kept] == self.weeks[kept]
+            ):
+                kept += 1
+
+            if kept == len(weeks) == len(self.weeks):
+                return
+
+            LOG.info("Updating build trends")
+            LOG.debug("kept weeks: %s", kept)
+            LOG.debug("new weeks: %s", len(weeks) - kept)
+
+            self._truncate(kept)
+            for week in weeks[kept:]:
+                self._append(week, load_snapshot(week))
+
+    def invalidate(self, week: Optional[str] = None) -> None:
+        """
+        Drop the state of a week, and of the weeks after it, after it was
+        (re)ingested
+
+        Args:
+            week (str, optional): The week identifier
+        """
+        with self._lock:
+            if week in self.weeks:
+                self._truncate(self.weeks.index(week))
+
+    def clear(self) -> None:
+        """Drop the whole trend state"""
+        with self._lock:
+            self._reset()
+
+    def statistics(
+        self, week: str, window: int
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Get the window statistics of the builds of a week
+
+        Args:
+            week (str): Last week of the window
+            window (int): Number of weeks the window spans
+
+        Raises:
+            ValueError: If the week was not synced
+
+        Returns:
+            tuple[np.ndarray, dict[str, np.ndarray]]: Number of weeks of the
+                window every build was seen in, and the `{metric}_{statistic}`
+                arrays, in snapshot order
+        """
+        with self._lock:
+            if week not in self.weeks:
+                raise ValueError(f"Invalid week: {week}")
+
+            t = self.weeks.index(week)
+            rows = self._week_rows[t]
+            current = self._sums[t]
+            start = self._sums[t - window] if t >= window else {}
+            ewma = self._ewma[t]
+
+        def window_sum(name: str) -> np.ndarray:
+            previous = start.get(name, np.zeros(0))
+            return (current[name] - _pad(previous, len(current[name])))[rows]
+
+        count, sum_t, sum_tt = (window_sum(name) for name in _INDEX_SUMS)
+        # Zero when a build was seen in a single week of the window
+        spread = count * sum_tt - sum_t**2
+
+        statistics = {}
+        for metric in TREND_METRICS:
+            sum_x = window_sum(metric)
+            sum_tx = window_sum(f"{metric}_t")
+            statistics[f"{metric}_mean"] = sum_x / count
+            statistics[f"{metric}_slope"] = np.divide(
+                count * sum_tx - sum_t * sum_x,
+                spread,
+                out=np.full(len(rows), np.nan),
+                where=spread > 0,
+            )
+            statistics[f"{metric}_ewma"] = ewma[metric][rows]
+
+        return count.astype(np.int64), statistics
+
+
+def _validate(params: TrendQueryParams) -> None:
+    if params.metric not in TREND_METRICS:
+        raise ValueError(f"Invalid metric: {params.metric}")
+    if params.window < 2:
+        raise ValueError("window must be at least 2")
+    if params.min_weeks < 2:
+        raise ValueError("min_weeks must be at least 2")
+    if params.top_n < 1:
+        raise ValueError("top_n must be at least 1")
+    if params.sort_by is not None and params.sort_by not in TREND_STATISTICS:
+        raise ValueError(f"Invalid sort_by field: {params.sort_by}")
+    if params.sort_order not in ("asc", "desc"):
+        raise ValueError(f"Invalid sort_order: {params.sort_order}")
+
+
+def compute_trends(
+    index: TrendIndex, snapshot: WeekSnapshot, params: TrendQueryParams
+) -> BuildTrends:
+    """
+    Get the builds of a week whose metric rises or falls the most, and the
+    builds sorted by a trend statistic
+
+    Args:
+        index (TrendIndex): Trend state, synced with the week
+        snapshot (WeekSnapshot): Snapshot of the last week of the window
+        params (TrendQueryParams): Window, metric and filters
+
+    Raises:
+        ValueError: If a parameter is invalid
+
+    Returns:
+        BuildTrends: The top risers and fallers, and the top builds by
+            `params.sort_by`
+    """
+    LOG.info("Computing build trends")
+    LOG.debug("week: %s", snapshot.week)
+    LOG.debug("params: %s", params)
+
+    _validate(params)
+    count, statistics = index.statistics(snapshot.week, params.window)
+
+    mask = count >= params.min_weeks
+    for column in ("pokemon", "role", "item"):
+        value = getattr(params, column)
+        if value is not None:
+            mask &= snapshot.keys(column) == normalize_key(value)
+    # Missing (NaN) statistics fail every bound
+    for name, values in statistics.items():
+        minimum = getattr(params, f"min_{name}")
+        maximum = getattr(params, f"max_{name}")
+        if minimum is not None:
+            mask &= values >= minimum
+        if maximum is not None:
+            mask &= values <= maximum
+
+    slopes = statistics[f"{params.metric}_slope"]
+    ids = snapshot.ids
+    rising = np.flatnonzero(mask & (slopes > 0))
+    falling = np.flatnonzero(mask & (slopes < 0))
+    # Steepest first, ties by build id
+    risers = rising[np.lexsort((ids[rising], -slopes[rising]))]
+    fallers = falling[np.lexsort((ids[falling], slopes[falling]))]
+
+    ordered = np.zeros(0, dtype=np.int64)
+    if params.sort_by is not None:
+        values = statistics[params.sort_by]
+        selected = np.flatnonzero(mask)
+        keys = values[selected]
+        if params.sort_order == "desc":
+            keys = -keys
+        # Ties by build id, missing (NaN) values last
+        ordered = selected[np.lexsort((ids[selected], keys))]
+
+    def trends(positions: np.ndarray) -> list[BuildTrend]:
+        positions = positions[: params.top_n]
+        return [
+            BuildTrend(
+                id=build.id,
+                pokemon=build.pokemon,
+                role=build.role,
+                move_1=build.move_1,
+                move_2=build.move_2,
+                item=build.item,
+                weeks=int(count[position]),
+                **{metric: getattr(build, metric) for metric in TREND_METRICS},
+                **{
+                    name: None
+                    if np.isnan(values[position])
+                    else values[position]
+                    for name, values in statistics.items()
+                },
+            )
+            for build, position in zip(
+                snapshot.take(positions), positions.tolist()
+            )
+        ]
+
+    return BuildTrends(
+        week=snapshot.week,
+        window=params.window,
+        metric=params.metric,
+        risers=trends(risers),
+        fallers=trends(fallers),
+        sort_by=params.sort_by,
+        builds=trends(ordered),
+    )
+
+
+TREND_INDEX = TrendIndex()
@@ -0,0 +1,398 @@
+"""
+In-memory, column-oriented view of the builds of one week.
+
+Derived metrics (see `derived_metrics`) are stored with the builds when a week
+is ingested, so sorting by them costs the same as any other column. Builds
+stored without them get them computed in one batch when the snapshot is
+loaded.
+
+A week's data never changes after ingest, so a snapshot is loaded once and
+shared by every request for that week. Derived structures, such as the sort
+permutations of every `SortBy` column, the popularity order, the builds
+selected by each relevance strategy, the inverted indexes of the filter
+columns, the Pokémon, role and item rollups, the co-occurrence matrices and
+the percentile ranks of the numeric columns (unless stored at ingest), are
+computed lazily on first use.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from entity.build_model import BuildModel
+from entity.meta_rollup import MetaRollup
+from entity.relevance import Relevance
+from entity.sort_by import SortBy
+from pokemon_unite_meta_analysis.cooccurrence import (
+    CooccurrenceMatrix,
+    build_cooccurrence,
+)
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.derived_metrics import with_derived_metrics
+from pokemon_unite_meta_analysis.inverted_index import InvertedIndex
+from pokemon_unite_meta_analysis.lookup_key import normalize_key
+from pokemon_unite_meta_analysis.percentile import (
+    PERCENTILE_COLUMNS,
+    decode_percentile_ranks,
+    percentile_matrix,
+)
+from pokemon_unite_meta_analysis.relevance_strategy import (
+    RELEVANCE_STRATEGIES,
+    popularity_order,
+)
+from pokemon_unite_meta_analysis.rollup import compute_rollup
+
+# Maximum number of (relevance, threshold) selections kept per snapshot
+RELEVANCE_CACHE_SIZE = 256
+
+# Maximum number of sort key combinations kept per snapshot
+PERMUTATION_CACHE_SIZE = 64
+
+# Sort columns with their direction (True for descending), most significant
+# first
+SortKeys = tuple[tuple[SortBy, bool], ...]
+
+
+class WeekSnapshot:
+    """
+    Immutable snapshot of the builds of a week
+
+    Args:
+        week (str, optional): The week identifier, or None for all weeks
+        builds (list[BuildModel]): Builds of the week, in repository order.
+            Builds missing their derived metrics are replaced by copies with
+            the metrics filled in.
+    """
+
+    def __init__(self, week: Optional[str], builds: list[BuildModel]):
+        LOG.info("Creating week snapshot")
+        LOG.debug("week: %s", week)
+
+        self.week = week
+        self.builds = with_derived_metrics(builds)
+        self.ids = np.fromiter(
+            (build.id for build in builds), dtype=np.int64, count=len(builds)
+        )
+        self._columns: dict[str, np.ndarray] = {}
+        self._sort_ranks: dict[SortBy, np.ndarray] = {}
+        self._permutations: dict[SortKeys, np.ndarray] = {}
+        self._popularity_order: Optional[np.ndarray] = None
+        self._popularity_ranks: Optional[dict[int, int]] = None
+        self._positions: Optional[dict[int, int]] = None
+        self._percentiles: Optional[np.ndarray] = None
+        self._keys: dict[str, np.ndarray] = {}
+        self._indexes: dict[str, InvertedIndex] = {}
+        self._relevant: dict[tuple[Relevance, Optional[float]], np.ndarray] = {}
+        self._rollups: dict[str, list[MetaRollup]] = {}
+        self._cooccurrences: dict[str, CooccurrenceMatrix] = {}
+
+    def __len__(self) -> int:
+        return len(self.builds)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a build attribute as an array
+
+        Args:
+            name (str): Build attribute name
+
+        Returns:
+            np.ndarray: Attribute values, in snapshot order
+        """
+        if name not in self._columns:
+            self._columns[name] = np.array(
+                [getattr(build, name) for build in self.builds]
+            )
+
+        return self._columns[name]
+
+    def keys(self, name: str) -> np.ndarray:
+        """
+        Get the lookup keys of a categorical build attribute
+
+        Keys are normalized once per snapshot, so filters compare interned
+        keys instead of lowercasing every build on every request.
+
+        Args:
+            name (str): Build attribute name (pokemon, role or item)
+
+        Returns:
+            np.ndarray: Lookup keys, in snapshot order
+        """
+        if name not in self._keys:
+            self._keys[name] = np.array(
+                [normalize_key(value) for value in self.column(name).tolist()],
+                dtype=object,
+            )
+
+        return self._keys[name]
+
+    def inverted_index(self, name: str) -> InvertedIndex:
+        """
+        Get the inverted index of a categorical build attribute
+
+        Args:
+            name (str): Build attribute name (pokemon, role or item)
+
+        Returns:
+            InvertedIndex: Lookup key to row bitmap index
+        """
+        if name not in self._indexes:
+            LOG.info("Building inverted index")
+            LOG.debug("name: %s", name)
+
+            self._indexes[name] = InvertedIndex(self.keys(name))
+
+        return self._indexes[name]
+
+    def rollup(self, name: str) -> list[MetaRollup]:
+        """
+        Get the aggregates of the builds grouped by a categorical attribute
+
+        Args:
+            name (str): Build attribute name (pokemon, role or item)
+
+        Returns:
+            list[MetaRollup]: One rollup per value, by descending total true
+                pick rate. The best build of a group is the one with the
+                highest adjusted_win_rate.
+        """
+        if name not in self._rollups:
+            self._rollups[name] = compute_rollup(
+                self.builds,
+                self.column(name),
+                self.column("moveset_item_win_rate"),
+                self.column("moveset_item_true_pick_rate"),
+                self.column("adjusted_win_rate"),
+            )
+
+        return self._rollups[name]
+
+    def cooccurrence(self, name: str) -> CooccurrenceMatrix:
+        """
+        Get a co-occurrence matrix of the builds
+
+        Args:
+            name (str): Matrix name (see `COOCCURRENCE_MATRICES`)
+
+        Returns:
+            CooccurrenceMatrix: The sparse matrix
+        """
+        if name not in self._cooccurrences:
+            self._cooccurrences[name] = build_cooccurrence(
+                name,
+                {
+                    column: self.column(column)
+                    for column in ("pokemon", "item", "move_1", "move_2")
+                },
+                self.column("moveset_item_win_rate"),
+                self.column("moveset_item_true_pick_rate"),
+            )
+
+        return self._cooccurrences[name]
+
+    def take(self, indices: np.ndarray) -> list[BuildModel]:
+        """
+        Get the builds at the given positions
+
+        Args:
+            indices (np.ndarray): Positions in the snapshot
+
+        Returns:
+            list[BuildModel]: Builds, in the order of `indices`
+        """
+        return [self.builds[index] for index in indices.tolist()]
+
+    def sort_permutation(self, sort_keys: SortKeys) -> np.ndarray:
+        """
+        Get the order of the whole week by one or more sort columns
+
+        The keys are compared in order with a single `np.lexsort`, and
+        remaining ties are broken by ascending build id, so the order is
+        deterministic.
+
+        Args:
+            sort_keys (SortKeys): (column, descending) pairs, most
+                significant first
+
+        Returns:
+            np.ndarray: Positions in the snapshot, in sorted order
+        """
+        sort_keys = tuple(sort_keys)
+
+        if sort_keys not in self._permutations:
+            LOG.info("Computing sort permutation")
+            LOG.debug("sort_keys: %s", sort_keys)
+
+            if len(self._permutations) >= PERMUTATION_CACHE_SIZE:
+                self._permutations.pop(next(iter(self._permutations)), None)
+
+            # np.lexsort sorts by its last key first
+            keys = [self.ids]
+            for sort_by, reverse in reversed(sort_keys):
+                ranks = self._ranks(sort_by)
+                keys.append(-ranks if reverse else ranks)
+
+            self._permutations[sort_keys] = np.lexsort(keys)
+
+        return self._permutations[sort_keys]
+
+    def sort_indices(
+        self,
+        indices: np.ndarray,
+        sort_keys: SortKeys,
+        k: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Sort a subset of the week using its precomputed permutation
+
+        Args:
+            indices (np.ndarray): Positions of the subset in the snapshot
+            sort_keys (SortKeys): (column, descending) pairs, most
+                significant first
+            k (int, optional): Keep only the first k positions
+
+        Returns:
+            np.ndarray: Positions of the subset, in sorted order
+        """
+        permutation = self.sort_permutation(sort_keys)
+
+        mask = np.zeros(len(self), dtype=bool)
+        mask[indices] = True
+        ordered = permutation[mask[permutation]]
+
+        return ordered if k is None else ordered[:k]
+
+    def _ranks(self, sort_by: SortBy) -> np.ndarray:
+        # Dense ranks make string and numeric columns sortable alike
+        if sort_by not in self._sort_ranks:
+            _, self._sort_ranks[sort_by] = np.unique(
+                self.column(sort_by.value), return_inverse=True
+            )
+
+        return self._sort_ranks[sort_by]
+
+    @property
+    def popularity_order(self) -> np.ndarray:
+        """
+        Positions of the week from most to least popular
+
+        Computed once per week and shared by the relevance strategies and
+        the popularity ranks.
+
+        Returns:
+            np.ndarray: Positions in the snapshot, by descending
+                moveset_item_true_pick_rate
+        """
+        if self._popularity_order is None:
+            LOG.info("Computing popularity order")
+            self._popularity_order = popularity_order(
+                self.column("moveset_item_true_pick_rate")
+            )
+
+        return self._popularity_order
+
+    @property
+    def popularity_ranks(self) -> dict[int, int]:
+        """
+        Popularity rank of every build of the week
+
+        Returns:
+            dict[int, int]: Build id to popularity rank (1 = most popular)
+        """
+        if self._popularity_ranks is None:
+            ranked_ids = self.ids[self.popularity_order].tolist()
+            self._popularity_ranks = {
+                build_id: rank + 1 for rank, build_id in enumerate(ranked_ids)
+            }
+
+        return self._popularity_ranks
+
+    @property
+    def positions(self) -> dict[int, int]:
+        """
+        Position of every build in the snapshot
+
+        Returns:
+            dict[int, int]: Build id to position
+        """
+        if self._positions is None:
+            self._positions = {
+                build_id: position
+                for position, build_id in enumerate(self.ids.tolist())
+            }
+
+        return self._positions
+
+    @property
+    def percentiles(self) -> np.ndarray:
+        """
+        Percentile ranks of every numeric column, within each week
+
+        Returns:
+            np.ndarray: (builds x `PERCENTILE_COLUMNS`) float32 matrix, in
+                snapshot order
+        """
+        if self._percentiles is None:
+            # Stored at ingest, unless a build was written without them
+            self._percentiles = decode_percentile_ranks(
+                [
+                    getattr(build, "percentile_ranks", None)
+                    for build in self.builds
+                ]
+            )
+
+        if self._percentiles is None:
+            LOG.info("Computing percentile ranks")
+
+            self._percentiles = percentile_matrix(
+                {name: self.column(name) for name in PERCENTILE_COLUMNS},
+                # The all-weeks snapshot still ranks builds within their week
+                groups=None if self.week is not None else self.column("week"),
+            )
+
+        return self._percentiles
+
+    def percentile(self, name: str) -> np.ndarray:
+        """
+        Get the percentile ranks of a numeric column
+
+        Args:
+            name (str): Column name, one of `PERCENTILE_COLUMNS`
+
+        Returns:
+            np.ndarray: Percentile ranks, in snapshot order
+        """
+        return self.percentiles[:, PERCENTILE_COLUMNS.index(name)]
+
+    def relevant_indices(
+        self, relevance: Relevance, threshold: Optional[float]
+    ) -> np.ndarray:
+        """
+        Select the relevant builds of the week, memoized per strategy and
+        threshold
+
+        Args:
+            relevance (Relevance): Relevance strategy
+            threshold (float, optional): Relevance threshold
+
+        Returns:
+            np.ndarray: Positions of the relevant builds in the snapshot
+        """
+        key = (relevance, threshold)
+
+        if key not in self._relevant:
+            LOG.info("Selecting relevant builds")
+            LOG.debug("relevance: %s", relevance)
+            LOG.debug("threshold: %s", threshold)
+
+            if len(self._relevant) >= RELEVANCE_CACHE_SIZE:
+                self._relevant.pop(next(iter(self._relevant)), None)
+
+            self._relevant[key] = RELEVANCE_STRATEGIES[relevance].select(
+                self.column("moveset_item_true_pick_rate"),
+                threshold,
+                order=self.popularity_order,
+            )
+
+        return self._relevant[key]
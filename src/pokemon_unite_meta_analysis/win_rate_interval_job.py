@@ -0,0 +1,153 @@
+"""
+Batch job storing the win rate confidence intervals of every build.
+
+Weeks are independent, so their intervals are computed in parallel by a
+process pool, one task per week, while the parent process loads the builds
+and writes the results. Intervals land in the `win_rate_ci_lower` and
+`win_rate_ci_upper` columns of the builds table.
+
+Usage:
+    python -m pokemon_unite_meta_analysis.win_rate_interval_job \
+        [--method wilson|bootstrap] [--matches-per-week N] [--workers N]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from entity.build_model import BuildModel
+from pokemon_unite_meta_analysis.custom_log import LOG
+from pokemon_unite_meta_analysis.win_rate_intervals import (
+    INTERVAL_METHODS,
+    MATCHES_PER_WEEK,
+    compute_win_rate_intervals,
+)
+from repository.build_repository import BuildRepository
+
+WeekTask = tuple[
+    str, list[int], list[float], list[float], str, int, Optional[int]
+]
+
+
+def _week_intervals(
+    task: WeekTask,
+) -> tuple[str, list[tuple[int, float, float]]]:
+    # Runs in a worker process, so it only receives and returns plain data
+    week, ids, win_rates, pick_rates, method, matches_per_week, seed = task
+
+    lower, upper = compute_win_rate_intervals(
+        np.asarray(win_rates),
+        np.asarray(pick_rates),
+        method=method,
+        matches_per_week=matches_per_week,
+        seed=seed,
+    )
+
+    return week, list(zip(ids, lower.tolist(), upper.tolist()))
+
+
+def _tasks(
+    builds: list[BuildModel],
+    method: str,
+    matches_per_week: int,
+    seed: Optional[int],
+) -> list[WeekTask]:
+    weeks: dict[str, list[BuildModel]] = {}
+    for build in builds:
+        weeks.setdefault(build.week, []).append(build)
+
+    return [
+        (
+            week,
+            [build.id for build in week_builds],
+            [build.moveset_item_win_rate for build in week_builds],
+            [build.moveset_item_true_pick_rate for build in week_builds],
+            method,
+            matches_per_week,
+            None if seed is None else seed + index,
+        )
+        for index, (week, week_builds) in enumerate(sorted(weeks.items()))
+    ]
+
+
+def run(
+    method: str = "bootstrap",
+    matches_per_week: int = MATCHES_PER_WEEK,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> int:
+    """
+    Compute and store the win rate intervals of every week
+
+    Args:
+        method (str, optional): One of `INTERVAL_METHODS`. Defaults to
+            "bootstrap".
+        matches_per_week (int, optional): Matches played per week
+        workers (int, optional): Worker processes. Defaults to one per CPU.
+        seed (int, optional): Seed of the bootstrap, for reproducible runs
+
+    Raises:
+        ValueError: If the method is unknown
+
+    Returns:
+        int: Number of builds updated
+    """
+    LOG.info("Running win rate interval job")
+    LOG.debug("method: %s", method)
+    LOG.debug("matches_per_week: %s", matches_per_week)
+    LOG.debug("workers: %s", workers)
+
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"Invalid interval method: {method}")
+
+    with BuildRepository() as repo:
+        repo.add_win_rate_interval_columns()
+        tasks = _tasks(repo.get_all_builds(), method, matches_per_week, seed)
+
+        updated = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for week, intervals in executor.map(_week_intervals, tasks):
+                repo.update_win_rate_intervals(week, intervals)
+                updated += len(intervals)
+
+    return updated
+
+
+def main():
+    """Command line entry point of the job."""
+    parser = argparse.ArgumentParser(
+        description="Store win rate confidence intervals of every build"
+    )
+    parser.add_argument(
+        "--method",
+        choices=list(INTERVAL_METHODS),
+        default="bootstrap",
+        help="Interval method (default: bootstrap)",
+    )
+    parser.add_argument(
+        "--matches-per-week",
+        type=int,
+        default=MATCHES_PER_WEEK,
+        help=f"Matches played per week (default: {MATCHES_PER_WEEK})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: one per CPU)",
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the bootstrap")
+    args = parser.parse_args()
+
+    updated = run(
+        method=args.method,
+        matches_per_week=args.matches_per_week,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(f"Stored win rate intervals of {updated} builds")
+
+
+if __name__ == "__main__":
+    main()
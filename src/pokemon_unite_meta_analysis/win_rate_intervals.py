@@ -0,0 +1,156 @@
+"""
+Confidence intervals of build win rates.
+
+The builds table only stores win rates, so the number of matches behind a win
+rate is estimated from its true pick rate: a build picked in
+`moveset_item_true_pick_rate` percent of the `MATCHES_PER_WEEK` matches of a
+week was played `pick rate / 100 * MATCHES_PER_WEEK` times. Two interval
+methods are vectorized over every build of a week:
+
+- `wilson`: the analytic Wilson score interval;
+- `bootstrap`: a parametric bootstrap, resampling every build's wins from a
+  binomial distribution `BOOTSTRAP_RESAMPLES` times.
+
+Intervals are bounds on the win rate, in percent. Rarely picked builds get
+wide intervals, so sorting by the lower bound favors win rates backed by
+many matches.
+"""
+
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+# Matches played per week, used to turn true pick rates into sample sizes
+MATCHES_PER_WEEK = int(os.environ.get("MATCHES_PER_WEEK", "100000"))
+
+# Confidence level of the intervals
+CONFIDENCE = 0.95
+
+# Resamples drawn per build by the bootstrap
+BOOTSTRAP_RESAMPLES = 1000
+
+# Two-sided standard normal quantiles of the supported confidence levels
+_Z_SCORES = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+
+
+def sample_sizes(
+    pick_rates: np.ndarray, matches_per_week: int = MATCHES_PER_WEEK
+) -> np.ndarray:
+    """
+    Estimate the number of matches behind every win rate
+
+    Args:
+        pick_rates (np.ndarray): moveset_item_true_pick_rate of every build
+        matches_per_week (int, optional): Matches played per week
+
+    Returns:
+        np.ndarray: Estimated matches, at least 1
+    """
+    pick_rates = np.clip(np.asarray(pick_rates, dtype=np.float64), 0.0, None)
+
+    return np.maximum(np.rint(pick_rates / 100.0 * matches_per_week), 1.0)
+
+
+def wilson_interval(
+    win_rates: np.ndarray,
+    sizes: np.ndarray,
+    confidence: float = CONFIDENCE,
+    seed: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wilson score interval of every win rate
+
+    Args:
+        win_rates (np.ndarray): Win rates, in percent
+        sizes (np.ndarray): Matches behind every win rate
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+        seed (int, optional): Unused, the interval is analytic
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Lower and upper bounds, in percent
+    """
+    z = _Z_SCORES[confidence]
+    p = np.clip(np.asarray(win_rates, dtype=np.float64) / 100.0, 0.0, 1.0)
+    n = np.asarray(sizes, dtype=np.float64)
+
+    denominator = 1.0 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+
+    return (center - margin) * 100.0, (center + margin) * 100.0
+
+
+def bootstrap_interval(
+    win_rates: np.ndarray,
+    sizes: np.ndarray,
+    confidence: float = CONFIDENCE,
+    seed: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parametric bootstrap interval of every win rate
+
+    Args:
+        win_rates (np.ndarray): Win rates, in percent
+        sizes (np.ndarray): Matches behind every win rate
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+        seed (int, optional): Seed of the random generator
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Lower and upper bounds, in percent
+    """
+    rng = np.random.default_rng(seed)
+    p = np.clip(np.asarray(win_rates, dtype=np.float64) / 100.0, 0.0, 1.0)
+    n = np.asarray(sizes, dtype=np.int64)
+
+    # One row of resampled win rates per build
+    wins = rng.binomial(
+        n[:, None], p[:, None], size=(len(p), BOOTSTRAP_RESAMPLES)
+    )
+    resampled = wins / n[:, None] * 100.0
+
+    alpha = (1.0 - confidence) / 2
+    lower, upper = np.quantile(resampled, [alpha, 1.0 - alpha], axis=1)
+
+    return lower, upper
+
+
+INTERVAL_METHODS: dict[str, Callable[..., tuple[np.ndarray, np.ndarray]]] = {
+    "wilson": wilson_interval,
+    "bootstrap": bootstrap_interval,
+}
+
+
+def compute_win_rate_intervals(
+    win_rates: np.ndarray,
+    pick_rates: np.ndarray,
+    method: str = "wilson",
+    matches_per_week: int = MATCHES_PER_WEEK,
+    seed: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the confidence intervals of the win rates of a week
+
+    Args:
+        win_rates (np.ndarray): moveset_item_win_rate of every build
+        pick_rates (np.ndarray): moveset_item_true_pick_rate of every build
+        method (str, optional): One of `INTERVAL_METHODS`. Defaults to
+            "wilson".
+        matches_per_week (int, optional): Matches played per week
+        seed (int, optional): Seed of the bootstrap
+
+    Raises:
+        ValueError: If the method is unknown
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Lower and upper bounds, in percent
+    """
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"Invalid interval method: {method}")
+
+    if len(win_rates) == 0:
+        return np.empty(0), np.empty(0)
+
+    return INTERVAL_METHODS[method](
+        win_rates, sample_sizes(pick_rates, matches_per_week), seed=seed
+    )
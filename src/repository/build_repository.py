@@ -13,9 +13,10 @@ init:
         and setting the table name.
 set_table_name:
     Sets the table name for the repository.
-_create_table:
-    Creates a new table in the database if it does not exist, with columns for
-        Pokémon build data.
+migrate:
+    Applies the versioned schema migrations the database is missing.
+optimize:
+    Refreshes the query planner statistics.
 get_table_names:
     Retrieves a list of table names from the database.
 commit:
@@ -25,19 +26,146 @@ create:
         object.
 get_all_builds:
     Retrieves all builds from the database.
-
-Note that the _create_table method is prefixed with an underscore, indicating
-    that it is intended to be a private method, not part of the public API.
+add_win_rate_interval_columns:
+    Adds the win rate confidence interval columns to the builds table.
+update_win_rate_intervals:
+    Stores the win rate confidence intervals of the builds of a week, and
+        ranks them again.
+sync_week:
+    Applies the row-level changes of an ingested week in a single transaction,
+        skipping weeks whose content hash did not change, and stores the
+        derived metrics and percentile ranks of the week.
+quarantine_builds:
+    Stores the rows of a snapshot file that failed validation.
+archive_weeks:
+    Moves weeks to the attached archive database.
+get_data_version:
+    Retrieves the monotonic data version, bumped by every write.
+sync_caches:
+    Drops the cached data of the weeks another process changed.
+
+Setting the BUILDS_QUERY_LOG environment variable captures every executed
+    statement for the index advisor (see repository.query_advisor).
+
+Weeks older than the ones the API mostly serves can be moved to an archive
+    database (BUILDS_ARCHIVE_DB_PATH, by default 'builds_archive.db' next to
+    the database), attached as 'archive' when it exists. Queries of a week read
+    the hot database first, so the latest weeks never touch the archive, while
+    history queries read both.
 """
 
 import os
 import sqlite3
+from typing import Optional
 
 from entity.build_model import BuildModel
+from pokemon_unite_meta_analysis.build_history import BUILD_HISTORY
+from pokemon_unite_meta_analysis.data_version import DATA_VERSION
+from pokemon_unite_meta_analysis.derived_metrics import (
+    DERIVED_COLUMNS,
+    derived_columns,
+)
+from pokemon_unite_meta_analysis.meta_diff import META_DIFF_CACHE
+from pokemon_unite_meta_analysis.percentile import encode_percentile_ranks
+from pokemon_unite_meta_analysis.search_index import SEARCH_INDEX
+from pokemon_unite_meta_analysis.snapshot_cache import SNAPSHOT_CACHE
+from pokemon_unite_meta_analysis.tier_list import TIER_LIST_CACHE
+from pokemon_unite_meta_analysis.trends import TREND_INDEX
+from repository import migrations
+from repository.query_advisor import QueryLog
 from util.log import setup_custom_logger
 
 LOG = setup_custom_logger("log_repository")
 
+# Stored columns of a build, besides its id, in insertion order
+BUILD_COLUMNS = (
+    "week",
+    "pokemon",
+    "role",
+    "pkm_win_rate",
+    "pkm_pick_rate",
+    "move1",
+    "move2",
+    "moveset_win_rate",
+    "moveset_pick_rate",
+    "moveset_true_pick_rate",
+    "item",
+    "moveset_item_win_rate",
+    "moveset_item_pick_rate",
+    "moveset_item_true_pick_rate",
+)
+
+# Columns identifying a build within its week, as in the UNIQUE constraint
+KEY_COLUMNS = ("pokemon", "move1", "move2", "item")
+
+_INSERT_BUILD = f"""
+    INSERT OR REPLACE INTO builds ({", ".join(BUILD_COLUMNS)})
+    VALUES ({", ".join("?" * len(BUILD_COLUMNS))})
+"""
+
+# Columns a re-ingested build can change
+_VALUE_COLUMNS = tuple(
+    column for column in BUILD_COLUMNS[1:] if column not in KEY_COLUMNS
+)
+
+# The stored win rate interval no longer matches a changed win rate, so it
+# is dropped and derived again from the new rates
+_UPDATE_BUILD = f"""
+    UPDATE builds SET {", ".join(f"{column} = ?" for column in _VALUE_COLUMNS)},
+        win_rate_ci_lower = NULL, win_rate_ci_upper = NULL
+    WHERE id = ?
+"""
+
+
+_UPDATE_DERIVED = f"""
+    UPDATE {{database}}.builds
+    SET {", ".join(f"{column} = ?" for column in DERIVED_COLUMNS)},
+        percentile_ranks = ?
+    WHERE id = ?
+"""
+
+
+def _build_from_row(row: tuple) -> BuildModel:
+    return BuildModel(
+        id=row[0],
+        week=row[1],
+        pokemon=row[2],
+        role=row[3],
+        pokemon_win_rate=row[4],
+        pokemon_pick_rate=row[5],
+        move_1=row[6],
+        move_2=row[7],
+        moveset_win_rate=row[8],
+        moveset_pick_rate=row[9],
+        moveset_true_pick_rate=row[10],
+        item=row[11],
+        moveset_item_win_rate=row[12],
+        moveset_item_pick_rate=row[13],
+        moveset_item_true_pick_rate=row[14],
+        # Only present once the interval columns were added
+        win_rate_ci_lower=row[15] if len(row) > 15 else None,
+        win_rate_ci_upper=row[16] if len(row) > 16 else None,
+        # Only present once the derived metric columns were added
+        weighted_win_rate=row[17] if len(row) > 17 else None,
+        adjusted_win_rate=row[18] if len(row) > 18 else None,
+        win_rate_z_score=row[19] if len(row) > 19 else None,
+        percentile_ranks=row[20] if len(row) > 20 else None,
+    )
+
+
+def default_archive_path(db_path: str) -> str:
+    """
+    Get the default archive database path of a database
+
+    Args:
+        db_path (str): Path of the hot database
+
+    Returns:
+        str: The path with an '_archive' suffix, e.g. 'builds_archive.db'
+    """
+    root, extension = os.path.splitext(db_path)
+    return f"{root}_archive{extension or '.db'}"
+
 
 class BuildRepository:
     """
@@ -49,9 +177,13 @@ class BuildRepository:
         conn (sqlite3.Connection, optional): An existing SQLite connection.
             If None, a new connection is created using the BUILDS_DB_PATH
             environment variable or defaults to 'builds.db'. Defaults to None.
+        archive_path (str, optional): Archive database holding the cold
+            weeks, attached when it exists. If None and no connection is
+            given, the BUILDS_ARCHIVE_DB_PATH environment variable or the
+            database path with an '_archive' suffix. Defaults to None.
     """
 
-    def __init__(self, table_name=None, conn=None):
+    def __init__(self, table_name=None, conn=None, archive_path=None):
         LOG.info("__init__")
         LOG.debug("table_name: %s", table_name)
         LOG.debug("conn: %s", conn)
@@ -63,13 +195,27 @@ class BuildRepository:
             db_path = os.environ.get("BUILDS_DB_PATH", "builds.db")
             LOG.debug("db_path: %s", db_path)
             conn = sqlite3.connect(db_path)
+            if archive_path is None:
+                archive_path = os.environ.get(
+                    "BUILDS_ARCHIVE_DB_PATH", default_archive_path(db_path)
+                )
+
+        query_log = os.environ.get("BUILDS_QUERY_LOG")
+        if query_log:
+            conn.set_trace_callback(QueryLog(query_log))
 
         self.conn: sqlite3.Connection = conn
         self.cursor: sqlite3.Cursor = self.conn.cursor()
         self.table_name: str = "builds"
 
+        self.archive_path: Optional[str] = archive_path
+        self._archive_attached = False
+        if archive_path is not None and os.path.exists(archive_path):
+            self._attach_archive()
+
     def __enter__(self):
-        """Context manager entry"""
+        """Context manager entry, dropping the caches of stale weeks"""
+        self.sync_caches()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -116,33 +262,37 @@ class BuildRepository:
 
         self.table_name = table_name
 
-    def _create_table(self) -> None:
+    def migrate(self) -> list[str]:
         """
-        Create the table if it does not exist
+        Apply the schema migrations the database is missing
+
+        Returns:
+            list[str]: Descriptions of the migrations applied
         """
-        LOG.info("create_table")
+        LOG.info("migrate")
 
-        self.cursor.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS {self.table_name} (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pokemon TEXT,
-                role TEXT,
-                pkm_win_rate REAL,
-                pkm_pick_rate REAL,
-                move1 TEXT,
-                move2 TEXT,
-                moveset_win_rate REAL,
-                moveset_pick_rate REAL,
-                moveset_true_pick_rate REAL,
-                item TEXT,
-                moveset_item_win_rate REAL,
-                moveset_item_pick_rate REAL,
-                moveset_item_true_pick_rate REAL
-            )
-            """
-        )
-        self.conn.commit()
+        applied = migrations.migrate(self.conn)
+        # The archive is read together with the main database, so both keep
+        # the same columns
+        if self._archive_attached:
+            self._migrate_archive()
+
+        return applied
+
+    def _migrate_archive(self) -> None:
+        archive = sqlite3.connect(self.archive_path)
+        try:
+            migrations.migrate(archive)
+        finally:
+            archive.close()
+
+    def optimize(self) -> None:
+        """
+        Refresh the query planner statistics with ANALYZE and PRAGMA optimize
+        """
+        LOG.info("optimize")
+
+        migrations.optimize(self.conn)
 
     def get_table_names(self) -> list[str]:
         """
@@ -173,6 +323,23 @@ class BuildRepository:
 
         self.conn.commit()
 
+    def _invalidate_week(self, week: str) -> None:
+        """
+        Drop the data cached for a week after it changed
+
+        Its cached snapshot, diffs, build history, tier lists and trends are
+        stale and its names must be indexed for search again.
+
+        Args:
+            week (str): The week identifier
+        """
+        SNAPSHOT_CACHE.invalidate(week)
+        SEARCH_INDEX.invalidate(week)
+        META_DIFF_CACHE.invalidate(week)
+        BUILD_HISTORY.invalidate(week)
+        TIER_LIST_CACHE.invalidate(week)
+        TREND_INDEX.invalidate(week)
+
     def create(self, build: BuildModel, week: str, commit=True) -> bool:
         """
         Create a new build
@@ -192,14 +359,7 @@ class BuildRepository:
 
         try:
             self.cursor.execute(
-                """
-                INSERT OR REPLACE INTO builds 
-                (week, pokemon, role, pkm_win_rate, pkm_pick_rate, move1, move2,
-                 moveset_win_rate, moveset_pick_rate, moveset_true_pick_rate,
-                 item, moveset_item_win_rate, moveset_item_pick_rate,
-                 moveset_item_true_pick_rate)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _INSERT_BUILD,
                 (
                     week,
                     build.pokemon,
@@ -218,9 +378,19 @@ class BuildRepository:
                 ),
             )
 
+            version = self._bump_data_version(week)
+            # The stored builds no longer match the ingested content
+            self.cursor.execute(
+                "UPDATE week_metadata SET content_hash = NULL WHERE week = ?",
+                (week,),
+            )
+
             if commit:
                 LOG.info("Committing changes to the database")
                 self.conn.commit()
+                DATA_VERSION.record(version, week)
+
+            self._invalidate_week(week)
 
         except sqlite3.Error as error:
             LOG.error("SQLite error creating build: %s", error)
@@ -246,40 +416,485 @@ class BuildRepository:
 
         if week:
             self.cursor.execute("SELECT * FROM builds WHERE week = ?", (week,))
+            query = self.cursor.fetchall()
+            # Only weeks missing from the hot database are read from the
+            # archive
+            if not query and self._archive_attached:
+                self.cursor.execute(
+                    "SELECT * FROM archive.builds WHERE week = ?", (week,)
+                )
+                query = self.cursor.fetchall()
+        elif self._archive_attached:
+            self.cursor.execute(
+                "SELECT * FROM archive.builds UNION ALL SELECT * FROM main.builds"
+            )
+            query = self.cursor.fetchall()
         else:
             self.cursor.execute("SELECT * FROM builds")
-
-        query = self.cursor.fetchall()
+            query = self.cursor.fetchall()
         LOG.debug("query: %s", query)
 
-        return [
-            BuildModel(
-                id=build[0],
-                week=build[1],
-                pokemon=build[2],
-                role=build[3],
-                pokemon_win_rate=build[4],
-                pokemon_pick_rate=build[5],
-                move_1=build[6],
-                move_2=build[7],
-                moveset_win_rate=build[8],
-                moveset_pick_rate=build[9],
-                moveset_true_pick_rate=build[10],
-                item=build[11],
-                moveset_item_win_rate=build[12],
-                moveset_item_pick_rate=build[13],
-                moveset_item_true_pick_rate=build[14],
-            )
-            for build in query
+        return [_build_from_row(row) for row in query]
+
+    def _week_builds(self, database: str, week: str) -> list[BuildModel]:
+        self.cursor.execute(
+            f"SELECT * FROM {database}.builds WHERE week = ?", (week,)
+        )
+        return [_build_from_row(row) for row in self.cursor.fetchall()]
+
+    def add_win_rate_interval_columns(self) -> None:
+        """
+        Add the win rate confidence interval columns if they do not exist
+        """
+        LOG.info("add_win_rate_interval_columns")
+
+        migrations.add_win_rate_interval_columns(self.cursor)
+        self.conn.commit()
+
+    def update_win_rate_intervals(
+        self, week: str, intervals: list[tuple[int, float, float]]
+    ) -> None:
+        """
+        Store the win rate confidence intervals of the builds of a week
+
+        Args:
+            week (str): The week identifier
+            intervals (list[tuple[int, float, float]]): (build id, lower
+                bound, upper bound) of every build
+        """
+        LOG.info("update_win_rate_intervals")
+        LOG.debug("week: %s", week)
+        LOG.debug("intervals: %s", len(intervals))
+
+        self.migrate()
+        parameters = [
+            (lower, upper, build_id) for build_id, lower, upper in intervals
         ]
+        # Archived builds keep their ids, which are never reused
+        databases = ("main", "archive") if self._archive_attached else ("main",)
+        for database in databases:
+            self.cursor.executemany(
+                f"""
+                UPDATE {database}.builds
+                SET win_rate_ci_lower = ?, win_rate_ci_upper = ?
+                WHERE id = ?
+                """,
+                parameters,
+            )
+        # The percentile ranks of the lower bounds changed
+        self._store_derived_metrics(week)
+        version = self._bump_data_version(week)
+        self.conn.commit()
+
+        DATA_VERSION.record(version, week)
+        self._invalidate_week(week)
+
+    def _create_metadata_tables(self) -> None:
+        """
+        Create the data version tables if they do not exist
+        """
+        migrations.create_metadata_tables(self.cursor)
 
-    def get_available_weeks(self) -> list[str]:
-        """Get list of available weeks"""
+    def _bump_data_version(self, week: str) -> int:
+        """
+        Bump the data version after the builds of a week changed
+
+        Runs in the transaction of the write, which must be committed by the
+        caller.
+
+        Args:
+            week (str): The week identifier
+
+        Returns:
+            int: The new data version, also stored as the week's version
+        """
+        self._create_metadata_tables()
         self.cursor.execute(
-            "SELECT DISTINCT week FROM builds ORDER BY week DESC"
+            """
+            INSERT INTO metadata (key, value) VALUES ('data_version', 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+            """
+        )
+        self.cursor.execute(
+            "SELECT value FROM metadata WHERE key = 'data_version'"
+        )
+        version = self.cursor.fetchone()[0]
+        self.cursor.execute(
+            """
+            INSERT INTO week_metadata (week, data_version) VALUES (?, ?)
+            ON CONFLICT(week) DO UPDATE SET data_version = excluded.data_version
+            """,
+            (week, version),
         )
+
+        return version
+
+    def get_data_version(self) -> int:
+        """
+        Get the data version, bumped by every write to the builds
+
+        Returns:
+            int: The data version, 0 if nothing was written yet
+        """
+        try:
+            self.cursor.execute(
+                "SELECT value FROM metadata WHERE key = 'data_version'"
+            )
+        except sqlite3.OperationalError:
+            return 0
+
+        row = self.cursor.fetchone()
+        return 0 if row is None else row[0]
+
+    def get_content_hash(self, week: str) -> Optional[str]:
+        """
+        Get the content hash of the builds of a week, as last ingested
+
+        Args:
+            week (str): The week identifier
+
+        Returns:
+            str, optional: The hash, or None if the week was not ingested or
+                was written since
+        """
+        try:
+            self.cursor.execute(
+                "SELECT content_hash FROM week_metadata WHERE week = ?",
+                (week,),
+            )
+        except sqlite3.OperationalError:
+            return None
+
+        row = self.cursor.fetchone()
+        return None if row is None else row[0]
+
+    def sync_week(
+        self, week: str, rows: list[tuple], content_hash: str
+    ) -> Optional[tuple[int, int, int]]:
+        """
+        Store the ingested builds of a week as row-level changes
+
+        Builds are matched on `KEY_COLUMNS`: new builds are inserted, changed
+        ones updated in place, keeping their id, and missing ones deleted, in
+        a single transaction. If an operation fails, the transaction is
+        rolled back and the week keeps its previous builds. The schema is
+        migrated first if needed.
+
+        Args:
+            week (str): The week identifier
+            rows (list[tuple]): Values of every build, in the order of
+                `BUILD_COLUMNS` without the week
+            content_hash (str): Content hash of the rows
+
+        Returns:
+            tuple[int, int, int], optional: Number of builds inserted, updated
+                and deleted, or None if the content hash did not change
+        """
+        LOG.info("sync_week")
+        LOG.debug("week: %s", week)
+        LOG.debug("rows: %s", len(rows))
+
+        if self.get_content_hash(week) == content_hash:
+            LOG.info("Week unchanged, skipping")
+            return None
+
+        self.migrate()
+
+        columns = ", ".join(BUILD_COLUMNS[1:])
+        self.cursor.execute(
+            f"SELECT id, {columns} FROM builds WHERE week = ?", (week,)
+        )
+        key_positions = [
+            BUILD_COLUMNS.index(column) - 1 for column in KEY_COLUMNS
+        ]
+        value_positions = [
+            BUILD_COLUMNS.index(column) - 1 for column in _VALUE_COLUMNS
+        ]
+
+        def key(row: tuple) -> tuple:
+            return tuple(row[position] for position in key_positions)
+
+        fetched = self.cursor.fetchall()
+        # An archived week is moved back to the hot database first
+        restore = not fetched and self._archive_attached
+        if restore:
+            self.cursor.execute(
+                f"SELECT id, {columns} FROM archive.builds WHERE week = ?",
+                (week,),
+            )
+            fetched = self.cursor.fetchall()
+            restore = bool(fetched)
+
+        stored = {key(row[1:]): row for row in fetched}
+        ingested = {key(row): row for row in rows}
+
+        inserts = [
+            (week, *row)
+            for build_key, row in ingested.items()
+            if build_key not in stored
+        ]
+        updates = [
+            (
+                *(row[position] for position in value_positions),
+                stored[build_key][0],
+            )
+            for build_key, row in ingested.items()
+            if build_key in stored and tuple(stored[build_key][1:]) != row
+        ]
+        deletes = [
+            (row[0],)
+            for build_key, row in stored.items()
+            if build_key not in ingested
+        ]
+
+        changed = bool(inserts or updates or deletes)
+
+        # Commits on success, rolls back on error
+        with self.conn:
+            if restore:
+                stored_columns = self._stored_columns()
+                self.cursor.execute(
+                    f"""
+                    INSERT INTO main.builds ({stored_columns})
+                    SELECT {stored_columns} FROM archive.builds WHERE week = ?
+                    """,
+                    (week,),
+                )
+                self.cursor.execute(
+                    "DELETE FROM archive.builds WHERE week = ?", (week,)
+                )
+            if changed:
+                self.cursor.executemany(
+                    "DELETE FROM builds WHERE id = ?", deletes
+                )
+                self.cursor.executemany(_UPDATE_BUILD, updates)
+                self.cursor.executemany(_INSERT_BUILD, inserts)
+                self._store_derived_metrics(week)
+                version = self._bump_data_version(week)
+            else:
+                # Only the hash is new, e.g. after builds were created one by
+                # one, so the data version stays
+                self._create_metadata_tables()
+                version = self.get_data_version()
+            self.cursor.execute(
+                """
+                INSERT INTO week_metadata (week, content_hash, data_version)
+                VALUES (?, ?, ?)
+                ON CONFLICT(week) DO UPDATE
+                SET content_hash = excluded.content_hash
+                """,
+                (week, content_hash, version),
+            )
+
+        if changed:
+            DATA_VERSION.record(version, week)
+            self._invalidate_week(week)
+
+        return len(inserts), len(updates), len(deletes)
+
+    def _store_derived_metrics(self, week: str) -> None:
+        """
+        Store the derived metrics and percentile ranks of the builds of a week
+
+        They depend on every build of the week, so all of them are updated.
+        Runs in the transaction of the write, which must be committed by the
+        caller.
+
+        Args:
+            week (str): The week identifier
+        """
+        LOG.info("Storing derived metrics")
+        LOG.debug("week: %s", week)
+
+        database = "main"
+        builds = self._week_builds(database, week)
+        if not builds and self._archive_attached:
+            database = "archive"
+            builds = self._week_builds(database, week)
+
+        columns = derived_columns(builds)
+        self.cursor.executemany(
+            _UPDATE_DERIVED.format(database=database),
+            zip(
+                *(columns[column].tolist() for column in DERIVED_COLUMNS),
+                encode_percentile_ranks(builds, columns),
+                (build.id for build in builds),
+            ),
+        )
+
+    def quarantine_builds(
+        self, week: str, source: str, rows: list[tuple[int, str, str]]
+    ) -> None:
+        """
+        Store the rows of a snapshot file that failed validation
+
+        The rows replace the ones of the previous import of the file.
+
+        Args:
+            week (str): The week identifier
+            source (str): Name of the snapshot file
+            rows (list[tuple[int, str, str]]): (position in the file, failed
+                checks, raw values as JSON) of every row
+        """
+        LOG.info("quarantine_builds")
+        LOG.debug("week: %s", week)
+        LOG.debug("rows: %s", len(rows))
+
+        self.migrate()
+        # Commits on success, rolls back on error
+        with self.conn:
+            self.cursor.execute(
+                "DELETE FROM quarantine WHERE week = ? AND source = ?",
+                (week, source),
+            )
+            self.cursor.executemany(
+                """
+                INSERT INTO quarantine (week, source, position, reasons, data)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(week, source, *row) for row in rows],
+            )
+
+    def sync_caches(self) -> None:
+        """
+        Drop the cached data of the weeks another process changed
+
+        Costs a single query when the data version did not move.
+        """
+        version = self.get_data_version()
+        if DATA_VERSION.is_current(version):
+            return
+
+        LOG.info("Data version changed, syncing caches")
+        LOG.debug("version: %s", version)
+
+        try:
+            self.cursor.execute("SELECT week, data_version FROM week_metadata")
+            weeks = dict(self.cursor.fetchall())
+        except sqlite3.OperationalError:
+            weeks = {}
+
+        for week in DATA_VERSION.update(version, weeks):
+            self._invalidate_week(week)
+
+    def get_available_weeks(self, include_archive: bool = True) -> list[str]:
+        """
+        Get list of available weeks
+
+        Args:
+            include_archive (bool, optional): Whether to include the weeks of
+                the attached archive. Defaults to True.
+
+        Returns:
+            list[str]: Weeks, latest first
+        """
+        if include_archive and self._archive_attached:
+            self.cursor.execute(
+                """
+                SELECT week FROM main.builds
+                UNION SELECT week FROM archive.builds
+                ORDER BY week DESC
+                """
+            )
+        else:
+            self.cursor.execute(
+                "SELECT DISTINCT week FROM builds ORDER BY week DESC"
+            )
         return [row[0] for row in self.cursor.fetchall()]
 
+    def _attach_archive(self) -> None:
+        LOG.info("Attaching archive database")
+        LOG.debug("archive_path: %s", self.archive_path)
+
+        self.cursor.execute(
+            "ATTACH DATABASE ? AS archive", (self.archive_path,)
+        )
+        self._archive_attached = True
+
+    def _stored_columns(self) -> str:
+        self.cursor.execute("PRAGMA main.table_info(builds)")
+        return ", ".join(row[1] for row in self.cursor.fetchall())
+
+    def archive_weeks(self, weeks: list[str]) -> int:
+        """
+        Move weeks to the archive database
+
+        The builds keep their ids and are moved in a single transaction
+        spanning both databases, which also bumps the data version of every
+        week, then both files are compacted with VACUUM.
+        Archived weeks stay readable through the attached archive, and
+        re-ingesting one moves it back.
+
+        Args:
+            weeks (list[str]): The week identifiers
+
+        Raises:
+            ValueError: If no archive database is configured
+
+        Returns:
+            int: Number of builds moved
+        """
+        LOG.info("archive_weeks")
+        LOG.debug("weeks: %s", weeks)
+
+        if self.archive_path is None:
+            raise ValueError("No archive database configured")
+
+        self.migrate()
+        if not self._archive_attached:
+            self._migrate_archive()
+            self._attach_archive()
+
+        if not weeks:
+            return 0
+
+        columns = self._stored_columns()
+        placeholders = ", ".join("?" * len(weeks))
+        # Commits on success, rolls back on error, in both databases
+        with self.conn:
+            self.cursor.execute(
+                f"""
+                INSERT OR REPLACE INTO archive.builds ({columns})
+                SELECT {columns} FROM main.builds
+                WHERE week IN ({placeholders})
+                """,
+                weeks,
+            )
+            self.cursor.execute(
+                f"DELETE FROM main.builds WHERE week IN ({placeholders})",
+                weeks,
+            )
+            moved = self.cursor.rowcount
+            # Readers keyed on the data version see the weeks moved
+            versions = [(self._bump_data_version(week), week) for week in weeks]
+
+        for version, week in versions:
+            DATA_VERSION.record(version, week)
+            self._invalidate_week(week)
+
+        # The hot database shrinks to the remaining weeks
+        self.cursor.execute("VACUUM main")
+        self.cursor.execute("VACUUM archive")
+
+        return moved
+
+    def get_stored_items(self) -> list[str]:
+        """
+        Get the distinct items of the stored builds, archived ones included
+
+        Returns:
+            list[str]: Sorted items, empty if nothing was written yet
+        """
+        query = "SELECT item FROM builds"
+        if self._archive_attached:
+            query = "SELECT item FROM main.builds UNION SELECT item FROM archive.builds"
+        try:
+            self.cursor.execute(f"SELECT DISTINCT item FROM ({query})")
+        except sqlite3.OperationalError:
+            return []
+
+        return sorted(row[0] for row in self.cursor.fetchall() if row[0])
+
     def get_all_pokemons_by_table(self, table_name) -> list[str]:
         """
         Get all pokemons from a table
@@ -293,7 +908,14 @@ class BuildRepository:
         LOG.info("get_all_pokemons_by_table")
         LOG.debug("table_name: %s", table_name)
 
-        self.cursor.execute(f"SELECT pokemon FROM {table_name}")
+        if table_name == self.table_name and self._archive_attached:
+            # Pokémon of archived weeks only are still served by /builds
+            self.cursor.execute(
+                "SELECT pokemon FROM archive.builds "
+                "UNION ALL SELECT pokemon FROM main.builds"
+            )
+        else:
+            self.cursor.execute(f"SELECT pokemon FROM {table_name}")
         query = self.cursor.fetchall()
 
         return [pokemon[0] for pokemon in query]
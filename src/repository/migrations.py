@@ -0,0 +1,409 @@
+"""
+Versioned schema migrations of the builds database.
+
+The schema version is stored in `PRAGMA user_version`: 0 for a database that
+was never migrated, then the number of `MIGRATIONS` applied. Each migration is
+applied in its own transaction together with the version bump, so an
+interrupted run leaves the database at the last complete version, and running
+the migrations again is a no-op.
+
+Migrations tolerate the schemas that existed before they did (the tables
+created by hand or by earlier versions of the repository), so they can run on
+any existing database.
+
+Usage:
+    pkmn-unite-db migrate [--no-analyze]
+    pkmn-unite-db optimize
+    pkmn-unite-db advise QUERY_LOG
+    pkmn-unite-db archive (--before WEEK | --keep N) [--archive PATH]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Callable
+
+from repository.custom_log import LOG
+
+BUILDS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS builds (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week TEXT NOT NULL,
+        pokemon TEXT,
+        role TEXT,
+        pkm_win_rate REAL,
+        pkm_pick_rate REAL,
+        move1 TEXT,
+        move2 TEXT,
+        moveset_win_rate REAL,
+        moveset_pick_rate REAL,
+        moveset_true_pick_rate REAL,
+        item TEXT,
+        moveset_item_win_rate REAL,
+        moveset_item_pick_rate REAL,
+        moveset_item_true_pick_rate REAL,
+        UNIQUE(week, pokemon, move1, move2, item)
+    )
+"""
+
+METADATA_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS metadata (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS week_metadata (
+        week TEXT PRIMARY KEY,
+        content_hash TEXT,
+        data_version INTEGER NOT NULL
+    )
+    """,
+)
+
+QUARANTINE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS quarantine (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week TEXT NOT NULL,
+        source TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        reasons TEXT NOT NULL,
+        data TEXT NOT NULL
+    )
+"""
+
+# Columns of the UNIQUE key of a build
+BUILD_KEY = ("week", "pokemon", "move1", "move2", "item")
+
+# Columns of the builds table before the interval columns, in order
+_BASE_COLUMNS = (
+    "id",
+    "week",
+    "pokemon",
+    "role",
+    "pkm_win_rate",
+    "pkm_pick_rate",
+    "move1",
+    "move2",
+    "moveset_win_rate",
+    "moveset_pick_rate",
+    "moveset_true_pick_rate",
+    "item",
+    "moveset_item_win_rate",
+    "moveset_item_pick_rate",
+    "moveset_item_true_pick_rate",
+)
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> list[str]:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _has_build_key(cursor: sqlite3.Cursor) -> bool:
+    cursor.execute("PRAGMA index_list(builds)")
+    unique_indexes = [row[1] for row in cursor.fetchall() if row[2]]
+
+    for index in unique_indexes:
+        cursor.execute(f"PRAGMA index_info({index})")
+        if tuple(row[2] for row in cursor.fetchall()) == BUILD_KEY:
+            return True
+
+    return False
+
+
+def _create_builds_table(cursor: sqlite3.Cursor) -> None:
+    columns = _columns(cursor, "builds")
+
+    if columns and "week" not in columns:
+        # Tables created without a week column could not store any build,
+        # but their rows are kept aside rather than dropped
+        LOG.warning("Keeping builds table without week as builds_legacy")
+        cursor.execute("ALTER TABLE builds RENAME TO builds_legacy")
+    elif columns and not _has_build_key(cursor):
+        LOG.warning("Rebuilding builds table with its UNIQUE key")
+        cursor.execute("ALTER TABLE builds RENAME TO builds_unkeyed")
+        cursor.execute(BUILDS_SCHEMA)
+        copied = ", ".join(_BASE_COLUMNS)
+        # Duplicated builds keep their last row
+        cursor.execute(
+            f"INSERT OR REPLACE INTO builds ({copied}) "
+            f"SELECT {copied} FROM builds_unkeyed ORDER BY id"
+        )
+        cursor.execute("DROP TABLE builds_unkeyed")
+
+    cursor.execute(BUILDS_SCHEMA)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_builds_week ON builds(week)")
+
+
+def create_metadata_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the data version tables if they do not exist
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the database
+    """
+    for statement in METADATA_SCHEMA:
+        cursor.execute(statement)
+
+
+def add_win_rate_interval_columns(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the win rate confidence interval columns if they do not exist
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the database
+    """
+    columns = _columns(cursor, "builds")
+
+    for column in ("win_rate_ci_lower", "win_rate_ci_upper"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE builds ADD COLUMN {column} REAL")
+
+
+def _add_derived_metric_columns(cursor: sqlite3.Cursor) -> None:
+    # Filled when a week is ingested, NULL for builds stored before
+    columns = _columns(cursor, "builds")
+
+    for column in (
+        "weighted_win_rate",
+        "adjusted_win_rate",
+        "win_rate_z_score",
+    ):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE builds ADD COLUMN {column} REAL")
+
+
+def _add_percentile_ranks_column(cursor: sqlite3.Cursor) -> None:
+    # Float32 ranks of every percentile column, filled when a week is
+    # ingested
+    if "percentile_ranks" not in _columns(cursor, "builds"):
+        cursor.execute("ALTER TABLE builds ADD COLUMN percentile_ranks BLOB")
+
+
+def _create_identity_index(cursor: sqlite3.Cursor) -> None:
+    # Looking a build up across weeks cannot use the UNIQUE key, which
+    # starts with the week
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_builds_identity
+        ON builds(pokemon, move1, move2, item, week)
+        """
+    )
+
+
+def _create_quarantine_table(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(QUARANTINE_SCHEMA)
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_quarantine_week
+        ON quarantine(week, source)
+        """
+    )
+
+
+# Migration N brings the schema from version N - 1 to version N
+MIGRATIONS: tuple[tuple[str, Callable[[sqlite3.Cursor], None]], ...] = (
+    ("builds table with week and UNIQUE build key", _create_builds_table),
+    ("data version metadata tables", create_metadata_tables),
+    ("win rate interval columns", add_win_rate_interval_columns),
+    ("build identity index", _create_identity_index),
+    ("quarantine table of rejected rows", _create_quarantine_table),
+    ("derived metric columns", _add_derived_metric_columns),
+    ("percentile ranks column", _add_percentile_ranks_column),
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Get the schema version of a database
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database
+
+    Returns:
+        int: Number of migrations applied
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> list[str]:
+    """
+    Apply the migrations a database is missing
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database
+
+    Raises:
+        ValueError: If the database has a newer schema than this code
+
+    Returns:
+        list[str]: Descriptions of the migrations applied
+    """
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise ValueError(
+            f"Database schema version {version} is newer than {SCHEMA_VERSION}"
+        )
+
+    applied = []
+    for number, (description, step) in enumerate(
+        MIGRATIONS[version:], start=version + 1
+    ):
+        LOG.info("Applying migration %s: %s", number, description)
+
+        cursor = conn.cursor()
+        # DDL does not open a transaction implicitly
+        cursor.execute("BEGIN")
+        try:
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        conn.commit()
+
+        applied.append(description)
+
+    return applied
+
+
+def optimize(conn: sqlite3.Connection, analyze: bool = True) -> None:
+    """
+    Refresh the query planner statistics
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database
+        analyze (bool, optional): Whether to run a full ANALYZE before
+            `PRAGMA optimize`. Defaults to True.
+    """
+    LOG.info("Optimizing database")
+
+    if analyze:
+        conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
+def _archive(args: argparse.Namespace) -> None:
+    # Imported here, the repository depends on this module
+    from repository.build_repository import (
+        BuildRepository,
+        default_archive_path,
+    )
+
+    archive_path = args.archive or os.environ.get(
+        "BUILDS_ARCHIVE_DB_PATH", default_archive_path(args.db)
+    )
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.keep is not None and args.keep < 0:
+            raise ValueError("--keep must not be negative")
+        repo = BuildRepository(conn=conn, archive_path=archive_path)
+        weeks = repo.get_available_weeks(include_archive=False)
+        if args.keep is not None:
+            weeks = weeks[args.keep :]
+        else:
+            weeks = [week for week in weeks if week < args.before]
+
+        moved = repo.archive_weeks(weeks)
+    except (OSError, ValueError, sqlite3.Error) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print(f"Archived {moved} builds of {len(weeks)} weeks to {archive_path}")
+    for week in sorted(weeks):
+        print(f"  {week}")
+
+
+def main():
+    """Command line entry point of the database tool."""
+    # Imported here, the advisor is only needed by its command
+    from repository.query_advisor import advise, format_report
+
+    parser = argparse.ArgumentParser(
+        description="Migrate, optimize and inspect the builds database"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.environ.get("BUILDS_DB_PATH", "builds.db"),
+        help="Database path (default: BUILDS_DB_PATH or builds.db)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="Apply missing migrations, then ANALYZE"
+    )
+    migrate_parser.add_argument(
+        "--no-analyze",
+        action="store_true",
+        help="Skip ANALYZE and PRAGMA optimize",
+    )
+    commands.add_parser("optimize", help="Run ANALYZE and PRAGMA optimize")
+    advise_parser = commands.add_parser(
+        "advise",
+        help="Replay a query log with EXPLAIN QUERY PLAN and report scans",
+    )
+    advise_parser.add_argument(
+        "query_log",
+        type=Path,
+        help="Query log captured with BUILDS_QUERY_LOG",
+    )
+    archive_parser = commands.add_parser(
+        "archive",
+        help="Move old weeks to the archive database, then VACUUM both",
+    )
+    cutoff = archive_parser.add_mutually_exclusive_group(required=True)
+    cutoff.add_argument(
+        "--before", metavar="WEEK", help="Archive the weeks before WEEK"
+    )
+    cutoff.add_argument(
+        "--keep",
+        type=int,
+        metavar="N",
+        help="Archive every week but the latest N",
+    )
+    archive_parser.add_argument(
+        "--archive",
+        help="Archive database path (default: BUILDS_ARCHIVE_DB_PATH or the "
+        "database path with an _archive suffix)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "archive":
+        _archive(args)
+        return
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.command == "migrate":
+            before = schema_version(conn)
+            for description in migrate(conn):
+                print(f"Applied: {description}")
+            print(
+                f"Schema version {before} -> {schema_version(conn)} "
+                f"(latest {SCHEMA_VERSION})"
+            )
+            if not args.no_analyze:
+                optimize(conn)
+        elif args.command == "optimize":
+            optimize(conn)
+            print("Statistics refreshed")
+        else:
+            print(format_report(advise(conn, args.query_log)))
+    except (OSError, ValueError, sqlite3.Error) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Index advisor replaying captured queries with EXPLAIN QUERY PLAN.
+
+Setting the `BUILDS_QUERY_LOG` environment variable to a file path makes every
+`BuildRepository` append the statements it executes to that file, one per
+line, with their parameters bound (see `QueryLog`). Run the API, the
+dashboard or a job with it set to capture the queries of a real workload.
+
+The advisor then groups the captured statements by pattern (literals replaced
+by `?`), replays one statement of every pattern with `EXPLAIN QUERY PLAN`
+against the database, and reports:
+
+- `full_scan`: a table read row by row without an index (`SCAN builds`);
+- `temp_btree`: a sort or DISTINCT that needs a temporary B-tree.
+
+Full scans of a filtered query come with the columns of its WHERE clause, the
+candidate columns of an index. Scans of a query without WHERE clause read
+the whole table by design and are only reported as such.
+"""
+
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+
+from repository.custom_log import LOG
+
+# Statements worth explaining, the others do not read tables
+_EXPLAINED = ("SELECT", "UPDATE", "DELETE", "INSERT", "REPLACE", "WITH")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_WHERE = re.compile(
+    r"\bWHERE\b(.*?)(?:\bGROUP\b|\bORDER\b|\bLIMIT\b|$)", re.IGNORECASE
+)
+_PREDICATE_COLUMN = re.compile(
+    r"\b(\w+)\s*(?:=|<|>|!=|\bIN\b|\bLIKE\b|\bBETWEEN\b)", re.IGNORECASE
+)
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+class QueryLog:
+    """
+    SQLite trace callback appending every statement to a file
+
+    Args:
+        path (str): File the statements are appended to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, statement: str) -> None:
+        line = " ".join(statement.split())
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+def query_pattern(statement: str) -> str:
+    """
+    Get the pattern of a statement, with its literals replaced by `?`
+
+    Args:
+        statement (str): SQL statement
+
+    Returns:
+        str: The pattern, with single spaces between tokens
+    """
+    pattern = _STRING.sub("?", statement)
+    pattern = _NUMBER.sub("?", pattern)
+
+    return " ".join(pattern.split())
+
+
+def _where_columns(statement: str) -> list[str]:
+    match = _WHERE.search(_STRING.sub("?", statement))
+    if match is None:
+        return []
+
+    columns = _PREDICATE_COLUMN.findall(match.group(1))
+    return list(dict.fromkeys(column for column in columns))
+
+
+def explain(conn: sqlite3.Connection, statement: str) -> list[str]:
+    """
+    Get the query plan of a statement
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database
+        statement (str): SQL statement, with its parameters bound
+
+    Raises:
+        sqlite3.Error: If the statement cannot be planned
+
+    Returns:
+        list[str]: Detail of every step of the plan
+    """
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+    return [row[3] for row in rows]
+
+
+def _findings(statement: str, plan: list[str]) -> list[dict]:
+    findings = []
+    for detail in plan:
+        scan = _FULL_SCAN.match(detail)
+        if scan is not None:
+            columns = _where_columns(statement)
+            findings.append(
+                {
+                    "type": "full_scan",
+                    "table": scan.group(1),
+                    "detail": detail,
+                    "index_columns": columns,
+                }
+            )
+        elif "USE TEMP B-TREE" in detail:
+            findings.append({"type": "temp_btree", "detail": detail})
+
+    return findings
+
+
+def advise(conn: sqlite3.Connection, query_log: Path) -> list[dict]:
+    """
+    Replay a captured query log with EXPLAIN QUERY PLAN
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database to plan against
+        query_log (Path): Query log captured with `BUILDS_QUERY_LOG`
+
+    Raises:
+        OSError: If the query log cannot be read
+
+    Returns:
+        list[dict]: Pattern, executions, plan and findings of every captured
+            query pattern, the most executed first
+    """
+    LOG.info("Advising indexes")
+    LOG.debug("query_log: %s", query_log)
+
+    executions: Counter[str] = Counter()
+    examples: dict[str, str] = {}
+    with open(query_log, encoding="utf-8") as file:
+        for line in file:
+            statement = line.strip()
+            if not statement.upper().startswith(_EXPLAINED):
+                continue
+            pattern = query_pattern(statement)
+            executions[pattern] += 1
+            examples.setdefault(pattern, statement)
+
+    report = []
+    for pattern, count in executions.most_common():
+        try:
+            plan = explain(conn, examples[pattern])
+        except sqlite3.Error as error:
+            # e.g. a table that only exists in another database
+            report.append(
+                {
+                    "pattern": pattern,
+                    "executions": count,
+                    "plan": [],
+                    "findings": [],
+                    "error": str(error),
+                }
+            )
+            continue
+
+        report.append(
+            {
+                "pattern": pattern,
+                "executions": count,
+                "plan": plan,
+                "findings": _findings(examples[pattern], plan),
+            }
+        )
+
+    return report
+
+
+def format_report(report: list[dict]) -> str:
+    """
+    Format an advisor report for the terminal
+
+    Args:
+        report (list[dict]): Report returned by `advise`
+
+    Returns:
+        str: One block per query pattern, then a summary
+    """
+    lines = []
+    scans = 0
+    for entry in report:
+        lines.append(f"[{entry['executions']}x] {entry['pattern']}")
+        if "error" in entry:
+            lines.append(f"    not planned: {entry['error']}")
+        for detail in entry["plan"]:
+            lines.append(f"    plan: {detail}")
+        for finding in entry["findings"]:
+            if finding["type"] == "full_scan":
+                scans += 1
+                columns = finding["index_columns"]
+                advice = (
+                    f"index candidate ({', '.join(columns)})"
+                    if columns
+                    else "reads the whole table"
+                )
+                lines.append(f"    FULL SCAN of {finding['table']}: {advice}")
+            else:
+                lines.append(f"    TEMP B-TREE: {finding['detail']}")
+
+    lines.append(
+        f"{len(report)} query patterns, {scans} with a full table scan"
+    )
+
+    return "\n".join(lines)
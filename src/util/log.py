@@ -28,13 +28,17 @@ class ClassNameFormatter(logging.Formatter):
     """
 
     def format(self, record: logging.LogRecord):
-        stack = inspect.stack()
-        caller_frame = stack[8]
-        scope = caller_frame[0]
+        # Walk up to the caller of the logging call without inspect.stack(),
+        # which reads the source of every frame and dominates bulk jobs
+        scope = inspect.currentframe()
+        for _ in range(8):
+            if scope is None:
+                break
+            scope = scope.f_back
 
         class_name = ""
 
-        if "self" in caller_frame[0].f_locals.keys():
+        if scope is not None and "self" in scope.f_locals:
             class_name: str = scope.f_locals["self"].__class__.__name__
             class_name.strip().strip('"')
             class_name = f"{class_name}."
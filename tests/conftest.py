@@ -10,9 +10,35 @@ import pytest
 
 from entity.build_model import BuildModel
 from entity.build_response import BuildResponse
+from pokemon_unite_meta_analysis.build_history import BUILD_HISTORY
+from pokemon_unite_meta_analysis.data_version import DATA_VERSION
+from pokemon_unite_meta_analysis.meta_diff import META_DIFF_CACHE
+from pokemon_unite_meta_analysis.search_index import SEARCH_INDEX
+from pokemon_unite_meta_analysis.snapshot_cache import SNAPSHOT_CACHE
+from pokemon_unite_meta_analysis.tier_list import TIER_LIST_CACHE
+from pokemon_unite_meta_analysis.trends import TREND_INDEX
 from repository.build_repository import BuildRepository
 
 
+@pytest.fixture(autouse=True)
+def clear_snapshot_cache():
+    """Fixture dropping cached week data between tests"""
+    caches = (
+        SNAPSHOT_CACHE,
+        SEARCH_INDEX,
+        META_DIFF_CACHE,
+        BUILD_HISTORY,
+        TIER_LIST_CACHE,
+        TREND_INDEX,
+        DATA_VERSION,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
 @pytest.fixture
 def sample_week() -> str:
     """Fixture providing a sample week identifier"""
@@ -180,3 +180,19 @@ async def test_get_logs():
     for log_entry in data["available_logs"]:
         assert "name" in log_entry
         assert "path" in log_entry
+
+
+@pytest.mark.asyncio
+async def test_get_meta_pokemon():
+    """Test GET /meta/pokemon aggregates every build of the week"""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        week = (await ac.get("/weeks")).json()[0]
+        builds = (await ac.get(f"/builds?week={week}&top_n=0")).json()
+        response = await ac.get(f"/meta/pokemon?week={week}")
+    assert response.status_code == 200
+    data = response.json()
+    assert sum(r["build_count"] for r in data) == len(builds)
+    assert {r["name"] for r in data} == {b["pokemon"] for b in builds}
+    assert all(r["best_build"]["pokemon"] == r["name"] for r in data)
@@ -0,0 +1,172 @@
+import os
+import sqlite3
+
+import pytest
+
+from pokemon_unite_meta_analysis.data_version import content_hash
+from repository.build_repository import BuildRepository, default_archive_path
+
+ROW = (
+    "Pikachu",
+    "Attacker",
+    55.0,
+    20.0,
+    "Thunderbolt",
+    "Volt Tackle",
+    52.0,
+    50.0,
+    10.0,
+    "Purify",
+    53.0,
+    40.0,
+    4.0,
+)
+
+WEEKS = ("Y2025m09d14", "Y2025m09d21", "Y2025m09d28")
+
+
+def _row(item: str) -> tuple:
+    return ROW[:9] + (item,) + ROW[10:]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    conn = sqlite3.connect(tmp_path / "builds.db")
+    repo = BuildRepository(
+        conn=conn, archive_path=str(tmp_path / "builds_archive.db")
+    )
+    for week in WEEKS:
+        rows = [_row("Purify"), _row(week)]
+        repo.sync_week(week, rows, content_hash(rows))
+    yield repo
+    conn.close()
+
+
+def _count(repo: BuildRepository, database: str) -> int:
+    return repo.conn.execute(
+        f"SELECT COUNT(*) FROM {database}.builds"
+    ).fetchone()[0]
+
+
+def test_default_archive_path():
+    assert default_archive_path("data/builds.db") == "data/builds_archive.db"
+    assert default_archive_path("builds") == "builds_archive.db"
+
+
+def test_archive_weeks_moves_builds(repository):
+    # Arrange
+    ids = {b.item: b.id for b in repository.get_all_builds(WEEKS[0])}
+    version = repository.get_data_version()
+
+    # Act
+    moved = repository.archive_weeks(list(WEEKS[:2]))
+
+    # Assert
+    assert moved == 4
+    assert _count(repository, "main") == 2
+    assert _count(repository, "archive") == 4
+    assert repository.get_available_weeks() == list(reversed(WEEKS))
+    assert repository.get_available_weeks(include_archive=False) == [WEEKS[2]]
+    archived = {b.item: b.id for b in repository.get_all_builds(WEEKS[0])}
+    assert archived == ids
+    assert len(repository.get_all_builds()) == 6
+    assert repository.get_data_version() == version + 2
+
+
+def test_archive_is_attached_when_it_exists(repository, tmp_path):
+    # Arrange
+    repository.archive_weeks([WEEKS[0]])
+
+    # Act
+    reopened = BuildRepository(
+        conn=sqlite3.connect(tmp_path / "builds.db"),
+        archive_path=str(tmp_path / "builds_archive.db"),
+    )
+
+    # Assert
+    assert reopened.get_available_weeks() == list(reversed(WEEKS))
+    assert len(reopened.get_all_builds(WEEKS[0])) == 2
+    reopened.conn.close()
+
+
+def test_sync_week_restores_archived_week(repository):
+    # Arrange
+    repository.archive_weeks([WEEKS[0]])
+    ids = {b.item: b.id for b in repository.get_all_builds(WEEKS[0])}
+    rows = [_row("Purify"), _row("Tail")]
+
+    # Act
+    changes = repository.sync_week(WEEKS[0], rows, content_hash(rows))
+
+    # Assert
+    assert changes == (1, 0, 1)
+    assert _count(repository, "archive") == 0
+    builds = {b.item: b.id for b in repository.get_all_builds(WEEKS[0])}
+    assert builds["Purify"] == ids["Purify"]
+    assert sorted(builds) == ["Purify", "Tail"]
+
+
+def test_update_win_rate_intervals_reaches_archived_builds(repository):
+    # Arrange
+    repository.archive_weeks([WEEKS[0]])
+    build = repository.get_all_builds(WEEKS[0])[0]
+
+    # Act
+    repository.update_win_rate_intervals(WEEKS[0], [(build.id, 50.0, 60.0)])
+
+    # Assert
+    updated = {b.id: b for b in repository.get_all_builds(WEEKS[0])}
+    assert updated[build.id].win_rate_ci_lower == 50.0
+    assert updated[build.id].win_rate_ci_upper == 60.0
+
+
+def test_archive_weeks_without_archive(build_repository, sample_week):
+    with pytest.raises(ValueError, match="No archive"):
+        build_repository.archive_weeks([sample_week])
+
+
+def test_archive_weeks_nothing_to_move(repository, tmp_path):
+    # Act
+    moved = repository.archive_weeks([])
+
+    # Assert
+    assert moved == 0
+    assert os.path.exists(tmp_path / "builds_archive.db")
+    assert _count(repository, "main") == 6
+
+
+def test_get_stored_items_includes_archive(repository):
+    # Arrange
+    repository.archive_weeks([WEEKS[0]])
+
+    # Act
+    items = repository.get_stored_items()
+
+    # Assert
+    assert items == sorted(("Purify", *WEEKS))
+
+
+def test_get_all_pokemons_includes_archive(repository):
+    # Arrange
+    rows = [("Snorlax",) + ROW[1:]]
+    repository.sync_week("Y2025m09d07", rows, content_hash(rows))
+
+    # Act
+    repository.archive_weeks(["Y2025m09d07"])
+    pokemons = repository.get_all_pokemons_by_table("builds")
+
+    # Assert
+    assert sorted(set(pokemons)) == ["Pikachu", "Snorlax"]
+    assert len(pokemons) == 7
+
+
+def test_archived_builds_keep_derived_metrics(repository):
+    # Arrange
+    stored = repository.get_all_builds(WEEKS[0])
+
+    # Act
+    repository.archive_weeks([WEEKS[0]])
+
+    # Assert
+    assert repository.get_all_builds(WEEKS[0]) == stored
+    assert all(build.adjusted_win_rate is not None for build in stored)
@@ -0,0 +1,114 @@
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.build_history import (
+    BuildHistoryIndex,
+    build_key,
+)
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+def _snapshots():
+    return {
+        "w1": WeekSnapshot(
+            "w1",
+            [
+                create_build_response(
+                    id=1,
+                    week="w1",
+                    pokemon="Pikachu",
+                    moveset_item_win_rate=50.0,
+                    moveset_item_true_pick_rate=2.0,
+                ),
+                create_build_response(
+                    id=2,
+                    week="w1",
+                    pokemon="Snorlax",
+                    moveset_item_true_pick_rate=4.0,
+                ),
+            ],
+        ),
+        "w2": WeekSnapshot(
+            "w2",
+            [
+                create_build_response(
+                    id=3,
+                    week="w2",
+                    pokemon="Pikachu",
+                    moveset_item_win_rate=52.0,
+                    moveset_item_true_pick_rate=6.0,
+                ),
+            ],
+        ),
+    }
+
+
+def test_build_key_ignores_case_and_spacing():
+    # Assert
+    assert build_key("Pikachu", "Thunderbolt", "Volt  Tackle", "Purify") == (
+        build_key(" pikachu", "THUNDERBOLT", "volt tackle", "purify ")
+    )
+
+
+def test_build_history_series():
+    # Arrange
+    index = BuildHistoryIndex()
+    snapshots = _snapshots()
+    index.sync(["w2", "w1"], snapshots.__getitem__)
+
+    # Act
+    pikachu, snorlax = index.history(
+        [
+            build_key("pikachu", "thunderbolt", "volt tackle", "purify"),
+            build_key("snorlax", "thunderbolt", "volt tackle", "purify"),
+        ]
+    )
+
+    # Assert
+    assert index.weeks == ("w1", "w2")
+    assert pikachu.pokemon == "Pikachu"
+    assert pikachu.role == "Attacker"
+    assert pikachu.ids == [1, 3]
+    assert pikachu.moveset_item_win_rate == [50.0, 52.0]
+    assert pikachu.moveset_item_true_pick_rate == [2.0, 6.0]
+    assert pikachu.popularity == [2, 1]
+    assert snorlax.ids == [2, None]
+    assert snorlax.moveset_item_win_rate[1] is None
+    assert snorlax.popularity == [1, None]
+
+
+def test_build_history_unknown_build():
+    # Arrange
+    index = BuildHistoryIndex()
+    snapshots = _snapshots()
+    index.sync(["w1", "w2"], snapshots.__getitem__)
+
+    pikachu = build_key("pikachu", "thunderbolt", "volt tackle", "purify")
+
+    # Act
+    histories = index.history([build_key("Mew", "a", "b", "c"), pikachu])
+
+    # Assert
+    assert [history.pokemon for history in histories] == ["Pikachu"]
+    assert index.history([build_key("Mew", "a", "b", "c")]) == []
+
+
+def test_build_history_rebuilds_only_when_stale():
+    # Arrange
+    index = BuildHistoryIndex()
+    snapshots = _snapshots()
+    loaded = []
+
+    def load_snapshot(week):
+        loaded.append(week)
+        return snapshots[week]
+
+    # Act
+    index.sync(["w1", "w2"], load_snapshot)
+    index.sync(["w1", "w2"], load_snapshot)
+    index.invalidate("w2")
+    index.sync(["w1", "w2"], load_snapshot)
+    index.sync(["w1"], load_snapshot)
+
+    # Assert
+    assert loaded == ["w1", "w2", "w1", "w2", "w1"]
+    assert index.weeks == ("w1",)
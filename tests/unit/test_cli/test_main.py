@@ -9,7 +9,9 @@ from cli.main import (  # noqa: E402
     colorize_role,
     get_builds,
     get_health,
+    get_tiers,
     main,
+    recommend_team,
 )
 
 
@@ -263,6 +265,121 @@ class TestGetBuilds:
         )
 
 
+class TestGetTiers:
+    """Tests for get_tiers function."""
+
+    def test_get_tiers_success(self, mock_httpx_get, capsys):
+        """Test printing a tier list of builds."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {
+            "tiers": [
+                {
+                    "tier": "S",
+                    "min_value": 54.2,
+                    "max_value": 54.2,
+                    "entries": [
+                        {
+                            "pokemon": "Pikachu",
+                            "role": "Attacker",
+                            "build_id": 7,
+                            "move_1": "Thunderbolt",
+                            "move_2": "Volt Tackle",
+                            "item": "Purify",
+                            "value": 54.2,
+                        }
+                    ],
+                },
+                {
+                    "tier": "A",
+                    "min_value": None,
+                    "max_value": None,
+                    "entries": [],
+                },
+            ]
+        }
+        mock_httpx_get.return_value = mock_response
+
+        with patch("cli.main.API_BASE_URL", "http://localhost:8000"):
+            get_tiers({"level": "build"})
+
+        out = capsys.readouterr().out
+        assert "S  (54.20 - 54.20)" in out
+        assert "Pikachu [Thunderbolt / Volt Tackle @ Purify]" in out
+        assert "A  -" in out
+        mock_httpx_get.assert_called_once_with(
+            "http://localhost:8000/meta/tiers", params={"level": "build"}
+        )
+
+    def test_get_tiers_failure(self, mock_httpx_get):
+        """Test tier list failure."""
+        mock_httpx_get.side_effect = Exception("Connection failed")
+
+        with pytest.raises(SystemExit) as exc_info:
+            get_tiers()
+
+        assert exc_info.value.code == 1
+
+
+class TestRecommendTeam:
+    """Tests for recommend_team function."""
+
+    def test_recommend_team_success(self, mock_httpx_get, capsys):
+        """Test printing recommended teams."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {
+            "teams": [
+                {
+                    "score": 54.2,
+                    "members": [
+                        {
+                            "pokemon": "Pikachu",
+                            "role": "Attacker",
+                            "build_id": 7,
+                            "move_1": "Thunderbolt",
+                            "move_2": "Volt Tackle",
+                            "item": "Purify",
+                            "value": 54.2,
+                        }
+                    ],
+                }
+            ]
+        }
+        mock_httpx_get.return_value = mock_response
+
+        with patch("cli.main.API_BASE_URL", "http://localhost:8000"):
+            recommend_team({"team_size": 1, "roles": "Attacker"})
+
+        out = capsys.readouterr().out
+        assert "#1  score 54.20" in out
+        assert "Pikachu [Thunderbolt / Volt Tackle @ Purify]" in out
+        mock_httpx_get.assert_called_once_with(
+            "http://localhost:8000/teams/recommend",
+            params={"team_size": 1, "roles": "Attacker"},
+        )
+
+    def test_recommend_team_no_team(self, mock_httpx_get, capsys):
+        """Test the message printed when no team satisfies the constraints."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"teams": []}
+        mock_httpx_get.return_value = mock_response
+
+        recommend_team()
+
+        assert "No team satisfies the constraints." in capsys.readouterr().out
+
+    def test_recommend_team_failure(self, mock_httpx_get):
+        """Test team recommendation failure."""
+        mock_httpx_get.side_effect = Exception("Connection failed")
+
+        with pytest.raises(SystemExit) as exc_info:
+            recommend_team()
+
+        assert exc_info.value.code == 1
+
+
 class TestMain:
     """Tests for main function."""
 
@@ -395,3 +512,41 @@ class TestMain:
             with pytest.raises(SystemExit) as exc_info:
                 main()
             assert exc_info.value.code == 0
+
+    def test_main_tiers_command(self, mock_httpx_get):
+        """Test main with tiers command."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"tiers": []}
+        mock_httpx_get.return_value = mock_response
+
+        with patch(
+            "sys.argv",
+            ["cli", "tiers", "--method", "kmeans", "--relevance", "top_n"],
+        ):
+            with patch("cli.main.API_BASE_URL", "http://localhost:8000"):
+                main()
+
+        mock_httpx_get.assert_called_once_with(
+            "http://localhost:8000/meta/tiers",
+            params={"method": "kmeans", "relevance": "top_n"},
+        )
+
+    def test_main_team_command(self, mock_httpx_get):
+        """Test main with team command."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"teams": []}
+        mock_httpx_get.return_value = mock_response
+
+        with patch(
+            "sys.argv",
+            ["cli", "team", "--roles", "Attacker,Support", "--top-k", "5"],
+        ):
+            with patch("cli.main.API_BASE_URL", "http://localhost:8000"):
+                main()
+
+        mock_httpx_get.assert_called_once_with(
+            "http://localhost:8000/teams/recommend",
+            params={"roles": "Attacker,Support", "top_k": 5},
+        )
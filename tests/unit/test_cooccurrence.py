@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from pokemon_unite_meta_analysis.cooccurrence import (
+    CooccurrenceMatrix,
+    build_cooccurrence,
+)
+
+
+@pytest.fixture
+def matrix():
+    return CooccurrenceMatrix(
+        np.array(["Potion", "Potion", "XSpeed", "Potion"]),
+        np.array(["Pikachu", "Snorlax", "Pikachu", "Pikachu"]),
+        np.array([50.0, 40.0, 60.0, 56.0]),
+        np.array([1.0, 5.0, 2.0, 3.0]),
+    )
+
+
+def test_cooccurrence_cells(matrix):
+    # Assert
+    assert len(matrix) == 3
+    assert matrix.build_count.tolist() == [2, 1, 1]
+    assert matrix.true_pick_rate.tolist() == [4.0, 5.0, 2.0]
+    assert matrix.win_rate[0] == pytest.approx(54.5)
+
+
+def test_cooccurrence_top(matrix):
+    # Act
+    entries = matrix.top(k=2)
+
+    # Assert
+    assert [(e.row, e.column) for e in entries] == [
+        ("Potion", "Snorlax"),
+        ("Potion", "Pikachu"),
+    ]
+
+
+def test_cooccurrence_row_and_column_lookup(matrix):
+    # Act
+    row = matrix.top(matrix.row_cells(" potion"), weight="win_rate")
+    column = matrix.top(matrix.column_cells("PIKACHU"), weight="build_count")
+
+    # Assert
+    assert [e.column for e in row] == ["Pikachu", "Snorlax"]
+    assert [e.row for e in column] == ["Potion", "XSpeed"]
+    assert matrix.row_cells("Eject Button") is None
+    assert matrix.column_cells("Mew") is None
+
+
+def test_build_cooccurrence_counts_both_move_slots():
+    # Act
+    matrix = build_cooccurrence(
+        "item_move",
+        {
+            "item": np.array(["Potion"]),
+            "move_1": np.array(["Thunderbolt"]),
+            "move_2": np.array(["Volt Tackle"]),
+        },
+        np.array([50.0]),
+        np.array([1.0]),
+    )
+
+    # Assert
+    assert matrix.column_labels.tolist() == ["Thunderbolt", "Volt Tackle"]
+    assert matrix.build_count.tolist() == [1, 1]
+
+
+def test_cooccurrence_empty():
+    # Act
+    matrix = CooccurrenceMatrix(
+        np.array([]), np.array([]), np.array([]), np.array([])
+    )
+
+    # Assert
+    assert len(matrix) == 0
+    assert matrix.top(k=5) == []
@@ -0,0 +1,112 @@
+import numpy as np
+
+from pokemon_unite_meta_analysis.data_quality import (
+    ROW_CHECKS,
+    check_rows,
+    check_week,
+    failure_reasons,
+    item_vocabulary,
+    rate_summary,
+)
+
+IDENTITY = ("pokemon", "move1", "move2", "item")
+
+
+def _names(*pokemon: str) -> dict[str, np.ndarray]:
+    n = len(pokemon)
+    return {
+        "pokemon": np.array(pokemon, dtype=object),
+        "role": np.array(["Attacker"] * n, dtype=object),
+        "move1": np.array(["Thunderbolt"] * n, dtype=object),
+        "move2": np.array(["Volt Tackle"] * n, dtype=object),
+        "item": np.array(["Purify"] * n, dtype=object),
+    }
+
+
+def _rates(**columns) -> dict[str, np.ndarray]:
+    return {
+        column: np.array(values, dtype=np.float64)
+        for column, values in columns.items()
+    }
+
+
+def test_check_rows_true_pick_rate_above_pick_rate():
+    # Arrange
+    names = _names("Pikachu", "Absol", "Lucario")
+    rates = _rates(
+        pkm_pick_rate=[20.0, 20.0, 20.0],
+        moveset_true_pick_rate=[10.0, 25.0, 10.0],
+        moveset_item_true_pick_rate=[4.0, 4.0, 10.04],
+    )
+
+    # Act
+    failures = check_rows(names, names, rates, IDENTITY)
+
+    # Assert
+    assert set(failures) == set(ROW_CHECKS)
+    assert failures["true_pick_rate_above_pick_rate"].tolist() == [
+        False,
+        True,
+        False,
+    ]
+
+
+def test_check_rows_duplicates_ignore_invalid_rows():
+    # Arrange
+    names = _names("Pikachu", "Pikachu", "Pikachu")
+    rates = _rates(
+        pkm_pick_rate=[20.0, 20.0, 120.0],
+        moveset_true_pick_rate=[10.0, 10.0, 10.0],
+        moveset_item_true_pick_rate=[4.0, 4.0, 4.0],
+    )
+
+    # Act
+    failures = check_rows(names, names, rates, IDENTITY)
+    reasons = failure_reasons(failures)
+
+    # Assert
+    assert reasons.tolist() == ["duplicate_build", "", "rate_out_of_range"]
+
+
+def test_check_week_warnings():
+    # Arrange
+    pokemon = np.array(["Pikachu", "Pikachu", "Absol"], dtype=object)
+    pick_rates = np.array([20.0, 20.0, 990.0])
+    true_pick_rates = np.array([15.0, 10.0, 5.0])
+
+    # Act
+    warnings = check_week(pokemon, pick_rates, true_pick_rates)
+
+    # Assert
+    assert [warning["check"] for warning in warnings] == [
+        "pick_rate_total",
+        "pokemon_true_pick_rate_total",
+    ]
+    assert warnings[0]["value"] == 1010.0
+    assert warnings[1]["pokemon"] == ["Pikachu"]
+
+
+def test_check_week_without_builds():
+    assert check_week(np.array([]), np.array([]), np.array([])) == []
+
+
+def test_rate_summary():
+    # Act
+    summary = rate_summary(
+        _rates(pkm_win_rate=[50.0, 54.0, 99.0]),
+        np.array([True, True, False]),
+    )
+
+    # Assert
+    assert summary == {"pkm_win_rate": {"min": 50.0, "mean": 52.0, "max": 54.0}}
+
+
+def test_item_vocabulary_adds_stored_items():
+    # Act
+    vocabulary = item_vocabulary(["FocusBand", "xspeed", "item"])
+
+    # Assert
+    assert vocabulary["focusband"] == "FocusBand"
+    assert vocabulary["xspeed"] == "XSpeed"
+    assert vocabulary["???"] == "???"
+    assert "item" not in vocabulary
@@ -0,0 +1,238 @@
+import numpy as np
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.data_version import (
+    DATA_VERSION,
+    DataVersionTracker,
+    content_hash,
+)
+from pokemon_unite_meta_analysis.derived_metrics import (
+    DERIVED_COLUMNS,
+    with_derived_metrics,
+)
+from pokemon_unite_meta_analysis.percentile import (
+    PERCENTILE_COLUMNS,
+    decode_percentile_ranks,
+)
+from pokemon_unite_meta_analysis.snapshot_cache import SNAPSHOT_CACHE
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+ROW = (
+    "Pikachu",
+    "Attacker",
+    55.0,
+    20.0,
+    "Thunderbolt",
+    "Volt Tackle",
+    52.0,
+    50.0,
+    10.0,
+    "Purify",
+    53.0,
+    40.0,
+    4.0,
+)
+
+
+def _row(**changes) -> tuple:
+    positions = {"role": 1, "item": 9, "moveset_item_win_rate": 10}
+    row = list(ROW)
+    for column, value in changes.items():
+        row[positions[column]] = value
+    return tuple(row)
+
+
+def test_content_hash_ignores_order():
+    # Arrange
+    rows = [_row(), _row(item="XSpeed")]
+
+    # Act & Assert
+    assert content_hash(rows) == content_hash(reversed(rows))
+    assert content_hash(rows) != content_hash(rows[:1])
+
+
+def test_tracker_update_returns_changed_weeks():
+    # Arrange
+    tracker = DataVersionTracker()
+    tracker.update(2, {"Y2025m09d21": 1, "Y2025m09d28": 2})
+
+    # Act
+    changed = tracker.update(4, {"Y2025m09d28": 4, "Y2025m10d05": 3})
+
+    # Assert
+    assert changed == ["Y2025m09d21", "Y2025m09d28", "Y2025m10d05"]
+    assert tracker.is_current(4)
+
+
+def test_tracker_record_only_follows_consecutive_versions():
+    # Arrange
+    tracker = DataVersionTracker()
+    tracker.update(1, {"Y2025m09d28": 1})
+
+    # Act
+    tracker.record(2, "Y2025m09d28")
+    tracker.record(5, "Y2025m10d05")
+
+    # Assert
+    assert tracker.is_current(2)
+    assert tracker.update(5, {"Y2025m09d28": 2, "Y2025m10d05": 5}) == [
+        "Y2025m10d05"
+    ]
+
+
+def test_sync_week_applies_row_level_changes(build_repository, sample_week):
+    # Arrange
+    rows = [_row(), _row(item="XSpeed"), _row(item="Potion")]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+    ids = {b.item: b.id for b in build_repository.get_all_builds(sample_week)}
+    changed = [
+        _row(moveset_item_win_rate=60.0),
+        _row(item="XSpeed"),
+        _row(item="Tail"),
+    ]
+
+    # Act
+    changes = build_repository.sync_week(
+        sample_week, changed, content_hash(changed)
+    )
+    builds = {b.item: b for b in build_repository.get_all_builds(sample_week)}
+
+    # Assert
+    assert changes == (1, 1, 1)
+    assert sorted(builds) == ["Purify", "Tail", "XSpeed"]
+    assert builds["Purify"].id == ids["Purify"]
+    assert builds["Purify"].moveset_item_win_rate == 60.0
+    assert builds["XSpeed"].id == ids["XSpeed"]
+    assert build_repository.get_data_version() == 2
+
+
+def test_sync_week_derives_new_interval_of_changed_build(
+    build_repository, sample_week
+):
+    # Arrange
+    rows = [_row(moveset_item_win_rate=55.0)]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+    build = build_repository.get_all_builds(sample_week)[0]
+    build_repository.update_win_rate_intervals(
+        sample_week, [(build.id, 54.0, 56.0)]
+    )
+    changed = [_row(moveset_item_win_rate=35.0)]
+
+    # Act
+    build_repository.sync_week(sample_week, changed, content_hash(changed))
+    stored = build_repository.get_all_builds(sample_week)[0]
+
+    # Assert
+    assert stored.win_rate_ci_lower < 35.0 < stored.win_rate_ci_upper
+
+
+def test_sync_week_stores_derived_metrics(build_repository, sample_week):
+    # Arrange
+    rows = [
+        _row(moveset_item_win_rate=55.0),
+        _row(item="XSpeed", moveset_item_win_rate=45.0),
+    ]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+    changed = [rows[0], _row(item="XSpeed", moveset_item_win_rate=50.0)]
+
+    # Act
+    build_repository.sync_week(sample_week, changed, content_hash(changed))
+    stored = build_repository.get_all_builds(sample_week)
+
+    # Assert
+    assert stored == with_derived_metrics(
+        [
+            build.model_copy(update={name: None for name in DERIVED_COLUMNS})
+            for build in stored
+        ]
+    )
+    assert [build.win_rate_z_score for build in stored] == [1.0, -1.0]
+
+
+def test_update_win_rate_intervals_ranks_builds_again(
+    build_repository, sample_week
+):
+    # Arrange
+    rows = [_row(), _row(item="XSpeed")]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+    first, second = build_repository.get_all_builds(sample_week)
+
+    # Act
+    build_repository.update_win_rate_intervals(
+        sample_week, [(first.id, 40.0, 60.0), (second.id, 50.0, 56.0)]
+    )
+    stored = build_repository.get_all_builds(sample_week)
+
+    # Assert
+    column = PERCENTILE_COLUMNS.index("win_rate_ci_lower")
+    ranks = decode_percentile_ranks([b.percentile_ranks for b in stored])
+    assert ranks[:, column].tolist() == [50.0, 100.0]
+    unstored = [b.model_copy(update={"percentile_ranks": None}) for b in stored]
+    assert np.array_equal(
+        ranks, WeekSnapshot(sample_week, unstored).percentiles
+    )
+
+
+def test_sync_week_skips_unchanged_week(build_repository, sample_week):
+    # Arrange
+    rows = [_row()]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+    snapshot = SNAPSHOT_CACHE.get(
+        sample_week, lambda: build_repository.get_all_builds(sample_week)
+    )
+
+    # Act
+    changes = build_repository.sync_week(sample_week, rows, content_hash(rows))
+
+    # Assert
+    assert changes is None
+    assert build_repository.get_data_version() == 1
+    assert SNAPSHOT_CACHE.get(sample_week, list) is snapshot
+
+
+def test_create_bumps_version_and_clears_hash(build_repository, sample_week):
+    # Arrange
+    rows = [_row()]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+
+    # Act
+    build_repository.create(
+        create_build_response(id=0, week=sample_week, item="XSpeed"),
+        week=sample_week,
+    )
+
+    # Assert
+    assert build_repository.get_data_version() == 2
+    assert build_repository.get_content_hash(sample_week) is None
+
+
+def test_sync_caches_drops_weeks_changed_elsewhere(
+    build_repository, sample_week
+):
+    # Arrange
+    rows = [_row()]
+    build_repository.sync_week(sample_week, rows, content_hash(rows))
+    build_repository.sync_caches()
+    snapshot = SNAPSHOT_CACHE.get(
+        sample_week, lambda: build_repository.get_all_builds(sample_week)
+    )
+    # Another process changes the week
+    DATA_VERSION.clear()
+    DATA_VERSION.update(1, {sample_week: 1})
+    build_repository.cursor.execute(
+        "UPDATE metadata SET value = 2 WHERE key = 'data_version'"
+    )
+    build_repository.cursor.execute(
+        "UPDATE week_metadata SET data_version = 2 WHERE week = ?",
+        (sample_week,),
+    )
+
+    # Act
+    build_repository.sync_caches()
+
+    # Assert
+    assert DATA_VERSION.is_current(2)
+    reloaded = SNAPSHOT_CACHE.get(
+        sample_week, lambda: build_repository.get_all_builds(sample_week)
+    )
+    assert reloaded is not snapshot
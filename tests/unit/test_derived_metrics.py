@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.derived_metrics import (
+    DERIVED_COLUMNS,
+    DERIVED_METRICS,
+    compute_derived_metrics,
+    derived_columns,
+    with_derived_metrics,
+)
+
+
+def test_weighted_win_rate():
+    # Act
+    metrics = compute_derived_metrics(
+        np.array(["w1", "w1"]), np.array([50.0, 60.0]), np.array([2.0, 0.5])
+    )
+
+    # Assert
+    assert metrics["weighted_win_rate"].tolist() == pytest.approx([1.0, 0.3])
+
+
+def test_z_score_is_computed_per_week():
+    # Arrange
+    weeks = np.array(["w1", "w2", "w1", "w2", "w1"])
+    win_rates = np.array([40.0, 70.0, 50.0, 30.0, 60.0])
+
+    # Act
+    z_score = compute_derived_metrics(weeks, win_rates, np.ones(5))[
+        "win_rate_z_score"
+    ]
+
+    # Assert
+    std = np.std([40.0, 50.0, 60.0])
+    assert z_score.tolist() == pytest.approx(
+        [-10 / std, 1.0, 0.0, -1.0, 10 / std]
+    )
+
+
+def test_z_score_of_constant_week_is_zero():
+    # Act
+    z_score = compute_derived_metrics(
+        np.array(["w1", "w1"]), np.array([50.0, 50.0]), np.ones(2)
+    )["win_rate_z_score"]
+
+    # Assert
+    assert z_score.tolist() == [0.0, 0.0]
+
+
+def test_adjusted_win_rate_shrinks_rare_builds():
+    # Arrange
+    weeks = np.array(["w1"] * 4)
+    win_rates = np.array([50.0, 50.0, 50.0, 80.0])
+    pick_rates = np.array([10.0, 10.0, 10.0, 0.1])
+
+    # Act
+    adjusted = compute_derived_metrics(weeks, win_rates, pick_rates)[
+        "adjusted_win_rate"
+    ]
+
+    # Assert
+    prior = (3 * 10.0 * 50.0 + 0.1 * 80.0) / 30.1
+    assert adjusted[:3].tolist() == pytest.approx(
+        [(10.0 * 50.0 + 10.0 * prior) / 20.0] * 3
+    )
+    assert adjusted[3] == pytest.approx((0.1 * 80.0 + 10.0 * prior) / 10.1)
+    assert adjusted[3] < 55.0
+
+
+def test_adjusted_win_rate_at_median_pick_rate_is_halfway():
+    # Arrange
+    weeks = np.array(["w1"] * 3)
+    win_rates = np.array([40.0, 60.0, 50.0])
+    pick_rates = np.array([1.0, 2.0, 3.0])
+
+    # Act
+    adjusted = compute_derived_metrics(weeks, win_rates, pick_rates)[
+        "adjusted_win_rate"
+    ]
+
+    # Assert
+    prior = (40.0 + 120.0 + 150.0) / 6.0
+    assert adjusted[1] == pytest.approx((60.0 + prior) / 2)
+
+
+def test_compute_derived_metrics_empty():
+    # Act
+    metrics = compute_derived_metrics(np.array([]), np.array([]), np.array([]))
+
+    # Assert
+    assert set(metrics) == set(DERIVED_METRICS)
+    assert all(len(values) == 0 for values in metrics.values())
+
+
+def test_with_derived_metrics_copies_builds(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(id=1, week=sample_week),
+        create_build_response(id=2, week=sample_week),
+    ]
+
+    # Act
+    result = with_derived_metrics(builds)
+
+    # Assert
+    assert [b.id for b in result] == [1, 2]
+    assert all(b.adjusted_win_rate is not None for b in result)
+    assert builds[0].adjusted_win_rate is None
+
+
+def test_with_derived_metrics_keeps_stored_metrics(sample_week):
+    # Arrange
+    stored = with_derived_metrics(
+        [
+            create_build_response(id=1, week=sample_week),
+            create_build_response(id=2, week=sample_week),
+        ]
+    )
+
+    # Act
+    result = with_derived_metrics(stored)
+
+    # Assert
+    assert all(a is b for a, b in zip(result, stored))
+
+
+def test_derived_columns_keep_stored_intervals(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(id=1, week=sample_week).model_copy(
+            update={"win_rate_ci_lower": 50.0, "win_rate_ci_upper": 56.0}
+        ),
+        create_build_response(id=2, week=sample_week),
+    ]
+
+    # Act
+    columns = derived_columns(builds)
+
+    # Assert
+    assert set(columns) == set(DERIVED_COLUMNS)
+    assert columns["win_rate_ci_lower"][0] == 50.0
+    assert columns["win_rate_ci_upper"][0] == 56.0
+    assert (
+        columns["win_rate_ci_lower"][1] < 53.0 < columns["win_rate_ci_upper"][1]
+    )
@@ -0,0 +1,316 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pokemon_unite_meta_analysis.data_quality import item_vocabulary
+from pokemon_unite_meta_analysis.ingest import (
+    _parse,
+    _parse_safely,
+    normalize_builds,
+    run,
+    snapshot_files,
+)
+
+HEADER = (
+    "pokemon,role,pkm_win_rate,pkm_pick_rate,move1,move2,moveset_win_rate,"
+    "moveset_pick_rate,moveset_true_pick_rate,item,moveset_item_win_rate,"
+    "moveset_item_pick_rate,moveset_item_true_pick_rate"
+)
+
+
+def _frame(**overrides) -> pd.DataFrame:
+    row = {
+        "pokemon": "Pikachu",
+        "role": "Attacker",
+        "pokemon_win_rate": "55.0",
+        "pokemon_pick_rate": "20.0",
+        "move_1": "Thunderbolt",
+        "move_2": "Volt Tackle",
+        "moveset_win_rate": "52.0",
+        "moveset_pick_rate": "50.0",
+        "item": "Purify",
+        "moveset_item_win_rate": "53.0",
+        "moveset_item_pick_rate": "40.0",
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def test_normalize_builds_names_and_derived_rates():
+    # Arrange
+    frame = _frame(pokemon="  Mr.   Mime ", role="supporter")
+
+    # Act
+    builds, quarantined, report = normalize_builds(frame)
+
+    # Assert
+    assert quarantined == []
+    assert report["valid"] == 1
+    build = builds.iloc[0]
+    assert build["pokemon"] == "Mr. Mime"
+    assert build["role"] == "Support"
+    assert build["move1"] == "Thunderbolt"
+    assert build["moveset_true_pick_rate"] == pytest.approx(10.0)
+    assert build["moveset_item_true_pick_rate"] == pytest.approx(4.0)
+
+
+@pytest.mark.parametrize(
+    ("overrides", "reasons"),
+    [
+        ({"role": "Tank"}, "unknown_role"),
+        ({"item": "Leftovers"}, "unknown_item"),
+        ({"pokemon": "  "}, "missing_name"),
+        ({"moveset_win_rate": "n/a"}, "rate_not_a_number"),
+        (
+            {"moveset_item_pick_rate": "120"},
+            "rate_out_of_range,true_pick_rate_above_pick_rate",
+        ),
+        ({"pokemon_win_rate": "-1"}, "rate_out_of_range"),
+    ],
+)
+def test_normalize_builds_quarantines_invalid_rows(overrides, reasons):
+    # Arrange
+    overrides = {"item": "XSpeed", **overrides}
+    frame = pd.concat([_frame(), _frame(**overrides)], ignore_index=True)
+
+    # Act
+    builds, quarantined, report = normalize_builds(frame)
+
+    # Assert
+    assert builds["item"].tolist() == ["Purify"]
+    assert len(quarantined) == 1
+    position, failed, data = quarantined[0]
+    assert (position, failed) == (2, reasons)
+    assert json.loads(data)["item"] == overrides["item"]
+    assert report["quarantined"] == 1
+    for check in reasons.split(","):
+        assert report["checks"][check] == 1
+
+
+def test_normalize_builds_keeps_last_duplicate():
+    # Arrange
+    frame = pd.concat([_frame(), _frame(moveset_item_win_rate="60.0")])
+
+    # Act
+    builds, quarantined, _ = normalize_builds(frame)
+
+    # Assert
+    assert [row[:2] for row in quarantined] == [(1, "duplicate_build")]
+    assert builds["moveset_item_win_rate"].tolist() == [60.0]
+
+
+def test_normalize_builds_items_vocabulary():
+    # Arrange
+    frame = pd.concat(
+        [_frame(item="???"), _frame(item="FocusBand")], ignore_index=True
+    )
+
+    # Act
+    known, known_quarantined, _ = normalize_builds(frame)
+    stored, stored_quarantined, _ = normalize_builds(
+        frame, item_vocabulary(["FocusBand"])
+    )
+
+    # Assert
+    assert known["item"].tolist() == ["???"]
+    assert [row[1] for row in known_quarantined] == ["unknown_item"]
+    assert stored["item"].tolist() == ["???", "FocusBand"]
+    assert stored_quarantined == []
+
+
+def test_normalize_builds_canonical_items():
+    # Act
+    builds, quarantined, _ = normalize_builds(_frame(item=" xspeed "))
+
+    # Assert
+    assert quarantined == []
+    assert builds["item"].tolist() == ["XSpeed"]
+
+
+def test_normalize_builds_missing_column():
+    # Act & Assert
+    with pytest.raises(ValueError, match="Missing column: item"):
+        normalize_builds(_frame().drop(columns=["item"]))
+
+
+def test_parse_csv_and_json(tmp_path, sample_week):
+    # Arrange
+    csv_path = tmp_path / f"{sample_week}.csv"
+    csv_path.write_text(
+        HEADER + "\nPikachu,Attacker,55,20,Thunderbolt,Volt Tackle,52,50,"
+        "10,Purify,53,40,4\n"
+    )
+    json_path = tmp_path / "snapshot.json"
+    json_path.write_text(
+        json.dumps([{"week": sample_week, **_frame().iloc[0].to_dict()}])
+    )
+
+    # Act
+    csv_parsed = _parse(str(csv_path))
+    json_parsed = _parse(str(json_path))
+
+    # Assert
+    for parsed in (csv_parsed, json_parsed):
+        _, week, rows, quarantined, report, _, _ = parsed
+        assert week == sample_week
+        assert quarantined == []
+        assert report["file"] == Path(parsed[0]).name
+        assert rows[0][:2] == ("Pikachu", "Attacker")
+        assert len(rows[0]) == 13
+    assert csv_parsed[5] == json_parsed[5]
+    assert snapshot_files(tmp_path) == [csv_path, json_path]
+
+
+def test_parse_safely_reports_invalid_week(tmp_path):
+    # Arrange
+    path = tmp_path / "latest.csv"
+    path.write_text(HEADER + "\n")
+
+    # Act
+    parsed, error = _parse_safely(str(path))
+
+    # Assert
+    assert parsed is None
+    assert error == "latest.csv: Invalid week: latest"
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ('{"pokemon": "Pikachu"}', "must be a list of objects"),
+        ("[1, 2]", "must be a list of objects"),
+        (
+            json.dumps([{**_frame().iloc[0].to_dict(), "pokemon": {}}]),
+            "unhashable",
+        ),
+    ],
+)
+def test_parse_safely_reports_malformed_json(tmp_path, content, message):
+    # Arrange
+    path = tmp_path / "Y2025m09d28.json"
+    path.write_text(content)
+
+    # Act
+    parsed, error = _parse_safely(str(path))
+
+    # Assert
+    assert parsed is None
+    assert error.startswith("Y2025m09d28.json: ")
+    assert message in error
+
+
+def test_run_imports_every_week(tmp_path, monkeypatch, capsys):
+    # Arrange
+    db_path = tmp_path / "builds.db"
+    monkeypatch.setenv("BUILDS_DB_PATH", str(db_path))
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    for week in ("Y2025m09d21", "Y2025m09d28"):
+        (snapshots / f"{week}.csv").write_text(
+            HEADER + "\nPikachu,Attacker,55,20,Thunderbolt,Volt Tackle,52,"
+            "50,10,Purify,53,40,4\n"
+        )
+    (snapshots / "Y2025m10d05.csv").write_text("pokemon\nPikachu\n")
+
+    # Act
+    ingested, failed = run(snapshots, workers=1)
+    first = capsys.readouterr()
+    run(snapshots, workers=1)
+    second = capsys.readouterr()
+
+    # Assert
+    assert (ingested, failed) == (2, 1)
+    assert "Y2025m09d28.csv: week Y2025m09d28, 1 rows" in first.out
+    assert "+1 ~0 -0" in first.out
+    assert "rows/s" in first.out
+    assert "data version 2" in first.out
+    assert "Missing column: role" in first.err
+    assert second.out.count("unchanged, skipped") == 2
+    assert "data version 2" in second.out
+    with sqlite3.connect(db_path) as conn:
+        weeks = conn.execute(
+            "SELECT week, COUNT(*) FROM builds GROUP BY week"
+        ).fetchall()
+    assert weeks == [("Y2025m09d21", 1), ("Y2025m09d28", 1)]
+
+
+def test_run_quarantines_rows_and_writes_report(tmp_path, monkeypatch):
+    # Arrange
+    db_path = tmp_path / "builds.db"
+    monkeypatch.setenv("BUILDS_DB_PATH", str(db_path))
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    path = snapshots / "Y2025m09d28.csv"
+    path.write_text(
+        HEADER + "\nPikachu,Attacker,55,20,Thunderbolt,Volt Tackle,52,50,"
+        "10,Purify,53,40,4\nEmpoleon,All-Rounder,0,0,move_1,move_2,0,0,0,"
+        "item,0,0,0\n"
+    )
+    (snapshots / "Y2025m10d05.csv").write_text("pokemon\nPikachu\n")
+    report = tmp_path / "report.json"
+
+    # Act
+    run(snapshots, workers=1, report=report)
+    path.write_text(
+        HEADER + "\nPikachu,Attacker,55,20,Thunderbolt,Volt Tackle,52,50,"
+        "10,Potion,53,40,4\nPikachu,Tank,55,20,Thunderbolt,Volt Tackle,52,"
+        "50,10,Purify,53,40,4\n"
+    )
+    run(snapshots, workers=1)
+
+    # Assert
+    summary = json.loads(report.read_text())
+    assert (summary["rows"], summary["valid"]) == (2, 1)
+    assert (summary["quarantined"], summary["failed"]) == (1, 1)
+    week, missing = summary["files"]
+    assert week["checks"]["unknown_item"] == 1
+    assert week["warnings"] == []
+    assert week["rates"]["pkm_win_rate"]["max"] == 55.0
+    assert missing == {
+        "file": "Y2025m10d05.csv",
+        "error": "Y2025m10d05.csv: Missing column: role",
+    }
+    with sqlite3.connect(db_path) as conn:
+        quarantined = conn.execute(
+            "SELECT week, source, position, reasons FROM quarantine"
+        ).fetchall()
+    assert quarantined == [
+        ("Y2025m09d28", "Y2025m09d28.csv", 2, "unknown_role")
+    ]
+
+
+def test_run_keeps_week_without_valid_rows(tmp_path, monkeypatch, capsys):
+    # Arrange
+    db_path = tmp_path / "builds.db"
+    monkeypatch.setenv("BUILDS_DB_PATH", str(db_path))
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    path = snapshots / "Y2025m09d28.csv"
+    path.write_text(
+        HEADER + "\nPikachu,Attacker,55,20,Thunderbolt,Volt Tackle,52,50,"
+        "10,Purify,53,40,4\n"
+    )
+    run(snapshots, workers=1)
+    path.write_text(
+        HEADER + "\nPikachu,Tank,55,20,Thunderbolt,Volt Tackle,52,50,"
+        "10,Purify,53,40,4\n"
+    )
+    report = tmp_path / "report.json"
+
+    # Act
+    ingested, failed = run(snapshots, workers=1, report=report)
+
+    # Assert
+    assert (ingested, failed) == (0, 0)
+    assert "no valid rows, skipped" in capsys.readouterr().out
+    summary = json.loads(report.read_text())
+    assert summary["data_version"] == 1
+    assert {"check": "no_valid_rows"} in summary["files"][0]["warnings"]
+    with sqlite3.connect(db_path) as conn:
+        builds = conn.execute("SELECT role FROM builds").fetchall()
+        quarantined = conn.execute("SELECT COUNT(*) FROM quarantine")
+        assert quarantined.fetchone() == (1,)
+    assert builds == [("Attacker",)]
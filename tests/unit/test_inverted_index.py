@@ -0,0 +1,49 @@
+import numpy as np
+
+from pokemon_unite_meta_analysis.inverted_index import InvertedIndex
+
+
+def test_inverted_index_union():
+    # Arrange
+    index = InvertedIndex(np.array(["pikachu", "snorlax", "pikachu", "absol"]))
+
+    # Act
+    mask = index.to_mask(index.union(["pikachu", "absol"]))
+
+    # Assert
+    assert mask.tolist() == [True, False, True, True]
+
+
+def test_inverted_index_unknown_value_matches_nothing():
+    # Arrange
+    index = InvertedIndex(np.array(["pikachu", "snorlax"]))
+
+    # Act
+    mask = index.to_mask(index.union(["mew"]))
+
+    # Assert
+    assert "mew" not in index
+    assert mask.tolist() == [False, False]
+
+
+def test_inverted_index_difference():
+    # Arrange
+    values = np.array(["a", "b", "c", "a", "b", "c", "a", "b", "c"])
+    index = InvertedIndex(values)
+
+    # Act
+    bitmap = index.full() & ~index.union(["a", "c"])
+
+    # Assert
+    assert index.to_mask(bitmap).tolist() == [value == "b" for value in values]
+
+
+def test_inverted_index_empty_column():
+    # Arrange
+    index = InvertedIndex(np.array([], dtype=str))
+
+    # Act
+    mask = index.to_mask(index.full())
+
+    # Assert
+    assert mask.tolist() == []
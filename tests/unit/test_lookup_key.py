@@ -0,0 +1,24 @@
+from pokemon_unite_meta_analysis.lookup_key import normalize_key, parse_keys
+
+
+def test_normalize_key_folds_case_and_spacing():
+    # Act & Assert
+    assert normalize_key("  Attack   Weight ") == "attack weight"
+    assert normalize_key("PIKACHU") == "pikachu"
+
+
+def test_normalize_key_returns_interned_key():
+    # Act
+    first = normalize_key("Mr. Mime")
+    second = normalize_key("".join(["mr.", " ", "MIME"]))
+
+    # Assert
+    assert first is second
+
+
+def test_parse_keys():
+    # Act
+    keys = parse_keys("Pikachu, snorlax ,PIKACHU,Attack  Weight")
+
+    # Assert
+    assert keys == {"pikachu", "snorlax", "attack weight"}
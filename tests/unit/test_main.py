@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from conftest import create_build_response
 from fastapi.testclient import TestClient
 
@@ -338,3 +340,578 @@ def test_get_builds_top_n(sample_week):
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 3
+
+
+def test_get_builds_percentiles(sample_week):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = [
+            create_build_response(
+                id=i,
+                week=sample_week,
+                pokemon=f"Pokemon{i}",
+                moveset_item_win_rate=50.0 + i,
+            )
+            for i in range(4)
+        ]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(
+            f"/builds?week={sample_week}&include_percentiles=true"
+            "&min_percentile_moveset_item_win_rate=50"
+            "&sort_by=moveset_item_win_rate:desc"
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert [b["moveset_item_win_rate"] for b in data] == [53.0, 52.0, 51.0]
+        assert [b["percentiles"]["moveset_item_win_rate"] for b in data] == [
+            100.0,
+            75.0,
+            50.0,
+        ]
+
+
+def test_get_builds_invalid_percentile(sample_week):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = []
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get("/builds?min_percentile_pokemon_win_rate=-1")
+
+        # Assert
+        assert response.status_code == 400
+        assert "between 0 and 100" in response.json()["detail"]
+
+
+def test_explain_builds():
+    # Act
+    response = client.get("/builds/explain?pokemon=Pikachu&top_n=3")
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filters"][0]["name"] == "pokemon"
+    assert data["limit"] == 3
+
+
+def test_explain_builds_invalid_sort_by():
+    # Act
+    response = client.get("/builds/explain?sort_by=not_a_strategy")
+
+    # Assert
+    assert response.status_code == 400
+
+
+def test_search(sample_week):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = [
+            create_build_response(id=1, week=sample_week, pokemon="Pikachu"),
+            create_build_response(id=2, week=sample_week, pokemon="Snorlax"),
+        ]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get("/search?q=PIKA")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["name"] == "Pikachu"
+        assert data[0]["kind"] == "pokemon"
+        assert data[0]["match"] == "prefix"
+
+
+def test_search_invalid_kind():
+    # Act
+    response = client.get("/search?q=pika&kind=role")
+
+    # Assert
+    assert response.status_code == 400
+
+
+def test_get_meta_diff():
+    # Arrange
+    weeks = {
+        "Y2025m09d21": [
+            create_build_response(id=1, week="Y2025m09d21", pokemon="Pikachu")
+        ],
+        "Y2025m09d28": [
+            create_build_response(
+                id=2,
+                week="Y2025m09d28",
+                pokemon="Pikachu",
+                moveset_item_win_rate=55.0,
+            ),
+            create_build_response(id=3, week="Y2025m09d28", pokemon="Snorlax"),
+        ],
+    }
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = list(weeks)
+        mock_repo.get_all_builds.side_effect = lambda week: weeks[week]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get("/meta/diff?from=Y2025m09d21&to=Y2025m09d28")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert [(d["pokemon"], d["status"]) for d in data] == [
+            ("Pikachu", "changed"),
+            ("Snorlax", "new"),
+        ]
+        assert data[0]["moveset_item_win_rate_delta"] == 2.0
+
+
+def test_get_meta_diff_invalid_week(sample_week):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(f"/meta/diff?from=Y1999m01d01&to={sample_week}")
+
+        # Assert
+        assert response.status_code == 400
+        assert "Invalid week" in response.json()["detail"]
+
+
+def test_get_meta_diff_same_week(sample_week):
+    # Act
+    response = client.get(f"/meta/diff?from={sample_week}&to={sample_week}")
+
+    # Assert
+    assert response.status_code == 400
+    assert "different weeks" in response.json()["detail"]
+
+
+def test_get_builds_history():
+    # Arrange
+    weeks = {
+        "Y2025m09d21": [
+            create_build_response(id=1, week="Y2025m09d21", pokemon="Pikachu")
+        ],
+        "Y2025m09d28": [
+            create_build_response(
+                id=2,
+                week="Y2025m09d28",
+                pokemon="Pikachu",
+                moveset_item_win_rate=55.0,
+            ),
+            create_build_response(id=3, week="Y2025m09d28", pokemon="Snorlax"),
+        ],
+    }
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = list(weeks)
+        mock_repo.get_all_builds.side_effect = lambda week: weeks[week]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(
+            "/builds/history",
+            params={
+                "pokemon": ["pikachu", "Snorlax"],
+                "move_1": ["Thunderbolt", "Thunderbolt"],
+                "move_2": ["Volt Tackle", "Volt Tackle"],
+                "item": ["Purify", "Purify"],
+            },
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["weeks"] == ["Y2025m09d21", "Y2025m09d28"]
+        assert data["builds"][0]["pokemon"] == "Pikachu"
+        assert data["builds"][0]["moveset_item_win_rate"] == [53.0, 55.0]
+        assert data["builds"][1]["ids"] == [None, 3]
+
+
+def test_get_builds_history_unknown_builds(sample_week):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = [
+            create_build_response(week=sample_week)
+        ]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(
+            "/builds/history",
+            params={
+                "pokemon": "Absol",
+                "move_1": "Pursuit",
+                "move_2": "Night Slash",
+                "item": "Nope",
+            },
+        )
+
+        # Assert
+        assert response.status_code == 404
+
+
+def test_get_builds_history_mismatched_parameters():
+    # Act
+    response = client.get(
+        "/builds/history",
+        params={
+            "pokemon": ["Pikachu", "Snorlax"],
+            "move_1": "Thunderbolt",
+            "move_2": "Volt Tackle",
+            "item": "Purify",
+        },
+    )
+
+    # Assert
+    assert response.status_code == 400
+
+
+def test_get_meta_roles(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(
+            id=0,
+            week=sample_week,
+            role="Attacker",
+            moveset_item_true_pick_rate=1.0,
+        ),
+        create_build_response(
+            id=1,
+            week=sample_week,
+            role="Defender",
+            moveset_item_true_pick_rate=3.0,
+        ),
+    ]
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = builds
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(f"/meta/roles?week={sample_week}")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["name"] for r in data] == ["Defender", "Attacker"]
+        assert data[0]["build_count"] == 1
+        assert data[0]["best_build"]["id"] == 1
+
+
+@pytest.mark.parametrize("endpoint", ["pokemon", "roles", "items"])
+def test_get_meta_rollup_invalid_week(sample_week, endpoint):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(f"/meta/{endpoint}?week=Y1999m01d01")
+
+        # Assert
+        assert response.status_code == 400
+        assert "Invalid week" in response.json()["detail"]
+
+
+def test_get_cooccurrence(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(id=0, pokemon="Pikachu", item="Potion"),
+        create_build_response(id=1, pokemon="Snorlax", item="Potion"),
+        create_build_response(id=2, pokemon="Pikachu", item="XSpeed"),
+    ]
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_all_builds.return_value = builds
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(
+            "/analysis/cooccurrence/item_pokemon?row=potion&weight=build_count"
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert [e["column"] for e in response.json()] == [
+            "Pikachu",
+            "Snorlax",
+        ]
+
+
+@pytest.mark.parametrize(
+    "url, status_code",
+    [
+        ("/analysis/cooccurrence/item_role", 404),
+        ("/analysis/cooccurrence/item_pokemon?weight=nope", 400),
+        ("/analysis/cooccurrence/item_pokemon?row=nope", 404),
+        ("/analysis/cooccurrence/item_pokemon?column=nope", 404),
+    ],
+)
+def test_get_cooccurrence_errors(url, status_code):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_all_builds.return_value = [create_build_response()]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(url)
+
+        # Assert
+        assert response.status_code == status_code
+
+
+def test_get_meta_tiers(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(
+            id=i,
+            week=sample_week,
+            pokemon=f"Pokemon{i}",
+            moveset_item_win_rate=45.0 + i,
+        )
+        for i in range(5)
+    ]
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = builds
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(
+            f"/meta/tiers?week={sample_week}&metric=moveset_item_win_rate"
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["level"] == "pokemon"
+        assert [t["entries"][0]["pokemon"] for t in data["tiers"]] == [
+            "Pokemon4",
+            "Pokemon3",
+            "Pokemon2",
+            "Pokemon1",
+            "Pokemon0",
+        ]
+
+
+def test_get_meta_tiers_invalid_metric():
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_all_builds.return_value = [create_build_response()]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get("/meta/tiers?metric=role")
+
+        # Assert
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid metric: role"
+
+
+def test_get_meta_trends():
+    # Arrange
+    weeks = ["Y2025m09d21", "Y2025m09d28"]
+    builds = {
+        week: [
+            create_build_response(
+                id=i,
+                week=week,
+                pokemon=pokemon,
+                moveset_item_win_rate=rate,
+            )
+            for i, (pokemon, rate) in enumerate(rates)
+        ]
+        for week, rates in zip(
+            weeks,
+            [
+                [("Pikachu", 50.0), ("Snorlax", 55.0)],
+                [("Pikachu", 52.0), ("Snorlax", 54.0)],
+            ],
+        )
+    }
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = weeks[::-1]
+        mock_repo.get_all_builds.side_effect = lambda week: builds[week]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get("/meta/trends")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["week"] == "Y2025m09d28"
+        assert [b["pokemon"] for b in data["risers"]] == ["Pikachu"]
+        assert data["risers"][0]["moveset_item_win_rate_slope"] == 2.0
+        assert [b["pokemon"] for b in data["fallers"]] == ["Snorlax"]
+        assert data["builds"] == []
+
+        # Act
+        response = client.get(
+            "/meta/trends?sort_by=moveset_item_win_rate_ewma"
+            "&min_moveset_item_win_rate_slope=-2"
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert [b["pokemon"] for b in data["builds"]] == ["Snorlax", "Pikachu"]
+        assert data["builds"][0]["moveset_item_win_rate_ewma"] == 54.5
+
+
+@pytest.mark.parametrize(
+    "query, status_code",
+    [
+        ("week=Y2024m01d01", 400),
+        ("metric=role", 400),
+        ("sort_by=pokemon", 400),
+    ],
+)
+def test_get_meta_trends_errors(sample_week, query, status_code):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = [create_build_response()]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(f"/meta/trends?{query}")
+
+        # Assert
+        assert response.status_code == status_code
+
+
+def test_recommend_team(sample_week):
+    # Arrange
+    roles = ["Attacker", "Defender", "Support", "Speedster", "All-Rounder"]
+    builds = [
+        create_build_response(
+            id=i,
+            week=sample_week,
+            pokemon=f"Pokemon{i}",
+            role=roles[i % 5],
+            moveset_item_win_rate=45.0 + i,
+        )
+        for i in range(10)
+    ]
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = builds
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(
+            "/teams/recommend?metric=moveset_item_win_rate&top_k=2"
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["week"] == sample_week
+        assert len(data["teams"]) == 2
+        assert [m["pokemon"] for m in data["teams"][0]["members"]] == [
+            "Pokemon9",
+            "Pokemon8",
+            "Pokemon7",
+            "Pokemon6",
+            "Pokemon5",
+        ]
+        assert data["teams"][0]["score"] == 260.0
+
+
+@pytest.mark.parametrize(
+    "query, status_code",
+    [
+        ("week=Y2024m01d01", 400),
+        ("roles=Tank", 400),
+        ("team_size=0", 400),
+    ],
+)
+def test_recommend_team_errors(sample_week, query, status_code):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = [create_build_response()]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(f"/teams/recommend?{query}")
+
+        # Assert
+        assert response.status_code == status_code
+
+
+def test_get_relevance_sweep(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(
+            id=i, week=sample_week, moveset_item_true_pick_rate=rate
+        )
+        for i, rate in enumerate([4.0, 1.0, 3.0, 2.0])
+    ]
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = builds
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(f"/relevance/top_n/sweep?week={sample_week}")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["build_count"] == 4
+        assert data["coverage"] == 10.0
+        assert [
+            (p["threshold"], p["build_count"], p["coverage"])
+            for p in data["points"]
+        ] == [(1.0, 1, 4.0), (2.0, 2, 7.0), (3.0, 3, 9.0), (4.0, 4, 10.0)]
+
+
+@pytest.mark.parametrize(
+    "url, status_code",
+    [
+        ("/relevance/unknown/sweep", 404),
+        ("/relevance/top_n/sweep?week=Y2024m01d01", 400),
+    ],
+)
+def test_get_relevance_sweep_errors(sample_week, url, status_code):
+    # Arrange
+    with patch("api.main.BuildRepository") as mock_repo_class:
+        mock_repo = _create_mock_repository()
+        mock_repo.get_available_weeks.return_value = [sample_week]
+        mock_repo.get_all_builds.return_value = [create_build_response()]
+        mock_repo_class.return_value = mock_repo
+
+        # Act
+        response = client.get(url)
+
+        # Assert
+        assert response.status_code == status_code
@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock
 
+import pytest
+
 from conftest import create_build_response
 
 from pokemon_unite_meta_analysis.manipulate_builds import (
@@ -84,65 +86,30 @@ def test_manipulate_builds_unsupported_relevance():
         assert False, "ValueError not raised"
 
 
-def test_head_returns_n_builds(sample_week):
+def test_sort_keeps_top_n_builds(sample_week):
     # Arrange
     mock_repo = MagicMock()
     builds = [
         create_build_response(
-            id=i,
-            week=sample_week,
-            pokemon=f"Poke{i}",
-            role="Role",
-            pokemon_win_rate=0.5,
-            pokemon_pick_rate=0.2,
-            move_1="Move1",
-            move_2="Move2",
-            moveset_win_rate=0.51,
-            moveset_pick_rate=0.15,
-            moveset_true_pick_rate=0.1,
-            item="Item",
-            moveset_item_win_rate=0.52,
-            moveset_item_pick_rate=0.12,
-            moveset_item_true_pick_rate=0.08,
+            id=i, week=sample_week, pokemon_win_rate=float(i % 3)
         )
-        for i in range(5)
+        for i in range(6)
     ]
     manip = ManipulateBuilds(mock_repo, "dummy_date")
 
     # Act
-    result = manip._head(builds, n=3)
+    result = manip._sort(builds, SortBy.POKEMON_WIN_RATE, n=3)
 
     # Assert
-    assert len(result) == 3
+    assert [b.id for b in result] == [2, 5, 1]
 
 
-def test_head_returns_all_builds(sample_week):
+def test_sort_rejects_negative_top_n(sample_week):
     # Arrange
     mock_repo = MagicMock()
-    builds = [
-        create_build_response(
-            id=i,
-            week=sample_week,
-            pokemon=f"Poke{i}",
-            role="Role",
-            pokemon_win_rate=0.5,
-            pokemon_pick_rate=0.2,
-            move_1="Move1",
-            move_2="Move2",
-            moveset_win_rate=0.51,
-            moveset_pick_rate=0.15,
-            moveset_true_pick_rate=0.1,
-            item="Item",
-            moveset_item_win_rate=0.52,
-            moveset_item_pick_rate=0.12,
-            moveset_item_true_pick_rate=0.08,
-        )
-        for i in range(5)
-    ]
+    builds = [create_build_response(id=i, week=sample_week) for i in range(3)]
     manip = ManipulateBuilds(mock_repo, "dummy_date")
 
-    # Act
-    result = manip._head(builds)
-
-    # Assert
-    assert len(result) == 5
+    # Act & Assert
+    with pytest.raises(ValueError, match="Invalid top_n: -1"):
+        manip._sort(builds, SortBy.POKEMON_WIN_RATE, n=-1)
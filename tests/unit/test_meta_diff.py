@@ -0,0 +1,181 @@
+import pytest
+from conftest import create_build_response
+
+from entity.meta_diff_query_params import MetaDiffQueryParams
+from pokemon_unite_meta_analysis.meta_diff import (
+    MetaDiffCache,
+    compute_meta_diff,
+    query_meta_diff,
+)
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+@pytest.fixture
+def diffs():
+    from_builds = [
+        create_build_response(
+            id=1,
+            week="w1",
+            pokemon="Pikachu",
+            moveset_item_win_rate=50.0,
+            moveset_item_true_pick_rate=3.0,
+        ),
+        create_build_response(
+            id=2,
+            week="w1",
+            pokemon="Snorlax",
+            role="Defender",
+            moveset_item_win_rate=48.0,
+            moveset_item_true_pick_rate=5.0,
+        ),
+        create_build_response(
+            id=3, week="w1", pokemon="Absol", role="Speedster", item="XSpeed"
+        ),
+    ]
+    to_builds = [
+        create_build_response(
+            id=11,
+            week="w2",
+            pokemon="Pikachu",
+            moveset_item_win_rate=53.5,
+            moveset_item_true_pick_rate=6.0,
+        ),
+        create_build_response(
+            id=12,
+            week="w2",
+            pokemon="Snorlax",
+            role="Defender",
+            moveset_item_win_rate=47.0,
+            moveset_item_true_pick_rate=4.0,
+        ),
+        create_build_response(
+            id=13, week="w2", pokemon="Absol", role="Speedster", item="Potion"
+        ),
+    ]
+    return compute_meta_diff(
+        WeekSnapshot("w1", from_builds), WeekSnapshot("w2", to_builds)
+    )
+
+
+def test_compute_meta_diff_joins_on_build_identity(diffs):
+    # Assert
+    assert [(d.pokemon, d.item, d.status) for d in diffs] == [
+        ("Pikachu", "Purify", "changed"),
+        ("Snorlax", "Purify", "changed"),
+        ("Absol", "Potion", "new"),
+        ("Absol", "XSpeed", "vanished"),
+    ]
+
+
+def test_compute_meta_diff_unchanged_builds():
+    # Arrange
+    builds = [
+        create_build_response(id=1, pokemon="Pikachu"),
+        create_build_response(id=2, pokemon="Snorlax", role="Defender"),
+    ]
+    later = [
+        builds[0].model_copy(update={"id": 11}),
+        builds[1].model_copy(update={"id": 12, "moveset_item_win_rate": 50.0}),
+    ]
+
+    # Act
+    diffs = compute_meta_diff(
+        WeekSnapshot("w1", builds), WeekSnapshot("w2", later)
+    )
+
+    # Assert
+    assert [(d.pokemon, d.status) for d in diffs] == [
+        ("Pikachu", "unchanged"),
+        ("Snorlax", "changed"),
+    ]
+
+
+def test_compute_meta_diff_deltas(diffs):
+    # Act
+    pikachu = diffs[0]
+
+    # Assert
+    assert pikachu.from_id == 1
+    assert pikachu.to_id == 11
+    assert pikachu.moveset_item_win_rate_delta == pytest.approx(3.5)
+    assert pikachu.moveset_item_true_pick_rate_delta == pytest.approx(3.0)
+    assert pikachu.popularity_from == 3
+    assert pikachu.popularity_to == 2
+    assert pikachu.popularity_delta == 1
+
+
+def test_compute_meta_diff_unmatched_builds(diffs):
+    # Act
+    new, vanished = diffs[2], diffs[3]
+
+    # Assert
+    assert new.from_id is None
+    assert new.moveset_item_win_rate_delta is None
+    assert vanished.to_id is None
+    assert vanished.moveset_item_win_rate_to is None
+
+
+def test_query_meta_diff_sorts_missing_values_last(diffs):
+    # Act
+    result = query_meta_diff(
+        diffs, MetaDiffQueryParams(sort_by="moveset_item_win_rate_delta")
+    )
+
+    # Assert
+    assert [d.pokemon for d in result] == [
+        "Pikachu",
+        "Snorlax",
+        "Absol",
+        "Absol",
+    ]
+
+
+def test_query_meta_diff_filters(diffs):
+    # Act
+    result = query_meta_diff(
+        diffs,
+        MetaDiffQueryParams(
+            status="changed,new", ignore_role="defender", sort_order="asc"
+        ),
+    )
+
+    # Assert
+    assert [(d.pokemon, d.status) for d in result] == [
+        ("Pikachu", "changed"),
+        ("Absol", "new"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ({"status": "gone"}, "Invalid status: gone"),
+        ({"sort_by": "nope"}, "Invalid sort_by field: nope"),
+    ],
+)
+def test_query_meta_diff_invalid(diffs, params, message):
+    # Act & Assert
+    with pytest.raises(ValueError, match=message):
+        query_meta_diff(diffs, MetaDiffQueryParams(**params))
+
+
+def test_meta_diff_cache_invalidates_weeks():
+    # Arrange
+    cache = MetaDiffCache()
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return []
+
+    cache.get("w1", "w2", compute)
+    cache.get("w2", "w3", compute)
+
+    # Act
+    cache.get("w1", "w2", compute)
+    cache.invalidate("w2")
+    cache.get("w1", "w2", compute)
+    cache.get("w2", "w3", compute)
+
+    # Assert
+    assert len(computed) == 4
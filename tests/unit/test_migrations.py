@@ -0,0 +1,138 @@
+import sqlite3
+
+import pytest
+
+from repository.migrations import (
+    SCHEMA_VERSION,
+    migrate,
+    optimize,
+    schema_version,
+)
+
+
+def _indexes(conn: sqlite3.Connection) -> set[str]:
+    return {row[1] for row in conn.execute("PRAGMA index_list(builds)")}
+
+
+def test_migrate_empty_database(in_memory_db):
+    # Act
+    applied = migrate(in_memory_db)
+
+    # Assert
+    assert len(applied) == SCHEMA_VERSION
+    assert schema_version(in_memory_db) == SCHEMA_VERSION
+    assert {"idx_builds_week", "idx_builds_identity"} <= _indexes(in_memory_db)
+    columns = [
+        row[1] for row in in_memory_db.execute("PRAGMA table_info(builds)")
+    ]
+    assert columns[1] == "week"
+    assert columns[15:] == [
+        "win_rate_ci_lower",
+        "win_rate_ci_upper",
+        "weighted_win_rate",
+        "adjusted_win_rate",
+        "win_rate_z_score",
+        "percentile_ranks",
+    ]
+    tables = {
+        row[0]
+        for row in in_memory_db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+    assert {"metadata", "week_metadata"} <= tables
+
+
+def test_migrate_is_idempotent(in_memory_db):
+    # Arrange
+    migrate(in_memory_db)
+
+    # Act
+    applied = migrate(in_memory_db)
+
+    # Assert
+    assert applied == []
+    assert schema_version(in_memory_db) == SCHEMA_VERSION
+
+
+def test_migrate_adds_unique_key_to_existing_table(in_memory_db, sample_week):
+    # Arrange
+    in_memory_db.execute(
+        """
+        CREATE TABLE builds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, week TEXT NOT NULL,
+            pokemon TEXT, role TEXT, pkm_win_rate REAL, pkm_pick_rate REAL,
+            move1 TEXT, move2 TEXT, moveset_win_rate REAL,
+            moveset_pick_rate REAL, moveset_true_pick_rate REAL, item TEXT,
+            moveset_item_win_rate REAL, moveset_item_pick_rate REAL,
+            moveset_item_true_pick_rate REAL
+        )
+        """
+    )
+    for win_rate in (50.0, 55.0):
+        in_memory_db.execute(
+            "INSERT INTO builds (week, pokemon, move1, move2, item, "
+            "moveset_item_win_rate) VALUES (?, 'Pikachu', 'a', 'b', 'c', ?)",
+            (sample_week, win_rate),
+        )
+    in_memory_db.commit()
+
+    # Act
+    migrate(in_memory_db)
+
+    # Assert
+    rows = in_memory_db.execute(
+        "SELECT id, moveset_item_win_rate FROM builds"
+    ).fetchall()
+    assert rows == [(2, 55.0)]
+    with pytest.raises(sqlite3.IntegrityError):
+        in_memory_db.execute(
+            "INSERT INTO builds (week, pokemon, move1, move2, item) "
+            "VALUES (?, 'Pikachu', 'a', 'b', 'c')",
+            (sample_week,),
+        )
+
+
+def test_migrate_keeps_table_without_week(in_memory_db):
+    # Arrange
+    in_memory_db.execute(
+        "CREATE TABLE builds (id INTEGER PRIMARY KEY, pokemon TEXT)"
+    )
+    in_memory_db.execute("INSERT INTO builds (pokemon) VALUES ('Pikachu')")
+    in_memory_db.commit()
+
+    # Act
+    migrate(in_memory_db)
+
+    # Assert
+    legacy = in_memory_db.execute("SELECT pokemon FROM builds_legacy")
+    assert legacy.fetchall() == [("Pikachu",)]
+    assert in_memory_db.execute("SELECT COUNT(*) FROM builds").fetchone() == (
+        0,
+    )
+
+
+def test_migrate_rejects_newer_schema(in_memory_db):
+    # Arrange
+    in_memory_db.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="newer"):
+        migrate(in_memory_db)
+
+
+def test_optimize_collects_statistics(in_memory_db):
+    # Arrange
+    migrate(in_memory_db)
+
+    # Act
+    optimize(in_memory_db)
+
+    # Assert
+    tables = {
+        row[0]
+        for row in in_memory_db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+    assert "sqlite_stat1" in tables
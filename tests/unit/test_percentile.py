@@ -0,0 +1,98 @@
+import numpy as np
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.derived_metrics import derived_columns
+from pokemon_unite_meta_analysis.percentile import (
+    PERCENTILE_COLUMNS,
+    decode_percentile_ranks,
+    encode_percentile_ranks,
+    percentile_matrix,
+    percentile_ranks,
+)
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+def test_percentile_ranks_share_highest_rank_on_ties():
+    # Act
+    ranks = percentile_ranks(np.array([10.0, 30.0, 20.0, 30.0]))
+
+    # Assert
+    assert ranks.dtype == np.float32
+    assert ranks.tolist() == [25.0, 100.0, 50.0, 100.0]
+
+
+def test_percentile_ranks_per_group():
+    # Arrange
+    values = np.array([1.0, 5.0, 2.0, 3.0, 4.0])
+    groups = np.array(["b", "a", "b", "a", "b"])
+
+    # Act
+    ranks = percentile_ranks(values, groups)
+
+    # Assert
+    np.testing.assert_allclose(
+        ranks, [100 / 3, 100.0, 200 / 3, 50.0, 100.0], rtol=1e-6
+    )
+
+
+def test_percentile_ranks_ignore_missing_values():
+    # Act
+    ranks = percentile_ranks(np.array([np.nan, 2.0, 1.0]))
+
+    # Assert
+    assert np.isnan(ranks[0])
+    assert ranks[1:].tolist() == [100.0, 50.0]
+
+
+def test_percentile_ranks_empty():
+    # Act
+    ranks = percentile_ranks(np.array([]))
+
+    # Assert
+    assert len(ranks) == 0
+
+
+def test_percentile_matrix():
+    # Arrange
+    columns = {
+        name: np.array([1.0, 2.0]) * (i + 1)
+        for i, name in enumerate(PERCENTILE_COLUMNS)
+    }
+
+    # Act
+    matrix = percentile_matrix(columns)
+
+    # Assert
+    assert matrix.shape == (2, len(PERCENTILE_COLUMNS))
+    assert matrix[:, 0].tolist() == [50.0, 100.0]
+    assert matrix[:, -1].tolist() == [50.0, 100.0]
+
+
+def test_encoded_percentile_ranks_match_snapshot(sample_week):
+    # Arrange
+    builds = [
+        create_build_response(
+            id=i,
+            week=sample_week,
+            moveset_item_win_rate=50.0 + i % 3,
+            moveset_item_true_pick_rate=1.0 + i,
+        )
+        for i in range(5)
+    ]
+
+    # Act
+    blobs = encode_percentile_ranks(builds, derived_columns(builds))
+
+    # Assert
+    expected = WeekSnapshot(sample_week, builds).percentiles
+    assert np.array_equal(decode_percentile_ranks(blobs), expected)
+
+
+def test_decode_percentile_ranks_incomplete():
+    # Arrange
+    ranks = np.ones(len(PERCENTILE_COLUMNS), dtype=np.float32).tobytes()
+
+    # Assert
+    assert decode_percentile_ranks([ranks, None]) is None
+    assert decode_percentile_ranks([ranks, ranks[:-4]]) is None
+    assert decode_percentile_ranks([]).shape == (0, len(PERCENTILE_COLUMNS))
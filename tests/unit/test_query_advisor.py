@@ -0,0 +1,57 @@
+from repository.build_repository import BuildRepository
+from repository.migrations import migrate
+from repository.query_advisor import advise, format_report, query_pattern
+
+
+def test_query_pattern_replaces_literals():
+    # Act
+    pattern = query_pattern(
+        "SELECT * FROM  builds WHERE week = 'Y2025m09d28' AND id = 12"
+    )
+
+    # Assert
+    assert pattern == "SELECT * FROM builds WHERE week = ? AND id = ?"
+
+
+def test_repository_captures_query_log(tmp_path, monkeypatch, sample_week):
+    # Arrange
+    query_log = tmp_path / "queries.log"
+    monkeypatch.setenv("BUILDS_QUERY_LOG", str(query_log))
+    monkeypatch.setenv("BUILDS_DB_PATH", str(tmp_path / "builds.db"))
+
+    # Act
+    with BuildRepository() as repo:
+        repo.migrate()
+        repo.get_all_builds(week=sample_week)
+
+    # Assert
+    assert (
+        f"SELECT * FROM builds WHERE week = '{sample_week}'"
+        in query_log.read_text().splitlines()
+    )
+
+
+def test_advise_reports_full_scans(tmp_path, in_memory_db):
+    # Arrange
+    migrate(in_memory_db)
+    query_log = tmp_path / "queries.log"
+    query_log.write_text(
+        "SELECT * FROM builds WHERE week = 'Y2025m09d28'\n"
+        "SELECT * FROM builds WHERE week = 'Y2025m10d05'\n"
+        "SELECT * FROM builds WHERE role = 'Attacker' AND item = 'Potion'\n"
+        "SELECT * FROM archive.builds\n"
+        "COMMIT\n"
+    )
+
+    # Act
+    report = advise(in_memory_db, query_log)
+
+    # Assert
+    assert [entry["executions"] for entry in report] == [2, 1, 1]
+    assert report[0]["findings"] == []
+    assert report[1]["findings"][0]["type"] == "full_scan"
+    assert report[1]["findings"][0]["index_columns"] == ["role", "item"]
+    assert "error" in report[2]
+    text = format_report(report)
+    assert "FULL SCAN of builds: index candidate (role, item)" in text
+    assert text.endswith("3 query patterns, 1 with a full table scan")
@@ -0,0 +1,228 @@
+import pytest
+from conftest import create_build_response
+
+from entity.builds_query_params import BuildsQueryParams
+from pokemon_unite_meta_analysis.filter_strategy import FILTER_STRATEGIES
+from pokemon_unite_meta_analysis.query_plan import QueryPlan, parse_sort_keys
+from pokemon_unite_meta_analysis.relevance_strategy import (
+    RELEVANCE_STRATEGIES,
+    Relevance,
+)
+from pokemon_unite_meta_analysis.sort_strategy import SORT_STRATEGIES, SortBy
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+@pytest.fixture
+def week_builds(sample_week):
+    pokemons = ["Pikachu", "Snorlax", "Lucario", "Gengar"]
+    roles = ["Attacker", "Defender", "All-Rounder", "Speedster"]
+    items = ["Purify", "XSpeed", "EjectButton"]
+    return [
+        create_build_response(
+            id=i,
+            week=sample_week,
+            pokemon=pokemons[i % 4],
+            role=roles[i % 4],
+            item=items[i % 3],
+            moveset_item_win_rate=45.0 + (i * 7) % 13,
+            moveset_item_true_pick_rate=float((i * 5) % 11),
+        )
+        for i in range(24)
+    ]
+
+
+def _legacy_pipeline(builds, params):
+    """Reference implementation of the pre-plan /builds pipeline"""
+    result = RELEVANCE_STRATEGIES[Relevance(params.relevance)].apply(
+        builds, params.relevance_threshold, lambda: builds
+    )
+
+    for column in ("pokemon", "role", "item"):
+        if getattr(params, column):
+            result = FILTER_STRATEGIES[column].apply(
+                result, getattr(params, column)
+            )
+        if getattr(params, f"ignore_{column}"):
+            result = FILTER_STRATEGIES[f"ignore_{column}"].apply(
+                result, getattr(params, f"ignore_{column}")
+            )
+
+    # Ties are broken by build id, then stable sorts from the least
+    # significant key to the most significant one
+    result = sorted(result, key=lambda b: b.id)
+    for entry in reversed(params.sort_by.split(",")):
+        column, _, order = entry.partition(":")
+        result = SORT_STRATEGIES[SortBy(column)].apply(
+            result, reverse=(order or params.sort_order) == "desc"
+        )
+
+    if params.top_n is not None and params.top_n > 0:
+        result = result[: params.top_n]
+
+    return result
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {},
+        {"top_n": 5},
+        {"pokemon": "pikachu,gengar", "sort_by": "moveset_item_win_rate"},
+        {"ignore_role": "Defender", "item": "xspeed", "top_n": 3},
+        {"relevance": "top_n", "relevance_threshold": 6, "sort_by": "pokemon"},
+        {
+            "relevance": "cumulative_coverage",
+            "relevance_threshold": 40,
+            "sort_by": "moveset_item_win_rate",
+            "sort_order": "asc",
+            "top_n": 4,
+        },
+        {"relevance": "quartile", "relevance_threshold": 2, "role": "attacker"},
+        {"relevance": "percentage", "relevance_threshold": 5, "top_n": 50},
+        {"pokemon": "pikachu,snorlax,gengar", "ignore_pokemon": "snorlax"},
+        {
+            "role": "attacker,defender",
+            "ignore_item": "purify, XSpeed",
+            "ignore_pokemon": "lucario",
+        },
+        {"item": "unknownitem"},
+        {"sort_by": "pokemon,moveset_item_win_rate", "sort_order": "asc"},
+        {"sort_by": "role:asc,item:desc,moveset_item_true_pick_rate"},
+        {
+            "sort_by": "item:asc,moveset_item_win_rate:desc",
+            "relevance": "top_n",
+            "relevance_threshold": 10,
+            "top_n": 6,
+        },
+        {"ignore_role": "unknownrole", "sort_by": "pokemon", "top_n": 7},
+    ],
+)
+def test_query_plan_matches_legacy_pipeline(sample_week, week_builds, query):
+    # Arrange
+    params = BuildsQueryParams(**query)
+
+    # Act
+    result = QueryPlan.compile(params).execute(
+        WeekSnapshot(sample_week, week_builds)
+    )
+
+    # Assert
+    expected = _legacy_pipeline(week_builds, params)
+    assert [b.id for b in result] == [b.id for b in expected]
+
+
+def test_query_plan_orders_filters_by_selectivity():
+    # Arrange
+    params = BuildsQueryParams(ignore_pokemon="pikachu", role="attacker")
+
+    # Act
+    plan = QueryPlan.compile(params)
+
+    # Assert
+    assert [p.name for p in plan.predicates] == ["role", "ignore_pokemon"]
+
+
+def test_query_plan_combines_include_and_ignore():
+    # Arrange
+    params = BuildsQueryParams(item="potion", ignore_item="xspeed")
+
+    # Act
+    plan = QueryPlan.compile(params)
+
+    # Assert
+    assert [p.name for p in plan.predicates] == ["item", "ignore_item"]
+
+
+def test_query_plan_explain():
+    # Arrange
+    params = BuildsQueryParams(
+        relevance="top_n", relevance_threshold=10, pokemon="pikachu", top_n=5
+    )
+
+    # Act
+    explanation = QueryPlan.compile(params).explain()
+
+    # Assert
+    assert explanation["relevance"] == {"strategy": "top_n", "threshold": 10}
+    assert explanation["filters"][0]["name"] == "pokemon"
+    assert explanation["filters"][0]["values"] == ["pikachu"]
+    assert explanation["sort"]["keys"] == [
+        {"by": "moveset_item_true_pick_rate", "order": "desc"}
+    ]
+    assert explanation["sort"]["method"] == "precomputed_permutation"
+    assert explanation["limit"] == 5
+
+
+def test_query_plan_min_percentile(sample_week, week_builds):
+    # Arrange
+    snapshot = WeekSnapshot(sample_week, week_builds)
+    params = BuildsQueryParams(min_percentile_moveset_item_win_rate=75, top_n=0)
+
+    # Act
+    plan = QueryPlan.compile(params)
+    result = plan.execute(snapshot)
+
+    # Assert
+    expected = sorted(
+        b.id
+        for b in week_builds
+        if sum(
+            other.moveset_item_win_rate <= b.moveset_item_win_rate
+            for other in week_builds
+        )
+        / len(week_builds)
+        >= 0.75
+    )
+    assert sorted(b.id for b in result) == expected
+    assert plan.explain()["filters"] == [
+        {
+            "name": "min_percentile_moveset_item_win_rate",
+            "type": "min_percentile",
+            "values": [75],
+        }
+    ]
+
+
+def test_query_plan_without_limit():
+    # Arrange
+    params = BuildsQueryParams(top_n=0)
+
+    # Act
+    explanation = QueryPlan.compile(params).explain()
+
+    # Assert
+    assert explanation["limit"] is None
+
+
+@pytest.mark.parametrize(
+    "query, message",
+    [
+        ({"relevance": "nope"}, "Invalid relevance strategy"),
+        ({"sort_by": "nope"}, "Invalid sort_by field"),
+        ({"sort_by": "pokemon,nope:asc"}, "Invalid sort_by field: nope"),
+        ({"sort_by": "pokemon:up"}, "Invalid sort order: up"),
+        (
+            {"min_percentile_moveset_item_win_rate": 101},
+            "min_percentile_moveset_item_win_rate must be between 0 and 100",
+        ),
+    ],
+)
+def test_query_plan_compile_invalid(query, message):
+    # Arrange
+    params = BuildsQueryParams(**query)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match=message):
+        QueryPlan.compile(params)
+
+
+def test_parse_sort_keys():
+    # Act
+    sort_keys = parse_sort_keys("role, pokemon_win_rate:DESC ,item:asc", "asc")
+
+    # Assert
+    assert sort_keys == (
+        (SortBy.ROLE, False),
+        (SortBy.POKEMON_WIN_RATE, True),
+        (SortBy.ITEM, False),
+    )
@@ -1,8 +1,12 @@
+import numpy as np
+import pytest
 from conftest import create_build_response
 
 from pokemon_unite_meta_analysis.relevance_strategy import (
     RELEVANCE_STRATEGIES,
     RelevanceStrategy,
+    popularity_order,
+    relevance_sweep,
 )
 
 
@@ -425,3 +429,124 @@ def test_relevance_quartile_invalid_threshold():
 
     # Assert
     assert len(result) == 0
+
+
+def _reference_select(strategy, rates, threshold):
+    """Loop-based reference mirroring the original list implementations"""
+    order = sorted(range(len(rates)), key=lambda i: rates[i], reverse=True)
+
+    if strategy == "top_n":
+        cut_value = rates[order[int(threshold - 1)]]
+        return [i for i in range(len(rates)) if rates[i] >= cut_value]
+
+    if strategy == "cumulative_coverage":
+        selected, cumulative = [], 0.0
+        for i in order:
+            cumulative += rates[i]
+            selected.append(i)
+            if cumulative >= threshold:
+                break
+        return selected
+
+    return order[: int(threshold) * (len(rates) // 4)]
+
+
+@pytest.mark.parametrize(
+    "strategy, thresholds",
+    [
+        ("top_n", [1, 2, 7, 13, 40]),
+        ("cumulative_coverage", [0.5, 10, 33.3, 99, 250]),
+        ("quartile", [1, 2, 3, 4]),
+    ],
+)
+@pytest.mark.parametrize("precomputed_order", [False, True])
+def test_relevance_select_matches_reference(
+    strategy, thresholds, precomputed_order
+):
+    # Arrange
+    rng = np.random.default_rng(7)
+    rates = np.round(rng.uniform(0, 5, size=41), 1)  # rounding forces ties
+    order = popularity_order(rates) if precomputed_order else None
+
+    for threshold in thresholds:
+        # Act
+        indices = RELEVANCE_STRATEGIES[strategy].select(
+            rates, threshold, order=order
+        )
+
+        # Assert
+        expected = _reference_select(strategy, rates.tolist(), threshold)
+        assert indices.tolist() == expected
+
+
+def test_relevance_percentage_select_returns_indices():
+    # Arrange
+    rates = np.array([12.0, 10.0, 8.0, 6.0])
+
+    # Act
+    indices = RELEVANCE_STRATEGIES["percentage"].select(rates, 9)
+
+    # Assert
+    assert indices.tolist() == [0, 1]
+
+
+def test_relevance_any_select_returns_all_indices():
+    # Arrange
+    rates = np.array([1.0, 3.0, 2.0])
+
+    # Act
+    indices = RELEVANCE_STRATEGIES["any"].select(rates, 0)
+
+    # Assert
+    assert indices.tolist() == [0, 1, 2]
+
+
+def test_relevance_top_n_cut_uses_week_rates():
+    # Arrange
+    rates = np.array([5.0, 3.0])
+    week_rates = np.array([9.0, 5.0, 4.0, 3.0])
+
+    # Act
+    indices = RELEVANCE_STRATEGIES["top_n"].select(
+        rates, 2, week_rates=week_rates
+    )
+
+    # Assert
+    assert indices.tolist() == [0]
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    ["any", "percentage", "top_n", "cumulative_coverage", "quartile"],
+)
+def test_relevance_sweep_matches_select(strategy):
+    # Arrange
+    rng = np.random.default_rng(7)
+    rates = np.round(rng.uniform(0, 5, size=41), 1)  # rounding forces ties
+    order = popularity_order(rates)
+
+    # Act
+    thresholds, counts, coverage = relevance_sweep(strategy, rates, order)
+
+    # Assert
+    assert len(thresholds) == len(counts) == len(coverage)
+    assert np.all(np.diff(thresholds) > 0)
+    for threshold, count, total in zip(thresholds, counts, coverage):
+        selected = RELEVANCE_STRATEGIES[strategy].select(
+            rates, threshold, order=order
+        )
+        assert len(selected) == count
+        assert rates[selected].sum() == pytest.approx(total)
+
+
+def test_relevance_sweep_lists_distinct_selections():
+    # Arrange
+    rates = np.array([2.0, 5.0, 2.0, 1.0])
+
+    # Act
+    thresholds, counts, coverage = relevance_sweep("percentage", rates)
+
+    # Assert
+    assert thresholds.tolist() == [1.0, 2.0, 5.0]
+    assert counts.tolist() == [4, 3, 1]
+    assert coverage.tolist() == [10.0, 9.0, 5.0]
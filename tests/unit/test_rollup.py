@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.rollup import compute_rollup
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+def test_compute_rollup():
+    # Arrange
+    builds = [
+        create_build_response(id=0, pokemon="Pikachu"),
+        create_build_response(id=1, pokemon="Snorlax"),
+        create_build_response(id=2, pokemon="Pikachu"),
+    ]
+
+    # Act
+    rollups = compute_rollup(
+        builds,
+        np.array(["Pikachu", "Snorlax", "Pikachu"]),
+        np.array([50.0, 48.0, 56.0]),
+        np.array([1.0, 2.0, 3.0]),
+        np.array([0.0, 0.0, 1.0]),
+    )
+
+    # Assert
+    assert [r.name for r in rollups] == ["Pikachu", "Snorlax"]
+    pikachu = rollups[0]
+    assert pikachu.build_count == 2
+    assert pikachu.total_true_pick_rate == pytest.approx(4.0)
+    assert pikachu.pick_weighted_win_rate == pytest.approx(54.5)
+    assert pikachu.best_build.id == 2
+
+
+def test_compute_rollup_unpicked_group():
+    # Arrange
+    builds = [create_build_response(id=i) for i in range(2)]
+
+    # Act
+    (rollup,) = compute_rollup(
+        builds,
+        np.array(["Pikachu", "Pikachu"]),
+        np.array([50.0, 54.0]),
+        np.array([0.0, 0.0]),
+        np.array([1.0, 0.0]),
+    )
+
+    # Assert
+    assert rollup.pick_weighted_win_rate == pytest.approx(52.0)
+    assert rollup.total_true_pick_rate == 0.0
+    assert rollup.best_build.id == 0
+
+
+def test_compute_rollup_empty():
+    # Act & Assert
+    assert compute_rollup([], np.array([]), [], [], []) == []
+
+
+def test_week_snapshot_rollup_is_cached(sample_week):
+    # Arrange
+    snapshot = WeekSnapshot(
+        sample_week,
+        [
+            create_build_response(id=0, role="Attacker"),
+            create_build_response(id=1, role="Defender"),
+        ],
+    )
+
+    # Act
+    rollups = snapshot.rollup("role")
+
+    # Assert
+    assert {r.name for r in rollups} == {"Attacker", "Defender"}
+    assert snapshot.rollup("role") is rollups
@@ -0,0 +1,151 @@
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.search_index import SearchIndex, trigrams
+
+
+def _index():
+    index = SearchIndex()
+    index.add("pokemon", "Pikachu")
+    index.add("pokemon", "Garchomp")
+    index.add("pokemon", "Pawmot")
+    index.add("item", "XSpeed")
+    index.add("move", "Thunder")
+    index.add("move", "Thunderbolt")
+    index.add("move", "Thunder Punch")
+    return index
+
+
+def test_trigrams():
+    # Act & Assert
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_search_exact_before_prefix():
+    # Act
+    results = _index().search("thunder")
+
+    # Assert
+    assert [r.name for r in results] == [
+        "Thunder",
+        "Thunderbolt",
+        "Thunder Punch",
+    ]
+    assert [r.match for r in results] == ["exact", "prefix", "prefix"]
+    assert results[0].score == 1.0
+
+
+def test_search_inner_word_prefix():
+    # Act
+    results = _index().search("punch")
+
+    # Assert
+    assert results[0].name == "Thunder Punch"
+    assert results[0].match == "prefix"
+
+
+def test_search_fuzzy():
+    # Act
+    results = _index().search("garchmop")
+
+    # Assert
+    assert results[0].name == "Garchomp"
+    assert results[0].match == "fuzzy"
+    assert results[0].score < 0.5
+
+
+def test_search_kind_and_limit():
+    # Arrange
+    index = _index()
+
+    # Act
+    results = index.search("p", kind="pokemon", limit=1)
+
+    # Assert
+    assert len(results) == 1
+    assert results[0].kind == "pokemon"
+
+
+def test_search_no_match():
+    # Act & Assert
+    assert _index().search("zzzz") == []
+    assert _index().search("   ") == []
+
+
+def test_add_ignores_duplicates():
+    # Arrange
+    index = _index()
+
+    # Act
+    index.add("pokemon", " pikachu ")
+
+    # Assert
+    assert len(index) == 7
+
+
+def test_sync_indexes_new_and_invalidated_weeks():
+    # Arrange
+    index = SearchIndex()
+    weeks = {
+        "w1": [create_build_response(pokemon="Pikachu", move_1="Thunder")],
+        "w2": [create_build_response(pokemon="Snorlax", item="Potion")],
+    }
+    loaded = []
+
+    def load_builds(week):
+        loaded.append(week)
+        return weeks[week]
+
+    # Act
+    index.sync(["w1"], load_builds)
+    index.sync(["w1", "w2"], load_builds)
+    index.invalidate("w1")
+    index.sync(["w1", "w2"], load_builds)
+
+    # Assert
+    assert loaded == ["w1", "w2", "w1"]
+    assert index.search("snorlax")[0].kind == "pokemon"
+    assert index.search("potion")[0].kind == "item"
+    assert index.search("thunder")[0].kind == "move"
+
+
+def test_invalidate_removes_names_of_no_other_week():
+    # Arrange
+    index = SearchIndex()
+    weeks = {
+        "w1": [create_build_response(pokemon="Pikachu", item="XSpeed")],
+        "w2": [create_build_response(pokemon="Pikachu", item="XSpede")],
+    }
+    index.sync(["w1", "w2"], weeks.get)
+    weeks["w2"] = [create_build_response(pokemon="Pikachu", item="XSpeed")]
+
+    # Act
+    index.invalidate("w2")
+    index.sync(["w1", "w2"], weeks.get)
+
+    # Assert
+    assert [result.name for result in index.search("xspe")] == ["XSpeed"]
+    assert index.search("pikachu")[0].match == "exact"
+    assert len(index) == 4
+
+
+def test_sync_releases_weeks_no_longer_available():
+    # Arrange
+    index = SearchIndex()
+    index.add("pokemon", "Mew")
+    weeks = {
+        "w1": [create_build_response(pokemon="Pikachu")],
+        "w2": [create_build_response(pokemon="Mew", move_1="Thunder Thunder")],
+    }
+    index.sync(["w1", "w2"], weeks.get)
+
+    # Act
+    index.sync(["w1"], weeks.get)
+
+    # Assert
+    names = [result.name for result in index.search("thunder thunder")]
+    assert "Thunder Thunder" not in names
+    assert [result.name for result in index.search("thunder")] == [
+        "Thunderbolt"
+    ]
+    assert index.search("mew")[0].name == "Mew"
+    assert index.search("pikachu")[0].name == "Pikachu"
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock
+
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.snapshot_cache import (
+    SNAPSHOT_CACHE,
+    SnapshotCache,
+)
+
+
+def test_snapshot_cache_loads_once(sample_week):
+    # Arrange
+    cache = SnapshotCache()
+    load_builds = MagicMock(return_value=[create_build_response()])
+
+    # Act
+    first = cache.get(sample_week, load_builds)
+    second = cache.get(sample_week, load_builds)
+
+    # Assert
+    assert first is second
+    load_builds.assert_called_once()
+
+
+def test_snapshot_cache_drops_least_recently_used():
+    # Arrange
+    cache = SnapshotCache(max_size=2)
+    load_builds = MagicMock(return_value=[create_build_response()])
+    first = cache.get("w1", load_builds)
+    cache.get("w2", load_builds)
+    cache.get("w1", load_builds)
+
+    # Act
+    cache.get("w3", load_builds)
+
+    # Assert
+    assert len(cache) == 2
+    assert cache.get("w1", load_builds) is first
+    assert load_builds.call_count == 3
+    cache.get("w2", load_builds)
+    assert load_builds.call_count == 4
+
+
+def test_snapshot_cache_invalidate_drops_week_and_all_weeks(sample_week):
+    # Arrange
+    cache = SnapshotCache()
+    load_builds = MagicMock(return_value=[create_build_response()])
+    cache.get(sample_week, load_builds)
+    cache.get(None, load_builds)
+    cache.get("Y2025m10d05", load_builds)
+
+    # Act
+    cache.invalidate(sample_week)
+    cache.get(sample_week, load_builds)
+    cache.get(None, load_builds)
+    cache.get("Y2025m10d05", load_builds)
+
+    # Assert
+    assert load_builds.call_count == 5
+
+
+def test_repository_create_invalidates_snapshot(build_repository, sample_week):
+    # Arrange
+    def load_builds():
+        return build_repository.get_all_builds(week=sample_week)
+
+    before = SNAPSHOT_CACHE.get(sample_week, load_builds)
+
+    # Act
+    build_repository.create(create_build_response(), week=sample_week)
+    after = SNAPSHOT_CACHE.get(sample_week, load_builds)
+
+    # Assert
+    assert len(before) == 0
+    assert len(after) == 1
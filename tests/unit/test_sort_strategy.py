@@ -341,3 +341,34 @@ def test_moveset_item_true_pick_rate_sort_strategy(sample_builds):
         14.0,
         19.0,
     ]
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+@pytest.mark.parametrize("k", [0, 1, 3, 7, 50])
+def test_sort_strategy_top_k_matches_full_sort(sample_week, reverse, k):
+    # Arrange
+    builds = [
+        create_build_response(
+            id=i, week=sample_week, moveset_item_win_rate=float(i % 4)
+        )
+        for i in range(12)
+    ]
+    strategy = MovesetItemWinRateSortStrategy()
+
+    # Act
+    top_k = strategy.apply(builds, reverse=reverse, k=k)
+
+    # Assert
+    full = strategy.apply(builds, reverse=reverse)
+    assert [b.id for b in top_k] == [b.id for b in full[:k]]
+
+
+def test_sort_strategy_top_k_accepts_iterables(sample_builds):
+    # Arrange
+    strategy = PokemonSortStrategy()
+
+    # Act
+    top_k = strategy.apply(iter(sample_builds), k=2)
+
+    # Assert
+    assert [b.pokemon for b in top_k] == ["Lucario", "Pikachu"]
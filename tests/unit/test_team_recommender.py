@@ -0,0 +1,142 @@
+import itertools
+
+import pytest
+from conftest import create_build_response
+
+from entity.team_query_params import TeamQueryParams
+from pokemon_unite_meta_analysis.team_recommender import recommend_teams
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+ROLES = ["Attacker", "Defender", "Support", "Speedster", "All-Rounder"]
+
+
+@pytest.fixture
+def snapshot(sample_week):
+    # Four Pokémon per role, two builds per Pokémon
+    builds = []
+    for i in range(40):
+        pokemon = i // 2
+        builds.append(
+            create_build_response(
+                id=i,
+                week=sample_week,
+                pokemon=f"Pokemon{pokemon}",
+                role=ROLES[pokemon % len(ROLES)],
+                move_1=f"Move{i}",
+                moveset_item_win_rate=40.0 + (i * 37) % 23,
+            )
+        )
+    return WeekSnapshot(sample_week, builds)
+
+
+def _brute_force(snapshot, metric, team_size, required, max_per_role, k):
+    best = {}
+    for build in snapshot.builds:
+        value = getattr(build, metric)
+        if build.pokemon not in best or value > best[build.pokemon][0]:
+            best[build.pokemon] = (value, build.role)
+
+    scores = []
+    for team in itertools.combinations(best.values(), team_size):
+        roles = [role for _, role in team]
+        if all(roles.count(role) >= count for role, count in required.items()):
+            if max(roles.count(role) for role in roles) <= max_per_role:
+                scores.append(sum(value for value, _ in team))
+
+    return sorted(scores, reverse=True)[:k]
+
+
+@pytest.mark.parametrize(
+    "params, required, max_per_role",
+    [
+        ({}, {role: 1 for role in ROLES}, 5),
+        ({"roles": "Attacker,Attacker"}, {"Attacker": 2}, 5),
+        (
+            {"roles": "Support", "max_per_role": 2},
+            {"Support": 1},
+            2,
+        ),
+        ({"roles": "Defender", "team_size": 3}, {"Defender": 1}, 3),
+    ],
+)
+def test_recommend_teams_matches_brute_force(
+    snapshot, params, required, max_per_role
+):
+    # Arrange
+    params = TeamQueryParams(metric="moveset_item_win_rate", top_k=5, **params)
+
+    # Act
+    recommendation = recommend_teams(snapshot, params)
+
+    # Assert
+    expected = _brute_force(
+        snapshot,
+        "moveset_item_win_rate",
+        params.team_size,
+        required,
+        max_per_role,
+        5,
+    )
+    assert [team.score for team in recommendation.teams] == pytest.approx(
+        expected
+    )
+    for team in recommendation.teams:
+        pokemon = [member.pokemon for member in team.members]
+        roles = [member.role for member in team.members]
+        assert len(set(pokemon)) == params.team_size
+        assert all(roles.count(r) >= count for r, count in required.items())
+        assert team.score == pytest.approx(
+            sum(member.value for member in team.members)
+        )
+
+
+def test_recommend_teams_include_and_exclude(snapshot):
+    # Arrange
+    params = TeamQueryParams(
+        metric="moveset_item_win_rate",
+        include_pokemon="pokemon0",
+        exclude_pokemon="Pokemon1,Pokemon6",
+        top_k=3,
+    )
+
+    # Act
+    recommendation = recommend_teams(snapshot, params)
+
+    # Assert
+    assert recommendation.teams
+    for team in recommendation.teams:
+        pokemon = {member.pokemon for member in team.members}
+        assert "Pokemon0" in pokemon
+        assert not pokemon & {"Pokemon1", "Pokemon6"}
+
+
+def test_recommend_teams_infeasible(snapshot):
+    # Arrange
+    params = TeamQueryParams(
+        roles="Attacker,Attacker,Attacker,Attacker,Attacker"
+    )
+
+    # Act
+    recommendation = recommend_teams(snapshot, params)
+
+    # Assert
+    assert recommendation.roles == ["Attacker"] * 5
+    assert recommendation.teams == []
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ({"metric": "role"}, "Invalid metric: role"),
+        ({"roles": "Tank"}, "Invalid role: Tank"),
+        ({"team_size": 3}, "5 roles are required but team_size is 3"),
+        ({"roles": "Attacker,Attacker", "max_per_role": 1}, "max_per_role"),
+        ({"include_pokemon": "Mew"}, "'mew' is not a candidate"),
+        ({"top_k": 0}, "top_k must be at least 1"),
+        ({"relevance": "best"}, "Invalid relevance strategy: best"),
+    ],
+)
+def test_recommend_teams_invalid_params(snapshot, params, message):
+    # Act & Assert
+    with pytest.raises(ValueError, match=message):
+        recommend_teams(snapshot, TeamQueryParams(**params))
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+from conftest import create_build_response
+
+from entity.tier_query_params import TierQueryParams
+from pokemon_unite_meta_analysis.tier_list import (
+    TierListCache,
+    compute_tier_list,
+    kmeans_tiers,
+    quantile_tiers,
+)
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+@pytest.fixture
+def snapshot(sample_week):
+    pokemons = ["Pikachu", "Snorlax", "Lucario", "Gengar", "Absol"]
+    return WeekSnapshot(
+        sample_week,
+        [
+            create_build_response(
+                id=i,
+                week=sample_week,
+                pokemon=pokemons[i % 5],
+                moveset_item_win_rate=45.0 + i,
+                moveset_item_true_pick_rate=float(i + 1),
+            )
+            for i in range(10)
+        ],
+    )
+
+
+def test_quantile_tiers():
+    # Act
+    tiers = quantile_tiers(np.arange(10.0))
+
+    # Assert
+    assert tiers.tolist() == [4, 4, 3, 3, 2, 2, 1, 1, 0, 0]
+
+
+def test_kmeans_tiers_follow_gaps():
+    # Arrange
+    values = np.array([1.0, 1.1, 5.0, 5.2, 9.0, 9.1, 9.2, 20.0, 30.0, 30.5])
+
+    # Act
+    tiers = kmeans_tiers(values)
+
+    # Assert
+    assert tiers.tolist() == [4, 4, 3, 3, 2, 2, 2, 1, 0, 0]
+
+
+@pytest.mark.parametrize("tiers", [quantile_tiers, kmeans_tiers])
+def test_tiers_empty(tiers):
+    # Act & Assert
+    assert tiers(np.array([])).tolist() == []
+
+
+def test_compute_tier_list_builds(snapshot):
+    # Act
+    tier_list = compute_tier_list(
+        snapshot,
+        TierQueryParams(level="build", metric="moveset_item_win_rate"),
+    )
+
+    # Assert
+    assert [t.tier for t in tier_list.tiers] == ["S", "A", "B", "C", "D"]
+    assert [e.build_id for e in tier_list.tiers[0].entries] == [9, 8]
+    assert tier_list.tiers[0].min_value == 53.0
+    assert tier_list.tiers[0].max_value == 54.0
+    assert [e.build_id for e in tier_list.tiers[4].entries] == [1, 0]
+
+
+def test_compute_tier_list_pokemon(snapshot):
+    # Act
+    tier_list = compute_tier_list(
+        snapshot,
+        TierQueryParams(
+            metric="moveset_item_win_rate",
+            relevance="top_n",
+            relevance_threshold=6,
+        ),
+    )
+
+    # Assert
+    entries = [e for t in tier_list.tiers for e in t.entries]
+    assert [e.pokemon for e in entries] == [
+        "Gengar",
+        "Absol",
+        "Lucario",
+        "Snorlax",
+        "Pikachu",
+    ]
+    assert entries[1].build_count == 2
+    assert entries[1].value == pytest.approx((49 * 5 + 54 * 10) / 15)
+    assert entries[1].build_id is None
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ({"level": "item"}, "Invalid level: item"),
+        ({"metric": "pokemon"}, "Invalid metric: pokemon"),
+        ({"method": "jenks"}, "Invalid method: jenks"),
+        ({"relevance": "nope"}, "Invalid relevance strategy: nope"),
+    ],
+)
+def test_compute_tier_list_invalid(snapshot, params, message):
+    # Act & Assert
+    with pytest.raises(ValueError, match=message):
+        compute_tier_list(snapshot, TierQueryParams(**params))
+
+
+def test_tier_list_cache_invalidates_week_and_all_weeks(snapshot):
+    # Arrange
+    cache = TierListCache()
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return compute_tier_list(snapshot, TierQueryParams())
+
+    for week in ("w1", "w2", None):
+        cache.get(TierQueryParams(week=week), compute)
+
+    # Act
+    cache.invalidate("w1")
+    for week in ("w1", "w2", None):
+        cache.get(TierQueryParams(week=week), compute)
+
+    # Assert
+    assert len(computed) == 5
@@ -0,0 +1,255 @@
+import numpy as np
+import pytest
+from conftest import create_build_response
+
+from entity.trend_query_params import TrendQueryParams
+from pokemon_unite_meta_analysis.trends import (
+    EWMA_ALPHA,
+    TrendIndex,
+    compute_trends,
+)
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+WEEKS = ["Y2025m09d07", "Y2025m09d14", "Y2025m09d21", "Y2025m09d28"]
+
+# Win rate of each Pokémon's build in each week, None when it is missing
+WIN_RATES = {
+    "Pikachu": [50.0, 51.0, 52.0, 53.0],
+    "Snorlax": [55.0, 54.0, None, 50.0],
+    "Lucario": [None, None, 48.0, 48.5],
+    "Gengar": [49.0, None, None, 49.0],
+}
+
+
+def _snapshots(win_rates=WIN_RATES):
+    snapshots = {}
+    for column, week in enumerate(WEEKS):
+        builds = [
+            create_build_response(
+                id=column * 10 + i,
+                week=week,
+                pokemon=pokemon,
+                moveset_item_win_rate=rates[column],
+                moveset_item_true_pick_rate=float(i + 1),
+            )
+            for i, (pokemon, rates) in enumerate(win_rates.items())
+            if rates[column] is not None
+        ]
+        snapshots[week] = WeekSnapshot(week, builds)
+    return snapshots
+
+
+@pytest.fixture
+def snapshots():
+    return _snapshots()
+
+
+@pytest.fixture
+def index(snapshots):
+    index = TrendIndex()
+    index.sync(WEEKS, snapshots.__getitem__)
+    return index
+
+
+def _expected(pokemon: str, window: int):
+    rates = WIN_RATES[pokemon]
+    points = [
+        (t, rate)
+        for t, rate in enumerate(rates)
+        if rate is not None and t > len(WEEKS) - 1 - window
+    ]
+    t, x = (np.array(values) for values in zip(*points))
+    ewma = None
+    for rate in rates:
+        if rate is not None:
+            ewma = (
+                rate
+                if ewma is None
+                else EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * ewma
+            )
+    slope = np.polyfit(t, x, 1)[0] if len(t) > 1 else np.nan
+    return len(t), x.mean(), slope, ewma
+
+
+@pytest.mark.parametrize("window", [2, 3, 4, 10])
+def test_statistics_match_full_recompute(index, snapshots, window):
+    # Act
+    count, statistics = index.statistics(WEEKS[-1], window)
+
+    # Assert
+    for position, build in enumerate(snapshots[WEEKS[-1]].builds):
+        weeks, mean, slope, ewma = _expected(build.pokemon, window)
+        assert count[position] == weeks
+        assert statistics["moveset_item_win_rate_mean"][position] == (
+            pytest.approx(mean)
+        )
+        assert statistics["moveset_item_win_rate_ewma"][position] == (
+            pytest.approx(ewma)
+        )
+        if weeks > 1:
+            assert statistics["moveset_item_win_rate_slope"][position] == (
+                pytest.approx(slope)
+            )
+        else:
+            assert np.isnan(statistics["moveset_item_win_rate_slope"][position])
+
+
+def test_sync_only_loads_new_weeks(snapshots):
+    # Arrange
+    index = TrendIndex()
+    loaded = []
+
+    def load_snapshot(week):
+        loaded.append(week)
+        return snapshots[week]
+
+    index.sync(WEEKS[:3], load_snapshot)
+
+    # Act
+    index.sync(WEEKS, load_snapshot)
+    index.sync(WEEKS, load_snapshot)
+
+    # Assert
+    assert loaded == WEEKS
+
+
+def test_invalidate_recomputes_from_week(index):
+    # Arrange
+    win_rates = dict(WIN_RATES, Pikachu=[50.0, 51.0, 52.0, 40.0])
+    snapshots = _snapshots(win_rates)
+    loaded = []
+
+    def load_snapshot(week):
+        loaded.append(week)
+        return snapshots[week]
+
+    # Act
+    index.invalidate(WEEKS[-1])
+    index.sync(WEEKS, load_snapshot)
+    count, statistics = index.statistics(WEEKS[-1], 4)
+
+    # Assert
+    assert loaded == [WEEKS[-1]]
+    slope = np.polyfit(np.arange(4), win_rates["Pikachu"], 1)[0]
+    assert statistics["moveset_item_win_rate_slope"][0] == pytest.approx(slope)
+
+
+def test_statistics_invalid_week(index):
+    # Act & Assert
+    with pytest.raises(ValueError, match="Invalid week"):
+        index.statistics("Y2024m01d01", 4)
+
+
+def test_compute_trends_risers_and_fallers(index, snapshots):
+    # Act
+    trends = compute_trends(
+        index, snapshots[WEEKS[-1]], TrendQueryParams(window=4)
+    )
+
+    # Assert
+    assert [trend.pokemon for trend in trends.risers] == ["Pikachu", "Lucario"]
+    assert [trend.pokemon for trend in trends.fallers] == ["Snorlax"]
+    assert trends.risers[0].moveset_item_win_rate_slope == pytest.approx(1.0)
+    assert trends.risers[0].weeks == 4
+
+
+def test_compute_trends_filters(index, snapshots):
+    # Act
+    trends = compute_trends(
+        index,
+        snapshots[WEEKS[-1]],
+        TrendQueryParams(pokemon="lucario", top_n=1),
+    )
+
+    # Assert
+    assert [trend.pokemon for trend in trends.risers] == ["Lucario"]
+    assert trends.fallers == []
+
+
+def test_compute_trends_min_weeks(index, snapshots):
+    # Act
+    trends = compute_trends(
+        index, snapshots[WEEKS[-1]], TrendQueryParams(min_weeks=3)
+    )
+
+    # Assert
+    assert [trend.pokemon for trend in trends.risers] == ["Pikachu"]
+    assert [trend.pokemon for trend in trends.fallers] == ["Snorlax"]
+
+
+def test_compute_trends_sorts_by_ewma(index, snapshots):
+    # Act
+    trends = compute_trends(
+        index,
+        snapshots[WEEKS[-1]],
+        TrendQueryParams(sort_by="moveset_item_win_rate_ewma"),
+    )
+
+    # Assert
+    ewma = [trend.moveset_item_win_rate_ewma for trend in trends.builds]
+    assert trends.sort_by == "moveset_item_win_rate_ewma"
+    assert [trend.pokemon for trend in trends.builds] == [
+        "Snorlax",
+        "Pikachu",
+        "Gengar",
+        "Lucario",
+    ]
+    assert ewma == sorted(ewma, reverse=True)
+
+
+def test_compute_trends_sorts_ascending(index, snapshots):
+    # Act
+    trends = compute_trends(
+        index,
+        snapshots[WEEKS[-1]],
+        TrendQueryParams(
+            sort_by="moveset_item_win_rate_ewma", sort_order="asc", top_n=2
+        ),
+    )
+
+    # Assert
+    assert [trend.pokemon for trend in trends.builds] == ["Lucario", "Gengar"]
+
+
+def test_compute_trends_without_sort_by(index, snapshots):
+    # Act
+    trends = compute_trends(index, snapshots[WEEKS[-1]], TrendQueryParams())
+
+    # Assert
+    assert trends.sort_by is None
+    assert trends.builds == []
+
+
+def test_compute_trends_filters_on_statistics(index, snapshots):
+    # Act
+    trends = compute_trends(
+        index,
+        snapshots[WEEKS[-1]],
+        TrendQueryParams(
+            sort_by="moveset_item_win_rate_mean",
+            min_moveset_item_win_rate_slope=0,
+            max_moveset_item_win_rate_mean=50,
+        ),
+    )
+
+    # Assert
+    assert [trend.pokemon for trend in trends.builds] == ["Gengar", "Lucario"]
+    assert [trend.pokemon for trend in trends.risers] == ["Lucario"]
+    assert trends.fallers == []
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ({"metric": "role"}, "Invalid metric: role"),
+        ({"window": 1}, "window must be at least 2"),
+        ({"min_weeks": 1}, "min_weeks must be at least 2"),
+        ({"top_n": 0}, "top_n must be at least 1"),
+        ({"sort_by": "role"}, "Invalid sort_by field: role"),
+        ({"sort_order": "up"}, "Invalid sort_order: up"),
+    ],
+)
+def test_compute_trends_invalid_params(index, snapshots, params, message):
+    # Act & Assert
+    with pytest.raises(ValueError, match=message):
+        compute_trends(index, snapshots[WEEKS[-1]], TrendQueryParams(**params))
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from conftest import create_build_response
+
+from pokemon_unite_meta_analysis.relevance_strategy import (
+    RELEVANCE_STRATEGIES,
+    Relevance,
+)
+from pokemon_unite_meta_analysis.sort_strategy import SORT_STRATEGIES, SortBy
+from pokemon_unite_meta_analysis.week_snapshot import WeekSnapshot
+
+
+@pytest.fixture
+def snapshot(sample_week):
+    builds = [
+        create_build_response(
+            id=10 + i,
+            week=sample_week,
+            pokemon=["Pikachu", "Snorlax", "Absol"][i % 3],
+            moveset_item_win_rate=float(i % 4),
+            moveset_item_true_pick_rate=float((i * 3) % 7),
+        )
+        for i in range(10)
+    ]
+    return WeekSnapshot(sample_week, builds)
+
+
+@pytest.mark.parametrize("sort_by", list(SortBy))
+@pytest.mark.parametrize("reverse", [True, False])
+def test_sort_permutation_breaks_ties_by_id(snapshot, sort_by, reverse):
+    # Act
+    permutation = snapshot.sort_permutation(((sort_by, reverse),))
+
+    # Assert
+    by_id = sorted(snapshot.builds, key=lambda b: b.id)
+    expected = SORT_STRATEGIES[sort_by].apply(by_id, reverse=reverse)
+    assert [b.id for b in snapshot.take(permutation)] == [
+        b.id for b in expected
+    ]
+
+
+def test_sort_permutation_multiple_keys(snapshot):
+    # Act
+    permutation = snapshot.sort_permutation(
+        ((SortBy.POKEMON, False), (SortBy.MOVESET_ITEM_WIN_RATE, True))
+    )
+
+    # Assert
+    expected = sorted(
+        snapshot.builds,
+        key=lambda b: (b.pokemon, -b.moveset_item_win_rate, b.id),
+    )
+    assert [b.id for b in snapshot.take(permutation)] == [
+        b.id for b in expected
+    ]
+
+
+def test_sort_permutation_is_computed_once(snapshot):
+    # Act
+    first = snapshot.sort_permutation(((SortBy.POKEMON, False),))
+    second = snapshot.sort_permutation(((SortBy.POKEMON, False),))
+
+    # Assert
+    assert first is second
+
+
+def test_sort_indices_walks_subset_in_order(snapshot):
+    # Arrange
+    subset = np.array([7, 0, 3, 5, 1])
+
+    # Act
+    ordered = snapshot.sort_indices(
+        subset, ((SortBy.MOVESET_ITEM_WIN_RATE, True),), k=3
+    )
+
+    # Assert
+    assert ordered.tolist() == [3, 7, 1]
+
+
+def test_sort_indices_empty_subset(snapshot):
+    # Act
+    ordered = snapshot.sort_indices(
+        np.array([], dtype=np.intp), ((SortBy.POKEMON, False),)
+    )
+
+    # Assert
+    assert ordered.tolist() == []
+
+
+def test_popularity_ranks(snapshot):
+    # Act
+    ranks = snapshot.popularity_ranks
+
+    # Assert
+    expected = sorted(
+        snapshot.builds,
+        key=lambda b: b.moveset_item_true_pick_rate,
+        reverse=True,
+    )
+    assert ranks == {b.id: rank + 1 for rank, b in enumerate(expected)}
+
+
+@pytest.mark.parametrize(
+    "relevance, threshold",
+    [
+        (Relevance.TOP_N, 3),
+        (Relevance.CUMULATIVE_COVERAGE, 12.0),
+        (Relevance.QUARTILE, 2),
+        (Relevance.PERCENTAGE, 4.0),
+    ],
+)
+def test_relevant_indices_matches_strategy(snapshot, relevance, threshold):
+    # Act
+    indices = snapshot.relevant_indices(relevance, threshold)
+
+    # Assert
+    expected = RELEVANCE_STRATEGIES[relevance].select(
+        snapshot.column("moveset_item_true_pick_rate"), threshold
+    )
+    assert indices.tolist() == expected.tolist()
+
+
+def test_relevant_indices_is_memoized(snapshot, monkeypatch):
+    # Arrange
+    first = snapshot.relevant_indices(Relevance.TOP_N, 3)
+    monkeypatch.setitem(RELEVANCE_STRATEGIES, Relevance.TOP_N, None)
+
+    # Act
+    second = snapshot.relevant_indices(Relevance.TOP_N, 3)
+
+    # Assert
+    assert first is second
+
+
+def test_keys_are_normalized_once(sample_week):
+    # Arrange
+    snapshot = WeekSnapshot(
+        sample_week,
+        [
+            create_build_response(id=1, item="Attack  Weight"),
+            create_build_response(id=2, item="attack weight"),
+        ],
+    )
+
+    # Act
+    keys = snapshot.keys("item")
+
+    # Assert
+    assert keys.tolist() == ["attack weight", "attack weight"]
+    assert keys[0] is keys[1]
+    assert snapshot.keys("item") is keys
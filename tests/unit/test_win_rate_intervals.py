@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+from conftest import create_build_model, create_build_response
+
+from pokemon_unite_meta_analysis.win_rate_interval_job import (
+    _tasks,
+    _week_intervals,
+)
+from pokemon_unite_meta_analysis.win_rate_intervals import (
+    compute_win_rate_intervals,
+    sample_sizes,
+    wilson_interval,
+)
+
+
+def test_sample_sizes():
+    # Act
+    sizes = sample_sizes(np.array([10.0, 0.5, 0.0]), matches_per_week=1000)
+
+    # Assert
+    assert sizes.tolist() == [100.0, 5.0, 1.0]
+
+
+def test_wilson_interval_contains_win_rate():
+    # Act
+    lower, upper = wilson_interval(np.array([50.0, 90.0]), np.array([100, 10]))
+
+    # Assert
+    assert lower[0] < 50.0 < upper[0]
+    assert lower[1] < 90.0 < upper[1]
+    assert upper[1] <= 100.0
+    assert lower[0] == pytest.approx(40.38, abs=0.01)
+    assert upper[0] == pytest.approx(59.62, abs=0.01)
+
+
+def test_intervals_narrow_with_pick_rate():
+    # Act
+    lower, upper = compute_win_rate_intervals(
+        np.array([55.0, 55.0]), np.array([0.1, 10.0])
+    )
+
+    # Assert
+    widths = upper - lower
+    assert widths[1] < widths[0]
+
+
+def test_bootstrap_close_to_wilson():
+    # Arrange
+    win_rates = np.array([48.0, 52.0, 60.0])
+    pick_rates = np.array([1.0, 2.0, 5.0])
+
+    # Act
+    wilson = compute_win_rate_intervals(win_rates, pick_rates)
+    bootstrap = compute_win_rate_intervals(
+        win_rates, pick_rates, method="bootstrap", seed=0
+    )
+
+    # Assert
+    np.testing.assert_allclose(bootstrap[0], wilson[0], atol=0.5)
+    np.testing.assert_allclose(bootstrap[1], wilson[1], atol=0.5)
+
+
+def test_bootstrap_is_reproducible_with_seed():
+    # Act
+    first = compute_win_rate_intervals(
+        np.array([50.0]), np.array([1.0]), method="bootstrap", seed=7
+    )
+    second = compute_win_rate_intervals(
+        np.array([50.0]), np.array([1.0]), method="bootstrap", seed=7
+    )
+
+    # Assert
+    assert first[0].tolist() == second[0].tolist()
+    assert first[1].tolist() == second[1].tolist()
+
+
+def test_compute_win_rate_intervals_empty():
+    # Act
+    lower, upper = compute_win_rate_intervals(np.array([]), np.array([]))
+
+    # Assert
+    assert len(lower) == 0
+    assert len(upper) == 0
+
+
+def test_compute_win_rate_intervals_invalid_method():
+    # Act & Assert
+    with pytest.raises(ValueError, match="Invalid interval method"):
+        compute_win_rate_intervals(np.array([50.0]), np.array([1.0]), "exact")
+
+
+def test_job_tasks_group_builds_by_week():
+    # Arrange
+    builds = [
+        create_build_model(id=1, week="Y2025m09d28"),
+        create_build_model(id=2, week="Y2025m09d21"),
+        create_build_model(id=3, week="Y2025m09d28"),
+    ]
+
+    # Act
+    tasks = _tasks(builds, "wilson", 1000, seed=10)
+
+    # Assert
+    assert [(task[0], task[1], task[-1]) for task in tasks] == [
+        ("Y2025m09d21", [2], 10),
+        ("Y2025m09d28", [1, 3], 11),
+    ]
+
+
+def test_job_week_intervals():
+    # Act
+    week, intervals = _week_intervals(
+        ("Y2025m09d28", [4, 5], [50.0, 60.0], [1.0, 2.0], "wilson", 1000, None)
+    )
+
+    # Assert
+    assert week == "Y2025m09d28"
+    assert [build_id for build_id, _, _ in intervals] == [4, 5]
+    assert all(lower < upper for _, lower, upper in intervals)
+
+
+def test_repository_stores_intervals(build_repository, sample_week):
+    # Arrange
+    build_repository.create(
+        create_build_response(id=0, week=sample_week), week=sample_week
+    )
+    build_id = build_repository.get_all_builds(week=sample_week)[0].id
+
+    # Act
+    build_repository.add_win_rate_interval_columns()
+    build_repository.add_win_rate_interval_columns()
+    build_repository.update_win_rate_intervals(
+        sample_week, [(build_id, 51.0, 55.0)]
+    )
+    build = build_repository.get_all_builds(week=sample_week)[0]
+
+    # Assert
+    assert build.win_rate_ci_lower == 51.0
+    assert build.win_rate_ci_upper == 55.0